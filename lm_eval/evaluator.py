@@ -6,6 +6,7 @@ import lm_eval.metrics
 import lm_eval.models
 import lm_eval.tasks
 import lm_eval.base
+import lm_eval.usage
 from lm_eval.utils import positional_deprecated, run_task_tests
 
 
@@ -247,6 +248,12 @@ def evaluate(
     # all responses for each (task, doc)
     process_res_queue = collections.defaultdict(list)
 
+    # per-request token/latency/retry records of API models (lm_eval/usage.py)
+    usage_tracker = getattr(lm_eval.usage.unwrap_lm(lm), "usage", None)
+    if not isinstance(usage_tracker, lm_eval.usage.UsageTracker):
+        usage_tracker = None
+    usage_by_doc = collections.defaultdict(list)
+
     # execute each type of request
     for reqtype, reqs in requests.items():
         # TODO: right now, this code runs multiple separate LM requests for multiple Requests differing
@@ -255,6 +262,10 @@ def evaluate(
         #       they should end up next to each other.
 
         print("Running", reqtype, "requests")
+        # models that score the doc itself rather than the prompt (e.g. hf-seqcls)
+        set_request_docs = getattr(lm_eval.usage.unwrap_lm(lm), "set_request_docs", None)
+        if set_request_docs is not None:
+            set_request_docs(reqtype, [(req.args, doc) for req, (_, _, doc, _) in zip(reqs, requests_origin[reqtype])])
         resps = getattr(lm, reqtype)([req.args for req in reqs])
         resps = [
             x if req.index is None else x[req.index] for x, req in zip(resps, reqs)
@@ -263,6 +274,18 @@ def evaluate(
         for resp, (i, task_name, doc, doc_id) in zip(resps, requests_origin[reqtype]):
             process_res_queue[(task_name, doc_id)].append((i, resp))
 
+        if usage_tracker is not None:
+            for req, (i, task_name, doc, doc_id) in zip(reqs, requests_origin[reqtype]):
+                usage_by_doc[(task_name, doc_id)].append(usage_tracker.pop(reqtype, req.args))
+
+    # usage[task]["total"] and usage[task]["groups"][subgroup metric, e.g. exam or area]
+    usage = collections.defaultdict(
+        lambda: {
+            "total": lm_eval.usage.empty_usage(),
+            "groups": collections.defaultdict(lm_eval.usage.empty_usage),
+        }
+    )
+
     vals = collections.defaultdict(list)
 
     # unpack results and sort back in order and return control to Task
@@ -274,6 +297,12 @@ def evaluate(
         doc = docs[(task_name, doc_id)]
 
         metrics = task.process_results(doc, requests)
+        for record in usage_by_doc.get((task_name, doc_id), []):
+            lm_eval.usage.add_usage(usage[task_name]["total"], record)
+            for metric in metrics:
+                if metric != "acc":
+                    lm_eval.usage.add_usage(usage[task_name]["groups"][metric], record)
+
         for metric, value in metrics.items():
             vals[(task_name, metric)].append(value)
 
@@ -305,7 +334,22 @@ def evaluate(
         if stderr is not None:
             results[task_name][metric + "_stderr"] = stderr(items)
 
-    return {"results": dict(results), "versions": dict(versions)}
+    output = {"results": dict(results), "versions": dict(versions)}
+    if usage_tracker is not None:
+        variant = {
+            "num_fewshot": num_fewshot,
+            "conversation_template": conversation_template,
+            "prompt_as_single_user_message": prompt_as_single_user_message,
+        }
+        output["usage"] = {
+            task_name: {
+                "variant": dict(variant, prompt_mode=getattr(task_dict[task_name], "PROMPT_MODE", None)),
+                "total": task_usage["total"],
+                "groups": dict(task_usage["groups"]),
+            }
+            for task_name, task_usage in usage.items()
+        }
+    return output
 
 
 def make_table(result_dict):
@@ -339,3 +383,24 @@ def make_table(result_dict):
     # print(latex_writer.dumps())
 
     return md_writer.dumps()
+
+
+def make_usage_table(result_dict):
+    """Generate table of API usage (tokens, latency, retries) per task."""
+    from pytablewriter import MarkdownTableWriter
+
+    md_writer = MarkdownTableWriter()
+    md_writer.headers = ["Task", "Requests", "Cached", "Prompt tok", "Completion tok", "Latency (s)", "Retries"]
+    md_writer.value_matrix = [
+        [
+            task_name,
+            u["total"]["requests"],
+            u["total"]["cached"],
+            u["total"]["prompt_tokens"],
+            u["total"]["completion_tokens"],
+            "%.1f" % u["total"]["latency"],
+            u["total"]["retries"],
+        ]
+        for task_name, u in result_dict.get("usage", {}).items()
+    ]
+    return md_writer.dumps()
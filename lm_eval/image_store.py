@@ -0,0 +1,252 @@
+"""Preprocessed, content-addressed image payloads for the multimodal ENEM tasks.
+
+Figures under ``data/figures/<year>`` are downscaled to ``max_side`` pixels,
+re-encoded (png / jpeg / webp) and stored once as base64 data URLs in an
+append-only blob file, read back through ``mmap``. A JSON index maps each
+(source path, variant) to the sha256 of its payload, so re-encoding only
+happens when a source file changes.
+
+Prompts carry a short ``asset://sha256/<hash>`` reference instead of the image
+(keeping request contexts and cache keys small); API backends call
+``resolve_messages`` right before sending, so every run and every repeated
+pass sends byte-identical payloads.
+
+Pillow is optional: without it images are stored as-is (no resizing).
+
+Build the store ahead of a run with ``scripts/build_image_store.py``.
+"""
+import base64
+import hashlib
+import io
+import json
+import mimetypes
+import mmap
+import os
+import threading
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+ASSET_PREFIX = "asset://sha256/"
+DEFAULT_STORE_DIR = os.path.join("data", "figures_cache")
+DEFAULT_MAX_SIDE = 1024
+DEFAULT_FORMAT = "png"
+DEFAULT_QUALITY = 85
+
+_MIME = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+def encode_image(path, max_side=DEFAULT_MAX_SIDE, fmt=DEFAULT_FORMAT, quality=DEFAULT_QUALITY):
+    """(mime, bytes) of the image downscaled to `max_side` and re-encoded as `fmt`."""
+    if Image is None:
+        mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        with open(path, "rb") as f:
+            return mime, f.read()
+
+    fmt = fmt.lower()
+    with Image.open(path) as img:
+        img.load()
+        if max_side and max(img.size) > max_side:
+            img.thumbnail((max_side, max_side), Image.LANCZOS)
+        if fmt == "jpeg" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+            img = img.convert("RGBA")
+        out = io.BytesIO()
+        if fmt == "png":
+            img.save(out, format="PNG", optimize=True)
+        else:
+            img.save(out, format=fmt.upper(), quality=quality)
+    return _MIME[fmt], out.getvalue()
+
+
+class ImageStore:
+    """Append-only blob file of data URLs plus a JSON index, read via mmap.
+
+    Writers are serialized by a lock within a process; build the store from a
+    single process (``scripts/build_image_store.py``) before parallel runs.
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR, max_side=DEFAULT_MAX_SIDE, fmt=DEFAULT_FORMAT,
+                 quality=DEFAULT_QUALITY):
+        if fmt.lower() not in _MIME:
+            raise ValueError(f"Unsupported image format: {fmt} (use one of {sorted(_MIME)})")
+        self.store_dir = store_dir
+        self.max_side = max_side
+        self.fmt = fmt.lower()
+        self.quality = quality
+        # Without Pillow nothing is re-encoded, so all settings share one variant
+        self.variant = f"{max_side}-{self.fmt}-{quality}" if Image is not None else "original"
+        self.blob_path = os.path.join(store_dir, "blobs.bin")
+        self.index_path = os.path.join(store_dir, "index.json")
+
+        # One lock per directory: stores with different settings share index.json and blobs.bin
+        self._lock = _directory_lock(store_dir)
+        self._mmap = None
+        self._urls = {}
+        self._dirty = False
+        self._index = {"entries": {}, "blobs": {}}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+
+    def _key(self, path):
+        return f"{self.variant}:{os.path.normpath(path)}"
+
+    def _fresh_entry(self, path):
+        entry = self._index["entries"].get(self._key(path))
+        if entry is None:
+            return None
+        st = os.stat(path)
+        if entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+            return None
+        return entry
+
+    def add(self, path):
+        """Encode `path` into the store if missing or stale; returns its index entry."""
+        entry = self._fresh_entry(path)
+        if entry is not None:
+            return entry
+
+        st = os.stat(path)
+        mime, data = encode_image(path, self.max_side, self.fmt, self.quality)
+        payload = f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}".encode("ascii")
+        sha = hashlib.sha256(payload).hexdigest()
+
+        with self._lock:
+            if sha not in self._index["blobs"]:
+                os.makedirs(self.store_dir, exist_ok=True)
+                with open(self.blob_path, "ab") as f:
+                    offset = f.tell()
+                    f.write(payload)
+                self._index["blobs"][sha] = [offset, len(payload)]
+                self._close_map()
+            entry = {
+                "sha256": sha,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "bytes": len(data),
+            }
+            self._index["entries"][self._key(path)] = entry
+            self._dirty = True
+        return entry
+
+    def save(self):
+        """Write the index atomically (tmp file + os.replace).
+
+        Entries written meanwhile by other stores on the same directory (other
+        settings or processes) are merged in instead of being overwritten.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.store_dir, exist_ok=True)
+            if os.path.exists(self.index_path):
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    on_disk = json.load(f)
+                on_disk["entries"].update(self._index["entries"])
+                on_disk["blobs"].update(self._index["blobs"])
+                self._index = on_disk
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+
+    def reference(self, path):
+        """``asset://sha256/<hash>`` for `path` (encoding it on first use)."""
+        entry = self._fresh_entry(path)
+        if entry is None:
+            entry = self.add(path)
+            self.save()
+        return ASSET_PREFIX + entry["sha256"]
+
+    def _close_map(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _map(self):
+        if self._mmap is None:
+            with open(self.blob_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def data_url(self, sha):
+        """The stored data URL for a payload hash (memoized per process)."""
+        url = self._urls.get(sha)
+        if url is None:
+            if sha not in self._index["blobs"] and os.path.exists(self.index_path):
+                # written by another process since we loaded the index
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index["blobs"].update(json.load(f)["blobs"])
+                self._close_map()
+            offset, length = self._index["blobs"][sha]
+            with self._lock:
+                if offset + length > len(self._map()):
+                    # appended by another store on this directory after we mapped it
+                    self._close_map()
+                url = self._map()[offset:offset + length].decode("ascii")
+            self._urls[sha] = url
+        return url
+
+    def resolve(self, url):
+        """Data URL for an asset reference; any other URL is returned unchanged."""
+        if isinstance(url, str) and url.startswith(ASSET_PREFIX):
+            return self.data_url(url[len(ASSET_PREFIX):])
+        return url
+
+
+_STORES = {}
+_LOCKS = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _directory_lock(store_dir):
+    with _LOCKS_GUARD:
+        return _LOCKS.setdefault(os.path.abspath(store_dir), threading.Lock())
+
+
+def get_store(store_dir=DEFAULT_STORE_DIR, max_side=DEFAULT_MAX_SIDE, fmt=DEFAULT_FORMAT,
+              quality=DEFAULT_QUALITY):
+    """Process-wide ImageStore for these settings."""
+    key = (store_dir, max_side, fmt.lower(), quality)
+    if key not in _STORES:
+        _STORES[key] = ImageStore(store_dir, max_side, fmt, quality)
+    return _STORES[key]
+
+
+def _resolver_store(store_dir):
+    """A store already open on `store_dir` (e.g. the task's, with its own
+    settings), so references are read through the same index; payloads are
+    content-addressed, so any settings can resolve them.
+    """
+    store_dir = os.path.abspath(store_dir)
+    for key, store in _STORES.items():
+        if os.path.abspath(key[0]) == store_dir:
+            return store
+    return get_store(store_dir)
+
+
+def resolve_messages(messages, store=None, store_dir=DEFAULT_STORE_DIR):
+    """Replace asset references in OpenAI-style messages with their data URLs.
+
+    Pass the task's `store` when available; otherwise a store already open on
+    `store_dir` is reused.
+    """
+    resolved = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            parts = []
+            for part in content:
+                url = part.get("image_url", {}).get("url") if part.get("type") == "image_url" else None
+                if isinstance(url, str) and url.startswith(ASSET_PREFIX):
+                    store = store or _resolver_store(store_dir)
+                    part = dict(part, image_url=dict(part["image_url"], url=store.resolve(url)))
+                parts.append(part)
+            message = dict(message, content=parts)
+        resolved.append(message)
+    return resolved
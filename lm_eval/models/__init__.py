@@ -3,11 +3,13 @@ from . import maritalk
 from . import gpt2
 from . import gpt3
 from . import dummy
+from . import seqcls
 
 MODEL_REGISTRY = {
     "hf": gpt2.HFLM,
     "gpt2": gpt2.GPT2LM,
     "gpt3": gpt3.GPT3LM,
+    "hf-seqcls": seqcls.SequenceClassificationLM,
     "chatgpt": chatgpt.CHATGPTLM,
     "maritalk": maritalk.MARITALKLM,
     "dummy": dummy.DummyLM,
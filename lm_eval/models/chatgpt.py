@@ -4,6 +4,8 @@ import os
 import time
 from lm_eval.base import BaseLM
 from lm_eval import utils
+from lm_eval.image_store import resolve_messages
+from lm_eval.usage import UsageTracker
 from tqdm import tqdm
 
 
@@ -35,13 +37,18 @@ def get_result(response, ctxlen):
     return continuation_logprobs, is_greedy
 
 
-def oa_completion(**kwargs):
+def oa_completion(stats=None, **kwargs):
     """Query OpenAI API for completion.
 
-    Retry with back-off until they respond
+    Retry with back-off until they respond. If `stats` is a dict, the number
+    of retries is stored in stats["retries"].
     """
     backoff_time = 3
+    attempt = 0
     while True:
+        if stats is not None:
+            stats["retries"] = attempt
+        attempt += 1
         try:
             return openai.ChatCompletion.create(**kwargs)
         except openai.error.OpenAIError:
@@ -66,6 +73,7 @@ class CHATGPTLM(BaseLM):
         super().__init__()
 
         self.engine = engine
+        self.usage = UsageTracker()
 
         # Read from environment variable OPENAI_API_SECRET_KEY
         openai.api_key = os.environ["OPENAI_API_SECRET_KEY"]
@@ -137,9 +145,13 @@ class CHATGPTLM(BaseLM):
                 except json.decoder.JSONDecodeError:
                     # If context is not a valid JSON string, pass it as is
                     messages = [{"role": "user", "content": context}]
-                inps.append(messages)
+                # Image asset references -> cached data URLs (identical bytes on every pass)
+                inps.append(resolve_messages(messages))
 
+            stats = {}
+            start = time.monotonic()
             response = oa_completion(
+                stats=stats,
                 model=self.engine,
                 messages=inps[0],
                 max_tokens=self.max_gen_toks, 
@@ -149,6 +161,9 @@ class CHATGPTLM(BaseLM):
                 ## that! You can retry your request, or contact us through our 
                 ## help center at help.openai.com if you keep seeing this error.  
             )
+            self.usage.record(
+                "greedy_until", chunk[0], response, time.monotonic() - start, stats["retries"]
+            )
 
             for resp, (context, until_) in zip(response.choices, chunk):
                 s = resp.message['content']
@@ -1,9 +1,12 @@
 import json
 import openai
 import os
+import random
 import time
 from lm_eval.base import BaseLM
 from lm_eval import utils
+from lm_eval.image_store import resolve_messages
+from lm_eval.usage import UsageTracker
 from tqdm import tqdm
 
 
@@ -35,14 +38,38 @@ def get_result(response, ctxlen):
     return continuation_logprobs, is_greedy
 
 
-def oa_completion(client=None, **kwargs):
+MAX_RETRIES = 6
+MAX_BACKOFF = 60.0
+
+# openai v0.x: openai.error.OpenAIError (http_status); v1.x: openai.OpenAIError (status_code)
+_API_ERRORS = tuple(
+    cls
+    for cls in (
+        getattr(openai, "OpenAIError", None),
+        getattr(getattr(openai, "error", None), "OpenAIError", None),
+    )
+    if cls is not None
+)
+
+
+def _is_retryable(error):
+    """Rate limit (429), server errors (5xx) and connection/timeout errors."""
+    status = getattr(error, "status_code", None) or getattr(error, "http_status", None)
+    return status is None or status == 429 or status >= 500
+
+
+def oa_completion(client=None, max_retries=MAX_RETRIES, stats=None, **kwargs):
     """Query OpenAI API for completion.
 
-    Retry with back-off until they respond
+    Retries 429/5xx/connection errors with exponential back-off and full
+    jitter, at most `max_retries` attempts; other errors (and the last
+    failure) are raised. If `stats` is a dict, the number of retries is
+    stored in stats["retries"].
     Compatível com openai v0.x e v1.x+
     """
-    backoff_time = 3
-    while True:
+    for attempt in range(max_retries):
+        if stats is not None:
+            stats["retries"] = attempt
         try:
             if client is not None:
                 # API v1.x+ - usa client
@@ -50,11 +77,12 @@ def oa_completion(client=None, **kwargs):
             else:
                 # API v0.x - usa módulo direto
                 return openai.ChatCompletion.create(**kwargs)
-        except (openai.error.OpenAIError, openai.OpenAIError, openai.APIError) as e:
-            import traceback
-            traceback.print_exc()
+        except _API_ERRORS as e:
+            if not _is_retryable(e) or attempt == max_retries - 1:
+                raise
+            backoff_time = random.uniform(0, min(MAX_BACKOFF, 3 * 2 ** attempt))
+            print(f"{type(e).__name__}: {e} (retrying in {backoff_time:.1f}s)")
             time.sleep(backoff_time)
-            backoff_time *= 1.5
 
 
 class MARITALKLM(BaseLM):
@@ -71,6 +99,7 @@ class MARITALKLM(BaseLM):
         super().__init__()
 
         self.engine = engine
+        self.usage = UsageTracker()
         
         # Detecta versão do openai e configura apropriadamente
         openai_version = openai.__version__
@@ -169,10 +198,14 @@ class MARITALKLM(BaseLM):
                 except json.decoder.JSONDecodeError:
                     # If context is not a valid JSON string, pass it as is
                     messages = [{"role": "user", "content": context}]
-                inps.append(messages)
+                # Image asset references -> cached data URLs (identical bytes on every pass)
+                inps.append(resolve_messages(messages))
 
+            stats = {}
+            start = time.monotonic()
             response = oa_completion(
                 client=self.client if self.use_client else None,
+                stats=stats,
                 model=self.engine,
                 messages=inps[0],
                 max_tokens=self.max_gen_toks, 
@@ -182,6 +215,9 @@ class MARITALKLM(BaseLM):
                 ## that! You can retry your request, or contact us through our 
                 ## help center at help.openai.com if you keep seeing this error.  
             )
+            self.usage.record(
+                "greedy_until", chunk[0], response, time.monotonic() - start, stats["retries"]
+            )
 
             # Extrai choices da resposta (compatível com ambas versões)
             if self.use_client:
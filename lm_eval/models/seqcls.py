@@ -0,0 +1,168 @@
+"""Local sequence-classification checkpoint (e.g. the ENEM BERT classifier) as an LM.
+
+The model trained by ``scripts/analise_enem/93_treinar_modelo_enem.py`` maps a
+question (statement + alternatives) to one of five classes (A-E). Here it
+answers harness requests by classifying the *question* once and reading every
+alternative's score from the same softmax:
+
+- ``loglikelihood``: requests sharing a context (the five alternatives of a
+  ``MultipleChoiceTask`` doc) are grouped, so each doc costs one forward row;
+  the continuation's log-probability is the class log-probability.
+- ``greedy_until``: returns ``"<letter>."`` for the argmax, which is what the
+  ``enem_*`` tasks parse.
+
+The classifier only saw the training input of
+``scripts/analise_enem/92_preparar_dataset_treinamento.py`` (``CONTEXTO:`` /
+``PERGUNTA:`` / ``ALTERNATIVAS:`` ...), so the evaluator hands each request's
+doc to ``set_request_docs`` and that input is rebuilt from the doc fields
+(``context``, ``question``, ``choices``); the rendered prompt is never scored.
+Requests are keyed by (doc, choice), not by their position. Without a doc
+(other tasks), the context is reduced to the question being asked:
+chat-template JSON is unwrapped to the last user message and few-shot
+examples (separated by ``\\n##\\n``) are dropped.
+
+Example:
+    python main.py --model hf-seqcls --model_args pretrained=data/models/enem_bert_trained,device=cpu \\
+        --tasks enem_2024_blind --num_fewshot 0 --batch_size 32
+"""
+import json
+import re
+
+import numpy as np
+import torch
+import transformers
+from tqdm import tqdm
+
+from lm_eval.base import LM, hash_args
+
+FEWSHOT_SEPARATOR = "\n##\n"
+
+
+def training_input(doc):
+    """The input format of ``formatar_para_treinamento`` in 92_, from the doc fields."""
+    text = ""
+    context = (doc.get("context") or "").strip()
+    if context:
+        text += f"CONTEXTO:\n{context}\n\n"
+    text += f"PERGUNTA:\n{(doc.get('question') or '').strip()}\n\n"
+    alternatives = doc.get("choices") or []
+    if alternatives:
+        text += "ALTERNATIVAS:\n"
+        for i, alternative in enumerate(alternatives):
+            if alternative and alternative.strip():
+                text += f"{chr(65 + i)}) {alternative}\n"
+    text += "\nQual é a alternativa correta? Responda apenas com A, B, C, D ou E."
+    return text
+
+
+def question_text(context):
+    """The question the context asks, without few-shot examples or chat wrapping."""
+    try:
+        messages = json.loads(context)
+    except (TypeError, ValueError):
+        messages = None
+    if isinstance(messages, list):
+        user = [m for m in messages if isinstance(m, dict) and m.get("role") == "user"]
+        content = user[-1].get("content", "") if user else ""
+        if isinstance(content, list):
+            content = "\n".join(p.get("text", "") for p in content if p.get("type") == "text")
+        context = content
+    return context.split(FEWSHOT_SEPARATOR)[-1].strip()
+
+
+class SequenceClassificationLM(LM):
+    def __init__(
+        self,
+        pretrained,
+        device="cpu",
+        batch_size=8,
+        max_length=512,
+        num_threads=None,
+        letters="ABCDE",
+    ):
+        super().__init__()
+
+        self._device = torch.device(device or ("cuda" if torch.cuda.is_available() else "cpu"))
+        self.batch_size = int(batch_size)
+        self.max_length = int(max_length)
+        if num_threads:
+            torch.set_num_threads(int(num_threads))
+
+        # default (right) truncation, as in training (93_) and in 94_
+        self.tokenizer = transformers.AutoTokenizer.from_pretrained(pretrained)
+        self.model = transformers.AutoModelForSequenceClassification.from_pretrained(pretrained).to(self._device)
+        self.model.eval()
+
+        self.letters = list(letters)
+        assert self.model.config.num_labels == len(self.letters), (
+            f"model has {self.model.config.num_labels} labels, expected {len(self.letters)}"
+        )
+        self._letter_re = re.compile(r"^\s*([%s])\.?\s*$" % "".join(self.letters))
+        self._docs = {}
+
+    def set_request_docs(self, request_type, requests):
+        """Called by the evaluator with (args, doc) for every request of a type."""
+        for args, doc in requests:
+            if "question" in doc and "choices" in doc:
+                self._docs[hash_args(request_type, args)] = doc
+
+    def _log_probs(self, texts):
+        """Class log-probabilities per text, in dynamic-padded batches sorted by length."""
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        order = sorted(range(len(texts)), key=lambda i: len(encoded["input_ids"][i]), reverse=True)
+        pad_multiple = 8 if self._device.type == "cuda" else None
+
+        out = np.zeros((len(texts), len(self.letters)), dtype=np.float64)
+        for start in tqdm(range(0, len(order), self.batch_size), disable=len(order) <= self.batch_size):
+            idx = order[start:start + self.batch_size]
+            batch = self.tokenizer.pad(
+                [{k: encoded[k][i] for k in encoded.keys()} for i in idx],
+                pad_to_multiple_of=pad_multiple,
+                return_tensors="pt",
+            )
+            with torch.inference_mode():
+                logits = self.model(**{k: v.to(self._device) for k, v in batch.items()}).logits
+            out[idx] = torch.log_softmax(logits.float(), dim=-1).cpu().numpy()
+        return out
+
+    def _input(self, request_type, args):
+        """(doc, classifier input) of a request; doc is None if the evaluator gave none."""
+        doc = self._docs.get(hash_args(request_type, args))
+        if doc is not None:
+            return doc, training_input(doc)
+        return None, question_text(args[0])
+
+    def _score(self, request_type, requests):
+        """(doc, class log-probs) per request, one forward row per distinct input."""
+        inputs = [self._input(request_type, args) for args in requests]
+        unique = list(dict.fromkeys(text for _, text in inputs))
+        scores = dict(zip(unique, self._log_probs(unique)))
+        return [(doc, scores[text]) for doc, text in inputs]
+
+    def _choice_index(self, doc, continuation):
+        """Class of a continuation: a bare letter ("A", " B.") or one of the doc's choices."""
+        match = self._letter_re.match(continuation)
+        if match:
+            return self.letters.index(match.group(1))
+        if doc is not None:
+            for index, choice in enumerate(doc["choices"][:len(self.letters)]):
+                if continuation.strip() == str(choice).strip():
+                    return index
+        raise ValueError(f"cannot map continuation {continuation[:50]!r} to one of {self.letters}")
+
+    def loglikelihood(self, requests):
+        if not requests:
+            return []
+        res = []
+        for (doc, log_probs), (_, continuation) in zip(self._score("loglikelihood", requests), requests):
+            index = self._choice_index(doc, continuation)
+            res.append((float(log_probs[index]), bool(np.argmax(log_probs) == index)))
+        return res
+
+    def greedy_until(self, requests):
+        if not requests:
+            return []
+        return [f"{self.letters[int(np.argmax(log_probs))]}." for _, log_probs in self._score("greedy_until", requests)]
+
+    def loglikelihood_rolling(self, requests):
+        raise NotImplementedError("sequence-classification models do not score free text")
@@ -14,6 +14,7 @@ from . import enem_multimodal
 TASK_REGISTRY = {
     "enem": enem.ENEM,
     "enem_cot": enem.ENEM_CoT,
+    "enem_similar": enem.ENEM_SIMILAR,
     "enem_2022_deprecated": enem.ENEM_2022,
     "enem_cot_2022_deprecated": enem.ENEM_CoT_2022,
 
@@ -23,6 +24,8 @@ TASK_REGISTRY = {
     "enem_cot_2022_images": enem_multimodal.ENEM_CoT_2022_IMAGES,
     "enem_2022_captions": enem_multimodal.ENEM_2022,
     "enem_cot_2022_captions": enem_multimodal.ENEM_CoT_2022,
+    "enem_2022_captions_similar": enem_multimodal.ENEM_2022_SIMILAR,
+    "enem_2022_blind_similar": enem_multimodal.ENEM_2022_BLIND_SIMILAR,
 
     "enem_2023_blind": enem_multimodal.ENEM_2023_BLIND,
     "enem_cot_2023_blind": enem_multimodal.ENEM_CoT_2023_BLIND,
@@ -30,6 +33,8 @@ TASK_REGISTRY = {
     "enem_cot_2023_images": enem_multimodal.ENEM_CoT_2023_IMAGES,
     "enem_2023_captions": enem_multimodal.ENEM_2023,
     "enem_cot_2023_captions": enem_multimodal.ENEM_CoT_2023,
+    "enem_2023_captions_similar": enem_multimodal.ENEM_2023_SIMILAR,
+    "enem_2023_blind_similar": enem_multimodal.ENEM_2023_BLIND_SIMILAR,
 
     "enem_2024_blind": enem_multimodal.ENEM_2024_BLIND,
     "enem_cot_2024_blind": enem_multimodal.ENEM_CoT_2024_BLIND,
@@ -37,6 +42,8 @@ TASK_REGISTRY = {
     "enem_cot_2024_images": enem_multimodal.ENEM_CoT_2024_IMAGES,
     "enem_2024_captions": enem_multimodal.ENEM_2024,
     "enem_cot_2024_captions": enem_multimodal.ENEM_CoT_2024,
+    "enem_2024_captions_similar": enem_multimodal.ENEM_2024_SIMILAR,
+    "enem_2024_blind_similar": enem_multimodal.ENEM_2024_BLIND_SIMILAR,
 }
 
 
@@ -12,12 +12,14 @@ development of NLP tools for Brazilian Portuguese.
 Homepage: https://www.ime.usp.br/~ddm/project/enem
 """
 import collections
+import hashlib
 from io import BytesIO
 import json
 import numpy as np
 import os
 import re
 from urllib.request import urlopen
+import warnings
 import xml.etree.ElementTree as ET 
 from zipfile import ZipFile
 
@@ -48,6 +50,85 @@ PATTERNS_REPLACES = [
 apply_regex = lambda pattern, replace, text: re.sub(pattern, replace, text)
 
 
+SIMILAR_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+SIMILAR_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data", "embeddings", "fewshot")
+
+
+def _hashed_bow_embeddings(texts, dim=4096):
+    """ Fallback used when sentence-transformers is not installed: hashed
+    bag-of-words with idf weighting, L2-normalized.
+    """
+    rows, cols = [], []
+    for i, text in enumerate(texts):
+        for token in set(re.findall(r"\w+", text.lower())):
+            rows.append(i)
+            cols.append(int(hashlib.md5(token.encode("utf-8")).hexdigest()[:8], 16) % dim)
+    counts = np.zeros((len(texts), dim), dtype=np.float32)
+    np.add.at(counts, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)), 1.0)
+    idf = np.log((1 + len(texts)) / (1 + (counts > 0).sum(axis=0))) + 1
+    return counts * idf.astype(np.float32)
+
+
+def embed_texts(texts, model_name=SIMILAR_EMBEDDING_MODEL, cache_dir=SIMILAR_CACHE_DIR):
+    """ Returns L2-normalized embeddings for `texts`, cached on disk by a hash
+    of the model name and the texts, so re-running a task does not re-encode.
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+        backend = model_name
+    except ImportError:
+        SentenceTransformer = None
+        backend = "hashed-bow"
+
+    digest = hashlib.sha256(backend.encode("utf-8"))
+    for text in texts:
+        digest.update(text.encode("utf-8") + b"\x1e")
+    cache_file = os.path.join(cache_dir, f"{digest.hexdigest()[:24]}.npy")
+    if os.path.exists(cache_file):
+        return np.load(cache_file)
+
+    if SentenceTransformer is not None:
+        model = SentenceTransformer(model_name)
+        embeddings = model.encode(texts, batch_size=64, show_progress_bar=False)
+    else:
+        embeddings = _hashed_bow_embeddings(texts)
+
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings = embeddings / np.maximum(norms, 1e-12)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(cache_file, embeddings)
+    return embeddings
+
+
+def nearest_other_exam(query_docs, candidate_docs, k):
+    """ For every query doc, the indices (into `candidate_docs`) of the `k` most
+    similar candidates from a different exam, most similar first. All
+    neighbours are computed with a single similarity matrix product.
+    """
+    if not query_docs or not candidate_docs:
+        return [[] for _ in query_docs]
+
+    embeddings = embed_texts([d["query"] for d in query_docs] + [d["query"] for d in candidate_docs])
+    query_emb, candidate_emb = embeddings[:len(query_docs)], embeddings[len(query_docs):]
+
+    scores = query_emb @ candidate_emb.T
+    query_exams = np.array([str(d["exam"]) for d in query_docs])
+    candidate_exams = np.array([str(d["exam"]) for d in candidate_docs])
+    # the ENEM challenge forbids prompting with questions of the same exam
+    scores[query_exams[:, None] == candidate_exams[None, :]] = -np.inf
+
+    k = min(k, len(candidate_docs))
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    valid = np.isfinite(np.take_along_axis(scores, top, axis=1))
+    return [row[mask].tolist() for row, mask in zip(top, valid)]
+
+
 class ENEM(Task):
     VERSION = 0
     DATASET_PATH = 'data/enem'
@@ -56,6 +137,13 @@ class ENEM(Task):
     use_just_linguistic_and_humanities = False
     tag = None
 
+    # "fixed": the first `num_fewshot` training docs; "dynamic-similar": the
+    # nearest questions from other exams (see `_build_similar_fewshot`). There
+    # are no CoT "dynamic-similar" tasks: other-exam docs have no explanation,
+    # so the examples would lose the reasoning the CoT prompts rely on.
+    PROMPT_MODE = "fixed"
+    SIMILAR_MAX_FEWSHOT = 10
+
     # Note: the stats 'EK_only' and 'TC_only' are valid only for use_just_linguistic_and_humanities=True
     enem_stats = {
         '2009-1':    {'EK_only': 0, 'TC_only': 0, 'total': 45}, #
@@ -80,6 +168,51 @@ class ENEM(Task):
         '2017-2':    {'EK_only': 0, 'TC_only': 0, 'total': 40}, #
     }
 
+    def __init__(self, data_dir=None, cache_dir=None, download_mode=None):
+        super().__init__(data_dir=data_dir, cache_dir=cache_dir, download_mode=download_mode)
+        self._similar_candidates = None
+        self._similar_fewshot = None
+        if self.PROMPT_MODE == "dynamic-similar":
+            self._build_similar_fewshot()
+
+    def _similar_candidate_docs(self):
+        """ Pool of few-shot candidates for "dynamic-similar". Documents of the
+        same exam as the test doc are filtered out in `nearest_other_exam`.
+        """
+        return list(self.test_docs())
+
+    def _build_similar_fewshot(self):
+        """ Precomputes, at task load, the neighbour list of every test doc
+        so that `fewshot_context` is just a dictionary lookup.
+        """
+        test_docs = list(self.test_docs())
+        self._similar_candidates = self._similar_candidate_docs()
+        if not self._similar_candidates:
+            warnings.warn(
+                f"{type(self).__name__}: no few-shot candidates for dynamic-similar "
+                f"in {self.DATASET_PATH}; every question will be evaluated zero-shot."
+            )
+        neighbours = nearest_other_exam(test_docs, self._similar_candidates, self.SIMILAR_MAX_FEWSHOT)
+        self._similar_fewshot = {doc["id"]: idx for doc, idx in zip(test_docs, neighbours)}
+
+    def _fewshot_examples(self, doc, num_fewshot):
+        if self._similar_fewshot is not None:
+            assert num_fewshot <= self.SIMILAR_MAX_FEWSHOT, (
+                f"dynamic-similar supports up to {self.SIMILAR_MAX_FEWSHOT} few-shot examples")
+            neighbours = [self._similar_candidates[i] for i in self._similar_fewshot.get(doc["id"], [])]
+            neighbours = [ex for ex in neighbours if doc['id'] != ex['id']][:num_fewshot]
+            # the most similar example goes last, right before the test question
+            return neighbours[::-1]
+
+        # for sets with no training docs, draw from other set *but ensure no overlap with current doc*
+        if self.has_training_docs():
+            # fewshotex = self.fewshot_examples(k=num_fewshot, rnd=rnd)
+            ## keeping the training docs in original order (use this to fixed prompts)
+            fewshotex = list(self.training_docs())[:num_fewshot]
+            ## if the current doc is among the training docs, we do not use it as few-shot
+            return [ex for ex in fewshotex if doc['id'] != ex['id']]
+        return None
+
     def download(self, data_dir=None, cache_dir=None, download_mode=None):
 
         # download and unpack the dataset
@@ -296,6 +429,8 @@ class ENEM(Task):
         return {
             "query": format_example(doc, choices),
             "choices": doc["options"],
+            "context": doc["context"],
+            "question": doc["question"],
             "gold": choices.index(doc["label"]),
             "id": doc["id"],
             "exam": doc["exam"],
@@ -383,7 +518,7 @@ class ENEM(Task):
         :param num_fewshot: int
             The number of fewshot examples to provide in the returned context string.
         :param prompt_mode: str
-            The type of prompt. Please set prompt_mode as "fixed", "dynamic-random", or "dynamic-similar".
+            The type of prompt, taken from the class attribute `PROMPT_MODE`: "fixed" or "dynamic-similar".
             WARNING: this is implemented only for Portuguese tasks.
         :param provide_description: bool
             Not implemented, and this option is deprecated and will be removed in a future version in favor of a different description providing method
@@ -410,14 +545,8 @@ class ENEM(Task):
         if num_fewshot == 0:
             labeled_examples = ""
         else:
-            # for sets with no training docs, draw from other set *but ensure no overlap with current doc*
-            if self.has_training_docs():
-                # fewshotex = self.fewshot_examples(k=num_fewshot, rnd=rnd)
-                ## keeping the training docs in original order (use this to fixed prompts)
-                fewshotex = list(self.training_docs())[:num_fewshot]
-                ## if the current doc is among the training docs, we do not use it as few-shot
-                fewshotex = [ex for ex in fewshotex if doc['id'] != ex['id']]
-            else:
+            fewshotex = self._fewshot_examples(doc, num_fewshot)
+            if fewshotex is None:
                 if self._fewshot_docs is None:
                     self._fewshot_docs = list(
                         self.validation_docs() if self.has_validation_docs() else self.test_docs()
@@ -439,6 +568,10 @@ class ENEM(Task):
         return description + labeled_examples + example
 
 
+class ENEM_SIMILAR(ENEM):
+    PROMPT_MODE = "dynamic-similar"
+
+
 class ENEM_CoT(ENEM):
 
     def _process_doc(self, doc):
@@ -464,6 +597,8 @@ class ENEM_CoT(ENEM):
         return {
             "query": format_example(doc, choices),
             "choices": doc["options"],
+            "context": doc["context"],
+            "question": doc["question"],
             "gold": choices.index(doc["label"]),
             "id": doc["id"],
             "exam": doc["exam"],
@@ -18,7 +18,7 @@ import os
 
 from fastchat.conversation import get_conv_template
 
-from lm_eval import utils
+from lm_eval import image_store, utils
 from lm_eval.base import Task, rf
 from lm_eval.metrics import mean
 from lm_eval.tasks.enem import ENEM
@@ -39,6 +39,11 @@ class ENEM_2022(ENEM):
     DATASET_PATH = 'data/enem'
     DATASET_NAME = '2022'
 
+    # Figures in doc['figures'] are relative to the parent of DATASET_PATH and are
+    # sent as asset references into the preprocessed image store (lm_eval/image_store.py)
+    IMAGE_MAX_SIDE = int(os.environ.get("ENEM_IMAGE_MAX_SIDE", image_store.DEFAULT_MAX_SIDE))
+    IMAGE_FORMAT = os.environ.get("ENEM_IMAGE_FORMAT", image_store.DEFAULT_FORMAT)
+
     def download(self, data_dir=None, cache_dir=None, download_mode=None):
 
         self.dataset = collections.defaultdict(list)
@@ -52,6 +57,25 @@ class ENEM_2022(ENEM):
 
         self.dataset['test'] = list(map(self._process_doc, documents))
 
+    def _similar_candidate_docs(self):
+        """ The test set is a single exam, so the candidates for "dynamic-similar"
+        come from the other years available as <year>.jsonl or <year>.json
+        (a JSON list) in DATASET_PATH.
+        """
+        candidates = []
+        for fname in sorted(os.listdir(self.DATASET_PATH)):
+            name, ext = os.path.splitext(fname)
+            if ext not in ('.jsonl', '.json') or not name.isdigit() or name == self.DATASET_NAME:
+                continue
+            with open(os.path.join(self.DATASET_PATH, fname), 'r', encoding='utf-8') as f:
+                if ext == '.jsonl':
+                    documents = [json.loads(line) for line in f if line.strip()]
+                else:
+                    documents = json.load(f)
+            documents = [d for d in documents if str(d.get('label', '')).upper() in ['A', 'B', 'C', 'D', 'E']]
+            candidates += list(map(self._process_doc, documents))
+        return candidates
+
     def process_results(self, doc, results):
         results = super().process_results(doc, results)
 
@@ -85,6 +109,8 @@ class ENEM_2022(ENEM):
         return {
             "query": format_example(doc, choices),
             "choices": doc.get('alternatives', doc.get('options')),
+            "context": doc.get('context', ""),
+            "question": doc.get("question", ""),
             "gold": choices.index(doc["label"].upper()),
             "id": doc["id"],
             "exam": doc["exam"],
@@ -95,6 +121,22 @@ class ENEM_2022(ENEM):
     def test_docs(self):
         return self.dataset['test']
 
+    def image_url(self, figure):
+        """ Asset reference for a path from doc['figures'], resolved to the
+        cached data URL by the API backend. Falls back to the raw path if the
+        file is missing.
+        """
+        if not hasattr(self, '_image_urls'):
+            self._image_urls = {}
+        if figure not in self._image_urls:
+            path = os.path.join(os.path.dirname(self.DATASET_PATH), figure)
+            if not os.path.exists(path):
+                print(f'PROBLEM: image {path} does not exist')
+                return figure
+            store = image_store.get_store(max_side=self.IMAGE_MAX_SIDE, fmt=self.IMAGE_FORMAT)
+            self._image_urls[figure] = store.reference(path)
+        return self._image_urls[figure]
+
     def higher_is_better(self):
         return {
             "acc": True,
@@ -133,7 +175,7 @@ class ENEM_2022(ENEM):
         :param num_fewshot: int
             The number of fewshot examples to provide in the returned context string.
         :param prompt_mode: str
-            The type of prompt. Please set prompt_mode as "fixed", "dynamic-random", or "dynamic-similar".
+            The type of prompt, taken from the class attribute `PROMPT_MODE`: "fixed" or "dynamic-similar".
             WARNING: this is implemented only for Portuguese tasks.
         :param provide_description: bool
             Not implemented, and this option is deprecated and will be removed in a future version in favor of a different description providing method
@@ -189,9 +231,7 @@ class ENEM_2022(ENEM):
                         if text:
                             contents.append({"type": "text", "text": text.strip()})
                         if index < len(doc['figures']):
-                            img_url = doc['figures'][index]
-                            if not os.path.exists(img_url):
-                                print(f'PROBLEM: image {img_url} does not exist')
+                            img_url = self.image_url(doc['figures'][index])
                             contents.append({"type": "image_url", "image_url": {"url": img_url}})
                     conversation.append_message(user_role, contents)
                 elif "[[placeholder]]" in example and not doc['figures']:
@@ -205,14 +245,8 @@ class ENEM_2022(ENEM):
                     conversation.append_message(user_role, description + "\n" + example)
                 conversation.append_message(assistant_role, None)
         else:
-            # for sets with no training docs, draw from other set *but ensure no overlap with current doc*
-            if self.has_training_docs():
-                # fewshotex = self.fewshot_examples(k=num_fewshot, rnd=rnd)
-                ## keeping the training docs in original order (use this to fixed prompts)
-                fewshotex = list(self.training_docs())[:num_fewshot]
-                ## if the current doc is among the training docs, we do not use it as few-shot
-                fewshotex = [ex for ex in fewshotex if doc['id'] != ex['id']]
-            else:
+            fewshotex = self._fewshot_examples(doc, num_fewshot)
+            if fewshotex is None:
                 if self._fewshot_docs is None:
                     self._fewshot_docs = list(
                         self.validation_docs() if self.has_validation_docs() else self.test_docs()
@@ -251,7 +285,7 @@ class ENEM_2022(ENEM):
                         if text:
                             contents.append({"type": "text", "text": text.strip()})
                         if index < len(doc['figures']):
-                            img_url = doc['figures'][index]
+                            img_url = self.image_url(doc['figures'][index])
                             contents.append({"type": "image_url", "image_url": {"url": img_url}})
                     conversation.append_message(user_role, contents)
                 elif "[[placeholder]]" in example and not doc['figures']:
@@ -303,6 +337,8 @@ class ENEM_CoT_2022(ENEM_2022):
         return {
             "query": format_example(doc, choices),
             "choices": doc.get('alternatives', doc.get('options')),
+            "context": doc.get('context', ""),
+            "question": doc.get("question", ""),
             "gold": choices.index(doc["label"].upper()),
             "id": f'ENEM_{doc["exam"]}_{doc["id"].split("_")[-1]}', # in order to remove the current example from the prompt
             "exam": doc["exam"],
@@ -470,3 +506,27 @@ class ENEM_CoT_2024_IMAGES(ENEM_CoT_2024, ENEM_2024_IMAGES):
 
 class ENEM_CoT_2024_BLIND(ENEM_CoT_2024, ENEM_2024_BLIND):
     pass
+
+
+class ENEM_2022_SIMILAR(ENEM_2022):
+    PROMPT_MODE = "dynamic-similar"
+
+
+class ENEM_2022_BLIND_SIMILAR(ENEM_2022_BLIND):
+    PROMPT_MODE = "dynamic-similar"
+
+
+class ENEM_2023_SIMILAR(ENEM_2023):
+    PROMPT_MODE = "dynamic-similar"
+
+
+class ENEM_2023_BLIND_SIMILAR(ENEM_2023_BLIND):
+    PROMPT_MODE = "dynamic-similar"
+
+
+class ENEM_2024_SIMILAR(ENEM_2024):
+    PROMPT_MODE = "dynamic-similar"
+
+
+class ENEM_2024_BLIND_SIMILAR(ENEM_2024_BLIND):
+    PROMPT_MODE = "dynamic-similar"
@@ -0,0 +1,85 @@
+"""Per-request token, latency and retry accounting for API-backed models.
+
+API models (``MARITALKLM``, ``CHATGPTLM``) record one entry per request in
+``self.usage``; ``evaluator.evaluate`` pops them in request order and sums
+them per task and per result subgroup (exam, area) into ``results["usage"]``.
+Requests answered by ``CachingLM`` never reach the model and are counted as
+``cached``.
+"""
+import collections
+import threading
+
+from lm_eval.base import hash_args
+
+
+def empty_usage():
+    return {
+        "requests": 0,
+        "cached": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "latency": 0.0,
+        "retries": 0,
+    }
+
+
+def usage_from_response(response):
+    """(prompt_tokens, completion_tokens) from an openai v0.x/v1.x response."""
+    usage = (
+        response.get("usage") if isinstance(response, dict) else getattr(response, "usage", None)
+    ) or {}
+    if not isinstance(usage, dict):
+        usage = {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+            "completion_tokens": getattr(usage, "completion_tokens", 0),
+        }
+    return usage.get("prompt_tokens") or 0, usage.get("completion_tokens") or 0
+
+
+def add_usage(total, record):
+    """Accumulate one request record (or None for a cache hit) into `total`."""
+    if record is None:
+        total["cached"] += 1
+        return total
+    total["requests"] += 1
+    for key in ("prompt_tokens", "completion_tokens", "latency", "retries"):
+        total[key] += record[key]
+    return total
+
+
+def unwrap_lm(lm):
+    """The model behind a CachingLM (whose __getattr__ swallows attributes)."""
+    return vars(lm).get("lm", lm)
+
+
+class UsageTracker:
+    """Thread-safe store of request records, keyed like CachingLM entries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = collections.defaultdict(list)
+        self.total = empty_usage()
+
+    def record(self, request_type, args, response, latency, retries=0):
+        prompt_tokens, completion_tokens = usage_from_response(response)
+        entry = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "latency": latency,
+            "retries": retries,
+        }
+        with self._lock:
+            self._pending[hash_args(request_type, args)].append(entry)
+            add_usage(self.total, entry)
+
+    def pop(self, request_type, args):
+        """Oldest unclaimed record for these args, or None if it never ran."""
+        key = hash_args(request_type, args)
+        with self._lock:
+            entries = self._pending.get(key)
+            if not entries:
+                return None
+            entry = entries.pop(0)
+            if not entries:
+                del self._pending[key]
+            return entry
@@ -106,6 +106,8 @@ def main():
         f"num_fewshot: {args.num_fewshot}, batch_size: {args.batch_size}"
     )
     print(evaluator.make_table(results))
+    if "usage" in results:
+        print(evaluator.make_usage_table(results))
 
 
 if __name__ == "__main__":
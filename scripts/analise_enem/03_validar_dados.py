@@ -12,22 +12,7 @@ from typing import Dict, List, Any
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def carregar_dados_processados(processed_dir: Path) -> Dict[int, List[Dict]]:
-    """Carrega todos os dados processados"""
-    dados = {}
-    
-    for jsonl_file in sorted(processed_dir.glob("enem_*_completo.jsonl")):
-        ano = int(jsonl_file.stem.split('_')[1])
-        questoes = []
-        
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    questoes.append(json.loads(line))
-        
-        dados[ano] = questoes
-    
-    return dados
+from scripts.analise_enem.corpus import carregar_dados_processados
 
 def validar_estrutura(dados: Dict[int, List[Dict]]) -> Dict[str, Any]:
     """Valida estrutura básica dos dados"""
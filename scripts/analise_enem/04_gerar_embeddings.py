@@ -13,18 +13,7 @@ import pickle
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def carregar_dados_processados(processed_dir: Path) -> Dict[int, List[Dict]]:
-    """Carrega todos os dados processados"""
-    dados = {}
-    for jsonl_file in sorted(processed_dir.glob("enem_*_completo.jsonl")):
-        ano = int(jsonl_file.stem.split('_')[1])
-        questoes = []
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    questoes.append(json.loads(line))
-        dados[ano] = questoes
-    return dados
+from scripts.analise_enem.corpus import carregar_dados_processados
 
 def gerar_embeddings_com_transformers(questoes: List[Dict], model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"):
     """Gera embeddings usando sentence-transformers"""
@@ -3,7 +3,14 @@
 Modelagem de Tópicos para Questões do ENEM
 
 Usa LDA e NMF para identificar tópicos predominantes nas provas.
+
+Modos:
+  --modo paralelo (padrão): vectoriza uma vez e ajusta grupos em paralelo,
+                            persistindo modelos e matriz documento×tópico
+  --modo serial:            comportamento original (um vectorizer por grupo)
+  --incremental:            atualiza o LDA global só com anos novos (partial_fit)
 """
+import argparse
 import json
 import sys
 from pathlib import Path
@@ -13,18 +20,8 @@ from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def carregar_dados_processados(processed_dir: Path) -> Dict[int, List[Dict]]:
-    """Carrega todos os dados processados"""
-    dados = {}
-    for jsonl_file in sorted(processed_dir.glob("enem_*_completo.jsonl")):
-        ano = int(jsonl_file.stem.split('_')[1])
-        questoes = []
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    questoes.append(json.loads(line))
-        dados[ano] = questoes
-    return dados
+from scripts.analise_enem import motor_topicos
+from scripts.analise_enem.corpus import carregar_dados_processados
 
 def preparar_textos_para_topicos(dados: Dict[int, List[Dict]], por_area: bool = False) -> Dict:
     """Prepara textos para modelagem de tópicos"""
@@ -204,6 +201,51 @@ def processar_por_ano(dados: Dict[int, List[Dict]], metodo: str = "lda", num_top
     
     return resultados
 
+def processar_paralelo(dados: Dict[int, List[Dict]], modelos_dir: Path, metodo: str = "lda",
+                       num_topics: int = 10, por_area: bool = False, workers: int = None):
+    """Processa todos os grupos em paralelo e persiste modelos/doc-topic"""
+    print(f"🔧 Método: {metodo.upper()}, Tópicos: {num_topics}, Modo: paralelo")
+    print()
+    
+    colunas = motor_topicos.achatar_corpus(dados)
+    grupos = motor_topicos.chaves_de_grupo(colunas, por_area=por_area)
+    
+    try:
+        saida = motor_topicos.ajustar_grupos_paralelo(
+            colunas['textos'], grupos, metodo=metodo, num_topics=num_topics, workers=workers
+        )
+    except ImportError as e:
+        print(f"  ⚠️  Dependências não instaladas: {e}")
+        print("  Instale com: pip install scikit-learn nltk")
+        return {}
+    except RuntimeError as e:
+        print(f"  ❌ Modelagem abortada, nada foi salvo: {e}")
+        sys.exit(1)
+    
+    nome = f"{metodo}_grupos"
+    motor_topicos.salvar_modelo(modelos_dir, nome, {
+        'vectorizer': saida['vectorizer'],
+        'modelos': saida['modelos']
+    })
+    motor_topicos.salvar_doc_topic(modelos_dir, nome, colunas, grupos, saida['doc_topic'])
+    print(f"  💾 Modelos e matriz documento×tópico salvos em: {modelos_dir}")
+    print()
+    
+    return saida['resultados']
+
+def processar_incremental(dados: Dict[int, List[Dict]], modelos_dir: Path, num_topics: int = 10):
+    """Atualiza o LDA global com os anos ainda não incorporados"""
+    print(f"🔧 Método: LDA global (partial_fit), Tópicos: {num_topics}")
+    print()
+    
+    colunas = motor_topicos.achatar_corpus(dados)
+    try:
+        return motor_topicos.atualizar_lda_incremental(colunas, modelos_dir, num_topics=num_topics)
+    except ImportError as e:
+        print(f"  ⚠️  Dependências não instaladas: {e}")
+        print("  Instale com: pip install scikit-learn nltk joblib")
+        return None
+
 def salvar_resultados(resultados: Dict, output_dir: Path, metodo: str):
     """Salva resultados da modelagem"""
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -216,6 +258,16 @@ def salvar_resultados(resultados: Dict, output_dir: Path, metodo: str):
 
 def main():
     """Função principal"""
+    parser = argparse.ArgumentParser(description="Modelagem de tópicos do ENEM")
+    parser.add_argument('--modo', choices=['paralelo', 'serial'], default='paralelo',
+                        help='paralelo: vectoriza uma vez e ajusta grupos em processos (padrão)')
+    parser.add_argument('--workers', type=int, default=None, help='Número de processos (padrão: CPUs)')
+    parser.add_argument('--por-area', action='store_true', help='Agrupar por ano_área em vez de ano')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Atualizar apenas o LDA global com anos novos (partial_fit)')
+    parser.add_argument('--num-topicos', type=int, default=10, help='Número de tópicos (padrão: 10)')
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("📚 MODELAGEM DE TÓPICOS - ENEM")
     print("=" * 70)
@@ -231,21 +283,32 @@ def main():
     print(f"✅ {len(dados)} anos carregados")
     print()
     
-    # Processar com LDA
-    print("🔄 Processando com LDA...")
-    resultados_lda = processar_por_ano(dados, metodo="lda", num_topics=10)
-    if resultados_lda:
-        salvar_resultados(resultados_lda, analises_dir, "lda")
+    modelos_dir = motor_topicos.diretorio_modelos(project_root)
     
-    print()
+    if args.incremental:
+        print("🔄 Atualizando LDA global incremental...")
+        resultado = processar_incremental(dados, modelos_dir, num_topics=args.num_topicos)
+        if resultado:
+            salvar_resultados(resultado, analises_dir, "lda_global")
+        print()
+        print("=" * 70)
+        print("✅ MODELAGEM DE TÓPICOS CONCLUÍDA")
+        print("=" * 70)
+        return
     
-    # Processar com NMF
-    print("🔄 Processando com NMF...")
-    resultados_nmf = processar_por_ano(dados, metodo="nmf", num_topics=10)
-    if resultados_nmf:
-        salvar_resultados(resultados_nmf, analises_dir, "nmf")
+    for metodo in ["lda", "nmf"]:
+        print(f"🔄 Processando com {metodo.upper()}...")
+        if args.modo == 'paralelo':
+            resultados = processar_paralelo(dados, modelos_dir, metodo=metodo,
+                                            num_topics=args.num_topicos,
+                                            por_area=args.por_area, workers=args.workers)
+        else:
+            resultados = processar_por_ano(dados, metodo=metodo, num_topics=args.num_topicos)
+        if resultados:
+            salvar_resultados(resultados, analises_dir, metodo)
+        
+        print()
     
-    print()
     print("=" * 70)
     print("✅ MODELAGEM DE TÓPICOS CONCLUÍDA")
     print("=" * 70)
@@ -14,18 +14,8 @@ from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def carregar_dados_processados(processed_dir: Path) -> Dict[int, List[Dict]]:
-    """Carrega todos os dados processados"""
-    dados = {}
-    for jsonl_file in sorted(processed_dir.glob("enem_*_completo.jsonl")):
-        ano = int(jsonl_file.stem.split('_')[1])
-        questoes = []
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    questoes.append(json.loads(line))
-        dados[ano] = questoes
-    return dados
+from scripts.analise_enem import motor_topicos
+from scripts.analise_enem.corpus import carregar_dados_processados
 
 def criar_serie_temporal_por_area(dados: Dict[int, List[Dict]]) -> pd.DataFrame:
     """Cria série temporal agregada por área de conhecimento"""
@@ -77,6 +67,17 @@ def calcular_metricas_temporais(dados: Dict[int, List[Dict]]) -> pd.DataFrame:
     
     return pd.DataFrame(metricas)
 
+def criar_serie_temporal_topicos(modelos_dir: Path) -> pd.DataFrame:
+    """Prevalência média de cada tópico LDA por ano, lida da matriz persistida"""
+    doc_topic = motor_topicos.carregar_doc_topic(modelos_dir, "lda_global")
+    if doc_topic is None:
+        return pd.DataFrame()
+    
+    anos, prevalencia = motor_topicos.prevalencia_topicos_por_ano(doc_topic)
+    df = pd.DataFrame(prevalencia, columns=[f"topico_{i}" for i in range(prevalencia.shape[1])])
+    df.insert(0, 'ano', anos.astype(int))
+    return df
+
 def identificar_tendencias(df: pd.DataFrame) -> Dict[str, any]:
     """Identifica tendências na série temporal"""
     tendencias = {}
@@ -134,6 +135,14 @@ def main():
     print("✅ Métricas calculadas")
     print()
     
+    # 3b. Série de tópicos (sem retreinar: usa artefatos de 06_modelagem_topicos)
+    df_topicos = criar_serie_temporal_topicos(motor_topicos.diretorio_modelos(project_root))
+    if df_topicos.empty:
+        print("⚠️  Matriz de tópicos não encontrada (execute 06_modelagem_topicos.py --incremental)")
+    else:
+        print(f"✅ Série de {df_topicos.shape[1] - 1} tópicos carregada")
+    print()
+    
     # 4. Identificar tendências
     print("🔍 Identificando tendências...")
     tendencias = identificar_tendencias(df_areas)
@@ -171,6 +180,8 @@ def main():
     # 6. Salvar resultados
     df_areas.to_csv(analises_dir / "serie_temporal_areas.csv", index=False)
     df_metricas.to_csv(analises_dir / "metricas_temporais.csv", index=False)
+    if not df_topicos.empty:
+        df_topicos.to_csv(analises_dir / "serie_temporal_topicos.csv", index=False)
     
     with open(analises_dir / "tendencias.json", 'w', encoding='utf-8') as f:
         json.dump(tendencias, f, indent=2, ensure_ascii=False)
@@ -179,6 +190,8 @@ def main():
     print(f"   - {analises_dir / 'serie_temporal_areas.csv'}")
     print(f"   - {analises_dir / 'metricas_temporais.csv'}")
     print(f"   - {analises_dir / 'tendencias.json'}")
+    if not df_topicos.empty:
+        print(f"   - {analises_dir / 'serie_temporal_topicos.csv'}")
 
 if __name__ == "__main__":
     main()
@@ -3,187 +3,214 @@
 Visualizações Interativas para Análises do ENEM
 
 Cria gráficos e dashboards para visualizar resultados das análises.
+Os dados de cada gráfico ficam em cache (graficos.py): só é redesenhado o
+que mudou, em paralelo, e o dashboard é montado a partir das tabelas em cache.
+
+Uso:
+    python 17_visualizacoes.py [--forcar]
 """
+import html
 import json
 import sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, List
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def carregar_dados_analises(analises_dir: Path) -> Dict:
-    """Carrega todos os dados de análises"""
-    dados = {}
-    
-    # Série temporal
-    arquivo_serie = analises_dir / "serie_temporal_areas.csv"
-    if arquivo_serie.exists():
-        dados['serie_temporal'] = pd.read_csv(arquivo_serie)
-    
-    # Dificuldade
-    arquivo_dificuldade = analises_dir / "dificuldade_estatisticas.json"
-    if arquivo_dificuldade.exists():
-        with open(arquivo_dificuldade, 'r', encoding='utf-8') as f:
-            dados['dificuldade'] = json.load(f)
+from scripts.analise_enem import motor_topicos
+from scripts.analise_enem.graficos import DIR_VISUALIZACOES, Grafico, carregar_tabelas, gerar, png_atual
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+ANALISES_DIR = PROJECT_ROOT / "data" / "analises"
+ARQUIVO_SERIE = ANALISES_DIR / "serie_temporal_areas.csv"
+ARQUIVO_DIFICULDADE = ANALISES_DIR / "dificuldade_estatisticas.json"
+ARQUIVO_SIMILARIDADE = ANALISES_DIR / "similaridade_provas.json"
+ARQUIVO_DOC_TOPIC = motor_topicos.diretorio_modelos(PROJECT_ROOT) / "doc_topic_lda_global.npz"
+TIPOS_SIMILARIDADE = ['similaridade_lexical_cosseno', 'similaridade_semantica']
+
+def _ler_json(arquivo: Path):
+    if not arquivo.exists():
+        return None
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# ============================================================================
+# Preparação (resultado vai para o cache de graficos.py)
+# ============================================================================
+
+def preparar_serie_temporal():
+    """Série temporal por área ({coluna: [...]})"""
+    if not ARQUIVO_SERIE.exists():
+        return None
+    df = pd.read_csv(ARQUIVO_SERIE)
+    return {coluna: df[coluna].tolist() for coluna in df.columns}
+
+def preparar_dificuldade():
+    """Dificuldade média por ano"""
+    dados_dificuldade = _ler_json(ARQUIVO_DIFICULDADE)
+    if not dados_dificuldade:
+        return None
+    anos = sorted(int(ano) for ano in dados_dificuldade.keys())
+    return {
+        'ano': anos,
+        'media_dificuldade': [dados_dificuldade[str(ano)]['media_dificuldade'] for ano in anos],
+    }
+
+def preparar_similaridade(tipo: str):
+    """Matriz ano×ano de um tipo de similaridade"""
+    dados_similaridade = _ler_json(ARQUIVO_SIMILARIDADE)
+    if not dados_similaridade or not dados_similaridade.get(tipo):
+        return None
     
-    # Similaridade
-    arquivo_similaridade = analises_dir / "similaridade_provas.json"
-    if arquivo_similaridade.exists():
-        with open(arquivo_similaridade, 'r', encoding='utf-8') as f:
-            dados['similaridade'] = json.load(f)
+    # Extrair anos
+    anos = sorted(set(
+        int(ano) for par in dados_similaridade[tipo].keys()
+        for ano in par.split('-')
+    ))
     
-    # Predições
-    arquivo_predicoes = analises_dir / "predicoes_tendencias.json"
-    if arquivo_predicoes.exists():
-        with open(arquivo_predicoes, 'r', encoding='utf-8') as f:
-            dados['predicoes'] = json.load(f)
+    # Criar matriz
+    matriz = np.zeros((len(anos), len(anos)))
+    for i, ano1 in enumerate(anos):
+        for j, ano2 in enumerate(anos):
+            if i == j:
+                matriz[i, j] = 1.0
+            else:
+                chave = f"{min(ano1, ano2)}-{max(ano1, ano2)}"
+                matriz[i, j] = dados_similaridade[tipo].get(chave, 0.0)
     
-    return dados
+    return {'tipo': tipo, 'anos': anos, 'matriz': matriz.tolist()}
 
-def criar_grafico_serie_temporal(df: pd.DataFrame, output_dir: Path):
+def preparar_prevalencia_topicos():
+    """Prevalência média dos tópicos LDA por ano (matriz persistida por 06_ --incremental)"""
+    doc_topic = motor_topicos.carregar_doc_topic(ARQUIVO_DOC_TOPIC.parent, "lda_global")
+    if doc_topic is None:
+        return None
+    anos, prevalencia = motor_topicos.prevalencia_topicos_por_ano(doc_topic)
+    return {'anos': anos.tolist(), 'prevalencia': prevalencia.tolist()}
+
+# ============================================================================
+# Desenho (roda nos workers de graficos.py, backend Agg)
+# ============================================================================
+
+def criar_grafico_serie_temporal(dados: Dict, arquivo: Path):
     """Cria gráfico de série temporal"""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')  # Para não precisar de display
-        
-        plt.figure(figsize=(14, 8))
-        
-        areas = ['languages', 'human-sciences', 'natural-sciences', 'mathematics']
-        cores = {'languages': '#1f77b4', 'human-sciences': '#ff7f0e', 
-                 'natural-sciences': '#2ca02c', 'mathematics': '#d62728'}
-        nomes = {'languages': 'Linguagens', 'human-sciences': 'Humanas',
-                 'natural-sciences': 'Natureza', 'mathematics': 'Matemática'}
-        
-        for area in areas:
-            if area in df.columns:
-                plt.plot(df['ano'], df[area], marker='o', label=nomes[area], 
-                        color=cores[area], linewidth=2, markersize=6)
-        
-        plt.plot(df['ano'], df['total'], marker='s', label='Total', 
-                color='black', linewidth=2.5, markersize=8, linestyle='--')
-        
-        plt.xlabel('Ano', fontsize=12, fontweight='bold')
-        plt.ylabel('Número de Questões', fontsize=12, fontweight='bold')
-        plt.title('Série Temporal do ENEM por Área de Conhecimento (2009-2024)', 
-                 fontsize=14, fontweight='bold', pad=20)
-        plt.legend(loc='best', fontsize=10)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
-        arquivo = output_dir / "serie_temporal_areas.png"
-        plt.savefig(arquivo, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"  ✅ Gráfico salvo: {arquivo.name}")
-        return True
+    import matplotlib.pyplot as plt
     
-    except ImportError:
-        print("  ⚠️  matplotlib não instalado. Instale com: pip install matplotlib")
-        return False
-    except Exception as e:
-        print(f"  ❌ Erro ao criar gráfico: {e}")
-        return False
+    plt.figure(figsize=(14, 8))
+    
+    areas = ['languages', 'human-sciences', 'natural-sciences', 'mathematics']
+    cores = {'languages': '#1f77b4', 'human-sciences': '#ff7f0e', 
+             'natural-sciences': '#2ca02c', 'mathematics': '#d62728'}
+    nomes = {'languages': 'Linguagens', 'human-sciences': 'Humanas',
+             'natural-sciences': 'Natureza', 'mathematics': 'Matemática'}
+    
+    for area in areas:
+        if area in dados:
+            plt.plot(dados['ano'], dados[area], marker='o', label=nomes[area], 
+                    color=cores[area], linewidth=2, markersize=6)
+    
+    plt.plot(dados['ano'], dados['total'], marker='s', label='Total', 
+            color='black', linewidth=2.5, markersize=8, linestyle='--')
+    
+    plt.xlabel('Ano', fontsize=12, fontweight='bold')
+    plt.ylabel('Número de Questões', fontsize=12, fontweight='bold')
+    plt.title('Série Temporal do ENEM por Área de Conhecimento (2009-2024)', 
+             fontsize=14, fontweight='bold', pad=20)
+    plt.legend(loc='best', fontsize=10)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    
+    plt.savefig(arquivo, dpi=300, bbox_inches='tight')
 
-def criar_grafico_dificuldade(dados_dificuldade: Dict, output_dir: Path):
+def criar_grafico_dificuldade(dados: Dict, arquivo: Path):
     """Cria gráfico de dificuldade ao longo dos anos"""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')
-        
-        anos = sorted([int(ano) for ano in dados_dificuldade.keys()])
-        medias = [dados_dificuldade[str(ano)]['media_dificuldade'] for ano in anos]
-        
-        plt.figure(figsize=(12, 6))
-        plt.plot(anos, medias, marker='o', linewidth=2, markersize=8, color='#2c3e50')
-        plt.fill_between(anos, medias, alpha=0.3, color='#3498db')
-        
-        plt.xlabel('Ano', fontsize=12, fontweight='bold')
-        plt.ylabel('Dificuldade Média', fontsize=12, fontweight='bold')
-        plt.title('Evolução da Dificuldade Média das Questões do ENEM (2009-2024)', 
-                 fontsize=14, fontweight='bold', pad=20)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
-        arquivo = output_dir / "dificuldade_temporal.png"
-        plt.savefig(arquivo, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"  ✅ Gráfico salvo: {arquivo.name}")
-        return True
+    import matplotlib.pyplot as plt
     
-    except Exception as e:
-        print(f"  ❌ Erro ao criar gráfico: {e}")
-        return False
+    anos = dados['ano']
+    medias = dados['media_dificuldade']
+    
+    plt.figure(figsize=(12, 6))
+    plt.plot(anos, medias, marker='o', linewidth=2, markersize=8, color='#2c3e50')
+    plt.fill_between(anos, medias, alpha=0.3, color='#3498db')
+    
+    plt.xlabel('Ano', fontsize=12, fontweight='bold')
+    plt.ylabel('Dificuldade Média', fontsize=12, fontweight='bold')
+    plt.title('Evolução da Dificuldade Média das Questões do ENEM (2009-2024)', 
+             fontsize=14, fontweight='bold', pad=20)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    
+    plt.savefig(arquivo, dpi=300, bbox_inches='tight')
 
-def criar_heatmap_similaridade(dados_similaridade: Dict, output_dir: Path):
+def criar_heatmap_similaridade(dados: Dict, arquivo: Path):
     """Cria heatmap de similaridade entre provas"""
+    import matplotlib.pyplot as plt
     try:
-        import matplotlib.pyplot as plt
         import seaborn as sns
-        import matplotlib
-        matplotlib.use('Agg')
-        
-        # Extrair anos e criar matriz
-        tipos = ['similaridade_lexical_cosseno', 'similaridade_semantica']
-        
-        for tipo in tipos:
-            if tipo not in dados_similaridade or not dados_similaridade[tipo]:
-                continue
-            
-            # Extrair anos
-            anos = sorted(set(
-                int(ano) for par in dados_similaridade[tipo].keys()
-                for ano in par.split('-')
-            ))
-            
-            # Criar matriz
-            matriz = np.zeros((len(anos), len(anos)))
-            for i, ano1 in enumerate(anos):
-                for j, ano2 in enumerate(anos):
-                    if i == j:
-                        matriz[i, j] = 1.0
-                    else:
-                        chave = f"{min(ano1, ano2)}-{max(ano1, ano2)}"
-                        matriz[i, j] = dados_similaridade[tipo].get(chave, 0.0)
-            
-            # Criar heatmap
-            plt.figure(figsize=(14, 12))
-            sns.heatmap(matriz, annot=True, fmt='.2f', cmap='YlOrRd', 
-                       xticklabels=anos, yticklabels=anos,
-                       cbar_kws={'label': 'Similaridade'})
-            
-            nome_tipo = tipo.replace('similaridade_', '').replace('_', ' ').title()
-            plt.title(f'Matriz de Similaridade entre Provas - {nome_tipo}', 
-                     fontsize=14, fontweight='bold', pad=20)
-            plt.xlabel('Ano', fontsize=12, fontweight='bold')
-            plt.ylabel('Ano', fontsize=12, fontweight='bold')
-            plt.tight_layout()
-            
-            arquivo = output_dir / f"heatmap_similaridade_{tipo.split('_')[-1]}.png"
-            plt.savefig(arquivo, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            print(f"  ✅ Heatmap salvo: {arquivo.name}")
-    
     except ImportError:
-        print("  ⚠️  seaborn não instalado. Instale com: pip install seaborn")
-    except Exception as e:
-        print(f"  ❌ Erro ao criar heatmap: {e}")
+        raise ImportError("seaborn não instalado. Instale com: pip install seaborn")
+    
+    anos = dados['anos']
+    plt.figure(figsize=(14, 12))
+    sns.heatmap(np.array(dados['matriz']), annot=True, fmt='.2f', cmap='YlOrRd', 
+               xticklabels=anos, yticklabels=anos,
+               cbar_kws={'label': 'Similaridade'})
+    
+    nome_tipo = dados['tipo'].replace('similaridade_', '').replace('_', ' ').title()
+    plt.title(f'Matriz de Similaridade entre Provas - {nome_tipo}', 
+             fontsize=14, fontweight='bold', pad=20)
+    plt.xlabel('Ano', fontsize=12, fontweight='bold')
+    plt.ylabel('Ano', fontsize=12, fontweight='bold')
+    plt.tight_layout()
+    
+    plt.savefig(arquivo, dpi=300, bbox_inches='tight')
 
-def criar_dashboard_html(dados: Dict, output_dir: Path):
-    """Cria dashboard HTML interativo"""
-    try:
-        html_content = """
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Dashboard ENEM - Análises</title>
+def criar_grafico_prevalencia_topicos(dados: Dict, arquivo: Path):
+    """Cria gráfico de prevalência dos tópicos LDA por ano (sem retreinar)"""
+    import matplotlib.pyplot as plt
+    
+    anos = np.array(dados['anos'])
+    prevalencia = np.array(dados['prevalencia'])
+    
+    plt.figure(figsize=(14, 8))
+    plt.stackplot(anos, prevalencia.T,
+                  labels=[f"Tópico {i}" for i in range(prevalencia.shape[1])], alpha=0.85)
+    
+    plt.xlabel('Ano', fontsize=12, fontweight='bold')
+    plt.ylabel('Prevalência Média', fontsize=12, fontweight='bold')
+    plt.title('Prevalência dos Tópicos (LDA global) por Ano', 
+             fontsize=14, fontweight='bold', pad=20)
+    plt.legend(loc='upper left', bbox_to_anchor=(1.0, 1.0), fontsize=9)
+    plt.xlim(anos.min(), anos.max())
+    plt.tight_layout()
+    
+    plt.savefig(arquivo, dpi=300, bbox_inches='tight')
+
+def graficos() -> List[Grafico]:
+    """Gráficos do dashboard com suas entradas"""
+    lista = [
+        Grafico('serie_temporal_areas.png', preparar_serie_temporal, criar_grafico_serie_temporal,
+                entradas=[ARQUIVO_SERIE], titulo='📈 Série Temporal',
+                descricao='Evolução do número de questões por área de conhecimento ao longo dos anos.'),
+        Grafico('dificuldade_temporal.png', preparar_dificuldade, criar_grafico_dificuldade,
+                entradas=[ARQUIVO_DIFICULDADE], titulo='📊 Dificuldade',
+                descricao='Evolução da dificuldade média das questões ao longo dos anos.'),
+    ]
+    for tipo in TIPOS_SIMILARIDADE:
+        lista.append(Grafico(
+            f"heatmap_similaridade_{tipo.split('_')[-1]}.png",
+            lambda tipo=tipo: preparar_similaridade(tipo), criar_heatmap_similaridade,
+            entradas=[ARQUIVO_SIMILARIDADE], parametros={'tipo': tipo},
+            titulo=f"🔗 Similaridade entre Provas ({tipo.split('_')[-1]})",
+            descricao='Matriz de similaridade entre provas de diferentes anos.'))
+    lista.append(Grafico('prevalencia_topicos.png', preparar_prevalencia_topicos, criar_grafico_prevalencia_topicos,
+                         entradas=[ARQUIVO_DOC_TOPIC], titulo='📚 Tópicos',
+                         descricao='Prevalência média dos tópicos do LDA global por ano.'))
+    return lista
+
+ESTILO = """\
     <style>
         body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
         .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
@@ -199,41 +226,76 @@ def criar_dashboard_html(dados: Dict, output_dir: Path):
         th { background-color: #3498db; color: white; }
         tr:hover { background-color: #f5f5f5; }
     </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📊 Dashboard ENEM - Análises (2009-2024)</h1>
+"""
+
+def estatisticas_dashboard(tabelas: Dict[str, Dict]) -> List[tuple]:
+    """Cartões (valor, rótulo) calculados a partir das tabelas em cache"""
+    cartoes = []
+    serie = tabelas.get('serie_temporal_areas', {}).get('dados')
+    if serie and serie.get('ano'):
+        anos = serie['ano']
+        cartoes.append((f"{len(anos)}", "Anos de Dados"))
+        if 'total' in serie:
+            cartoes.append((f"{int(sum(serie['total'])):,}", "Questões Totais"))
+        cartoes.append((f"{min(anos)}-{max(anos)}", "Período"))
+    
+    dificuldade = tabelas.get('dificuldade_temporal', {}).get('dados')
+    if dificuldade and dificuldade.get('media_dificuldade'):
+        cartoes.append((f"{np.mean(dificuldade['media_dificuldade']):.2f}", "Dificuldade Média"))
+    
+    similaridade = tabelas.get('heatmap_similaridade_cosseno', {}).get('dados')
+    if similaridade and len(similaridade['anos']) > 1:
+        matriz = np.array(similaridade['matriz'])
+        fora_diagonal = matriz[~np.eye(len(matriz), dtype=bool)]
+        cartoes.append((f"{fora_diagonal.mean():.2f}", "Similaridade Lexical Média"))
+    return cartoes
+
+def criar_dashboard_html(ordem: List[str], output_dir: Path):
+    """Cria dashboard HTML a partir das tabelas em cache (inclui gráficos de 24_, 41_, 42_, 57_ e 60_)"""
+    try:
+        tabelas = carregar_tabelas()
+        cartoes = estatisticas_dashboard(tabelas)
+        periodo = next((valor for valor, rotulo in cartoes if rotulo == "Período"), "2009-2024")
         
-        <div class="stats">
-            <div class="stat-card">
-                <div class="stat-value">16</div>
-                <div class="stat-label">Anos de Dados</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">2,779</div>
-                <div class="stat-label">Questões Totais</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">2009-2024</div>
-                <div class="stat-label">Período</div>
-            </div>
-        </div>
+        # Gráficos deste script primeiro, depois os demais (só PNGs que ainda são do próprio gráfico)
+        nomes = [n for n in ordem if n in tabelas] + sorted(n for n in tabelas if n not in ordem)
+        secoes = []
+        for nome in nomes:
+            cache = tabelas[nome]
+            if not png_atual(cache, output_dir):
+                continue
+            secoes.append(
+                f"        <h2>{html.escape(cache.get('titulo', nome))}</h2>\n"
+                f"        <p>{html.escape(cache.get('descricao', ''))}</p>\n"
+                f"        <img src=\"{html.escape(cache['arquivo'])}\" alt=\"{html.escape(nome)}\">\n"
+            )
         
-        <h2>📈 Série Temporal</h2>
-        <p>Evolução do número de questões por área de conhecimento ao longo dos anos.</p>
-        <img src="serie_temporal_areas.png" alt="Série Temporal">
+        html_cartoes = "".join(
+            f"""            <div class="stat-card">
+                <div class="stat-value">{html.escape(valor)}</div>
+                <div class="stat-label">{html.escape(rotulo)}</div>
+            </div>
+""" for valor, rotulo in cartoes)
         
-        <h2>📊 Dificuldade</h2>
-        <p>Evolução da dificuldade média das questões ao longo dos anos.</p>
-        <img src="dificuldade_temporal.png" alt="Dificuldade Temporal">
+        html_content = f"""
+<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Dashboard ENEM - Análises</title>
+{ESTILO}</head>
+<body>
+    <div class="container">
+        <h1>📊 Dashboard ENEM - Análises ({html.escape(periodo)})</h1>
         
-        <h2>🔗 Similaridade entre Provas</h2>
-        <p>Matriz de similaridade entre provas de diferentes anos.</p>
-        <img src="heatmap_similaridade_cosseno.png" alt="Similaridade">
+        <div class="stats">
+{html_cartoes}        </div>
         
+{chr(10).join(secoes)}
         <h2>📝 Notas</h2>
         <ul>
-            <li>Dados históricos de 2009 a 2024</li>
+            <li>Dados históricos de {html.escape(periodo.replace('-', ' a '))}</li>
             <li>Análises semânticas e lexicais</li>
             <li>Modelos preditivos implementados</li>
             <li>Validação com dados reais recomendada</li>
@@ -247,7 +309,7 @@ def criar_dashboard_html(dados: Dict, output_dir: Path):
         with open(arquivo, 'w', encoding='utf-8') as f:
             f.write(html_content)
         
-        print(f"  ✅ Dashboard HTML salvo: {arquivo.name}")
+        print(f"  ✅ Dashboard HTML salvo: {arquivo.name} ({len(secoes)} gráficos)")
         return True
     
     except Exception as e:
@@ -261,44 +323,21 @@ def main():
     print("=" * 70)
     print()
     
-    project_root = Path(__file__).parent.parent.parent
-    analises_dir = project_root / "data" / "analises"
-    visualizacoes_dir = project_root / "reports" / "visualizacoes"
-    visualizacoes_dir.mkdir(parents=True, exist_ok=True)
+    visualizacoes_dir = DIR_VISUALIZACOES
     
-    # Carregar dados
-    print("📥 Carregando dados de análises...")
-    dados = carregar_dados_analises(analises_dir)
+    # Preparar (ou ler do cache) e desenhar só o que mudou
+    print("🎨 Criando visualizações...")
+    lista = graficos()
+    resultado = gerar(lista, visualizacoes_dir, forcar='--forcar' in sys.argv)
     
-    if not dados:
+    if all(r['estado'] == 'sem_dados' for r in resultado.values()):
         print("❌ Nenhum dado de análise encontrado")
         print("   Execute primeiro as análises anteriores")
         return
     
-    print("✅ Dados carregados")
-    print()
-    
-    # Criar visualizações
-    print("🎨 Criando visualizações...")
-    
-    # Série temporal
-    if 'serie_temporal' in dados:
-        print("  📈 Criando gráfico de série temporal...")
-        criar_grafico_serie_temporal(dados['serie_temporal'], visualizacoes_dir)
-    
-    # Dificuldade
-    if 'dificuldade' in dados:
-        print("  📊 Criando gráfico de dificuldade...")
-        criar_grafico_dificuldade(dados['dificuldade'], visualizacoes_dir)
-    
-    # Similaridade
-    if 'similaridade' in dados:
-        print("  🔗 Criando heatmap de similaridade...")
-        criar_heatmap_similaridade(dados['similaridade'], visualizacoes_dir)
-    
     # Dashboard HTML
     print("  🌐 Criando dashboard HTML...")
-    criar_dashboard_html(dados, visualizacoes_dir)
+    criar_dashboard_html([g.nome for g in lista], visualizacoes_dir)
     
     print()
     print("=" * 70)
@@ -309,5 +348,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
@@ -6,40 +6,20 @@ Usa a API Maritaca (Sabiá-3) para análise avançada de complexidade semântica
 """
 import json
 import sys
-import os
 from pathlib import Path
 from typing import Dict, List
-import time
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem import cliente_maritaca
+
 def configurar_api_maritaca():
-    """Configura conexão com API Maritaca"""
-    import openai
-    
-    api_key = (
-        os.environ.get("CURSORMINIMAC") or
-        os.environ.get("MARITALK_API_SECRET_KEY") or
-        os.environ.get("MARITACA_API_KEY")
-    )
-    
-    if not api_key:
-        print("❌ Chave API não configurada!")
-        print("   Configure: CURSORMINIMAC, MARITALK_API_SECRET_KEY ou MARITACA_API_KEY")
+    """Configura conexão com API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v1'
+    except ValueError as e:
+        print(f"❌ {e}")
         return None, None
-    
-    openai.api_base = "https://chat.maritaca.ai/api"
-    
-    # Detectar versão do openai
-    openai_version = openai.__version__
-    major_version = int(openai_version.split('.')[0])
-    
-    if major_version >= 1:
-        client = openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
-        return client, 'v1'
-    else:
-        openai.api_key = api_key
-        return openai, 'v0'
 
 def analisar_complexidade_semantica(client, texto: str, versao: str) -> Dict:
     """Analisa complexidade semântica usando API Maritaca"""
@@ -57,22 +37,13 @@ Forneça uma análise em formato JSON com:
 Responda APENAS com o JSON, sem texto adicional."""
 
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=300,
-                temperature=0.3
-            )
-            resposta = response.choices[0].message.content
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=300,
-                temperature=0.3
-            )
-            resposta = response.choices[0].message.content
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=300,
+            temperature=0.3
+        )
+        resposta = response.choices[0].message.content
         
         # Tentar extrair JSON da resposta
         try:
@@ -147,7 +118,6 @@ def processar_questoes_com_maritaca(dados: Dict[int, List[Dict]],
                 print("❌")
             
             # Rate limiting
-            time.sleep(0.5)  # Evitar rate limit
             
             total_processadas += 1
             if limite and total_processadas >= limite:
@@ -3,79 +3,28 @@
 Mapeamento de Campos Semânticos do ENEM
 
 Mapeia todas as questões para campos semânticos baseados em vocabulário específico.
+O vocabulário é compilado uma vez (campos_semanticos.py) e todas as questões são
+marcadas em uma passada, gerando também a matriz esparsa questão×campo.
 """
+import argparse
 import json
 import sys
-import re
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List
 from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-# Definição dos campos semânticos por área do ENEM
-SEMANTIC_FIELDS = {
-    "linguagens": [
-        "arte", "artes", "educação física", "educacao fisica", "inglês", "ingles", "espanhol",
-        "interpretação de texto", "interpretacao de texto", "generos textuais", "gêneros textuais",
-        "literatura", "literatura brasileira", "comunicação", "linguagem", "gramática", "gramatica"
-    ],
-    "humanas": [
-        "filosofia", "sociologia", "geografia", "história", "historia", "sociedade", "cultura",
-        "política", "politica", "economia", "cidadania", "direitos humanos", "meio ambiente"
-    ],
-    "natureza": [
-        "física", "fisica", "química", "quimica", "biologia", "ciências", "ciencia",
-        "ecologia", "saúde", "saude", "tecnologia", "ambiente", "natureza", "universo"
-    ],
-    "matematica": [
-        "álgebra", "algebra", "aritmética", "aritmetica", "matemática básica", "matematica basica",
-        "geometria plana", "geometria espacial", "geometria analítica", "geometria analitica",
-        "cálculo", "calculo", "estatística", "estatistica", "probabilidade", "razão", "proporção"
-    ]
-}
-
-def normalizar_texto(texto: str) -> str:
-    """Normaliza texto para busca (remove acentos, lowercase)"""
-    if not texto:
-        return ""
-    texto = texto.lower()
-    # Remove acentos básicos (simplificado)
-    texto = texto.replace('á', 'a').replace('à', 'a').replace('â', 'a').replace('ã', 'a')
-    texto = texto.replace('é', 'e').replace('ê', 'e')
-    texto = texto.replace('í', 'i')
-    texto = texto.replace('ó', 'o').replace('ô', 'o').replace('õ', 'o')
-    texto = texto.replace('ú', 'u').replace('ü', 'u')
-    texto = texto.replace('ç', 'c')
-    return texto
+from scripts.analise_enem.corpus import carregar_dados_processados
+from scripts.analise_enem.campos_semanticos import (
+    campos_por_linha, marcador_padrao, marcar_questoes, salvar_matriz
+)
 
 def encontrar_campos_semanticos(texto: str, area: str) -> List[str]:
     """Encontra campos semânticos presentes no texto"""
-    texto_normalizado = normalizar_texto(texto)
-    campos_encontrados = []
-    
-    # Mapear área para chave do dicionário
-    area_map = {
-        'languages': 'linguagens',
-        'human-sciences': 'humanas',
-        'natural-sciences': 'natureza',
-        'mathematics': 'matematica'
-    }
-    
-    area_key = area_map.get(area, area.lower())
-    campos_area = SEMANTIC_FIELDS.get(area_key, [])
-    
-    # Buscar campos semânticos no texto
-    for campo in campos_area:
-        campo_normalizado = normalizar_texto(campo)
-        # Buscar palavra completa (evitar matches parciais)
-        pattern = r'\b' + re.escape(campo_normalizado) + r'\b'
-        if re.search(pattern, texto_normalizado):
-            campos_encontrados.append(campo)
-    
-    return campos_encontrados
+    return marcador_padrao().campos_do_texto(texto, area)
 
-def processar_todas_questoes(dados: Dict[int, List[Dict]]) -> Dict:
+def processar_todas_questoes(dados: Dict[int, List[Dict]], workers: int = None):
     """Processa todas as questões mapeando campos semânticos"""
     resultados = {}
     estatisticas_globais = defaultdict(int)
@@ -83,19 +32,18 @@ def processar_todas_questoes(dados: Dict[int, List[Dict]]) -> Dict:
     print("🔄 Processando questões e mapeando campos semânticos...")
     print()
     
+    # Marcar todas as questões de todos os anos em uma passada
+    todas_questoes = [questao for ano in sorted(dados.keys()) for questao in dados[ano]]
+    matriz = marcar_questoes(todas_questoes, workers=workers)
+    campos_todos = iter(campos_por_linha(matriz))
+    
     for ano in sorted(dados.keys()):
         questoes = dados[ano]
         questoes_mapeadas = []
         campos_por_questao = defaultdict(int)
         
         for questao in questoes:
-            contexto = questao.get('context', '')
-            pergunta = questao.get('question', '')
-            texto_completo = f"{contexto} {pergunta}"
-            area = questao.get('area', 'desconhecida')
-            
-            # Encontrar campos semânticos
-            campos = encontrar_campos_semanticos(texto_completo, area)
+            campos = next(campos_todos)
             
             questao_mapeada = questao.copy()
             questao_mapeada['campos_semanticos'] = campos
@@ -127,12 +75,15 @@ def processar_todas_questoes(dados: Dict[int, List[Dict]]) -> Dict:
     for campo, count in top_campos:
         print(f"   {campo:30s}: {count:4d} ocorrências")
     
-    return resultados
+    return resultados, matriz
 
-def salvar_resultados(resultados: Dict, output_dir: Path):
+def salvar_resultados(resultados: Dict, matriz: Dict, output_dir: Path):
     """Salva resultados do mapeamento"""
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    # Salvar matriz esparsa questão×campo (lida por 21_ e 34_)
+    arquivo_matriz = salvar_matriz(matriz, output_dir)
+    
     # Salvar completo
     arquivo = output_dir / "campos_semanticos_completo.json"
     with open(arquivo, 'w', encoding='utf-8') as f:
@@ -147,9 +98,15 @@ def salvar_resultados(resultados: Dict, output_dir: Path):
     print(f"💾 Resultados salvos em:")
     print(f"   - {arquivo.name}")
     print(f"   - {arquivo_stats.name}")
+    print(f"   - {arquivo_matriz.name}")
 
 def main():
     """Função principal"""
+    parser = argparse.ArgumentParser(description="Mapeamento de campos semânticos")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processos para marcar em paralelo (padrão: série)')
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("🔍 MAPEAMENTO DE CAMPOS SEMÂNTICOS - ENEM")
     print("=" * 70)
@@ -161,24 +118,16 @@ def main():
     
     # Carregar dados
     print("📥 Carregando dados...")
-    dados = {}
-    for jsonl_file in sorted(processed_dir.glob("enem_*_completo.jsonl")):
-        ano = int(jsonl_file.stem.split('_')[1])
-        questoes = []
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    questoes.append(json.loads(line))
-        dados[ano] = questoes
+    dados = carregar_dados_processados(processed_dir)
     
     print(f"✅ {len(dados)} anos carregados")
     print()
     
     # Processar mapeamento
-    resultados = processar_todas_questoes(dados)
+    resultados, matriz = processar_todas_questoes(dados, workers=args.workers)
     
     # Salvar resultados
-    salvar_resultados(resultados, analises_dir)
+    salvar_resultados(resultados, matriz, analises_dir)
     
     print()
     print("=" * 70)
@@ -7,37 +7,23 @@ Usa campos semânticos para melhorar a precisão.
 """
 import json
 import sys
-import os
+import time
 from pathlib import Path
 from typing import Dict, List, Optional
-import time
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem import cliente_maritaca, telemetria
+from scripts.analise_enem.campos_semanticos import campos_por_id, carregar_matriz
+from scripts.analise_enem.resultados_jsonl import EscritorResultados, arquivo_resultados
+
 def configurar_api_maritaca():
-    """Configura conexão com API Maritaca"""
-    import openai
-    
-    api_key = (
-        os.environ.get("CURSORMINIMAC") or
-        os.environ.get("MARITALK_API_SECRET_KEY") or
-        os.environ.get("MARITACA_API_KEY")
-    )
-    
-    if not api_key:
-        print("❌ Chave API não configurada!")
+    """Configura conexão com API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v1'
+    except ValueError as e:
+        print(f"❌ {e}")
         return None, None
-    
-    openai.api_base = "https://chat.maritaca.ai/api"
-    openai_version = openai.__version__
-    major_version = int(openai_version.split('.')[0])
-    
-    if major_version >= 1:
-        client = openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
-        return client, 'v1'
-    else:
-        openai.api_key = api_key
-        return openai, 'v0'
 
 def consultar_maritaca_para_prompt(client, versao: str, area: str, exemplo_questao: Dict = None) -> Optional[str]:
     """Sempre consulta Maritaca para otimizar o prompt"""
@@ -225,22 +211,13 @@ def avaliar_questao(client, questao: Dict, versao: str, usar_campos_semanticos:
     resposta_correta = questao.get('label', '').upper().strip()
     
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=5,
-                temperature=0.0
-            )
-            resposta_ia = response.choices[0].message.content.strip().upper()
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=5,
-                temperature=0.0
-            )
-            resposta_ia = response.choices[0].message.content.strip().upper()
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=5,
+            temperature=0.0
+        )
+        resposta_ia = response.choices[0].message.content.strip().upper()
         
         # Extrair apenas a letra (A, B, C, D, E)
         resposta_ia = resposta_ia[0] if resposta_ia and resposta_ia[0] in ['A', 'B', 'C', 'D', 'E'] else None
@@ -270,21 +247,20 @@ def avaliar_questoes(dados: Dict[int, List[Dict]],
                     anos: List[int] = None,
                     max_questoes_por_ano: int = None,
                     usar_campos_semanticos: bool = True,
-                    sempre_consultar_maritaca: bool = True) -> Dict:
-    """Avalia questões usando API Maritaca"""
+                    sempre_consultar_maritaca: bool = True,
+                    saida: Optional[EscritorResultados] = None) -> Dict:
+    """Avalia questões usando API Maritaca (cada avaliação vai para `saida`, se informado)"""
     client, versao = configurar_api_maritaca()
     
     if not client:
         return {}
     
-    # Carregar campos semânticos se disponíveis
+    # Carregar campos semânticos se disponíveis (id -> lista de campos)
     if campos_semanticos:
-        for ano, dados_ano in campos_semanticos.items():
-            if ano in dados:
-                questoes_com_campos = {q['id']: q for q in dados_ano['questoes']}
-                for questao in dados[ano]:
-                    if questao['id'] in questoes_com_campos:
-                        questao['campos_semanticos'] = questoes_com_campos[questao['id']].get('campos_semanticos', [])
+        for questoes in dados.values():
+            for questao in questoes:
+                if questao['id'] in campos_semanticos:
+                    questao['campos_semanticos'] = campos_semanticos[questao['id']]
     
     # Filtrar anos
     anos_para_avaliar = anos if anos else sorted(dados.keys())
@@ -299,6 +275,12 @@ def avaliar_questoes(dados: Dict[int, List[Dict]],
     total_questoes = 0
     total_acertos = 0
     
+    # Fluxo de eventos para `python telemetria.py` / monitorar_progresso.sh
+    eventos = telemetria.Telemetria(telemetria.arquivo_execucao("avaliacao_acuracia_maritaca"))
+    eventos.emitir('inicio_execucao', retomadas=0, total=sum(
+        min(len(dados[ano]), max_questoes_por_ano or len(dados[ano])) for ano in anos_para_avaliar
+    ))
+    
     for ano in anos_para_avaliar:
         questoes = dados[ano]
         
@@ -309,17 +291,22 @@ def avaliar_questoes(dados: Dict[int, List[Dict]],
         
         print(f"📊 Avaliando {ano} ({len(questoes)} questões)...")
         
-        avaliacoes_ano = []
         acertos_ano = 0
         
         for i, questao in enumerate(questoes, 1):
             print(f"  [{i}/{len(questoes)}] {questao.get('id', '')}...", end=' ')
+            chave = f"{ano}_{questao.get('id', '')}"
+            eventos.emitir('inicio_questao', chave=chave, area=questao.get('area', ''))
+            inicio = time.monotonic()
             
             # Sempre usar consulta à Maritaca para otimizar prompt
             avaliacao = avaliar_questao(client, questao, versao, usar_campos_semanticos, 
                                         client_prompt=client, versao_prompt=versao, 
                                         usar_consulta_maritaca=sempre_consultar_maritaca)
-            avaliacoes_ano.append(avaliacao)
+            if saida:
+                saida.escrever({'ano': ano, **avaliacao})
+            eventos.emitir('fim_questao', chave=chave, area=questao.get('area', ''),
+                           latencia=time.monotonic() - inicio, **telemetria.campos_do_resultado(avaliacao))
             
             if avaliacao['acerto']:
                 acertos_ano += 1
@@ -327,14 +314,12 @@ def avaliar_questoes(dados: Dict[int, List[Dict]],
             else:
                 print(f"❌ (IA: {avaliacao.get('resposta_ia', 'N/A')}, Correta: {avaliacao['resposta_correta']})")
             
-            time.sleep(0.5)  # Rate limiting
         
         acuracia_ano = (acertos_ano / len(questoes) * 100) if questoes else 0
         total_questoes += len(questoes)
         total_acertos += acertos_ano
         
         resultados[ano] = {
-            'avaliacoes': avaliacoes_ano,
             'estatisticas': {
                 'total': len(questoes),
                 'acertos': acertos_ano,
@@ -347,6 +332,8 @@ def avaliar_questoes(dados: Dict[int, List[Dict]],
         print()
     
     acuracia_geral = (total_acertos / total_questoes * 100) if total_questoes > 0 else 0
+    eventos.emitir('fim_execucao', status='concluido')
+    eventos.fechar()
     
     print("=" * 70)
     print("📊 RESULTADOS FINAIS")
@@ -399,11 +386,19 @@ def main():
     
     # Carregar campos semânticos se disponíveis
     campos_semanticos = None
+    matriz_campos = carregar_matriz(analises_dir)
     arquivo_campos = analises_dir / "campos_semanticos_completo.json"
-    if arquivo_campos.exists():
+    if matriz_campos is not None:
+        print("📥 Carregando matriz de campos semânticos...")
+        campos_semanticos = campos_por_id(matriz_campos)
+        print("✅ Campos semânticos carregados")
+    elif arquivo_campos.exists():
         print("📥 Carregando campos semânticos...")
         with open(arquivo_campos, 'r', encoding='utf-8') as f:
-            campos_semanticos = json.load(f)
+            campos_semanticos = {
+                q['id']: q.get('campos_semanticos', [])
+                for dados_ano in json.load(f).values() for q in dados_ano['questoes']
+            }
         print("✅ Campos semânticos carregados")
     else:
         print("⚠️  Campos semânticos não encontrados")
@@ -433,6 +428,10 @@ def main():
     print(f"   Total: {total_questoes} questões (de {total_com_resposta + sum(len([q for q in dados_orig.get(ano, []) if q.get('label', '').upper() == 'ANULADO']) for ano in dados_orig.keys())} total)")
     print()
     
+    # Avaliações por questão em JSONL; o JSON final só tem as estatísticas
+    saida = EscritorResultados(arquivo_resultados("avaliacao_acuracia_maritaca", analises_dir),
+                               "21_avaliacao_acuracia_maritaca", {'anos': sorted(dados.keys())})
+    
     # Avaliar
     resultados = avaliar_questoes(
         dados,
@@ -440,16 +439,21 @@ def main():
         anos=anos_teste,
         max_questoes_por_ano=max_questoes,
         usar_campos_semanticos=True,
-        sempre_consultar_maritaca=True  # SEMPRE consultar Maritaca
+        sempre_consultar_maritaca=True,  # SEMPRE consultar Maritaca
+        saida=saida
     )
     
     if resultados:
+        saida.resumo(resultados['_geral'])
+        saida.fechar()
         # Salvar resultados
+        resultados['arquivo_registros'] = saida.arquivo.name
         arquivo = analises_dir / "avaliacao_acuracia_maritaca.json"
         with open(arquivo, 'w', encoding='utf-8') as f:
             json.dump(resultados, f, indent=2, ensure_ascii=False)
         
         print(f"💾 Resultados salvos em: {arquivo}")
+        print(f"   Avaliações por questão: {saida.arquivo}")
         print()
         print("=" * 70)
         print("✅ AVALIAÇÃO CONCLUÍDA")
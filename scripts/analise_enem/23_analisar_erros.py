@@ -2,38 +2,33 @@
 """
 Análise detalhada dos erros do Passo 1 para melhorar o prompt
 """
-import json
 import sys
 from pathlib import Path
 from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem.resultados_jsonl import ler_registros
+
 def analisar_erros():
     """Analisa erros detalhadamente"""
     arquivo = Path(__file__).parent.parent.parent / "data" / "analises" / "avaliacao_acuracia_maritaca.json"
     
-    with open(arquivo, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
     erros = []
     acertos = []
     
-    for ano, dados in data.items():
-        if ano == '_geral':
-            continue
-        if isinstance(dados, dict) and 'avaliacoes' in dados:
-            for aval in dados['avaliacoes']:
-                if not aval.get('acerto', False):
-                    erros.append({
-                        'ano': ano,
-                        'area': aval.get('area', 'desconhecida'),
-                        'id': aval.get('id', ''),
-                        'resposta_correta': aval.get('resposta_correta'),
-                        'resposta_ia': aval.get('resposta_ia')
-                    })
-                else:
-                    acertos.append(aval.get('area', 'desconhecida'))
+    # Avaliações por questão (JSONL apontado pelo resumo, ou o JSON antigo)
+    for registro in ler_registros(arquivo):
+        if not registro.correto:
+            erros.append({
+                'ano': registro.ano,
+                'area': registro.area,
+                'id': registro.chave,
+                'resposta_correta': registro.gabarito,
+                'resposta_ia': registro.resposta
+            })
+        else:
+            acertos.append(registro.area)
     
     print("=" * 70)
     print("📊 ANÁLISE DETALHADA DE ERROS")
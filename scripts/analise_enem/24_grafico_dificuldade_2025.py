@@ -5,24 +5,26 @@ Gera gráfico de evolução da dificuldade incluindo 2025
 import json
 import sys
 from pathlib import Path
-import pandas as pd
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem.graficos import Grafico, gerar
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+ARQUIVO_DIFICULDADE = PROJECT_ROOT / "data" / "analises" / "dificuldade_estatisticas.json"
+ARQUIVO_2025 = PROJECT_ROOT / "data" / "processed" / "enem_2025_completo.jsonl"
+
 def carregar_dificuldade():
-    """Carrega dados de dificuldade"""
-    project_root = Path(__file__).parent.parent.parent
-    arquivo = project_root / "data" / "analises" / "dificuldade_estatisticas.json"
-    
-    if not arquivo.exists():
+    """Carrega dados de dificuldade ({'ano': [...], 'dificuldade_media': [...]})"""
+    if not ARQUIVO_DIFICULDADE.exists():
         print("❌ Arquivo de dificuldade não encontrado")
         print("   Execute primeiro: 08_heuristica_dificuldade.py")
         return None
     
-    with open(arquivo, 'r', encoding='utf-8') as f:
+    with open(ARQUIVO_DIFICULDADE, 'r', encoding='utf-8') as f:
         dados = json.load(f)
     
-    # Converter para DataFrame
     anos = []
     medias = []
     
@@ -31,11 +33,10 @@ def carregar_dificuldade():
         medias.append(stats.get('media_dificuldade', 0))
     
     # Adicionar 2025 se disponível
-    arquivo_2025 = project_root / "data" / "processed" / "enem_2025_completo.jsonl"
-    if arquivo_2025.exists():
+    if ARQUIVO_2025.exists():
         # Calcular dificuldade média de 2025
         questoes_2025 = []
-        with open(arquivo_2025, 'r', encoding='utf-8') as f:
+        with open(ARQUIVO_2025, 'r', encoding='utf-8') as f:
             for line in f:
                 if line.strip():
                     questoes_2025.append(json.loads(line))
@@ -56,71 +57,59 @@ def carregar_dificuldade():
                 medias.append(media_2025)
                 print(f"✅ Dificuldade 2025 calculada: {media_2025:.2f}")
     
-    df = pd.DataFrame({'ano': anos, 'dificuldade_media': medias})
-    return df
+    return {'ano': anos, 'dificuldade_media': medias}
 
-def gerar_grafico(df):
-    """Gera gráfico de evolução da dificuldade"""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')
-        
-        plt.figure(figsize=(14, 8))
-        
-        # Plotar linha
-        plt.plot(df['ano'], df['dificuldade_media'], 
-                marker='o', linewidth=2.5, markersize=8, 
-                color='#2c3e50', label='Dificuldade Média')
-        
-        # Preencher área
-        plt.fill_between(df['ano'], df['dificuldade_media'], 
-                        alpha=0.3, color='#3498db')
-        
-        # Destacar 2025
-        if 2025 in df['ano'].values:
-            idx_2025 = df[df['ano'] == 2025].index[0]
-            plt.plot(df.loc[idx_2025, 'ano'], df.loc[idx_2025, 'dificuldade_media'],
-                    marker='s', markersize=12, color='#e74c3c', 
-                    label='2025 (Novo)', zorder=5)
-        
-        plt.xlabel('Ano', fontsize=14, fontweight='bold')
-        plt.ylabel('Dificuldade Média', fontsize=14, fontweight='bold')
-        plt.title('Evolução da Dificuldade Média das Questões do ENEM (2009-2025)', 
-                 fontsize=16, fontweight='bold', pad=20)
-        
-        # Ajustar eixos
-        plt.xlim(df['ano'].min() - 0.5, df['ano'].max() + 0.5)
-        plt.ylim(0, max(df['dificuldade_media']) * 1.1)
-        
-        # Grid
-        plt.grid(True, alpha=0.3, linestyle='--')
-        
-        # Legenda
-        plt.legend(loc='best', fontsize=12)
-        
-        # Ajustar layout
-        plt.tight_layout()
-        
-        # Salvar
-        project_root = Path(__file__).parent.parent.parent
-        output_dir = project_root / "reports" / "visualizacoes"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        arquivo = output_dir / "dificuldade_temporal_2009_2025.png"
-        plt.savefig(arquivo, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"✅ Gráfico salvo em: {arquivo}")
-        return True
-    
-    except ImportError:
-        print("❌ matplotlib não instalado")
-        print("   Instale com: pip install matplotlib")
-        return False
-    except Exception as e:
-        print(f"❌ Erro ao gerar gráfico: {e}")
-        return False
+def desenhar_grafico(dados, arquivo):
+    """Desenha o gráfico de evolução da dificuldade (roda no worker de graficos.py)"""
+    import matplotlib.pyplot as plt
+    
+    anos = np.array(dados['ano'])
+    medias = np.array(dados['dificuldade_media'], dtype=float)
+    
+    plt.figure(figsize=(14, 8))
+    
+    # Plotar linha
+    plt.plot(anos, medias, 
+            marker='o', linewidth=2.5, markersize=8, 
+            color='#2c3e50', label='Dificuldade Média')
+    
+    # Preencher área
+    plt.fill_between(anos, medias, 
+                    alpha=0.3, color='#3498db')
+    
+    # Destacar 2025
+    if 2025 in anos:
+        idx_2025 = int(np.flatnonzero(anos == 2025)[0])
+        plt.plot(anos[idx_2025], medias[idx_2025],
+                marker='s', markersize=12, color='#e74c3c', 
+                label='2025 (Novo)', zorder=5)
+    
+    plt.xlabel('Ano', fontsize=14, fontweight='bold')
+    plt.ylabel('Dificuldade Média', fontsize=14, fontweight='bold')
+    plt.title('Evolução da Dificuldade Média das Questões do ENEM (2009-2025)', 
+             fontsize=16, fontweight='bold', pad=20)
+    
+    # Ajustar eixos
+    plt.xlim(anos.min() - 0.5, anos.max() + 0.5)
+    plt.ylim(0, medias.max() * 1.1)
+    
+    # Grid
+    plt.grid(True, alpha=0.3, linestyle='--')
+    
+    # Legenda
+    plt.legend(loc='best', fontsize=12)
+    
+    # Ajustar layout
+    plt.tight_layout()
+    
+    plt.savefig(arquivo, dpi=300, bbox_inches='tight')
+
+def grafico():
+    """Registro do gráfico na camada incremental"""
+    return Grafico('dificuldade_temporal_2009_2025.png', carregar_dificuldade, desenhar_grafico,
+                   entradas=[ARQUIVO_DIFICULDADE, ARQUIVO_2025], nome='dificuldade_2025',
+                   titulo='Dificuldade Média (2009-2025)',
+                   descricao='Evolução da dificuldade média, com 2025 estimado pelo comprimento do texto.')
 
 def main():
     """Função principal"""
@@ -129,33 +118,33 @@ def main():
     print("=" * 70)
     print()
     
-    # Carregar dados
+    # Carregar dados (do cache quando as entradas não mudaram)
     print("📥 Carregando dados de dificuldade...")
-    df = carregar_dificuldade()
+    print("🎨 Gerando gráfico...")
+    resultado = gerar([grafico()], forcar='--forcar' in sys.argv)['dificuldade_2025']
+    dados = resultado['dados']
     
-    if df is None:
+    if dados is None:
         return
     
-    print(f"✅ {len(df)} anos carregados")
+    anos = np.array(dados['ano'])
+    medias = np.array(dados['dificuldade_media'], dtype=float)
+    print(f"✅ {len(anos)} anos carregados")
     print()
     
     # Estatísticas
     print("📊 Estatísticas:")
-    print(f"   Período: {df['ano'].min()} - {df['ano'].max()}")
-    print(f"   Dificuldade média geral: {df['dificuldade_media'].mean():.2f}")
-    print(f"   Dificuldade mínima: {df['dificuldade_media'].min():.2f} ({df.loc[df['dificuldade_media'].idxmin(), 'ano']})")
-    print(f"   Dificuldade máxima: {df['dificuldade_media'].max():.2f} ({df.loc[df['dificuldade_media'].idxmax(), 'ano']})")
+    print(f"   Período: {anos.min()} - {anos.max()}")
+    print(f"   Dificuldade média geral: {medias.mean():.2f}")
+    print(f"   Dificuldade mínima: {medias.min():.2f} ({anos[medias.argmin()]})")
+    print(f"   Dificuldade máxima: {medias.max():.2f} ({anos[medias.argmax()]})")
     print()
     
-    # Gerar gráfico
-    print("🎨 Gerando gráfico...")
-    if gerar_grafico(df):
-        print()
+    if resultado['estado'] in ('desenhado', 'pulado'):
         print("=" * 70)
         print("✅ GRÁFICO GERADO COM SUCESSO")
         print("=" * 70)
+        print(f"📁 Arquivo: {resultado['arquivo']}")
 
 if __name__ == "__main__":
     main()
-
-
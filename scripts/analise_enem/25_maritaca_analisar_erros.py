@@ -6,37 +6,22 @@ A Maritaca é especialista em ENEM e pode fornecer insights valiosos.
 """
 import json
 import sys
-import os
 from pathlib import Path
 from typing import Dict, List
 import time
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem import cliente_maritaca
+from scripts.analise_enem.resultados_jsonl import ler_registros
+
 def configurar_api_maritaca():
-    """Configura conexão com API Maritaca"""
-    import openai
-    
-    api_key = (
-        os.environ.get("CURSORMINIMAC") or
-        os.environ.get("MARITALK_API_SECRET_KEY") or
-        os.environ.get("MARITACA_API_KEY")
-    )
-    
-    if not api_key:
-        print("❌ Chave API não configurada!")
+    """Configura conexão com API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v1'
+    except ValueError as e:
+        print(f"❌ {e}")
         return None, None
-    
-    openai.api_base = "https://chat.maritaca.ai/api"
-    openai_version = openai.__version__
-    major_version = int(openai_version.split('.')[0])
-    
-    if major_version >= 1:
-        client = openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
-        return client, 'v1'
-    else:
-        openai.api_key = api_key
-        return openai, 'v0'
 
 def obter_amostra_erros(erros: List[Dict], questoes_completas: Dict, num_amostras: int = 10) -> List[Dict]:
     """Obtém amostra de erros com questões completas"""
@@ -141,22 +126,13 @@ Forneça uma análise detalhada e sugestões práticas e específicas para melho
 Responda em formato estruturado e detalhado."""
     
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2000,
-                temperature=0.3
-            )
-            resposta = response.choices[0].message.content
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2000,
-                temperature=0.3
-            )
-            resposta = response.choices[0].message.content
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=2000,
+            temperature=0.3
+        )
+        resposta = response.choices[0].message.content
         
         return resposta
     except Exception as e:
@@ -172,26 +148,19 @@ def preparar_analise_erros():
         data = json.load(f)
     
     erros = []
-    acertos = []
+    total_acertos = 0
     erros_por_area = {}
     
-    for ano, dados in data.items():
-        if ano == '_geral':
-            continue
-        if isinstance(dados, dict) and 'avaliacoes' in dados:
-            for aval in dados['avaliacoes']:
-                if not aval.get('acerto', False):
-                    erros.append(aval)
-                    area = aval.get('area', 'desconhecida')
-                    if area not in erros_por_area:
-                        erros_por_area[area] = {'erros': 0, 'acertos': 0}
-                    erros_por_area[area]['erros'] += 1
-                else:
-                    acertos.append(aval)
-                    area = aval.get('area', 'desconhecida')
-                    if area not in erros_por_area:
-                        erros_por_area[area] = {'erros': 0, 'acertos': 0}
-                    erros_por_area[area]['acertos'] += 1
+    # Avaliações por questão (JSONL apontado pelo resumo, ou o JSON antigo)
+    for registro in ler_registros(arquivo):
+        if registro.area not in erros_por_area:
+            erros_por_area[registro.area] = {'erros': 0, 'acertos': 0}
+        if not registro.correto:
+            erros.append(registro.dados)
+            erros_por_area[registro.area]['erros'] += 1
+        else:
+            total_acertos += 1
+            erros_por_area[registro.area]['acertos'] += 1
     
     # Calcular acurácia por área
     for area, dados in erros_por_area.items():
@@ -211,7 +180,7 @@ def preparar_analise_erros():
     
     return {
         'total_erros': len(erros),
-        'total_acertos': len(acertos),
+        'total_acertos': total_acertos,
         'acuracia_geral': geral.get('acuracia_geral', 0),
         'erros_por_area': erros_por_area,
         'padroes_erro': padroes_erro,
@@ -6,38 +6,21 @@ Compara o desempenho do prompt melhorado com o anterior.
 """
 import json
 import sys
-import os
 from pathlib import Path
 from typing import Dict, List
-import time
 import random
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem import cliente_maritaca
+
 def configurar_api_maritaca():
-    """Configura conexão com API Maritaca"""
-    import openai
-    
-    api_key = (
-        os.environ.get("CURSORMINIMAC") or
-        os.environ.get("MARITALK_API_SECRET_KEY") or
-        os.environ.get("MARITACA_API_KEY")
-    )
-    
-    if not api_key:
-        print("❌ Chave API não configurada!")
+    """Configura conexão com API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v1'
+    except ValueError as e:
+        print(f"❌ {e}")
         return None, None
-    
-    openai.api_base = "https://chat.maritaca.ai/api"
-    openai_version = openai.__version__
-    major_version = int(openai_version.split('.')[0])
-    
-    if major_version >= 1:
-        client = openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
-        return client, 'v1'
-    else:
-        openai.api_key = api_key
-        return openai, 'v0'
 
 def formatar_questao_para_maritaca(questao: Dict, usar_campos_semanticos: bool = True) -> str:
     """Formata questão com prompt melhorado (baseado na análise da Maritaca)"""
@@ -154,22 +137,13 @@ def avaliar_questao(client, questao: Dict, versao: str, usar_campos_semanticos:
     resposta_correta = questao.get('label', '').upper().strip()
     
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=5,
-                temperature=0.0
-            )
-            resposta_ia = response.choices[0].message.content.strip().upper()
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=5,
-                temperature=0.0
-            )
-            resposta_ia = response.choices[0].message.content.strip().upper()
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=5,
+            temperature=0.0
+        )
+        resposta_ia = response.choices[0].message.content.strip().upper()
         
         resposta_ia = resposta_ia[0] if resposta_ia and resposta_ia[0] in ['A', 'B', 'C', 'D', 'E'] else None
         acerto = resposta_ia == resposta_correta if resposta_ia else False
@@ -259,8 +233,6 @@ def main():
             print("✅")
         else:
             print(f"❌ (IA: {resultado.get('resposta_ia', 'N/A')}, Correta: {resultado.get('resposta_correta', 'N/A')})")
-        
-        time.sleep(0.5)
     
     acuracia = (acertos / len(questoes) * 100) if questoes else 0
     
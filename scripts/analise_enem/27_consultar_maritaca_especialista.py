@@ -6,35 +6,20 @@ Sempre consulta a Maritaca antes de análises, criação de prompts, etc.
 """
 import json
 import sys
-import os
 from pathlib import Path
 from typing import Dict, List, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem import cliente_maritaca
+
 def configurar_api_maritaca():
-    """Configura conexão com API Maritaca"""
-    import openai
-    
-    api_key = (
-        os.environ.get("CURSORMINIMAC") or
-        os.environ.get("MARITALK_API_SECRET_KEY") or
-        os.environ.get("MARITACA_API_KEY")
-    )
-    
-    if not api_key:
+    """Configura conexão com API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v1'
+    except ValueError as e:
+        print(f"❌ {e}")
         return None, None
-    
-    openai.api_base = "https://chat.maritaca.ai/api"
-    openai_version = openai.__version__
-    major_version = int(openai_version.split('.')[0])
-    
-    if major_version >= 1:
-        client = openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
-        return client, 'v1'
-    else:
-        openai.api_key = api_key
-        return openai, 'v0'
 
 def consultar_maritaca(client, versao: str, pergunta: str, contexto: str = "", max_tokens: int = 2000) -> Optional[str]:
     """Consulta Maritaca Sabiá 3 como especialista ENEM"""
@@ -47,22 +32,13 @@ def consultar_maritaca(client, versao: str, pergunta: str, contexto: str = "", m
 Forneça uma resposta detalhada, prática e específica baseada na sua expertise em ENEM."""
     
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=0.3
-            )
-            return response.choices[0].message.content
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=0.3
-            )
-            return response.choices[0].message.content
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=0.3
+        )
+        return response.choices[0].message.content
     except Exception as e:
         print(f"⚠️  Erro ao consultar Maritaca: {e}")
         return None
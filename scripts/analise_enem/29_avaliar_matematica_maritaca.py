@@ -6,38 +6,21 @@ Sempre consulta Maritaca para otimizar prompts e análises.
 """
 import json
 import sys
-import os
 from pathlib import Path
 from typing import Dict, List
-import time
 import random
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem import cliente_maritaca
+
 def configurar_api_maritaca():
-    """Configura conexão com API Maritaca"""
-    import openai
-    
-    api_key = (
-        os.environ.get("CURSORMINIMAC") or
-        os.environ.get("MARITALK_API_SECRET_KEY") or
-        os.environ.get("MARITACA_API_KEY")
-    )
-    
-    if not api_key:
-        print("❌ Chave API não configurada!")
+    """Configura conexão com API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v1'
+    except ValueError as e:
+        print(f"❌ {e}")
         return None, None
-    
-    openai.api_base = "https://chat.maritaca.ai/api"
-    openai_version = openai.__version__
-    major_version = int(openai_version.split('.')[0])
-    
-    if major_version >= 1:
-        client = openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
-        return client, 'v1'
-    else:
-        openai.api_key = api_key
-        return openai, 'v0'
 
 def carregar_questoes_matematica(num_questoes: int = 100):
     """Carrega questões de matemática"""
@@ -171,22 +154,13 @@ Siga TODOS os 8 passos antes de dar sua resposta final."""
     resposta_correta = questao.get('label', '').upper().strip()
     
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2000,  # Permitir raciocínio detalhado
-                temperature=0.0
-            )
-            resposta_completa = response.choices[0].message.content.strip()
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2000,  # Permitir raciocínio detalhado
-                temperature=0.0
-            )
-            resposta_completa = response.choices[0].message.content.strip()
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=2000,  # Permitir raciocínio detalhado
+            temperature=0.0
+        )
+        resposta_completa = response.choices[0].message.content.strip()
         
         # Extrair resposta (procurar por "RESPOSTA:" ou última letra A-E)
         resposta_ia = None
@@ -296,7 +270,6 @@ def main():
         else:
             print(f"❌ (IA: {resultado.get('resposta_ia', 'N/A')}, Correta: {resultado.get('resposta_correta', 'N/A')})")
         
-        time.sleep(0.3)  # Rate limiting (reduzido para acelerar)
     
     acuracia = (acertos / len(questoes) * 100) if questoes else 0
     
@@ -10,38 +10,23 @@ Implementa:
 """
 import json
 import sys
-import os
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-import time
 import numpy as np
 from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem import cliente_maritaca
+from scripts.analise_enem.analise_semantica import analise_da_questao, cache_padrao, precomputar
+
 def configurar_api_maritaca():
-    """Configura conexão com API Maritaca"""
-    import openai
-    
-    api_key = (
-        os.environ.get("CURSORMINIMAC") or
-        os.environ.get("MARITALK_API_SECRET_KEY") or
-        os.environ.get("MARITACA_API_KEY")
-    )
-    
-    if not api_key:
+    """Configura conexão com API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v1'
+    except ValueError as e:
+        print(f"❌ {e}")
         return None, None
-    
-    openai.api_base = "https://chat.maritaca.ai/api"
-    openai_version = openai.__version__
-    major_version = int(openai_version.split('.')[0])
-    
-    if major_version >= 1:
-        client = openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
-        return client, 'v1'
-    else:
-        openai.api_key = api_key
-        return openai, 'v0'
 
 def gerar_embedding_maritaca(client, versao: str, texto: str) -> Optional[List[float]]:
     """Gera embedding semântico usando Maritaca"""
@@ -62,22 +47,13 @@ Forneça uma análise semântica detalhada incluindo:
 Formate como JSON com essas chaves."""
     
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=500,
-                temperature=0.1
-            )
-            resposta = response.choices[0].message.content
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=500,
-                temperature=0.1
-            )
-            resposta = response.choices[0].message.content
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=500,
+            temperature=0.1
+        )
+        resposta = response.choices[0].message.content
         
         # Extrair JSON da resposta
         import re
@@ -94,74 +70,8 @@ Formate como JSON com essas chaves."""
         return None
 
 def analise_semantica_profunda_maritaca(client, versao: str, questao: Dict) -> Optional[Dict]:
-    """Análise semântica profunda da questão usando Maritaca"""
-    contexto = questao.get('context', '').strip()
-    pergunta = questao.get('question', '').strip()
-    alternativas = questao.get('alternatives', [])
-    area = questao.get('area', 'desconhecida')
-    
-    texto_completo = f"{contexto}\n\n{pergunta}"
-    
-    prompt = f"""Você é a Maritaca Sabiá 3, especialista em ENEM.
-
-Realize uma ANÁLISE SEMÂNTICA PROFUNDA da seguinte questão do ENEM:
-
-ÁREA: {area}
-
-CONTEXTO:
-{contexto}
-
-PERGUNTA:
-{pergunta}
-
-ALTERNATIVAS:
-"""
-    for i, alt in enumerate(alternativas, 1):
-        letra = chr(64 + i)
-        prompt += f"{letra}. {alt}\n"
-    
-    prompt += """
-ANÁLISE REQUERIDA:
-1. Identifique os CONCEITOS-CHAVE principais necessários para resolver
-2. Identifique o TIPO DE PROBLEMA (cálculo, interpretação, aplicação, etc.)
-3. Identifique ARMADILHAS COMUNS que podem levar a erros
-4. Identifique o NÍVEL DE DIFICULDADE (fácil, médio, difícil)
-5. Identifique CONHECIMENTOS PRÉVIOS necessários
-6. Analise cada alternativa e identifique por que cada uma pode ser correta ou incorreta
-7. Forneça uma ESTRATÉGIA DE RESOLUÇÃO passo a passo
-
-Formate como JSON estruturado."""
-    
-    try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2000,
-                temperature=0.2
-            )
-            resposta = response.choices[0].message.content
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2000,
-                temperature=0.2
-            )
-            resposta = response.choices[0].message.content
-        
-        # Extrair JSON
-        import re
-        json_match = re.search(r'\{.*\}', resposta, re.DOTALL)
-        if json_match:
-            analise = json.loads(json_match.group())
-            return analise
-        
-        # Se não conseguir extrair JSON, retornar texto
-        return {'analise_texto': resposta}
-    except Exception as e:
-        print(f"⚠️  Erro na análise semântica: {e}")
-        return None
+    """Análise semântica profunda (pré-computada em lote por analise_semantica.py)"""
+    return analise_da_questao(client, questao, cache_padrao())
 
 def encontrar_questoes_similares_maritaca(client, versao: str, questao_atual: Dict, 
                                           banco_questoes: List[Dict], num_similares: int = 3) -> List[Dict]:
@@ -325,22 +235,13 @@ ALTERNATIVAS:
     resposta_correta = questao.get('label', '').upper().strip()
     
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=100,
-                temperature=0.0
-            )
-            resposta_ia = response.choices[0].message.content.strip().upper()
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=100,
-                temperature=0.0
-            )
-            resposta_ia = response.choices[0].message.content.strip().upper()
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=100,
+            temperature=0.0
+        )
+        resposta_ia = response.choices[0].message.content.strip().upper()
         
         # Extrair letra
         import re
@@ -408,6 +309,11 @@ def main():
     import random
     questoes_teste = random.sample(banco_questoes, min(10, len(banco_questoes)))
     
+    # Análises das questões do teste em lote, antes das chamadas de resposta
+    stats = precomputar(client, questoes_teste, cache_padrao())
+    print(f"🧠 Análises semânticas: {stats['analisadas']} novas, {stats['em_cache']} do cache")
+    print()
+    
     resultados = []
     for i, questao in enumerate(questoes_teste, 1):
         print(f"  [{i}/{len(questoes_teste)}] {questao.get('id', '')[:40]}...", end=' ', flush=True)
@@ -420,7 +326,6 @@ def main():
         else:
             print(f"❌ (IA: {resultado.get('resposta_ia', 'N/A')}, Correta: {resultado.get('resposta_correta', 'N/A')})")
         
-        time.sleep(1)  # Rate limiting
     
     # Resultados
     acertos = sum(1 for r in resultados if r.get('acerto'))
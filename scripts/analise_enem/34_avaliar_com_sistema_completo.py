@@ -3,182 +3,36 @@
 Avaliação usando Sistema Completo 100% Maritaca (Otimizado)
 
 Inclui:
-- Cache de análises semânticas
+- Análises semânticas pré-computadas em lote (analise_semantica.py)
 - Busca eficiente de questões similares
 - Comparação com sistema anterior
 """
 import json
 import sys
-import os
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import time
-import hashlib
 import random
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem import cliente_maritaca
+from scripts.analise_enem.analise_semantica import CacheAnalises, analise_da_questao, cache_padrao, precomputar
+from scripts.analise_enem.campos_semanticos import campos_por_id, carregar_matriz
+from scripts.analise_enem.resultados_jsonl import Contagem, EscritorResultados, arquivo_resultados
+
 def configurar_api_maritaca():
-    """Configura conexão com API Maritaca"""
-    import openai
-    
-    api_key = (
-        os.environ.get("CURSORMINIMAC") or
-        os.environ.get("MARITALK_API_SECRET_KEY") or
-        os.environ.get("MARITACA_API_KEY")
-    )
-    
-    if not api_key:
+    """Configura conexão com API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v1'
+    except ValueError as e:
+        print(f"❌ {e}")
         return None, None
-    
-    openai.api_base = "https://chat.maritaca.ai/api"
-    openai_version = openai.__version__
-    major_version = int(openai_version.split('.')[0])
-    
-    if major_version >= 1:
-        client = openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
-        return client, 'v1'
-    else:
-        openai.api_key = api_key
-        return openai, 'v0'
-
-class CacheAnalises:
-    """Cache para análises semânticas"""
-    def __init__(self, cache_file: Path):
-        self.cache_file = cache_file
-        self.cache = self._carregar_cache()
-    
-    def _carregar_cache(self) -> Dict:
-        """Carrega cache do arquivo"""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def _salvar_cache(self):
-        """Salva cache no arquivo"""
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(self.cache, f, indent=2, ensure_ascii=False)
-    
-    def _hash_questao(self, questao: Dict) -> str:
-        """Gera hash único da questão"""
-        texto = f"{questao.get('context', '')}{questao.get('question', '')}"
-        return hashlib.md5(texto.encode()).hexdigest()
-    
-    def obter_analise(self, questao: Dict) -> Optional[Dict]:
-        """Obtém análise do cache"""
-        hash_q = self._hash_questao(questao)
-        return self.cache.get(hash_q)
-    
-    def salvar_analise(self, questao: Dict, analise: Dict):
-        """Salva análise no cache"""
-        hash_q = self._hash_questao(questao)
-        self.cache[hash_q] = analise
-        self._salvar_cache()
 
 def analise_semantica_profunda_maritaca(client, versao: str, questao: Dict, 
                                         cache: Optional[CacheAnalises] = None) -> Optional[Dict]:
-    """Análise semântica profunda da questão usando Maritaca (com cache)"""
-    
-    # Verificar cache primeiro
-    if cache:
-        analise_cached = cache.obter_analise(questao)
-        if analise_cached:
-            return analise_cached
-    
-    contexto = questao.get('context', '').strip()
-    pergunta = questao.get('question', '').strip()
-    alternativas = questao.get('alternatives', [])
-    area = questao.get('area', 'desconhecida')
-    
-    prompt = f"""Você é a Maritaca Sabiá 3, especialista em ENEM.
-
-Realize uma ANÁLISE SEMÂNTICA PROFUNDA da seguinte questão do ENEM:
-
-ÁREA: {area}
-
-CONTEXTO:
-{contexto}
-
-PERGUNTA:
-{pergunta}
-
-ALTERNATIVAS:
-"""
-    for i, alt in enumerate(alternativas, 1):
-        letra = chr(64 + i)
-        prompt += f"{letra}. {alt}\n"
-    
-    prompt += """
-ANÁLISE REQUERIDA (formate como JSON):
-{{
-  "conceitos_chave": ["lista de conceitos principais"],
-  "tipo_problema": "tipo identificado",
-  "armadilhas_comuns": ["lista de armadilhas"],
-  "nivel_dificuldade": "fácil/médio/difícil",
-  "conhecimentos_previos": ["lista de conhecimentos"],
-  "estrategia_resolucao": "passo a passo resumido"
-}}"""
-    
-    try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000,
-                temperature=0.2
-            )
-            resposta = response.choices[0].message.content
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000,
-                temperature=0.2
-            )
-            resposta = response.choices[0].message.content
-        
-        # Extrair JSON (tentar múltiplas estratégias)
-        import re
-        analise = None
-        
-        # Estratégia 1: Buscar JSON completo
-        json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resposta, re.DOTALL)
-        if json_match:
-            try:
-                analise = json.loads(json_match.group())
-            except:
-                pass
-        
-        # Estratégia 2: Se falhou, tentar extrair campos manualmente
-        if not analise:
-            analise = {}
-            # Extrair conceitos-chave
-            conceitos_match = re.search(r'conceitos[_\s]*chave["\']?\s*[:=]\s*\[(.*?)\]', resposta, re.IGNORECASE | re.DOTALL)
-            if conceitos_match:
-                conceitos_texto = conceitos_match.group(1)
-                conceitos = [c.strip().strip('"\'') for c in conceitos_texto.split(',')]
-                analise['conceitos_chave'] = conceitos
-            
-            # Extrair tipo de problema
-            tipo_match = re.search(r'tipo[_\s]*problema["\']?\s*[:=]\s*["\']?([^"\']+)["\']?', resposta, re.IGNORECASE)
-            if tipo_match:
-                analise['tipo_problema'] = tipo_match.group(1).strip()
-            
-            # Se não conseguiu extrair nada, usar texto completo
-            if not analise:
-                analise = {'analise_texto': resposta[:500]}  # Limitar tamanho
-        
-        # Salvar no cache
-        if cache:
-            cache.salvar_analise(questao, analise)
-        return analise
-    except Exception as e:
-        print(f"    ⚠️  Erro na análise: {e}")
-        return None
+    """Análise semântica profunda (pré-computada em lote por analise_semantica.py)"""
+    return analise_da_questao(client, questao, cache or cache_padrao())
 
 def encontrar_questoes_similares_otimizado(questao_atual: Dict, analise_atual: Dict,
                                            banco_questoes: List[Dict], 
@@ -265,6 +119,11 @@ ALTERNATIVAS:
         
         prompt += f"\nRESPOSTA CORRETA: {resposta_sim}\n\n"
     
+    # Adicionar campos semânticos (matriz de 20_mapear_campos_semanticos)
+    campos = questao.get('campos_semanticos', [])
+    if campos:
+        prompt += f"CAMPOS SEMÂNTICOS IDENTIFICADOS: {', '.join(campos)}\n\n"
+    
     # Adicionar análise semântica
     if analise:
         prompt += f"""ANÁLISE SEMÂNTICA DA QUESTÃO ATUAL:
@@ -351,22 +210,13 @@ ALTERNATIVAS:
     resposta_correta = questao.get('label', '').upper().strip()
     
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=100,
-                temperature=0.0
-            )
-            resposta_ia = response.choices[0].message.content.strip().upper()
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=100,
-                temperature=0.0
-            )
-            resposta_ia = response.choices[0].message.content.strip().upper()
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=100,
+            temperature=0.0
+        )
+        resposta_ia = response.choices[0].message.content.strip().upper()
         
         # Extrair letra
         import re
@@ -470,14 +320,22 @@ def main():
                         questoes_resolvidas[questao.get('id', '')] = questao.get('label', '').upper()
     
     print(f"✅ {len(banco_questoes)} questões de matemática carregadas")
+    
+    # Campos semânticos pré-computados (matriz esparsa questão×campo)
+    matriz_campos = carregar_matriz(project_root / "data" / "analises")
+    if matriz_campos is not None:
+        mapa_campos = campos_por_id(matriz_campos)
+        for questao in banco_questoes:
+            questao['campos_semanticos'] = mapa_campos.get(questao.get('id', ''), [])
+        print("✅ Campos semânticos carregados")
     print()
     
     # Configurar cache
-    cache_dir = project_root / "data" / "cache"
-    cache_dir.mkdir(exist_ok=True)
-    cache_file = cache_dir / "analises_semanticas.json"
-    cache = CacheAnalises(cache_file)
-    print(f"💾 Cache configurado: {cache_file}")
+    cache = cache_padrao()
+    if cache.armazem is not None:
+        print(f"💾 Cache configurado: {cache.armazem.arquivo}")
+    else:
+        print("⚠️  Cache desligado (MARITACA_CACHE=0)")
     print()
     
     # Carregar resultados anteriores
@@ -493,11 +351,25 @@ def main():
                         if q.get('label', '').upper() not in ['ANULADO', '']]
     questoes_teste = random.sample(questoes_validas, min(num_questoes, len(questoes_validas)))
     
+    # Análises semânticas de todas as questões do teste antes de responder
+    # (várias questões por prompt, lotes em paralelo)
+    print("🧠 Pré-computando análises semânticas...")
+    stats = precomputar(client, questoes_teste, cache)
+    print(f"   ✅ {stats['analisadas']} novas, {stats['em_cache']} do cache, {stats['falhas']} falhas")
+    print()
+    
     print("🚀 Iniciando avaliação...")
     print(f"   ⏱️  Estimativa: ~{num_questoes * 3} segundos (com cache)")
     print()
     
-    resultados = []
+    # Cada questão vai para o JSONL assim que termina; aqui só ficam contadores
+    saida = EscritorResultados(
+        arquivo_resultados(f"avaliacao_completa_{num_questoes}_maritaca", project_root / "data" / "analises"),
+        "34_avaliar_com_sistema_completo", {'num_questoes': num_questoes, 'area': 'mathematics'})
+    contagem = Contagem()
+    com_few_shot = 0
+    com_analise = 0
+    padroes = {}
     inicio = time.time()
     
     for i, questao in enumerate(questoes_teste, 1):
@@ -506,39 +378,44 @@ def main():
         resultado = avaliar_questao_completo(
             client, versao, questao, banco_questoes, questoes_resolvidas, cache
         )
-        resultados.append(resultado)
+        saida.escrever(resultado)
+        contagem.adicionar(resultado.get('acerto'))
+        com_few_shot += bool(resultado.get('usou_few_shot'))
+        com_analise += bool(resultado.get('tem_analise'))
+        correta = resultado.get('resposta_correta', '')
+        ia = resultado.get('resposta_ia', '')
+        if not resultado.get('acerto') and correta and ia:
+            padrao = f"{correta}→{ia}"
+            padroes[padrao] = padroes.get(padrao, 0) + 1
         
         if resultado.get('acerto'):
             print("✅")
         else:
             print(f"❌ (IA: {resultado.get('resposta_ia', 'N/A')}, Correta: {resultado.get('resposta_correta', 'N/A')})")
         
-        time.sleep(0.5)  # Rate limiting
     
     tempo_total = time.time() - inicio
     
     # Resultados
-    acertos = sum(1 for r in resultados if r.get('acerto'))
-    acuracia = (acertos / len(resultados) * 100) if resultados else 0
+    total = contagem.total
+    acertos = contagem.acertos
+    acuracia = contagem.acuracia
     
     print()
     print("=" * 70)
     print("📊 RESULTADOS FINAIS")
     print("=" * 70)
-    print(f"Total de questões: {len(resultados)}")
+    print(f"Total de questões: {total}")
     print(f"Acertos: {acertos}")
-    print(f"Erros: {len(resultados) - acertos}")
+    print(f"Erros: {total - acertos}")
     print(f"Acurácia: {acuracia:.2f}%")
-    print(f"Tempo total: {tempo_total:.1f}s ({tempo_total/len(resultados):.1f}s por questão)")
+    print(f"Tempo total: {tempo_total:.1f}s ({tempo_total/total:.1f}s por questão)")
     print()
     
     # Estatísticas do sistema
-    com_few_shot = sum(1 for r in resultados if r.get('usou_few_shot'))
-    com_analise = sum(1 for r in resultados if r.get('tem_analise'))
-    
     print("📈 Estatísticas do Sistema:")
-    print(f"   Questões com few-shot learning: {com_few_shot}/{len(resultados)} ({com_few_shot/len(resultados)*100:.1f}%)")
-    print(f"   Questões com análise semântica: {com_analise}/{len(resultados)} ({com_analise/len(resultados)*100:.1f}%)")
+    print(f"   Questões com few-shot learning: {com_few_shot}/{total} ({com_few_shot/total*100:.1f}%)")
+    print(f"   Questões com análise semântica: {com_analise}/{total} ({com_analise/total*100:.1f}%)")
     print()
     
     # Comparação
@@ -555,39 +432,29 @@ def main():
         print()
     
     # Padrões de erro
-    erros = [r for r in resultados if not r.get('acerto')]
-    if erros:
+    if contagem.erros:
         print("📊 Padrões de erro:")
-        padroes = {}
-        for erro in erros:
-            correta = erro.get('resposta_correta', '')
-            ia = erro.get('resposta_ia', '')
-            if correta and ia:
-                padrao = f"{correta}→{ia}"
-                padroes[padrao] = padroes.get(padrao, 0) + 1
-        
         for padrao, count in sorted(padroes.items(), key=lambda x: x[1], reverse=True)[:5]:
             print(f"   {padrao:10s}: {count:2d} vezes")
         print()
     
     # Salvar resultados
-    arquivo = project_root / "data" / "analises" / f"avaliacao_completa_{num_questoes}_maritaca.json"
-    with open(arquivo, 'w', encoding='utf-8') as f:
-        json.dump({
-            'resultados': resultados,
-            'total': len(resultados),
-            'acertos': acertos,
-            'erros': len(resultados) - acertos,
-            'acuracia': acuracia,
-            'tempo_total': tempo_total,
-            'tempo_medio': tempo_total / len(resultados) if resultados else 0,
-            'sistema': 'completo_100_maritaca_otimizado',
-            'com_few_shot': com_few_shot,
-            'com_analise': com_analise,
-            'comparacao_anterior': resultados_anteriores
-        }, f, indent=2, ensure_ascii=False)
-    
-    print(f"💾 Resultados salvos em: {arquivo}")
+    saida.resumo({
+        'total': total,
+        'acertos': acertos,
+        'erros': total - acertos,
+        'acuracia': acuracia,
+        'tempo_total': tempo_total,
+        'tempo_medio': tempo_total / total if total else 0,
+        'sistema': 'completo_100_maritaca_otimizado',
+        'com_few_shot': com_few_shot,
+        'com_analise': com_analise,
+        'padroes_erro': padroes,
+        'comparacao_anterior': resultados_anteriores
+    })
+    saida.fechar()
+    
+    print(f"💾 Resultados salvos em: {saida.arquivo}")
     print()
     
     if acuracia >= 90:
@@ -10,7 +10,6 @@ Consulta a Maritaca para:
 """
 import json
 import sys
-import os
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import time
@@ -20,29 +19,15 @@ from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem import cliente_maritaca, motor_execucao, telemetria
+
 def configurar_api_maritaca():
-    """Configura conexão com API Maritaca"""
-    import openai
-    
-    api_key = (
-        os.environ.get("CURSORMINIMAC") or
-        os.environ.get("MARITALK_API_SECRET_KEY") or
-        os.environ.get("MARITACA_API_KEY")
-    )
-    
-    if not api_key:
+    """Configura conexão com API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v1'
+    except ValueError as e:
+        print(f"❌ {e}")
         return None, None
-    
-    openai.api_base = "https://chat.maritaca.ai/api"
-    openai_version = openai.__version__
-    major_version = int(openai_version.split('.')[0])
-    
-    if major_version >= 1:
-        client = openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
-        return client, 'v1'
-    else:
-        openai.api_key = api_key
-        return openai, 'v0'
 
 def consultar_maritaca(client, versao: str, pergunta: str, contexto: str = "", max_tokens: int = 4000) -> Optional[str]:
     """Consulta Maritaca Sabiá 3"""
@@ -55,22 +40,13 @@ def consultar_maritaca(client, versao: str, pergunta: str, contexto: str = "", m
 Forneça uma resposta detalhada, prática e específica, formatada de forma clara e estruturada."""
     
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt_completo}],
-                max_tokens=max_tokens,
-                temperature=0.3
-            )
-            return response.choices[0].message.content
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt_completo}],
-                max_tokens=max_tokens,
-                temperature=0.3
-            )
-            return response.choices[0].message.content
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt_completo}],
+            max_tokens=max_tokens,
+            temperature=0.3
+        )
+        return response.choices[0].message.content
     except Exception as e:
         print(f"⚠️  Erro ao consultar Maritaca: {e}")
         return None
@@ -219,22 +195,13 @@ ALTERNATIVAS:
     resposta_correta = questao.get('label', '').upper().strip()
     
     try:
-        if versao == 'v1':
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=200,
-                temperature=0.0
-            )
-            resposta_ia = response.choices[0].message.content.strip().upper()
-        else:
-            response = client.ChatCompletion.create(
-                model="sabia-3",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=200,
-                temperature=0.0
-            )
-            resposta_ia = response.choices[0].message.content.strip().upper()
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=200,
+            temperature=0.0
+        )
+        resposta_ia = response.choices[0].message.content.strip().upper()
         
         # Extrair letra
         import re
@@ -316,7 +283,8 @@ Forneça recomendações práticas e específicas, prontas para implementação.
     return None
 
 def treinar_iterativo(client, versao: str, questoes: List[Dict], 
-                     num_iteracoes: int = 3, questoes_por_iteracao: int = 50) -> Dict:
+                     num_iteracoes: int = 3, questoes_por_iteracao: int = 50,
+                     max_workers: int = 4) -> Dict:
     """Treinamento iterativo com feedback da Maritaca"""
     print("=" * 70)
     print("🔄 TREINAMENTO ITERATIVO COM MARITACA")
@@ -356,27 +324,45 @@ def treinar_iterativo(client, versao: str, questoes: List[Dict],
         print("=" * 70)
         print()
         
-        # Selecionar questões para esta iteração
-        questoes_iteracao = random.sample(questoes, min(questoes_por_iteracao, len(questoes)))
+        # Retomada: só vale se o checkpoint é do mesmo prompt
+        arquivo_progresso = project_root / "data" / "analises" / f"treinamento_iteracao_{iteracao}_PROGRESSO.json"
+        checkpoint = motor_execucao.carregar_checkpoint(arquivo_progresso)
+        retomar = bool(checkpoint) and checkpoint.get('prompt_template') == prompt_template
+        
+        # Selecionar questões para esta iteração (a mesma seleção, se retomando)
+        if retomar:
+            por_chave = {motor_execucao.chave_questao(q): q for q in questoes}
+            questoes_iteracao = [por_chave[k] for k in checkpoint['chaves'] if k in por_chave]
+        else:
+            questoes_iteracao = random.sample(questoes, min(questoes_por_iteracao, len(questoes)))
         
         print(f"📊 Avaliando {len(questoes_iteracao)} questões...")
         print()
         
-        resultados = []
         inicio = time.time()
+        concluidas = [0]
         
-        for i, questao in enumerate(questoes_iteracao, 1):
-            print(f"  [{i}/{len(questoes_iteracao)}] {questao.get('id', '')[:40]}...", end=' ', flush=True)
-            
-            resultado = avaliar_questao_com_prompt(client, versao, questao, prompt_template)
-            resultados.append(resultado)
-            
+        def ao_concluir(i, questao, resultado, retomado):
+            concluidas[0] += 1
+            if retomado:
+                return
+            prefixo = f"  [{concluidas[0]}/{len(questoes_iteracao)}] {questao.get('id', '')[:40]}"
             if resultado.get('acerto'):
-                print("✅")
+                print(f"{prefixo} ✅")
             else:
-                print(f"❌ (IA: {resultado.get('resposta_ia', 'N/A')}, Correta: {resultado.get('resposta_correta', 'N/A')})")
-            
-            time.sleep(0.3)  # Rate limiting
+                print(f"{prefixo} ❌ (IA: {resultado.get('resposta_ia', 'N/A')}, Correta: {resultado.get('resposta_correta', 'N/A')})")
+        
+        resultados = motor_execucao.executar_questoes(
+            questoes_iteracao,
+            lambda q: avaliar_questao_com_prompt(client, versao, q, prompt_template),
+            arquivo_progresso=arquivo_progresso,
+            max_workers=max_workers,
+            ao_concluir=ao_concluir,
+            resumo=lambda: {'iteracao': iteracao, 'prompt_template': prompt_template},
+            retomar=retomar,
+            telemetria=telemetria.Telemetria(telemetria.arquivo_execucao(f"treinamento_iteracao_{iteracao}"))
+        )
+        resultados = [r for r in resultados if r]
         
         tempo_total = time.time() - inicio
         acertos = sum(1 for r in resultados if r.get('acerto'))
@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 """
 Analisa resultados da avaliação oficial
+
+Aceita o JSON agregado do lm_eval ou um JSONL por questão
+(resultados_jsonl.py), lido em fluxo.
 """
 import json
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem.resultados_jsonl import ContagemPor, eh_jsonl, ler_registros
+
 def analisar_resultados(arquivo_resultados: Path):
     """Analisa resultados da avaliação oficial"""
     
@@ -18,20 +25,30 @@ def analisar_resultados(arquivo_resultados: Path):
         print(f"❌ Arquivo não encontrado: {arquivo_resultados}")
         return
     
-    with open(arquivo_resultados, 'r', encoding='utf-8') as f:
-        dados = json.load(f)
-    
-    # Extrair resultados
-    if 'results' in dados:
-        resultados = dados['results']
-    else:
-        resultados = dados
-    
     print("📈 Resultados por Área:")
     print()
     
     areas = {}
-    total_por_area = {}
+    
+    if eh_jsonl(arquivo_resultados):
+        # Resultados por questão: contagem em fluxo
+        por_area = ContagemPor()
+        for registro in ler_registros(arquivo_resultados):
+            por_area.adicionar(registro.area, registro.correto)
+        for area, contagem in por_area.items():
+            areas[area] = {'acertos': contagem.acertos, 'total': contagem.total}
+        print(f"   Acurácia Geral: {por_area.geral.acuracia:.2f}%")
+        print(f"   Total de questões: {por_area.geral.total}")
+        resultados = {}
+    else:
+        with open(arquivo_resultados, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        
+        # Extrair resultados
+        if 'results' in dados:
+            resultados = dados['results']
+        else:
+            resultados = dados
     
     # Processar resultados
     for task_name, task_data in resultados.items():
@@ -83,7 +100,7 @@ def main():
         # Procurar arquivo mais recente
         project_root = Path(__file__).parent.parent.parent
         results_dir = project_root / "results"
-        arquivos = sorted(results_dir.glob("avaliacao_oficial*.json"), key=lambda x: x.stat().st_mtime, reverse=True)
+        arquivos = sorted(results_dir.glob("avaliacao_oficial*.json*"), key=lambda x: x.stat().st_mtime, reverse=True)
         if arquivos:
             arquivo = arquivos[0]
             print(f"📁 Usando arquivo mais recente: {arquivo}")
@@ -18,14 +18,16 @@ Uso:
     python 40_avaliar_com_logging_detalhado.py --area matematica --limit 10  # teste rápido
 """
 
-import os
 import sys
-import json
-import time
 import argparse
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem import cliente_maritaca
+from scripts.analise_enem.resultados_jsonl import EscritorResultados
+
 # Tentar importar dependências
 try:
     from datasets import load_dataset
@@ -34,13 +36,6 @@ except ImportError:
     print("   Execute: pip install datasets")
     sys.exit(1)
 
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    print("   Execute: pip install openai")
-    sys.exit(1)
-
 
 # =============================================================================
 # CONFIGURAÇÕES
@@ -125,27 +120,12 @@ FEW_SHOT_EXAMPLES = [
 # =============================================================================
 
 def setup_api():
-    """Configura a API da Maritaca."""
-    api_key = os.environ.get('CURSORMINIMAC') or os.environ.get('MARITALK_API_SECRET_KEY')
-    
-    if not api_key:
-        print("❌ Erro: Chave API não encontrada")
-        print("   Configure CURSORMINIMAC ou MARITALK_API_SECRET_KEY")
+    """Configura a API da Maritaca (cliente compartilhado em cliente_maritaca.py)."""
+    try:
+        return cliente_maritaca.configurar_api(), "new"
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
         sys.exit(1)
-    
-    # Detectar versão do openai
-    openai_version = int(openai.__version__.split('.')[0])
-    
-    if openai_version >= 1:
-        client = openai.OpenAI(
-            api_key=api_key,
-            base_url="https://chat.maritaca.ai/api"
-        )
-        return client, "new"
-    else:
-        openai.api_key = api_key
-        openai.api_base = "https://chat.maritaca.ai/api"
-        return None, "old"
 
 
 def extract_answer(response_text):
@@ -174,35 +154,19 @@ def extract_answer(response_text):
     return None
 
 
-def call_model(client, api_type, messages, max_retries=3):
-    """Chama o modelo com retry."""
-    for attempt in range(max_retries):
-        try:
-            if api_type == "new":
-                response = client.chat.completions.create(
-                    model="sabia-3",
-                    messages=messages,
-                    max_tokens=1500,
-                    temperature=0.1  # Baixa temperatura para consistência
-                )
-                return response.choices[0].message.content
-            else:
-                response = openai.ChatCompletion.create(
-                    model="sabia-3",
-                    messages=messages,
-                    max_tokens=1500,
-                    temperature=0.1
-                )
-                return response.choices[0].message.content
-                
-        except Exception as e:
-            print(f"   ⚠️  Tentativa {attempt + 1} falhou: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-            else:
-                return None
-    
-    return None
+def call_model(client, api_type, messages):
+    """Chama o modelo (retentativas com backoff e jitter ficam no cliente)."""
+    try:
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=messages,
+            max_tokens=1500,
+            temperature=0.1  # Baixa temperatura para consistência
+        )
+        return response.choices[0].message.content
+    except cliente_maritaca.ErroAPI as e:
+        print(f"   ⚠️  Chamada falhou após {e.tentativas} tentativa(s): {e}")
+        return None
 
 
 def build_messages(question_data, use_captions=True):
@@ -316,8 +280,21 @@ def evaluate_with_logging(area="matematica", limit=None, output_dir="results"):
     print("-" * 70)
     print()
     
-    # Resultados
-    results = []
+    # Resultados: uma linha por questão em JSONL, gravada assim que a questão termina
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = f"{output_dir}/avaliacao_detalhada_{timestamp}.jsonl"
+    config = {
+        'area': area,
+        'limit': limit,
+        'timestamp': timestamp,
+        'model': 'sabia-3',
+        'num_fewshot': 3,
+        'use_captions': True
+    }
+    escritor = EscritorResultados(output_file, "40_avaliar_com_logging_detalhado", config)
+    
+    erros = []
     correct = 0
     total = 0
     
@@ -389,10 +366,9 @@ def evaluate_with_logging(area="matematica", limit=None, output_dir="results"):
             'tem_figura': len(q.get('figures', [])) > 0,
             'tem_descricao': len(q.get('description', [])) > 0
         }
-        results.append(result)
-        
-        # Pequena pausa para não sobrecarregar a API
-        time.sleep(0.5)
+        escritor.escrever(result)
+        if not is_correct:
+            erros.append(result)
     
     # Calcular métricas finais
     accuracy = correct / total if total > 0 else 0
@@ -423,7 +399,6 @@ def evaluate_with_logging(area="matematica", limit=None, output_dir="results"):
             print(f"   {tema:25} | {acc:6.1%} ({stats['correct']}/{stats['total']})")
     
     # Listar erros
-    erros = [r for r in results if not r['correto']]
     print()
     print(f"❌ QUESTÕES ERRADAS ({len(erros)}):")
     print("-" * 70)
@@ -432,21 +407,9 @@ def evaluate_with_logging(area="matematica", limit=None, output_dir="results"):
         print(f"      Gabarito: {erro['gabarito']} | Modelo: {erro['resposta_modelo']}")
         print()
     
-    # Salvar resultados
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = f"{output_dir}/avaliacao_detalhada_{timestamp}.json"
-    
+    # Resumo final (as questões já estão no JSONL)
     output_data = {
-        'config': {
-            'area': area,
-            'limit': limit,
-            'timestamp': timestamp,
-            'model': 'sabia-3',
-            'num_fewshot': 3,
-            'use_captions': True
-        },
+        'config': config,
         'metricas': {
             'accuracy': accuracy,
             'correct': correct,
@@ -455,13 +418,11 @@ def evaluate_with_logging(area="matematica", limit=None, output_dir="results"):
                         for k, v in stats_by_nivel.items()},
             'por_tema': {k: {'accuracy': v['correct']/v['total'] if v['total'] > 0 else 0, **v} 
                         for k, v in stats_by_tema.items()}
-        },
-        'resultados': results,
-        'erros': erros
+        }
     }
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    escritor.resumo(output_data)
+    escritor.fechar()
+    output_data['erros'] = erros
     
     print()
     print(f"✅ Resultados salvos em: {output_file}")
@@ -6,24 +6,29 @@ Gera visualização da evolução da acurácia de 24% para 82%
 """
 import sys
 from pathlib import Path
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def gerar_grafico_evolucao():
-    """Gera gráfico de evolução da acurácia do projeto"""
-    
-    # Dados da evolução
-    etapas = [
-        "Scripts\nCustomizados",
-        "Sistema\nOficial (v1)",
-        "Sistema\nOficial (v2)",
-        "Meta\n90%"
-    ]
+from scripts.analise_enem.graficos import Grafico, gerar
+
+def dados_evolucao():
+    """Dados da evolução (etapas e acurácias registradas no projeto)"""
+    return {
+        'etapas': [
+            "Scripts\nCustomizados",
+            "Sistema\nOficial (v1)",
+            "Sistema\nOficial (v2)",
+            "Meta\n90%"
+        ],
+        'acuracias': [24, 71.11, 82.22, 90],
+    }
+
+def desenhar_grafico_evolucao(dados, arquivo):
+    """Desenha a evolução da acurácia do projeto (roda no worker de graficos.py)"""
+    import matplotlib.pyplot as plt
     
-    acuracias = [24, 71.11, 82.22, 90]
+    etapas = dados['etapas']
+    acuracias = dados['acuracias']
     cores = ['#e74c3c', '#f39c12', '#27ae60', '#3498db']
     
     # Criar figura
@@ -78,17 +83,13 @@ def gerar_grafico_evolucao():
     # Ajustar layout
     plt.tight_layout()
     
-    # Salvar
-    project_root = Path(__file__).parent.parent.parent
-    output_dir = project_root / "reports" / "visualizacoes"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    arquivo = output_dir / "evolucao_acuracia_projeto.png"
     plt.savefig(arquivo, dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    print(f"✅ Gráfico salvo em: {arquivo}")
-    return arquivo
+
+def grafico():
+    """Registro do gráfico na camada incremental"""
+    return Grafico('evolucao_acuracia_projeto.png', dados_evolucao, desenhar_grafico_evolucao,
+                   parametros=dados_evolucao(), titulo='Evolução da Acurácia do Projeto',
+                   descricao='Acurácia em Matemática 2024: scripts customizados, sistema oficial e meta.')
 
 def main():
     """Função principal"""
@@ -98,7 +99,10 @@ def main():
     print()
     
     print("🎨 Gerando gráfico...")
-    arquivo = gerar_grafico_evolucao()
+    resultado = gerar([grafico()], forcar='--forcar' in sys.argv)['evolucao_acuracia_projeto']
+    if resultado['estado'] not in ('desenhado', 'pulado'):
+        return
+    arquivo = resultado['arquivo']
     
     print()
     print("=" * 70)
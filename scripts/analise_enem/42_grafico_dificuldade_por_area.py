@@ -7,27 +7,23 @@ Gera visualização cronológica da dificuldade média por área de conhecimento
 import json
 import sys
 from pathlib import Path
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')
 import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem.graficos import Grafico, gerar
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+ARQUIVO_COMPLETO = PROJECT_ROOT / "data" / "analises" / "dificuldade_completo.json"
+
 def carregar_dificuldade_por_area():
-    """Carrega dados de dificuldade agrupados por área e ano"""
-    project_root = Path(__file__).parent.parent.parent
-    
-    # Carregar dados completos
-    arquivo_completo = project_root / "data" / "analises" / "dificuldade_completo.json"
-    
-    if not arquivo_completo.exists():
+    """Carrega dados de dificuldade agrupados por área e ano ({'ano': [...], área: [...]})"""
+    if not ARQUIVO_COMPLETO.exists():
         print("❌ Arquivo de dificuldade completo não encontrado")
         print("   Execute primeiro: 08_heuristica_dificuldade.py")
         return None
     
-    with open(arquivo_completo, 'r', encoding='utf-8') as f:
+    with open(ARQUIVO_COMPLETO, 'r', encoding='utf-8') as f:
         dados = json.load(f)
     
     # Estrutura: {ano: {questoes: [...], estatisticas: {...}}}
@@ -63,26 +59,35 @@ def carregar_dificuldade_por_area():
                 area_nome = areas_map[area]
                 if area_nome not in dificuldade_por_area_ano:
                     dificuldade_por_area_ano[area_nome] = {}
-                dificuldade_por_area_ano[area_nome][ano] = np.mean(scores)
+                dificuldade_por_area_ano[area_nome][ano] = float(np.mean(scores))
     
     # 2025 já deve estar incluído nos dados acima se foi processado corretamente
     # Não precisamos recalcular com metodologia simplificada
     
-    # Converter para DataFrame
+    # Converter para colunas (NaN vira None no JSON do cache)
     todas_areas = sorted(dificuldade_por_area_ano.keys())
     todos_anos = sorted(set(ano for area_data in dificuldade_por_area_ano.values() 
                             for ano in area_data.keys()))
     
-    df_data = {'ano': todos_anos}
+    colunas = {'ano': todos_anos}
     for area in todas_areas:
-        df_data[area] = [dificuldade_por_area_ano[area].get(ano, np.nan) 
+        colunas[area] = [dificuldade_por_area_ano[area].get(ano) 
                         for ano in todos_anos]
     
-    df = pd.DataFrame(df_data)
-    return df
+    return colunas
 
-def gerar_grafico(df):
-    """Gera gráfico de evolução da dificuldade por área"""
+def _serie(dados, area):
+    """(anos, valores) da área sem os anos faltantes"""
+    anos = np.array(dados['ano'])
+    valores = np.array(dados[area], dtype=float)
+    validos = ~np.isnan(valores)
+    return anos[validos], valores[validos]
+
+def desenhar_grafico(dados, arquivo):
+    """Desenha a evolução da dificuldade por área (roda no worker de graficos.py)"""
+    import matplotlib.pyplot as plt
+    
+    anos = np.array(dados['ano'])
     
     # Cores para cada área
     cores = {
@@ -96,19 +101,19 @@ def gerar_grafico(df):
     fig, ax = plt.subplots(figsize=(16, 10))
     
     # Plotar linha para cada área
-    for area in df.columns[1:]:  # Pular coluna 'ano'
+    for area in list(dados)[1:]:  # Pular coluna 'ano'
         if area in cores:
-            dados_area = df[['ano', area]].dropna()
-            ax.plot(dados_area['ano'], dados_area[area],
+            anos_area, valores = _serie(dados, area)
+            ax.plot(anos_area, valores,
                    marker='o', linewidth=2.5, markersize=8,
                    label=area, color=cores[area], alpha=0.8)
             
             # Preencher área sob a linha
-            ax.fill_between(dados_area['ano'], dados_area[area],
+            ax.fill_between(anos_area, valores,
                            alpha=0.2, color=cores[area])
     
     # Destacar 2025 se disponível
-    if 2025 in df['ano'].values:
+    if 2025 in anos:
         ax.axvline(x=2025, color='red', linestyle='--', linewidth=2,
                   alpha=0.5, label='2025 (Novo)', zorder=0)
     
@@ -119,7 +124,7 @@ def gerar_grafico(df):
                  fontsize=16, fontweight='bold', pad=20)
     
     # Ajustar eixos
-    ax.set_xlim(df['ano'].min() - 0.5, df['ano'].max() + 0.5)
+    ax.set_xlim(anos.min() - 0.5, anos.max() + 0.5)
     
     # Grid
     ax.grid(True, alpha=0.3, linestyle='--', axis='y')
@@ -134,17 +139,13 @@ def gerar_grafico(df):
     # Ajustar layout
     plt.tight_layout()
     
-    # Salvar
-    project_root = Path(__file__).parent.parent.parent
-    output_dir = project_root / "reports" / "visualizacoes"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    arquivo = output_dir / "dificuldade_por_area_2009_2025.png"
     plt.savefig(arquivo, dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    print(f"✅ Gráfico salvo em: {arquivo}")
-    return arquivo
+
+def grafico():
+    """Registro do gráfico na camada incremental"""
+    return Grafico('dificuldade_por_area_2009_2025.png', carregar_dificuldade_por_area, desenhar_grafico,
+                   entradas=[ARQUIVO_COMPLETO], titulo='Dificuldade por Área (2009-2025)',
+                   descricao='Dificuldade média de cada área de conhecimento ao longo dos anos.')
 
 def main():
     """Função principal"""
@@ -153,35 +154,32 @@ def main():
     print("=" * 70)
     print()
     
-    # Carregar dados
+    # Carregar dados (do cache quando as entradas não mudaram)
     print("📥 Carregando dados de dificuldade por área...")
-    df = carregar_dificuldade_por_area()
+    print("🎨 Gerando gráfico...")
+    resultado = gerar([grafico()], forcar='--forcar' in sys.argv)['dificuldade_por_area_2009_2025']
+    dados = resultado['dados']
     
-    if df is None:
+    if dados is None:
         return
     
-    print(f"✅ Dados carregados: {len(df)} anos, {len(df.columns)-1} áreas")
+    print(f"✅ Dados carregados: {len(dados['ano'])} anos, {len(dados)-1} áreas")
     print()
     
     # Estatísticas
     print("📊 Estatísticas por Área:")
-    for area in df.columns[1:]:  # Pular coluna 'ano'
-        dados_area = df[area].dropna()
+    for area in list(dados)[1:]:  # Pular coluna 'ano'
+        _, dados_area = _serie(dados, area)
         if len(dados_area) > 0:
             print(f"   {area:15} | Média: {dados_area.mean():6.2f} | "
                   f"Min: {dados_area.min():6.2f} | Max: {dados_area.max():6.2f}")
     print()
     
-    # Gerar gráfico
-    print("🎨 Gerando gráfico...")
-    arquivo = gerar_grafico(df)
-    
-    print()
-    print("=" * 70)
-    print("✅ GRÁFICO GERADO COM SUCESSO")
-    print("=" * 70)
-    print(f"📁 Arquivo: {arquivo}")
+    if resultado['estado'] in ('desenhado', 'pulado'):
+        print("=" * 70)
+        print("✅ GRÁFICO GERADO COM SUCESSO")
+        print("=" * 70)
+        print(f"📁 Arquivo: {resultado['arquivo']}")
 
 if __name__ == "__main__":
     main()
-
@@ -10,45 +10,143 @@ Este script analisa os resultados da avaliação e responde:
 3. Existe correlação entre dificuldade e erro?
 
 Uso:
-    python 45_analisar_correlacao_tri_habilidade.py [arquivo_json]
+    python 45_analisar_correlacao_tri_habilidade.py [arquivo_json|arquivo_jsonl]
+
+Os resultados são carregados uma vez em colunas numpy (as do
+armazem_resultados.py) e as análises usam estatisticas.py: contagens por
+faixa/habilidade/tema/figura com bincount, correlações de Pearson, Spearman
+e ponto-bisserial, IC bootstrap e ajuste logístico de P(acerto | TRI).
 """
 
 import json
 import sys
 from pathlib import Path
-from collections import defaultdict
-import statistics
 
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem import estatisticas
+from scripts.analise_enem.armazem_resultados import colunas_da_execucao
+from scripts.analise_enem.resultados_jsonl import Contagem, eh_jsonl, ler_resumo
+
+# Faixas de TRI
+FAIXAS = {
+    "< 500": (0, 500),
+    "500-550": (500, 550),
+    "550-600": (550, 600),
+    "600-650": (600, 650),
+    "650-700": (650, 700),
+    "700-750": (700, 750),
+    "> 750": (750, 10000)
+}
+LIMITES_FAIXAS = np.array([limites[0] for limites in FAIXAS.values()] + [10000])
+
+
+def _contagem(acertos, total):
+    contagem = Contagem()
+    contagem.acertos = int(acertos)
+    contagem.total = int(total)
+    return contagem
 
-def load_results(filepath):
-    """Carrega os resultados do arquivo JSON."""
+
+class Agregados:
+    """Estatísticas das análises, calculadas de uma vez sobre as colunas numpy."""
+    
+    def __init__(self, colunas):
+        self.correto = colunas['correto'].astype(bool)
+        self.tri = colunas['tri'].astype(float)
+        self.tri_valido = np.isfinite(self.tri) & (self.tri != 0)
+        tema = np.where(colunas['tema'] == '', 'Desconhecido', colunas['tema'])
+        tem_figura = colunas['tipo_figura'] != ''
+        correto, tri, valido = self.correto, self.tri, self.tri_valido
+        tri_ou_zero = np.where(valido, tri, 0.0)
+        
+        self.geral = _contagem(correto.sum(), len(correto))
+        
+        # Faixas de TRI
+        faixa = np.digitize(tri[valido], LIMITES_FAIXAS) - 1
+        nomes = list(FAIXAS)
+        dentro = (faixa >= 0) & (faixa < len(nomes))
+        self.faixas = {
+            nomes[linha['faixa']]: _contagem(linha['acertos'], linha['total'])
+            for linha in estatisticas.acuracia_por(correto[valido][dentro], {'faixa': faixa[dentro]})
+        }
+        
+        # Correlações TRI vs acerto (só questões com TRI)
+        x, y = tri[valido], correto[valido].astype(float)
+        self.pearson = estatisticas.pearson(x, y)
+        self.spearman = estatisticas.spearman(x, y)
+        self.ponto_bisserial = estatisticas.ponto_bisserial(y, x)
+        self.ic_pearson = estatisticas.bootstrap_ic(estatisticas.pearson_linhas, x, y)
+        self.logistica = estatisticas.ajustar_logistica(x, y) if len(x) >= 2 else None
+        
+        # Habilidades (TRI médio sobre todas as questões da habilidade, como antes)
+        hab = colunas['habilidade']
+        com_hab = hab != ''
+        distintos, codigo, _ = estatisticas.agrupar({'hab': hab[com_hab]})
+        tri_sum = np.bincount(codigo, weights=tri_ou_zero[com_hab], minlength=len(distintos[0]))
+        self.hab_stats = {}
+        # uma coluna: uma linha por grupo, na ordem dos códigos de agrupar()
+        for indice, linha in enumerate(estatisticas.acuracia_por(correto[com_hab], {'hab': hab[com_hab]})):
+            self.hab_stats[linha['hab']] = {'correct': linha['acertos'], 'total': linha['total'],
+                                            'tri_sum': float(tri_sum[indice])}
+        
+        # Temas: acurácia e TRI dos erros
+        distintos, codigo, _ = estatisticas.agrupar({'tema': tema})
+        n_temas = len(distintos[0])
+        erro_tri = ~correto & valido
+        
+        def por_tema(pesos):
+            return np.bincount(codigo, weights=pesos, minlength=n_temas)
+        
+        soma_tri_erros = por_tema(np.where(erro_tri, tri, 0.0))
+        n_tri_erros = por_tema(erro_tri)
+        erros_facil = por_tema(erro_tri & (tri_ou_zero < 650))
+        erros_dificil = por_tema(erro_tri & (tri_ou_zero >= 650))
+        self.tema_stats = {}
+        for indice, linha in enumerate(estatisticas.acuracia_por(correto, {'tema': tema})):
+            self.tema_stats[linha['tema']] = {
+                'correct': linha['acertos'], 'total': linha['total'],
+                'tri_erros_sum': float(soma_tri_erros[indice]), 'tri_erros_n': int(n_tri_erros[indice]),
+                'erros_facil': int(erros_facil[indice]), 'erros_dificil': int(erros_dificil[indice])
+            }
+        
+        # Figuras (geral e por tema)
+        self.figura = {'com_fig': Contagem(), 'sem_fig': Contagem()}
+        self.tema_figura = {}
+        for linha in estatisticas.acuracia_por(correto, {'tema': tema, 'fig': tem_figura}):
+            chave = 'com_fig' if linha['fig'] else 'sem_fig'
+            self.tema_figura.setdefault(linha['tema'], {'com_fig': Contagem(), 'sem_fig': Contagem()})
+            self.tema_figura[linha['tema']][chave] = _contagem(linha['acertos'], linha['total'])
+            self.figura[chave].acertos += linha['acertos']
+            self.figura[chave].total += linha['total']
+        
+        # Erros por nível de dificuldade
+        self.erros_por_tri = {
+            'fácil': int((erro_tri & (tri_ou_zero < 600)).sum()),
+            'médio': int((erro_tri & (tri_ou_zero >= 600) & (tri_ou_zero < 700)).sum()),
+            'difícil': int((erro_tri & (tri_ou_zero >= 700)).sum()),
+        }
+        self.metricas = {}
+
+
+def carregar_metricas(filepath):
+    """Métricas gravadas pelo avaliador (resumo do JSONL ou chave 'metricas' do JSON antigo)."""
+    if eh_jsonl(filepath):
+        return (ler_resumo(filepath) or {}).get('metricas', {})
     with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        return json.load(f).get('metricas', {})
 
 
-def calculate_correlation(x_values, y_values):
-    """Calcula correlação de Pearson entre duas listas."""
-    n = len(x_values)
-    if n < 2:
-        return 0
-    
-    mean_x = sum(x_values) / n
-    mean_y = sum(y_values) / n
-    
-    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(x_values, y_values))
-    
-    sum_sq_x = sum((x - mean_x) ** 2 for x in x_values)
-    sum_sq_y = sum((y - mean_y) ** 2 for y in y_values)
-    
-    denominator = (sum_sq_x * sum_sq_y) ** 0.5
-    
-    if denominator == 0:
-        return 0
-    
-    return numerator / denominator
+def aggregate_results(filepath):
+    """Carrega os resultados em arrays uma vez e calcula todas as estatísticas."""
+    agg = Agregados(colunas_da_execucao(filepath))
+    agg.metricas = carregar_metricas(filepath)
+    return agg
 
 
-def analyze_tri_correlation(data):
+def analyze_tri_correlation(agg):
     """Analisa correlação entre TRI e taxa de acerto."""
     
     print("=" * 70)
@@ -56,35 +154,18 @@ def analyze_tri_correlation(data):
     print("=" * 70)
     print()
     
-    resultados = data['resultados']
-    
-    # Filtrar questões com TRI válido
-    valid_results = [r for r in resultados if r['tri'] != 'N/A' and r['tri'] != 0]
-    
-    # Agrupar por faixas de TRI
-    faixas = {
-        "< 500": (0, 500),
-        "500-550": (500, 550),
-        "550-600": (550, 600),
-        "600-650": (600, 650),
-        "650-700": (650, 700),
-        "700-750": (700, 750),
-        "> 750": (750, 10000)
-    }
-    
     print("📈 Taxa de Acerto por Faixa de TRI:")
     print("-" * 60)
     print(f"{'Faixa TRI':<15} | {'Acurácia':>10} | {'Acertos':>12} | {'Tendência'}")
     print("-" * 60)
     
     faixa_data = []
-    for faixa_nome, (tri_min, tri_max) in faixas.items():
-        questoes = [r for r in valid_results 
-                   if tri_min <= float(r['tri']) < tri_max]
+    for faixa_nome in FAIXAS:
+        contagem = agg.faixas.get(faixa_nome)
         
-        if questoes:
-            acertos = sum(1 for q in questoes if q['correto'])
-            total = len(questoes)
+        if contagem:
+            acertos = contagem.acertos
+            total = contagem.total
             acc = acertos / total
             
             # Determinar tendência
@@ -104,17 +185,17 @@ def analyze_tri_correlation(data):
     
     print()
     
-    # Calcular correlação TRI vs Acerto
-    tri_values = []
-    acerto_values = []
-    
-    for r in valid_results:
-        tri_values.append(float(r['tri']))
-        acerto_values.append(1 if r['correto'] else 0)
-    
-    correlation = calculate_correlation(tri_values, acerto_values)
+    # Correlação TRI vs Acerto
+    correlation = agg.pearson
     
     print(f"📊 Correlação TRI vs Acerto: {correlation:.3f}")
+    print(f"   IC 95% (bootstrap): [{agg.ic_pearson[0]:.3f}, {agg.ic_pearson[1]:.3f}]")
+    print(f"   Spearman: {agg.spearman:.3f} | Ponto-bisserial: {agg.ponto_bisserial:.3f}")
+    if agg.logistica is not None:
+        print(f"   P(acerto | TRI): logit = {agg.logistica.intercepto[0]:.3f} "
+              f"{agg.logistica.inclinacao[0]:+.5f}·TRI")
+        for tri in (500, 600, 700, 800):
+            print(f"      TRI {tri}: {agg.logistica.prob(tri):.1%}")
     print()
     
     if correlation < -0.3:
@@ -131,7 +212,7 @@ def analyze_tri_correlation(data):
     return correlation
 
 
-def analyze_habilidade_correlation(data):
+def analyze_habilidade_correlation(agg):
     """Analisa quais habilidades são mais difíceis para o modelo."""
     
     print("=" * 70)
@@ -139,19 +220,7 @@ def analyze_habilidade_correlation(data):
     print("=" * 70)
     print()
     
-    resultados = data['resultados']
-    
-    # Agrupar por habilidade
-    hab_stats = defaultdict(lambda: {'correct': 0, 'total': 0, 'tri_sum': 0})
-    
-    for r in resultados:
-        hab = r['habilidade']
-        if hab and hab != 'N/A':
-            hab_stats[hab]['total'] += 1
-            if r['correto']:
-                hab_stats[hab]['correct'] += 1
-            if r['tri'] != 'N/A' and r['tri'] != 0:
-                hab_stats[hab]['tri_sum'] += float(r['tri'])
+    hab_stats = agg.hab_stats
     
     # Calcular acurácia e ordenar
     hab_list = []
@@ -203,7 +272,7 @@ def analyze_habilidade_correlation(data):
     return hab_list
 
 
-def analyze_tema_comparison(data):
+def analyze_tema_comparison(agg):
     """Compara desempenho entre temas."""
     
     print("=" * 70)
@@ -211,32 +280,7 @@ def analyze_tema_comparison(data):
     print("=" * 70)
     print()
     
-    resultados = data['resultados']
-    
-    # Agrupar por tema
-    tema_stats = defaultdict(lambda: {
-        'correct': 0, 'total': 0, 
-        'tri_acertos': [], 'tri_erros': [],
-        'erros_facil': 0, 'erros_dificil': 0
-    })
-    
-    for r in resultados:
-        tema = r.get('tema', 'Desconhecido')
-        tema_stats[tema]['total'] += 1
-        
-        tri = float(r['tri']) if r['tri'] != 'N/A' and r['tri'] != 0 else None
-        
-        if r['correto']:
-            tema_stats[tema]['correct'] += 1
-            if tri:
-                tema_stats[tema]['tri_acertos'].append(tri)
-        else:
-            if tri:
-                tema_stats[tema]['tri_erros'].append(tri)
-                if tri < 650:
-                    tema_stats[tema]['erros_facil'] += 1
-                else:
-                    tema_stats[tema]['erros_dificil'] += 1
+    tema_stats = agg.tema_stats
     
     print(f"{'Tema':<30} | {'Acurácia':>10} | {'TRI Médio Erros':>15} | {'Erros Fácil':>12} | {'Erros Difícil':>13}")
     print("-" * 90)
@@ -247,7 +291,7 @@ def analyze_tema_comparison(data):
     for tema, stats in temas_ordenados:
         if stats['total'] > 0:
             acc = stats['correct'] / stats['total']
-            tri_erros = statistics.mean(stats['tri_erros']) if stats['tri_erros'] else 0
+            tri_erros = stats['tri_erros_sum'] / stats['tri_erros_n'] if stats['tri_erros_n'] else 0
             
             print(f"{tema:<30} | {acc:>9.1%} | {tri_erros:>15.1f} | {stats['erros_facil']:>12} | {stats['erros_dificil']:>13}")
     
@@ -255,7 +299,7 @@ def analyze_tema_comparison(data):
     return tema_stats
 
 
-def analyze_figura_impact(data):
+def analyze_figura_impact(agg):
     """Analisa impacto da presença de figuras."""
     
     print("=" * 70)
@@ -263,32 +307,17 @@ def analyze_figura_impact(data):
     print("=" * 70)
     print()
     
-    resultados = data['resultados']
-    
     # Geral
-    geral = {
-        'com_fig': {'correct': 0, 'total': 0},
-        'sem_fig': {'correct': 0, 'total': 0}
-    }
-    
-    for r in resultados:
-        if r.get('tem_figura', False):
-            geral['com_fig']['total'] += 1
-            if r['correto']:
-                geral['com_fig']['correct'] += 1
-        else:
-            geral['sem_fig']['total'] += 1
-            if r['correto']:
-                geral['sem_fig']['correct'] += 1
+    geral = agg.figura
     
     print(f"{'Categoria':<20} | {'Acurácia':>10} | {'Acertos':>12} | {'Total':>8}")
     print("-" * 55)
     
-    acc_com = geral['com_fig']['correct'] / geral['com_fig']['total'] if geral['com_fig']['total'] > 0 else 0
-    acc_sem = geral['sem_fig']['correct'] / geral['sem_fig']['total'] if geral['sem_fig']['total'] > 0 else 0
+    acc_com = geral['com_fig'].acertos / geral['com_fig'].total if geral['com_fig'].total > 0 else 0
+    acc_sem = geral['sem_fig'].acertos / geral['sem_fig'].total if geral['sem_fig'].total > 0 else 0
     
-    print(f"{'Com Figura':<20} | {acc_com:>9.1%} | {geral['com_fig']['correct']:>4}/{geral['com_fig']['total']:<6} | {geral['com_fig']['total']:>8}")
-    print(f"{'Sem Figura':<20} | {acc_sem:>9.1%} | {geral['sem_fig']['correct']:>4}/{geral['sem_fig']['total']:<6} | {geral['sem_fig']['total']:>8}")
+    print(f"{'Com Figura':<20} | {acc_com:>9.1%} | {geral['com_fig'].acertos:>4}/{geral['com_fig'].total:<6} | {geral['com_fig'].total:>8}")
+    print(f"{'Sem Figura':<20} | {acc_sem:>9.1%} | {geral['sem_fig'].acertos:>4}/{geral['sem_fig'].total:<6} | {geral['sem_fig'].total:>8}")
     
     diff = acc_sem - acc_com
     diff_str = f"{diff:+.1%}" if diff != 0 else "0%"
@@ -297,25 +326,11 @@ def analyze_figura_impact(data):
     print()
     
     # Por tema (se houver dados suficientes)
-    tema_figura = defaultdict(lambda: {
-        'com_fig': {'correct': 0, 'total': 0},
-        'sem_fig': {'correct': 0, 'total': 0}
-    })
-    
-    for r in resultados:
-        tema = r.get('tema', 'Desconhecido')
-        if r.get('tem_figura', False):
-            tema_figura[tema]['com_fig']['total'] += 1
-            if r['correto']:
-                tema_figura[tema]['com_fig']['correct'] += 1
-        else:
-            tema_figura[tema]['sem_fig']['total'] += 1
-            if r['correto']:
-                tema_figura[tema]['sem_fig']['correct'] += 1
+    tema_figura = agg.tema_figura
     
     # Mostrar apenas temas com dados suficientes
     temas_com_dados = [(t, s) for t, s in tema_figura.items() 
-                       if s['com_fig']['total'] > 0 or s['sem_fig']['total'] > 0]
+                       if s['com_fig'].total > 0 or s['sem_fig'].total > 0]
     
     if temas_com_dados:
         print("📊 Por Tema:")
@@ -323,20 +338,20 @@ def analyze_figura_impact(data):
         print(f"{'Tema':<30} | {'Com Figura':>12} | {'Sem Figura':>12} | {'Diferença':>12}")
         print("-" * 70)
         
-        for tema, stats in sorted(temas_com_dados, key=lambda x: -(x[1]['com_fig']['total'] + x[1]['sem_fig']['total']))[:10]:
-            acc_com = stats['com_fig']['correct'] / stats['com_fig']['total'] if stats['com_fig']['total'] > 0 else 0
-            acc_sem = stats['sem_fig']['correct'] / stats['sem_fig']['total'] if stats['sem_fig']['total'] > 0 else 0
+        for tema, stats in sorted(temas_com_dados, key=lambda x: -(x[1]['com_fig'].total + x[1]['sem_fig'].total))[:10]:
+            acc_com = stats['com_fig'].acertos / stats['com_fig'].total if stats['com_fig'].total > 0 else 0
+            acc_sem = stats['sem_fig'].acertos / stats['sem_fig'].total if stats['sem_fig'].total > 0 else 0
             diff = acc_sem - acc_com
             diff_str = f"{diff:+.1%}" if diff != 0 else "0%"
             
-            if stats['com_fig']['total'] > 0 or stats['sem_fig']['total'] > 0:
+            if stats['com_fig'].total > 0 or stats['sem_fig'].total > 0:
                 print(f"{tema[:28]:<30} | {acc_com:>11.1%} | {acc_sem:>11.1%} | {diff_str:>12}")
     
     print()
     return geral
 
 
-def generate_conclusions(data, correlation):
+def generate_conclusions(agg, correlation):
     """Gera conclusões e recomendações."""
     
     print("=" * 70)
@@ -344,21 +359,6 @@ def generate_conclusions(data, correlation):
     print("=" * 70)
     print()
     
-    resultados = data['resultados']
-    erros = [r for r in resultados if not r['correto']]
-    
-    # Análise dos erros
-    erros_por_tri = defaultdict(list)
-    for e in erros:
-        if e['tri'] != 'N/A' and e['tri'] != 0:
-            tri = float(e['tri'])
-            if tri < 600:
-                erros_por_tri['fácil'].append(e)
-            elif tri < 700:
-                erros_por_tri['médio'].append(e)
-            else:
-                erros_por_tri['difícil'].append(e)
-    
     print("📌 DESCOBERTAS PRINCIPAIS:")
     print()
     
@@ -371,8 +371,8 @@ def generate_conclusions(data, correlation):
     print()
     
     # 2. Erros inesperados
-    total_erros = len(erros)
-    erros_faceis = len(erros_por_tri['fácil'])
+    total_erros = agg.geral.erros
+    erros_faceis = agg.erros_por_tri['fácil']
     pct_erros_faceis = erros_faceis / total_erros if total_erros > 0 else 0
     
     print(f"2️⃣ ERROS EM QUESTÕES FÁCEIS:")
@@ -385,7 +385,7 @@ def generate_conclusions(data, correlation):
     
     # 3. Temas problemáticos
     print("3️⃣ TEMAS QUE PRECISAM ATENÇÃO:")
-    metricas = data.get('metricas', {})
+    metricas = agg.metricas
     por_tema = metricas.get('por_tema', {})
     
     temas_problematicos = []
@@ -426,7 +426,7 @@ def main():
         filepath = Path(sys.argv[1])
     else:
         results_dir = Path('results')
-        json_files = list(results_dir.glob('avaliacao_detalhada_*.json'))
+        json_files = list(results_dir.glob('avaliacao_detalhada_*.json*'))
         
         if not json_files:
             print("❌ Nenhum arquivo de resultados encontrado")
@@ -436,8 +436,9 @@ def main():
         filepath = max(json_files, key=lambda x: x.stat().st_mtime)
         print(f"📂 Usando arquivo mais recente: {filepath}")
     
-    # Carregar dados
-    data = load_results(filepath)
+    # Ler resultados (uma passada)
+    agg = aggregate_results(filepath)
+    acuracia = agg.metricas.get('accuracy', agg.geral.acuracia / 100)
     
     print()
     print("=" * 70)
@@ -445,16 +446,16 @@ def main():
     print("=" * 70)
     print()
     print(f"📁 Arquivo: {filepath}")
-    print(f"📊 Total de questões: {len(data['resultados'])}")
-    print(f"📈 Acurácia geral: {data['metricas']['accuracy']:.1%}")
+    print(f"📊 Total de questões: {agg.geral.total}")
+    print(f"📈 Acurácia geral: {acuracia:.1%}")
     print()
     
     # Executar análises
-    correlation = analyze_tri_correlation(data)
-    analyze_habilidade_correlation(data)
-    analyze_tema_comparison(data)
-    analyze_figura_impact(data)
-    generate_conclusions(data, correlation)
+    correlation = analyze_tri_correlation(agg)
+    analyze_habilidade_correlation(agg)
+    analyze_tema_comparison(agg)
+    analyze_figura_impact(agg)
+    generate_conclusions(agg, correlation)
     
     print()
     print(f"✅ Análise concluída!")
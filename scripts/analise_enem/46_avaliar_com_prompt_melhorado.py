@@ -12,14 +12,16 @@ Uso:
     python 46_avaliar_com_prompt_melhorado.py [--area matematica|todas] [--limit N]
 """
 
-import os
 import sys
-import json
-import time
 import argparse
 import re
 from datetime import datetime
 from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem import cliente_maritaca
+from scripts.analise_enem.resultados_jsonl import EscritorResultados
 from collections import defaultdict
 
 try:
@@ -29,13 +31,6 @@ except ImportError:
     print("   Execute: pip install datasets")
     sys.exit(1)
 
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    print("   Execute: pip install openai")
-    sys.exit(1)
-
 # =============================================================================
 # CONFIGURAÇÕES
 # =============================================================================
@@ -224,26 +219,12 @@ Resposta: B"""
 # =============================================================================
 
 def setup_api():
-    """Configura a API da Maritaca."""
-    api_key = os.environ.get('CURSORMINIMAC') or os.environ.get('MARITALK_API_SECRET_KEY')
-    if not api_key:
-        print("❌ Erro: Chave API não encontrada")
-        print("   Configure CURSORMINIMAC ou MARITALK_API_SECRET_KEY")
+    """Configura a API da Maritaca (cliente compartilhado em cliente_maritaca.py)."""
+    try:
+        return cliente_maritaca.configurar_api(), "new"
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
         sys.exit(1)
-    
-    # Detectar versão do openai
-    openai_version = int(openai.__version__.split('.')[0])
-    
-    if openai_version >= 1:
-        client = openai.OpenAI(
-            api_key=api_key,
-            base_url="https://chat.maritaca.ai/api"
-        )
-        return client, "new"
-    else:
-        openai.api_key = api_key
-        openai.api_base = "https://chat.maritaca.ai/api"
-        return None, "old"
 
 def extract_answer(response_text):
     """Extrai a resposta (A, B, C, D ou E) do texto do modelo."""
@@ -268,33 +249,19 @@ def extract_answer(response_text):
     
     return None
 
-def call_model(client, api_type, messages, max_retries=3):
-    """Chama o modelo com retry."""
-    for attempt in range(max_retries):
-        try:
-            if api_type == "new":
-                response = client.chat.completions.create(
-                    model="sabia-3",
-                    messages=messages,
-                    max_tokens=2000,
-                    temperature=0.0  # Temperatura zero para consistência
-                )
-                return response.choices[0].message.content
-            else:
-                response = openai.ChatCompletion.create(
-                    model="sabia-3",
-                    messages=messages,
-                    max_tokens=2000,
-                    temperature=0.0
-                )
-                return response.choices[0].message.content
-        except Exception as e:
-            print(f"   ⚠️  Tentativa {attempt + 1} falhou: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-            else:
-                return None
-    return None
+def call_model(client, api_type, messages):
+    """Chama o modelo (retentativas com backoff e jitter ficam no cliente)."""
+    try:
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=messages,
+            max_tokens=2000,
+            temperature=0.0  # Temperatura zero para consistência
+        )
+        return response.choices[0].message.content
+    except cliente_maritaca.ErroAPI as e:
+        print(f"   ⚠️  Chamada falhou após {e.tentativas} tentativa(s): {e}")
+        return None
 
 def build_messages(question_data, use_captions=True, tem_figura=False):
     """Constrói as mensagens para o modelo com few-shots apropriados."""
@@ -399,8 +366,20 @@ def evaluate_with_improved_prompt(area="matematica", limit=None, output_dir="res
     print(f"📊 Total de questões a avaliar: {len(questions)}")
     print()
     
+    # Resultados: uma linha por questão em JSONL, gravada assim que a questão termina
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = output_dir / f"avaliacao_melhorada_{timestamp}.jsonl"
+    config = {
+        'area': area,
+        'total_questoes': len(questions),
+        'prompt_version': 'melhorado_v1',
+        'timestamp': timestamp
+    }
+    escritor = EscritorResultados(output_file, "46_avaliar_com_prompt_melhorado", config)
+    
     # Estatísticas
-    results = []
     correct = 0
     total = 0
     
@@ -469,10 +448,7 @@ def evaluate_with_improved_prompt(area="matematica", limit=None, output_dir="res
             'tem_figura': tem_figura,
             'tem_descricao': len(q.get('description', [])) > 0
         }
-        results.append(result)
-        
-        # Pequena pausa
-        time.sleep(0.5)
+        escritor.escrever(result)
     
     # Calcular métricas finais
     accuracy = correct / total if total > 0 else 0
@@ -502,20 +478,9 @@ def evaluate_with_improved_prompt(area="matematica", limit=None, output_dir="res
             acc = stats['correct'] / stats['total']
             print(f"   {tema:25} | {acc:6.1%} ({stats['correct']}/{stats['total']})")
     
-    # Salvar resultados
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = output_dir / f"avaliacao_melhorada_{timestamp}.json"
-    
+    # Resumo final (as questões já estão no JSONL)
     output_data = {
-        'config': {
-            'area': area,
-            'total_questoes': len(questions),
-            'prompt_version': 'melhorado_v1',
-            'timestamp': timestamp
-        },
+        'config': config,
         'metricas': {
             'accuracy': accuracy,
             'correct': correct,
@@ -526,12 +491,10 @@ def evaluate_with_improved_prompt(area="matematica", limit=None, output_dir="res
             'por_tema': {k: {'accuracy': v['correct']/v['total'] if v['total'] > 0 else 0,
                             'correct': v['correct'], 'total': v['total']}
                         for k, v in stats_by_tema.items()}
-        },
-        'resultados': results
+        }
     }
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    escritor.resumo(output_data)
+    escritor.fechar()
     
     print()
     print(f"💾 Resultados salvos em: {output_file}")
@@ -9,7 +9,6 @@ Uso:
     python 55_iniciar_treinamento_2025.py [--area todas|linguagens|humanas|natureza|matematica] [--limit N]
 """
 
-import os
 import sys
 import json
 import time
@@ -21,12 +20,7 @@ from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    print("   Execute: pip install openai")
-    sys.exit(1)
+from scripts.analise_enem import cliente_maritaca
 
 # =============================================================================
 # CONFIGURAÇÕES
@@ -51,27 +45,12 @@ Apenas uma alternativa é correta. Encerre a explicação com "Resposta: " segui
 # =============================================================================
 
 def setup_api():
-    """Configura a API da Maritaca."""
-    api_key = os.environ.get('CURSORMINIMAC') or os.environ.get('MARITALK_API_SECRET_KEY')
-    
-    if not api_key:
-        print("❌ Erro: Chave API não encontrada")
-        print("   Configure CURSORMINIMAC ou MARITALK_API_SECRET_KEY")
+    """Configura a API da Maritaca (cliente compartilhado em cliente_maritaca.py)."""
+    try:
+        return cliente_maritaca.configurar_api(), "new"
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
         sys.exit(1)
-    
-    # Detectar versão do openai
-    openai_version = int(openai.__version__.split('.')[0])
-    
-    if openai_version >= 1:
-        client = openai.OpenAI(
-            api_key=api_key,
-            base_url="https://chat.maritaca.ai/api"
-        )
-        return client, "new"
-    else:
-        openai.api_key = api_key
-        openai.api_base = "https://chat.maritaca.ai/api"
-        return None, "old"
 
 def extract_answer(response_text):
     """Extrai a resposta (A, B, C, D ou E) do texto do modelo."""
@@ -94,33 +73,19 @@ def extract_answer(response_text):
     
     return None
 
-def call_model(client, api_type, messages, max_retries=3):
-    """Chama o modelo com retry."""
-    for attempt in range(max_retries):
-        try:
-            if api_type == "new":
-                response = client.chat.completions.create(
-                    model="sabia-3",
-                    messages=messages,
-                    max_tokens=1500,
-                    temperature=0.1
-                )
-                return response.choices[0].message.content
-            else:
-                response = openai.ChatCompletion.create(
-                    model="sabia-3",
-                    messages=messages,
-                    max_tokens=1500,
-                    temperature=0.1
-                )
-                return response.choices[0].message.content
-        except Exception as e:
-            print(f"   ⚠️  Tentativa {attempt + 1} falhou: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
-            else:
-                return None
-    return None
+def call_model(client, api_type, messages):
+    """Chama o modelo (retentativas com backoff e jitter ficam no cliente)."""
+    try:
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=messages,
+            max_tokens=1500,
+            temperature=0.1
+        )
+        return response.choices[0].message.content
+    except cliente_maritaca.ErroAPI as e:
+        print(f"   ⚠️  Chamada falhou após {e.tentativas} tentativa(s): {e}")
+        return None
 
 def build_messages(question_data):
     """Constrói as mensagens para o modelo."""
@@ -299,9 +264,6 @@ def main():
         
         print(f"  Progresso: {accuracy:.1f}% | Tempo: {elapsed:.0f}s | Restante: ~{remaining:.0f}s")
         print()
-        
-        # Pequena pausa para não sobrecarregar a API
-        time.sleep(0.5)
     
     # Calcular estatísticas finais
     final_accuracy = (correct_count / len(questions)) * 100 if questions else 0
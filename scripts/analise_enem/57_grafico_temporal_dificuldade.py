@@ -7,27 +7,24 @@ Gera visualização da evolução temporal da dificuldade média geral e por ár
 import json
 import sys
 from pathlib import Path
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')
 import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem.graficos import Grafico, gerar
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+ARQUIVO_COMPLETO = PROJECT_ROOT / "data" / "analises" / "dificuldade_completo.json"
+AREAS = ['Linguagens', 'Humanas', 'Natureza', 'Matemática']
+
 def carregar_dificuldade_temporal():
-    """Carrega dados de dificuldade para análise temporal"""
-    project_root = Path(__file__).parent.parent.parent
-    
-    # Carregar dados completos
-    arquivo_completo = project_root / "data" / "analises" / "dificuldade_completo.json"
-    
-    if not arquivo_completo.exists():
+    """Carrega dados de dificuldade para análise temporal ({'ano', 'Dificuldade Geral', áreas...})"""
+    if not ARQUIVO_COMPLETO.exists():
         print("❌ Arquivo de dificuldade completo não encontrado")
         print("   Execute primeiro: 08_heuristica_dificuldade.py")
         return None
     
-    with open(arquivo_completo, 'r', encoding='utf-8') as f:
+    with open(ARQUIVO_COMPLETO, 'r', encoding='utf-8') as f:
         dados = json.load(f)
     
     # Extrair dados temporais
@@ -57,7 +54,7 @@ def carregar_dificuldade_temporal():
         
         # Dificuldade geral (média de todas as questões)
         scores_geral = [q.get('score_dificuldade', 0) for q in questoes]
-        media_geral = np.mean(scores_geral) if scores_geral else 0
+        media_geral = float(np.mean(scores_geral)) if scores_geral else 0
         
         anos.append(ano)
         dificuldade_geral.append(media_geral)
@@ -77,25 +74,27 @@ def carregar_dificuldade_temporal():
         # Calcular média por área
         for area_nome in dificuldade_por_area.keys():
             if area_nome in por_area:
-                media_area = np.mean(por_area[area_nome])
+                media_area = float(np.mean(por_area[area_nome]))
             else:
-                media_area = np.nan
+                media_area = None
             dificuldade_por_area[area_nome].append(media_area)
     
-    # Criar DataFrame
-    df = pd.DataFrame({
+    # Colunas (None nos anos sem a área)
+    return {
         'ano': anos,
         'Dificuldade Geral': dificuldade_geral,
-        'Linguagens': dificuldade_por_area['Linguagens'],
-        'Humanas': dificuldade_por_area['Humanas'],
-        'Natureza': dificuldade_por_area['Natureza'],
-        'Matemática': dificuldade_por_area['Matemática']
-    })
-    
-    return df
+        **dificuldade_por_area
+    }
+
+def _coluna(dados, nome):
+    return np.array(dados[nome], dtype=float)
 
-def gerar_grafico_temporal(df):
-    """Gera gráfico temporal da evolução da dificuldade"""
+def desenhar_grafico_temporal(dados, arquivo):
+    """Desenha a evolução temporal da dificuldade (roda no worker de graficos.py)"""
+    import matplotlib.pyplot as plt
+    
+    anos = np.array(dados['ano'])
+    geral = _coluna(dados, 'Dificuldade Geral')
     
     # Criar figura com subplots
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 12))
@@ -103,28 +102,28 @@ def gerar_grafico_temporal(df):
     # ========================================================================
     # GRÁFICO 1: Evolução Geral
     # ========================================================================
-    ax1.plot(df['ano'], df['Dificuldade Geral'],
+    ax1.plot(anos, geral,
             marker='o', linewidth=3, markersize=10,
             color='#2c3e50', label='Dificuldade Média Geral', alpha=0.9)
     
     # Preencher área
-    ax1.fill_between(df['ano'], df['Dificuldade Geral'],
+    ax1.fill_between(anos, geral,
                     alpha=0.3, color='#2c3e50')
     
     # Destacar 2025
-    if 2025 in df['ano'].values:
-        idx_2025 = df[df['ano'] == 2025].index[0]
-        ax1.scatter([2025], [df.loc[idx_2025, 'Dificuldade Geral']],
+    if 2025 in anos:
+        idx_2025 = int(np.flatnonzero(anos == 2025)[0])
+        ax1.scatter([2025], [geral[idx_2025]],
                    s=200, color='red', zorder=5, edgecolors='black', linewidth=2)
-        ax1.annotate('2025', xy=(2025, df.loc[idx_2025, 'Dificuldade Geral']),
+        ax1.annotate('2025', xy=(2025, geral[idx_2025]),
                     xytext=(10, 10), textcoords='offset points',
                     fontsize=12, fontweight='bold', color='red',
                     bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.7))
     
     # Linha de tendência
-    z = np.polyfit(df['ano'], df['Dificuldade Geral'], 1)
+    z = np.polyfit(anos, geral, 1)
     p = np.poly1d(z)
-    ax1.plot(df['ano'], p(df['ano']), "--", alpha=0.5, color='gray',
+    ax1.plot(anos, p(anos), "--", alpha=0.5, color='gray',
             linewidth=2, label=f'Tendência (inclinação: {z[0]:.2f})')
     
     ax1.set_xlabel('Ano', fontsize=14, fontweight='bold')
@@ -133,7 +132,7 @@ def gerar_grafico_temporal(df):
                  fontsize=16, fontweight='bold', pad=20)
     ax1.grid(True, alpha=0.3, linestyle='--')
     ax1.legend(loc='best', fontsize=12, framealpha=0.9)
-    ax1.set_xlim(df['ano'].min() - 0.5, df['ano'].max() + 0.5)
+    ax1.set_xlim(anos.min() - 0.5, anos.max() + 0.5)
     
     # ========================================================================
     # GRÁFICO 2: Evolução por Área
@@ -145,19 +144,20 @@ def gerar_grafico_temporal(df):
         'Matemática': '#f39c12'
     }
     
-    for area in ['Linguagens', 'Humanas', 'Natureza', 'Matemática']:
-        dados_area = df[['ano', area]].dropna()
-        if len(dados_area) > 0:
-            ax2.plot(dados_area['ano'], dados_area[area],
+    for area in AREAS:
+        valores = _coluna(dados, area)
+        validos = ~np.isnan(valores)
+        if validos.any():
+            ax2.plot(anos[validos], valores[validos],
                     marker='o', linewidth=2.5, markersize=7,
                     label=area, color=cores[area], alpha=0.8)
             
             # Preencher área sob a linha
-            ax2.fill_between(dados_area['ano'], dados_area[area],
+            ax2.fill_between(anos[validos], valores[validos],
                            alpha=0.15, color=cores[area])
     
     # Destacar 2025
-    if 2025 in df['ano'].values:
+    if 2025 in anos:
         ax2.axvline(x=2025, color='red', linestyle='--', linewidth=2,
                    alpha=0.5, label='2025 (Novo)', zorder=0)
     
@@ -168,7 +168,7 @@ def gerar_grafico_temporal(df):
     ax2.grid(True, alpha=0.3, linestyle='--', axis='y')
     ax2.grid(True, alpha=0.2, linestyle='--', axis='x')
     ax2.legend(loc='best', fontsize=12, framealpha=0.9, ncol=2)
-    ax2.set_xlim(df['ano'].min() - 0.5, df['ano'].max() + 0.5)
+    ax2.set_xlim(anos.min() - 0.5, anos.max() + 0.5)
     
     # Rotacionar labels do eixo X
     plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
@@ -177,17 +177,14 @@ def gerar_grafico_temporal(df):
     # Ajustar layout
     plt.tight_layout()
     
-    # Salvar
-    project_root = Path(__file__).parent.parent.parent
-    output_dir = project_root / "reports" / "visualizacoes"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    arquivo = output_dir / "dificuldade_temporal_2009_2025.png"
     plt.savefig(arquivo, dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    print(f"✅ Gráfico temporal salvo em: {arquivo}")
-    return arquivo
+
+def grafico():
+    """Registro do gráfico na camada incremental"""
+    return Grafico('dificuldade_temporal_2009_2025.png', carregar_dificuldade_temporal, desenhar_grafico_temporal,
+                   entradas=[ARQUIVO_COMPLETO], nome='dificuldade_temporal_geral_areas',
+                   titulo='Dificuldade Geral e por Área (2009-2025)',
+                   descricao='Dificuldade média geral com linha de tendência e a evolução de cada área.')
 
 def main():
     """Função principal"""
@@ -196,37 +193,36 @@ def main():
     print("=" * 70)
     print()
     
-    # Carregar dados
+    # Carregar dados (do cache quando as entradas não mudaram)
     print("📥 Carregando dados de dificuldade temporal...")
-    df = carregar_dificuldade_temporal()
+    print("🎨 Gerando gráfico temporal...")
+    resultado = gerar([grafico()], forcar='--forcar' in sys.argv)['dificuldade_temporal_geral_areas']
+    dados = resultado['dados']
     
-    if df is None:
+    if dados is None:
         return
     
-    print(f"✅ Dados carregados: {len(df)} anos")
+    anos = np.array(dados['ano'])
+    geral = _coluna(dados, 'Dificuldade Geral')
+    print(f"✅ Dados carregados: {len(anos)} anos")
     print()
     
     # Estatísticas
     print("📊 Estatísticas Temporais:")
     print(f"   Dificuldade Geral:")
-    print(f"     Média: {df['Dificuldade Geral'].mean():6.2f}")
-    print(f"     Mín: {df['Dificuldade Geral'].min():6.2f}")
-    print(f"     Máx: {df['Dificuldade Geral'].max():6.2f}")
-    print(f"     Primeiro ano (2009): {df[df['ano'] == 2009]['Dificuldade Geral'].values[0]:6.2f}")
-    if 2025 in df['ano'].values:
-        print(f"     Último ano (2025): {df[df['ano'] == 2025]['Dificuldade Geral'].values[0]:6.2f}")
+    print(f"     Média: {geral.mean():6.2f}")
+    print(f"     Mín: {geral.min():6.2f}")
+    print(f"     Máx: {geral.max():6.2f}")
+    print(f"     Primeiro ano (2009): {geral[anos == 2009][0]:6.2f}")
+    if 2025 in anos:
+        print(f"     Último ano (2025): {geral[anos == 2025][0]:6.2f}")
     print()
     
-    # Gerar gráfico
-    print("🎨 Gerando gráfico temporal...")
-    arquivo = gerar_grafico_temporal(df)
-    
-    print()
-    print("=" * 70)
-    print("✅ GRÁFICO TEMPORAL GERADO COM SUCESSO")
-    print("=" * 70)
-    print(f"📁 Arquivo: {arquivo}")
+    if resultado['estado'] in ('desenhado', 'pulado'):
+        print("=" * 70)
+        print("✅ GRÁFICO TEMPORAL GERADO COM SUCESSO")
+        print("=" * 70)
+        print(f"📁 Arquivo: {resultado['arquivo']}")
 
 if __name__ == "__main__":
     main()
-
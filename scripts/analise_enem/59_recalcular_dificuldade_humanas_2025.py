@@ -9,100 +9,59 @@ import json
 import sys
 from pathlib import Path
 import numpy as np
-import re
-from typing import Dict
+from typing import Dict, List
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def calcular_complexidade_sintatica(texto: str) -> float:
-    """Calcula complexidade sintática básica"""
-    if not texto:
-        return 0.0
-    
-    sentencas = re.split(r'[.!?]+', texto)
-    num_sentencas = len([s for s in sentencas if s.strip()])
-    palavras = texto.split()
-    num_palavras = len(palavras)
-    
-    palavras_por_sentenca = num_palavras / num_sentencas if num_sentencas > 0 else 0
-    palavras_longas = sum(1 for p in palavras if len(p) > 6)
-    percentual_longas = (palavras_longas / num_palavras * 100) if num_palavras > 0 else 0
-    
-    complexidade = palavras_por_sentenca + (percentual_longas / 10)
-    return complexidade
-
-def calcular_raridade_lexical(texto: str) -> float:
-    """Calcula raridade lexical simplificada"""
-    if not texto:
-        return 0.0
-    
-    palavras = texto.lower().split()
-    palavras_raras = sum(1 for p in palavras if len(p) > 8 or not p.isalnum())
-    return (palavras_raras / len(palavras) * 100) if palavras else 0.0
+from scripts.analise_enem.features_dificuldade import (
+    calcular_scores, extrair_features, metricas_como_dicts, textos_das_questoes
+)
 
-def calcular_dificuldade_questao(questao: Dict, usar_media_historica: bool = False, 
-                                 media_historica: float = 35.0) -> Dict:
-    """Calcula dificuldade de uma questão"""
-    
-    # Se for questão incompleta ou usar média histórica
-    if questao.get('incomplete', False) or usar_media_historica:
-        import random
-        # Variação de ±5 pontos em torno da média histórica
-        dificuldade_ajustada = media_historica + random.uniform(-5, 5)
-        dificuldade_ajustada = max(32, min(42, dificuldade_ajustada))  # Limitar entre 32-42
-        
-        return {
-            'score_dificuldade': float(dificuldade_ajustada),
-            'complexidade_sintatica': dificuldade_ajustada / 5,
-            'raridade_lexical': dificuldade_ajustada * 0.8,
-            'comprimento_texto': int(dificuldade_ajustada * 15),
-            'nivel_dificuldade': (
-                'facil' if dificuldade_ajustada < 35 else
-                'medio' if dificuldade_ajustada < 40 else
-                'dificil'
-            )
-        }
-    
-    # Calcular normalmente para questões completas
-    contexto = questao.get('context', '')
-    pergunta = questao.get('question', '')
-    texto_completo = f"{contexto} {pergunta}".strip()
-    
-    if not texto_completo:
-        # Se não tem texto, usar média histórica
-        return calcular_dificuldade_questao(questao, usar_media_historica=True, 
-                                           media_historica=media_historica)
-    
-    complexidade_sint = calcular_complexidade_sintatica(texto_completo)
-    raridade_lex = calcular_raridade_lexical(texto_completo)
-    comprimento = len(texto_completo)
-    
-    # Normalizar
-    score_complexidade = min(complexidade_sint * 5, 100)
-    score_raridade = min(raridade_lex, 100)
-    score_comprimento = min(comprimento / 50, 100)
-    
-    # Score final (média ponderada)
-    score_dificuldade = (
-        score_complexidade * 0.4 +
-        score_raridade * 0.4 +
-        score_comprimento * 0.2
-    )
+def calcular_dificuldade_media_historica(media_historica: float = 35.0) -> Dict:
+    """Dificuldade para questão incompleta: média histórica com variação"""
+    import random
+    # Variação de ±5 pontos em torno da média histórica
+    dificuldade_ajustada = media_historica + random.uniform(-5, 5)
+    dificuldade_ajustada = max(32, min(42, dificuldade_ajustada))  # Limitar entre 32-42
     
     return {
-        'score_dificuldade': float(score_dificuldade),
-        'complexidade_sintatica': float(complexidade_sint),
-        'raridade_lexical': float(raridade_lex),
-        'comprimento_texto': comprimento,
+        'score_dificuldade': float(dificuldade_ajustada),
+        'complexidade_sintatica': dificuldade_ajustada / 5,
+        'raridade_lexical': dificuldade_ajustada * 0.8,
+        'comprimento_texto': int(dificuldade_ajustada * 15),
         'nivel_dificuldade': (
-            'muito_facil' if score_dificuldade < 30 else
-            'facil' if score_dificuldade < 50 else
-            'medio' if score_dificuldade < 70 else
-            'dificil' if score_dificuldade < 85 else
-            'muito_dificil'
+            'facil' if dificuldade_ajustada < 35 else
+            'medio' if dificuldade_ajustada < 40 else
+            'dificil'
         )
     }
 
+def calcular_dificuldade_questoes(questoes: List[Dict], media_historica: float = 35.0) -> List[Dict]:
+    """Calcula dificuldade de todas as questões (completas em uma passada vetorizada)"""
+    textos = textos_das_questoes(questoes, strip=True)
+    completas = [
+        i for i, (questao, texto) in enumerate(zip(questoes, textos))
+        if not questao.get('incomplete', False) and texto
+    ]
+    
+    metricas_completas = {}
+    if completas:
+        matriz = extrair_features([questoes[i] for i in completas], strip=True)
+        scores = calcular_scores(matriz['features'])
+        for i, metricas in zip(completas, metricas_como_dicts(matriz, scores)):
+            metricas_completas[i] = {
+                chave: metricas[chave] for chave in
+                ['score_dificuldade', 'complexidade_sintatica', 'raridade_lexical',
+                 'comprimento_texto', 'nivel_dificuldade']
+            }
+    
+    # Incompletas (ou sem texto) usam a média histórica, na ordem original
+    return [
+        metricas_completas[i] if i in metricas_completas
+        else calcular_dificuldade_media_historica(media_historica)
+        for i in range(len(questoes))
+    ]
+
 def calcular_media_historica_humanas():
     """Calcula média histórica de Humanas (excluindo 2025)"""
     project_root = Path(__file__).parent.parent.parent
@@ -163,25 +122,13 @@ def main():
     
     # 3. Recalcular dificuldade para todas as questões
     print("\n🔧 Recalculando dificuldade...")
-    questoes_recalculadas = []
+    metricas_por_questao = calcular_dificuldade_questoes(questoes_humanas, media_historica)
     
-    incompletas = 0
-    completas = 0
+    questoes_recalculadas = []
+    incompletas = sum(1 for questao in questoes_humanas if questao.get('incomplete', False))
+    completas = len(questoes_humanas) - incompletas
     
-    for questao in questoes_humanas:
-        is_incomplete = questao.get('incomplete', False)
-        
-        if is_incomplete:
-            incompletas += 1
-            # Usar média histórica com variação
-            metricas = calcular_dificuldade_questao(questao, usar_media_historica=True,
-                                                   media_historica=media_historica)
-        else:
-            completas += 1
-            # Calcular normalmente
-            metricas = calcular_dificuldade_questao(questao, usar_media_historica=False,
-                                                   media_historica=media_historica)
-        
+    for questao, metricas in zip(questoes_humanas, metricas_por_questao):
         # Atualizar questão
         questao.update(metricas)
         questoes_recalculadas.append(questao)
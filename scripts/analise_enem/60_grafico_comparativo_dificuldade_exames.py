@@ -7,204 +7,42 @@ com outras provas brasileiras (FUVEST, ITA, IME).
 """
 import json
 import sys
+from functools import lru_cache
 from pathlib import Path
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')
 import numpy as np
-import re
 from typing import Dict, List
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-# Funções de cálculo de dificuldade (copiadas de 08_heuristica_dificuldade.py)
-def calcular_complexidade_sintatica(texto: str) -> float:
-    """Calcula complexidade sintática básica"""
-    if not texto:
-        return 0.0
-    
-    # Contar sentenças
-    sentencas = re.split(r'[.!?]+', texto)
-    num_sentencas = len([s for s in sentencas if s.strip()])
-    
-    # Contar palavras
-    palavras = texto.split()
-    num_palavras = len(palavras)
-    
-    # Palavras por sentença
-    palavras_por_sentenca = num_palavras / num_sentencas if num_sentencas > 0 else 0
-    
-    # Contar palavras longas (>6 caracteres)
-    palavras_longas = sum(1 for p in palavras if len(p) > 6)
-    percentual_longas = (palavras_longas / num_palavras * 100) if num_palavras > 0 else 0
-    
-    # Complexidade = palavras por sentença + percentual de palavras longas
-    complexidade = palavras_por_sentenca + (percentual_longas / 10)
-    
-    return complexidade
-
-def calcular_raridade_lexical(texto: str, vocabulario_geral: Dict[str, int] = None) -> float:
-    """Calcula raridade lexical (frequência de palavras raras)"""
-    if not texto:
-        return 0.0
-    
-    palavras = texto.lower().split()
-    
-    if vocabulario_geral is None:
-        # Se não houver vocabulário geral, usar heurística simples
-        # Palavras raras = palavras longas ou com caracteres especiais
-        palavras_raras = sum(1 for p in palavras if len(p) > 8 or not p.isalnum())
-        return (palavras_raras / len(palavras) * 100) if palavras else 0.0
-    
-    # Calcular frequência média das palavras
-    frequencias = []
-    for palavra in palavras:
-        freq = vocabulario_geral.get(palavra, 0)
-        if freq > 0:
-            frequencias.append(freq)
-    
-    if not frequencias:
-        return 100.0  # Todas as palavras são raras
-    
-    # Raridade = inverso da frequência média (normalizado)
-    freq_media = np.mean(frequencias)
-    raridade = 100.0 / (1 + freq_media)  # Normalizado
-    
-    return raridade
-
-def construir_vocabulario_geral(dados: Dict[int, List[Dict]]) -> Dict[str, int]:
-    """Constrói vocabulário geral de todas as questões"""
-    vocabulario = {}
-    
-    for questoes in dados.values():
-        for questao in questoes:
-            texto = f"{questao.get('context', '')} {questao.get('question', '')}".lower()
-            palavras = texto.split()
-            
-            for palavra in palavras:
-                palavra_limpa = re.sub(r'[^\w]', '', palavra)
-                if palavra_limpa:
-                    vocabulario[palavra_limpa] = vocabulario.get(palavra_limpa, 0) + 1
-    
-    return vocabulario
-
-def detectar_termos_tecnicos_exatas(texto: str) -> float:
-    """Detecta termos técnicos de exatas e retorna peso adicional"""
-    texto_lower = texto.lower()
-    
-    # Termos técnicos de matemática/física (peso alto)
-    termos_tecnicos = [
-        # Matemática avançada
-        'integral', 'derivada', 'limite', 'matriz', 'determinante', 'vetor',
-        'logaritmo', 'exponencial', 'trigonometria', 'seno', 'cosseno', 'tangente',
-        'polinômio', 'raiz', 'equação diferencial', 'série', 'sequência',
-        # Física avançada
-        'eletromagnetismo', 'mecânica quântica', 'termodinâmica', 'óptica',
-        'campo elétrico', 'campo magnético', 'força', 'energia', 'potencial',
-        'circuito', 'resistência', 'capacitância', 'indutância',
-        # Química avançada
-        'equilíbrio químico', 'cinética', 'termodinâmica química', 'eletroquímica',
-        'orgânica', 'inorgânica', 'estequiometria',
-        # Notação matemática
-        '∑', '∫', '∂', '∇', '∞', '√', 'π', 'α', 'β', 'γ', 'θ', 'λ', 'μ', 'σ',
-        # Símbolos LaTeX comuns
-        '\\frac', '\\sqrt', '\\int', '\\sum', '\\lim'
-    ]
-    
-    # Contar ocorrências
-    contador = sum(1 for termo in termos_tecnicos if termo in texto_lower)
-    
-    # Peso: cada termo técnico adiciona 5 pontos à dificuldade
-    # Máximo de 30 pontos adicionais (6 termos técnicos)
-    peso_adicional = min(contador * 5, 30)
-    
-    return peso_adicional
+from scripts.analise_enem import features_dificuldade
+from scripts.analise_enem.corpus import PADRAO_ARQUIVOS, carregar_corpus
+from scripts.analise_enem.features_dificuldade import (
+    VERSAO_FEATURES, calcular_scores, construir_vocabulario, extrair_features, textos_das_questoes
+)
+from scripts.analise_enem.graficos import Grafico, gerar
 
-def calcular_metricas_dificuldade(questao: Dict, vocabulario_geral: Dict[str, int]) -> Dict:
-    """Calcula todas as métricas de dificuldade para uma questão"""
-    contexto = questao.get('context', '')
-    pergunta = questao.get('question', '')
-    texto_completo = f"{contexto} {pergunta}"
-    
-    # Complexidade sintática
-    complexidade_sint = calcular_complexidade_sintatica(texto_completo)
-    
-    # Raridade lexical
-    raridade_lex = calcular_raridade_lexical(texto_completo, vocabulario_geral)
-    
-    # Comprimento do texto
-    comprimento = len(texto_completo)
-    
-    # Detectar termos técnicos de exatas (peso adicional)
-    peso_exatas = detectar_termos_tecnicos_exatas(texto_completo)
-    
-    # Número de alternativas (normalmente 5)
-    num_alternativas = len(questao.get('alternatives', []))
-    
-    # Comprimento das alternativas
-    alternativas = questao.get('alternatives', [])
-    comprimento_alternativas = sum(len(alt) for alt in alternativas)
-    
-    # Score de dificuldade (combinação de métricas)
-    # Normalizar cada métrica para escala 0-100
-    score_complexidade = min(complexidade_sint * 5, 100)  # Normalizar
-    score_raridade = min(raridade_lex, 100)
-    score_comprimento = min(comprimento / 50, 100)  # Normalizar
-    
-    # Score base (média ponderada)
-    score_base = (
-        score_complexidade * 0.4 +
-        score_raridade * 0.4 +
-        score_comprimento * 0.2
-    )
-    
-    # Adicionar peso de termos técnicos (ajuste para exatas)
-    score_dificuldade = min(score_base + peso_exatas, 100)
-    
-    return {
-        'complexidade_sintatica': float(complexidade_sint),
-        'raridade_lexical': float(raridade_lex),
-        'comprimento_texto': comprimento,
-        'comprimento_alternativas': comprimento_alternativas,
-        'num_alternativas': num_alternativas,
-        'score_dificuldade': float(score_dificuldade),
-        'nivel_dificuldade': (
-            'muito_facil' if score_dificuldade < 30 else
-            'facil' if score_dificuldade < 50 else
-            'medio' if score_dificuldade < 70 else
-            'dificil' if score_dificuldade < 85 else
-            'muito_dificil'
-        )
-    }
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+TAMANHO_AMOSTRA = 147
+EXAMES_TREINO = ['fuvest', 'ita', 'ime']
 
 def carregar_questoes_enem_amostra(tamanho_amostra: int = 147) -> List[Dict]:
     """Carrega questões do ENEM e retorna uma amostra balanceada"""
     project_root = Path(__file__).parent.parent.parent
     processed_dir = project_root / "data" / "processed"
     
-    todas_questoes = []
+    # Carregar questões de todos os anos (só as amostradas são materializadas)
+    corpus = carregar_corpus(processed_dir)
     
-    # Carregar questões de todos os anos
-    for jsonl_file in sorted(processed_dir.glob("enem_*_completo.jsonl")):
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        todas_questoes.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-    
-    print(f"   📚 Total de questões ENEM disponíveis: {len(todas_questoes)}")
+    print(f"   📚 Total de questões ENEM disponíveis: {len(corpus)}")
     
     # Amostrar aleatoriamente
-    if len(todas_questoes) > tamanho_amostra:
+    if len(corpus) > tamanho_amostra:
         np.random.seed(42)  # Para reprodutibilidade
-        indices = np.random.choice(len(todas_questoes), tamanho_amostra, replace=False)
-        amostra = [todas_questoes[i] for i in indices]
+        indices = np.random.choice(len(corpus), tamanho_amostra, replace=False)
+        amostra = corpus.questoes(indices)
         print(f"   ✅ Amostra aleatória de {tamanho_amostra} questões selecionada")
     else:
-        amostra = todas_questoes
+        amostra = corpus.questoes()
         print(f"   ⚠️  Usando todas as {len(amostra)} questões disponíveis (menos que {tamanho_amostra})")
     
     return amostra
@@ -260,32 +98,38 @@ def calcular_dificuldade_exames(tamanho_amostra: int = 147):
     print(f"   ✅ IME: {len(questoes_ime)} questões")
     print()
     
+    exames = {
+        'ENEM': questoes_enem,
+        'FUVEST': questoes_fuvest,
+        'ITA': questoes_ita,
+        'IME': questoes_ime
+    }
+    
     # Construir vocabulário geral de todos os exames
     print("📚 Construindo vocabulário geral...")
     todas_questoes = questoes_enem + questoes_fuvest + questoes_ita + questoes_ime
-    # A função espera Dict[int, List[Dict]], então usamos um índice fictício
-    dados_para_vocab = {0: todas_questoes}
-    vocabulario_geral = construir_vocabulario_geral(dados_para_vocab)
+    vocabulario_geral = construir_vocabulario(textos_das_questoes(todas_questoes))
     print(f"   ✅ Vocabulário: {len(vocabulario_geral)} palavras únicas")
     print()
     
+    # Uma única passada vetorizada sobre as amostras dos quatro exames
+    print(f"🔄 Extraindo features de {len(todas_questoes)} questões...")
+    project_root = Path(__file__).parent.parent.parent
+    matriz = extrair_features(todas_questoes, vocabulario_geral,
+                              cache_dir=project_root / "data" / "analises" / "cache_features",
+                              nome_cache="exames")
+    scores_todos = calcular_scores(matriz['features'], com_termos_tecnicos=True)
+    print()
+    
     # Calcular dificuldade para cada exame
     resultados = {}
     
-    exames = {
-        'ENEM': questoes_enem,
-        'FUVEST': questoes_fuvest,
-        'ITA': questoes_ita,
-        'IME': questoes_ime
-    }
-    
+    inicio = 0
     for nome_exame, questoes in exames.items():
         print(f"📊 Calculando dificuldade para {nome_exame}...")
         
-        dificuldades = []
-        for questao in questoes:
-            metricas = calcular_metricas_dificuldade(questao, vocabulario_geral)
-            dificuldades.append(metricas['score_dificuldade'])
+        dificuldades = [float(score) for score in scores_todos[inicio:inicio + len(questoes)]]
+        inicio += len(questoes)
         
         if dificuldades:
             # Calcular quartis reais
@@ -310,8 +154,21 @@ def calcular_dificuldade_exames(tamanho_amostra: int = 147):
     
     return resultados
 
-def gerar_grafico_comparativo(dados_todos: Dict):
-    """Gera gráficos comparativos de dificuldade"""
+def entradas_dificuldade() -> List[Path]:
+    """Arquivos dos quais as amostras e os scores dependem"""
+    return (sorted((PROJECT_ROOT / "data" / "processed").glob(PADRAO_ARQUIVOS))
+            + [PROJECT_ROOT / "data" / "treino" / f"treino_{exame}.jsonl" for exame in EXAMES_TREINO]
+            + [Path(features_dificuldade.__file__)])
+
+@lru_cache(maxsize=1)
+def dificuldade_exames() -> Dict:
+    """calcular_dificuldade_exames() uma vez por processo (os dois gráficos usam a mesma tabela)"""
+    return calcular_dificuldade_exames(tamanho_amostra=TAMANHO_AMOSTRA)
+
+def desenhar_grafico_comparativo(dados_todos: Dict, arquivo: Path):
+    """Desenha os gráficos comparativos de dificuldade (roda no worker de graficos.py)"""
+    import matplotlib.pyplot as plt
+    
     
     # Preparar dados
     exames = ['ENEM', 'FUVEST', 'ITA', 'IME']
@@ -498,17 +355,7 @@ def gerar_grafico_comparativo(dados_todos: Dict):
     # Ajustar layout
     plt.tight_layout()
     
-    # Salvar
-    project_root = Path(__file__).parent.parent.parent
-    output_dir = project_root / "reports" / "visualizacoes"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    arquivo = output_dir / "comparativo_dificuldade_exames.png"
     plt.savefig(arquivo, dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    print(f"✅ Gráfico comparativo salvo em: {arquivo}")
-    return arquivo
 
 def calcular_quartis(dificuldades: List[float]) -> Dict:
     """Calcula quartis de uma distribuição"""
@@ -530,8 +377,9 @@ def calcular_quartis(dificuldades: List[float]) -> Dict:
         'max': sorted_diffs[-1]
     }
 
-def gerar_grafico_radar(dados_todos: Dict):
-    """Gera gráfico radar comparando múltiplas métricas (CORRIGIDO)"""
+def desenhar_grafico_radar(dados_todos: Dict, arquivo: Path):
+    """Desenha o gráfico radar comparando múltiplas métricas (roda no worker de graficos.py)"""
+    import matplotlib.pyplot as plt
     
     # Métricas a comparar (REMOVIDO Desvio Padrão - não faz sentido na mesma escala)
     metricas = ['Mínimo', 'Q1 (25%)', 'Média', 'Q3 (75%)', 'Máximo']
@@ -618,17 +466,20 @@ def gerar_grafico_radar(dados_todos: Dict):
                 fontsize=16, fontweight='bold', pad=30)
     ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), fontsize=12)
     
-    # Salvar
-    project_root = Path(__file__).parent.parent.parent
-    output_dir = project_root / "reports" / "visualizacoes"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    arquivo = output_dir / "comparativo_dificuldade_radar.png"
     plt.savefig(arquivo, dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    print(f"✅ Gráfico radar salvo em: {arquivo}")
-    return arquivo
+
+def graficos() -> List[Grafico]:
+    """Registro dos dois gráficos na camada incremental (mesmas entradas, mesma tabela)"""
+    entradas = entradas_dificuldade()
+    parametros = {'tamanho_amostra': TAMANHO_AMOSTRA, 'versao_features': VERSAO_FEATURES}
+    return [
+        Grafico('comparativo_dificuldade_exames.png', dificuldade_exames, desenhar_grafico_comparativo,
+                entradas=entradas, parametros=parametros, titulo='ENEM vs FUVEST, ITA e IME',
+                descricao=f'Dificuldade heurística em amostras de {TAMANHO_AMOSTRA} questões por exame.'),
+        Grafico('comparativo_dificuldade_radar.png', dificuldade_exames, desenhar_grafico_radar,
+                entradas=entradas, parametros=parametros, titulo='Comparação Multidimensional (Radar)',
+                descricao='Mínimo, Q1, média, Q3 e máximo de cada exame, normalizados para 0-100.'),
+    ]
 
 def main():
     """Função principal"""
@@ -636,16 +487,19 @@ def main():
     print("📊 GRÁFICOS COMPARATIVOS DE DIFICULDADE - AMOSTRA BALANCEADA")
     print("=" * 70)
     print()
-    print("🎯 Usando amostra balanceada de 147 questões por exame")
+    print(f"🎯 Usando amostra balanceada de {TAMANHO_AMOSTRA} questões por exame")
     print()
     
-    # Calcular dificuldade de todos os exames com amostra balanceada
+    # Dificuldade de todos os exames (recalculada só se alguma entrada mudou) e gráficos
     print("📊 Calculando dificuldade de ENEM, FUVEST, ITA e IME...")
-    dados_todos = calcular_dificuldade_exames(tamanho_amostra=147)
+    print("🎨 Gerando gráficos comparativos...")
+    resultado = gerar(graficos(), forcar='--forcar' in sys.argv)
+    dados_todos = resultado['comparativo_dificuldade_exames']['dados']
+    print()
     
     # Estatísticas resumidas
     print("=" * 70)
-    print("📊 RESUMO COMPARATIVO (Amostra Balanceada: 147 questões)")
+    print(f"📊 RESUMO COMPARATIVO (Amostra Balanceada: {TAMANHO_AMOSTRA} questões)")
     print("=" * 70)
     print()
     print(f"{'Exame':<10} {'Média':<10} {'Mediana':<10} {'Desvio':<10} {'Questões':<10}")
@@ -660,10 +514,8 @@ def main():
                   f"{stats['num_questoes']:<10}")
     print()
     
-    # Gerar gráficos
-    print("🎨 Gerando gráficos comparativos...")
-    arquivo1 = gerar_grafico_comparativo(dados_todos)
-    arquivo2 = gerar_grafico_radar(dados_todos)
+    arquivo1 = resultado['comparativo_dificuldade_exames']['arquivo']
+    arquivo2 = resultado['comparativo_dificuldade_radar']['arquivo']
     
     print()
     print("=" * 70)
@@ -17,11 +17,12 @@ import matplotlib
 matplotlib.use('Agg')
 import seaborn as sns
 from typing import Dict, List, Tuple
-from collections import defaultdict
 from sklearn.metrics.pairwise import cosine_similarity
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem.corpus import carregar_corpus
+
 def carregar_embeddings(embeddings_dir: Path) -> Dict[int, np.ndarray]:
     """Carrega embeddings salvos"""
     embeddings_por_ano = {}
@@ -37,21 +38,7 @@ def carregar_embeddings(embeddings_dir: Path) -> Dict[int, np.ndarray]:
 
 def carregar_questoes_por_ano_area(processed_dir: Path) -> Dict[int, Dict[str, List[Dict]]]:
     """Carrega questões agrupadas por ano e área"""
-    questoes_por_ano_area = defaultdict(lambda: defaultdict(list))
-    
-    for jsonl_file in sorted(processed_dir.glob("enem_*_completo.jsonl")):
-        ano = int(jsonl_file.stem.split('_')[1])
-        questoes = []
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    questoes.append(json.loads(line))
-        
-        for questao in questoes:
-            area = questao.get('area', 'desconhecida')
-            questoes_por_ano_area[ano][area].append(questao)
-    
-    return questoes_por_ano_area
+    return carregar_corpus(processed_dir).por_ano_area()
 
 def calcular_embedding_medio_por_area_ano(embeddings_por_ano: Dict[int, np.ndarray],
                                           questoes_por_ano_area: Dict[int, Dict[str, List[Dict]]]) -> Dict[int, Dict[str, np.ndarray]]:
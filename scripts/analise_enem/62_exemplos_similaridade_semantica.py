@@ -6,7 +6,6 @@ Mostra exemplos concretos de questões semanticamente similares:
 - Dentro da mesma área (intra-área)
 - Entre áreas correlatas (inter-área)
 """
-import json
 import sys
 from pathlib import Path
 import numpy as np
@@ -16,6 +15,8 @@ from sklearn.metrics.pairwise import cosine_similarity
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem.corpus import carregar_corpus
+
 def carregar_embeddings(embeddings_dir: Path) -> Dict[int, np.ndarray]:
     """Carrega embeddings salvos"""
     embeddings_por_ano = {}
@@ -31,18 +32,7 @@ def carregar_embeddings(embeddings_dir: Path) -> Dict[int, np.ndarray]:
 
 def carregar_questoes_por_ano(processed_dir: Path) -> Dict[int, List[Dict]]:
     """Carrega todas as questões por ano"""
-    questoes_por_ano = {}
-    
-    for jsonl_file in sorted(processed_dir.glob("enem_*_completo.jsonl")):
-        ano = int(jsonl_file.stem.split('_')[1])
-        questoes = []
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    questoes.append(json.loads(line))
-        questoes_por_ano[ano] = questoes
-    
-    return questoes_por_ano
+    return carregar_corpus(processed_dir).por_ano()
 
 def encontrar_questoes_similares(questao_ref: Dict, questao_ref_emb: np.ndarray,
                                 banco_questoes: List[Dict], banco_embeddings: np.ndarray,
@@ -9,25 +9,21 @@ Uso:
     python 63_teste_100_questoes_por_area.py [--anos 2009,2010,2011,...]
 """
 
-import os
 import sys
-import json
 import time
 import argparse
 import random
-from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 from collections import defaultdict
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    print("   Execute: pip install openai")
-    sys.exit(1)
+from scripts.analise_enem import cliente_maritaca, motor_execucao, telemetria
+from scripts.analise_enem.resultados_jsonl import ContagemPor, EscritorResultados, arquivo_resultados
+
+from scripts.analise_enem.corpus import carregar_corpus
 
 # =============================================================================
 # CONFIGURAÇÕES
@@ -52,27 +48,12 @@ Apenas uma alternativa é correta. Encerre a explicação com "Resposta: " segui
 # =============================================================================
 
 def setup_api():
-    """Configura a API da Maritaca."""
-    api_key = os.environ.get('CURSORMINIMAC') or os.environ.get('MARITALK_API_SECRET_KEY')
-    
-    if not api_key:
-        print("❌ Erro: Chave API não encontrada")
-        print("   Configure CURSORMINIMAC ou MARITALK_API_SECRET_KEY")
+    """Configura a API da Maritaca (cliente compartilhado em cliente_maritaca.py)."""
+    try:
+        return cliente_maritaca.configurar_api(), "new"
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
         sys.exit(1)
-    
-    # Detectar versão do openai
-    openai_version = int(openai.__version__.split('.')[0])
-    
-    if openai_version >= 1:
-        client = openai.OpenAI(
-            api_key=api_key,
-            base_url="https://chat.maritaca.ai/api"
-        )
-        return client, "new"
-    else:
-        openai.api_key = api_key
-        openai.api_base = "https://chat.maritaca.ai/api"
-        return None, "old"
 
 def extract_answer(response_text):
     """Extrai a resposta (A, B, C, D ou E) do texto do modelo."""
@@ -95,36 +76,19 @@ def extract_answer(response_text):
     
     return None
 
-def call_model(client, api_type, messages, max_retries=3, max_tokens=2000):
-    """Chama o modelo com retry."""
-    for attempt in range(max_retries):
-        try:
-            if api_type == "new":
-                response = client.chat.completions.create(
-                    model="sabia-3",
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=0.1
-                )
-                return response.choices[0].message.content
-            else:
-                response = openai.ChatCompletion.create(
-                    model="sabia-3",
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=0.1
-                )
-                return response.choices[0].message.content
-        except Exception as e:
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 2
-                print(f"⚠️  Erro na tentativa {attempt + 1}/{max_retries}: {e}")
-                print(f"   Aguardando {wait_time}s antes de tentar novamente...")
-                time.sleep(wait_time)
-            else:
-                print(f"❌ Erro após {max_retries} tentativas: {e}")
-                return None
-    return None
+def call_model(client, api_type, messages, max_tokens=2000):
+    """Chama o modelo (retentativas com backoff e jitter ficam no cliente)."""
+    try:
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=0.1
+        )
+        return response.choices[0].message.content
+    except cliente_maritaca.ErroAPI as e:
+        print(f"   ⚠️  Chamada falhou após {e.tentativas} tentativa(s): {e}")
+        return None
 
 def formatar_questao(questao: Dict) -> str:
     """Formata questão para o prompt."""
@@ -178,22 +142,15 @@ def avaliar_questao(client, api_type: str, questao: Dict) -> Dict:
 
 def carregar_questoes_por_area(processed_dir: Path, anos: Optional[List[int]] = None) -> Dict[str, List[Dict]]:
     """Carrega questões agrupadas por área."""
-    questoes_por_area = defaultdict(list)
+    corpus = carregar_corpus(processed_dir)
+    indices = corpus.selecionar(anos=anos or None)
     
-    for jsonl_file in sorted(processed_dir.glob("enem_*_completo.jsonl")):
-        ano = int(jsonl_file.stem.split('_')[1])
-        
-        if anos and ano not in anos:
-            continue
-        
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    questao = json.loads(line)
-                    area = questao.get('area', 'desconhecida')
-                    # Filtrar questões anuladas
-                    if questao.get('label', '').upper() != 'ANULADO':
-                        questoes_por_area[area].append(questao)
+    # Filtrar questões anuladas
+    indices = indices[np.char.upper(corpus.labels[indices]) != 'ANULADO']
+    
+    questoes_por_area = defaultdict(list)
+    for i in indices:
+        questoes_por_area[str(corpus.areas[i])].append(corpus.questao(i))
     
     return questoes_por_area
 
@@ -246,6 +203,7 @@ def main():
     parser.add_argument('--anos', type=str, help='Anos a incluir (ex: 2009,2010,2011)')
     parser.add_argument('--num-questoes', type=int, default=100, help='Número de questões por área (padrão: 100)')
     parser.add_argument('--areas', type=str, help='Áreas a testar (ex: languages,human-sciences)')
+    motor_execucao.adicionar_argumentos(parser)
     args = parser.parse_args()
     
     # Processar argumentos
@@ -289,49 +247,81 @@ def main():
             print(f"   {area_nome}: {len(questoes_por_area[area_codigo])} questões")
     print()
     
+    output_dir = project_root / "reports" / "avaliacoes"
+    arquivo_progresso = output_dir / "teste_100_questoes_PROGRESSO.json"
+    checkpoint = None if args.reiniciar else motor_execucao.carregar_checkpoint(arquivo_progresso)
+    
     # Selecionar questões
-    print(f"🎯 Selecionando {args.num_questoes} questões por área...")
     questoes_selecionadas = {}
+    if checkpoint:
+        # Retomada: mesma seleção (aleatória) da execução interrompida
+        print(f"♻️  Reutilizando a seleção de {arquivo_progresso.name}...")
+        por_chave = {motor_execucao.chave_questao(q): q for qs in questoes_por_area.values() for q in qs}
+        for k in checkpoint['chaves']:
+            if k in por_chave:
+                questao = por_chave[k]
+                questoes_selecionadas.setdefault(questao.get('area'), []).append(questao)
+    else:
+        print(f"🎯 Selecionando {args.num_questoes} questões por área...")
+        for area_codigo, area_nome in areas_map.items():
+            if area_codigo not in questoes_por_area:
+                continue
+            
+            if areas_filtro and area_codigo not in areas_filtro:
+                continue
+            
+            questoes_area = questoes_por_area[area_codigo]
+            questoes_selecionadas[area_codigo] = selecionar_questoes_balanceadas(questoes_area, args.num_questoes)
     
-    for area_codigo, area_nome in areas_map.items():
-        if area_codigo not in questoes_por_area:
-            continue
-        
-        if areas_filtro and area_codigo not in areas_filtro:
-            continue
-        
-        questoes_area = questoes_por_area[area_codigo]
-        selecionadas = selecionar_questoes_balanceadas(questoes_area, args.num_questoes)
-        questoes_selecionadas[area_codigo] = selecionadas
-        print(f"   {area_nome}: {len(selecionadas)} questões selecionadas")
+    for area_codigo, selecionadas in questoes_selecionadas.items():
+        print(f"   {areas_map.get(area_codigo, area_codigo)}: {len(selecionadas)} questões selecionadas")
     print()
     
-    # Avaliar questões
-    resultados_por_area = {}
+    # Avaliar questões (todas as áreas no mesmo pool)
+    todas = [q for qs in questoes_selecionadas.values() for q in qs]
     tempo_total_inicio = time.time()
+    concluidas = [0]
+    por_area = ContagemPor()
+    
+    # Uma linha por questão concluída (inclusive as retomadas do checkpoint)
+    configuracao = {
+        'num_questoes_por_area': args.num_questoes,
+        'anos': anos,
+        'areas': list(questoes_selecionadas.keys())
+    }
+    saida = EscritorResultados(arquivo_resultados("teste_100_questoes", output_dir),
+                               "63_teste_100_questoes_por_area", configuracao)
+    
+    print(f"📊 Avaliando {len(todas)} questões ({args.workers} simultâneas)...")
+    print("-" * 70)
+    
+    def ao_concluir(i, questao, resultado, retomado):
+        concluidas[0] += 1
+        saida.escrever(resultado)
+        por_area.adicionar(questao.get('area'), resultado['acertou'])
+        if retomado:
+            return
+        prefixo = f"   [{concluidas[0]}/{len(todas)}] {resultado['questao_id']}"
+        if resultado['acertou']:
+            print(f"{prefixo} ✅ {resultado['resposta_modelo']}")
+        else:
+            print(f"{prefixo} ❌ {resultado['resposta_modelo']} (correta: {resultado['resposta_correta']})")
+    
+    motor_execucao.executar_questoes(
+        todas, lambda q: avaliar_questao(client, api_type, q),
+        arquivo_progresso=arquivo_progresso,
+        max_workers=args.workers,
+        max_por_area=args.max_por_area,
+        ao_concluir=ao_concluir,
+        retomar=not args.reiniciar,
+        telemetria=telemetria.Telemetria(telemetria.arquivo_execucao("teste_100_questoes"))
+    )
+    print()
     
+    resultados_por_area = {}
     for area_codigo, questoes in questoes_selecionadas.items():
-        area_nome = areas_map[area_codigo]
-        print(f"📊 Avaliando {area_nome} ({len(questoes)} questões)...")
-        print("-" * 70)
-        
-        resultados_area = []
-        acertos = 0
-        
-        for i, questao in enumerate(questoes, 1):
-            print(f"   [{i}/{len(questoes)}] {questao.get('id', 'N/A')}...", end=' ', flush=True)
-            
-            resultado = avaliar_questao(client, api_type, questao)
-            resultados_area.append(resultado)
-            
-            if resultado['acertou']:
-                acertos += 1
-                print(f"✅ {resultado['resposta_modelo']}")
-            else:
-                print(f"❌ {resultado['resposta_modelo']} (correta: {resultado['resposta_correta']})")
-            
-            # Pequena pausa para não sobrecarregar API
-            time.sleep(0.5)
+        area_nome = areas_map.get(area_codigo, area_codigo)
+        acertos = por_area.grupos[area_codigo].acertos
         
         acuracia = (acertos / len(questoes)) * 100 if questoes else 0
         resultados_por_area[area_codigo] = {
@@ -339,12 +329,11 @@ def main():
             'total': len(questoes),
             'acertos': acertos,
             'erros': len(questoes) - acertos,
-            'acuracia': acuracia,
-            'resultados': resultados_area
+            'acuracia': acuracia
         }
         
-        print(f"\n   ✅ {area_nome}: {acertos}/{len(questoes)} ({acuracia:.2f}%)")
-        print()
+        print(f"   ✅ {area_nome}: {acertos}/{len(questoes)} ({acuracia:.2f}%)")
+    print()
     
     tempo_total = time.time() - tempo_total_inicio
     
@@ -370,20 +359,9 @@ def main():
         print(f"   {resultado['area']}:")
         print(f"      Acurácia: {resultado['acuracia']:.2f}% ({resultado['acertos']}/{resultado['total']})")
     
-    # Salvar resultados
-    output_dir = project_root / "reports" / "avaliacoes"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    arquivo_resultados = output_dir / f"teste_100_questoes_{timestamp}.json"
-    
+    # Resumo final (as questões já estão no JSONL)
     relatorio = {
-        'timestamp': timestamp,
-        'configuracao': {
-            'num_questoes_por_area': args.num_questoes,
-            'anos': anos,
-            'areas': list(questoes_selecionadas.keys())
-        },
+        'configuracao': configuracao,
         'resumo': {
             'total_questoes': total_questoes,
             'total_acertos': total_acertos,
@@ -393,11 +371,11 @@ def main():
         'resultados_por_area': resultados_por_area
     }
     
-    with open(arquivo_resultados, 'w', encoding='utf-8') as f:
-        json.dump(relatorio, f, ensure_ascii=False, indent=2, default=str)
+    saida.resumo(relatorio)
+    saida.fechar()
     
     print()
-    print(f"💾 Resultados salvos em: {arquivo_resultados}")
+    print(f"💾 Resultados salvos em: {saida.arquivo}")
     print()
     print("=" * 70)
     print("✅ TESTE CONCLUÍDO")
@@ -15,7 +15,14 @@ Régua Oficial ENEM:
 Objetivo: Resolver o paradoxo "fácil vs difícil" onde o modelo erra mais questões fáceis.
 """
 
-# Dados TRI completos do ENEM
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem import prompts
+
+# Dados TRI completos do ENEM (prompts/dados/tri_data.json, lido no primeiro uso)
 # - Linguagens, Humanas, Natureza: ENEM 2022 (fonte: Google Sheets)
 # - Matemática: ENEM 2024 (dados oficiais completos)
 # Fonte histórica: https://docs.google.com/spreadsheets/d/1aCR6Q9LBd5-byvzyFAECuwkTZc8bmRtwZxZ_m4U1FA8/edit
@@ -25,196 +32,11 @@ Objetivo: Resolver o paradoxo "fácil vs difícil" onde o modelo erra mais quest
 # - Médio: 590 - 690  
 # - Difícil: 700+
 
-TRI_DATA = {
-    # LANGUAGES (1-45)
-    1: {'TRI': 275.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    2: {'TRI': 283.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    3: {'TRI': 293.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    4: {'TRI': 304.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    5: {'TRI': 316.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    6: {'TRI': 328.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    7: {'TRI': 341.2, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    8: {'TRI': 354.3, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    9: {'TRI': 367.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    10: {'TRI': 381.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    11: {'TRI': 396.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    12: {'TRI': 411.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    13: {'TRI': 426.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    14: {'TRI': 440.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    15: {'TRI': 454.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    16: {'TRI': 467.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    17: {'TRI': 480.6, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    18: {'TRI': 492.3, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    19: {'TRI': 503.2, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    20: {'TRI': 513.7, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    21: {'TRI': 523.6, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    22: {'TRI': 533.2, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    23: {'TRI': 542.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    24: {'TRI': 551.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    25: {'TRI': 560.3, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    26: {'TRI': 568.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    27: {'TRI': 577.6, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    28: {'TRI': 586.3, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    29: {'TRI': 594.9, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    30: {'TRI': 603.8, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    31: {'TRI': 612.7, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    32: {'TRI': 621.8, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    33: {'TRI': 631.1, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    34: {'TRI': 640.8, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    35: {'TRI': 650.7, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    36: {'TRI': 661.0, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    37: {'TRI': 672.1, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    38: {'TRI': 683.4, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    39: {'TRI': 695.3, 'H': 'N/A', 'Nivel': 'Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    40: {'TRI': 708.1, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    41: {'TRI': 721.5, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    42: {'TRI': 739.0, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    43: {'TRI': 754.5, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    44: {'TRI': 768.1, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    45: {'TRI': 793.1, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-
-    # HUMAN SCIENCES (46-90)
-    46: {'TRI': 305.1, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    47: {'TRI': 316.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    48: {'TRI': 326.8, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    49: {'TRI': 334.6, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    50: {'TRI': 343.6, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    51: {'TRI': 354.6, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    52: {'TRI': 366.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    53: {'TRI': 380.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    54: {'TRI': 394.7, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    55: {'TRI': 410.3, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    56: {'TRI': 426.0, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    57: {'TRI': 441.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    58: {'TRI': 457.2, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    59: {'TRI': 471.7, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    60: {'TRI': 485.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    61: {'TRI': 498.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    62: {'TRI': 510.7, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    63: {'TRI': 522.2, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    64: {'TRI': 533.0, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    65: {'TRI': 543.3, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    66: {'TRI': 553.2, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    67: {'TRI': 562.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    68: {'TRI': 571.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    69: {'TRI': 580.1, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    70: {'TRI': 588.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    71: {'TRI': 596.6, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    72: {'TRI': 605.0, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    73: {'TRI': 613.1, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    74: {'TRI': 621.3, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    75: {'TRI': 629.5, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    76: {'TRI': 637.8, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    77: {'TRI': 646.4, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    78: {'TRI': 655.1, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    79: {'TRI': 664.1, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    80: {'TRI': 673.4, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    81: {'TRI': 683.0, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    82: {'TRI': 693.3, 'H': 'N/A', 'Nivel': 'Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    83: {'TRI': 703.9, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    84: {'TRI': 715.2, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    85: {'TRI': 727.6, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    86: {'TRI': 741.1, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    87: {'TRI': 756.8, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    88: {'TRI': 776.4, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    89: {'TRI': 795.5, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    90: {'TRI': 811.8, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-
-    # NATURAL SCIENCES (91-135)
-    91: {'TRI': 360.6, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    92: {'TRI': 368.4, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    93: {'TRI': 373.7, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    94: {'TRI': 380.8, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    95: {'TRI': 388.7, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    96: {'TRI': 397.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    97: {'TRI': 407.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    98: {'TRI': 418.2, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    99: {'TRI': 430.1, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    100: {'TRI': 443.2, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    101: {'TRI': 457.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    102: {'TRI': 473.2, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    103: {'TRI': 489.9, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    104: {'TRI': 507.2, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    105: {'TRI': 525.0, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    106: {'TRI': 542.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    107: {'TRI': 559.5, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    108: {'TRI': 575.6, 'H': 'N/A', 'Nivel': 'Fácil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    109: {'TRI': 590.5, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    110: {'TRI': 604.5, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    111: {'TRI': 617.2, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    112: {'TRI': 628.8, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    113: {'TRI': 639.6, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    114: {'TRI': 649.8, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    115: {'TRI': 659.1, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    116: {'TRI': 667.9, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    117: {'TRI': 676.8, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    118: {'TRI': 684.6, 'H': 'N/A', 'Nivel': 'Intermediário', 'Tema': 'N/A', 'Gab': 'N/A'},
-    119: {'TRI': 693.0, 'H': 'N/A', 'Nivel': 'Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    120: {'TRI': 700.6, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    121: {'TRI': 708.9, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    122: {'TRI': 716.9, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    123: {'TRI': 725.1, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    124: {'TRI': 733.4, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    125: {'TRI': 742.1, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    126: {'TRI': 750.5, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    127: {'TRI': 760.5, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    128: {'TRI': 769.2, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    129: {'TRI': 779.0, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    130: {'TRI': 790.8, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    131: {'TRI': 802.3, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    132: {'TRI': 816.5, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    133: {'TRI': 825.9, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    134: {'TRI': 857.3, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-    135: {'TRI': 868.7, 'H': 'N/A', 'Nivel': 'Muito Difícil', 'Tema': 'N/A', 'Gab': 'N/A'},
-
-    # MATHEMATICS (136-180)
-    136: {'TRI': 755.3, 'H': 'H13', 'Nivel': 'Muito Difícil', 'Tema': 'Grandezas e medidas', 'Gab': 'C'},
-    137: {'TRI': 662.3, 'H': 'H28', 'Nivel': 'Intermediário', 'Tema': 'Estatística e probabilidade', 'Gab': 'E'},
-    138: {'TRI': 705.0, 'H': 'H3', 'Nivel': 'Intermediário', 'Tema': 'Números e operações', 'Gab': 'B'},
-    139: {'TRI': 550.2, 'H': 'H26', 'Nivel': 'Fácil', 'Tema': 'Estatística e probabilidade', 'Gab': 'A'},
-    140: {'TRI': 660.6, 'H': 'H4', 'Nivel': 'Intermediário', 'Tema': 'Números e operações', 'Gab': 'B'},
-    141: {'TRI': 701.9, 'H': 'H20', 'Nivel': 'Intermediário', 'Tema': 'Álgebra e funções', 'Gab': 'B'},
-    142: {'TRI': 661.7, 'H': 'H2', 'Nivel': 'Intermediário', 'Tema': 'Números e operações', 'Gab': 'A'},
-    143: {'TRI': 792.0, 'H': 'H18', 'Nivel': 'Muito Difícil', 'Tema': 'Álgebra e funções', 'Gab': 'D'},
-    144: {'TRI': 636.5, 'H': 'H7', 'Nivel': 'Fácil', 'Tema': 'Geometria', 'Gab': 'D'},
-    145: {'TRI': 613.0, 'H': 'H8', 'Nivel': 'Fácil', 'Tema': 'Geometria', 'Gab': 'D'},
-    146: {'TRI': 809.9, 'H': 'H22', 'Nivel': 'Muito Difícil', 'Tema': 'Álgebra e funções', 'Gab': 'B'},
-    147: {'TRI': 601.8, 'H': 'H1', 'Nivel': 'Fácil', 'Tema': 'Números e operações', 'Gab': 'B'},
-    148: {'TRI': 776.1, 'H': 'H21', 'Nivel': 'Muito Difícil', 'Tema': 'Álgebra e funções', 'Gab': 'C'},
-    149: {'TRI': 703.3, 'H': 'H14', 'Nivel': 'Intermediário', 'Tema': 'Grandezas e medidas', 'Gab': 'E'},
-    150: {'TRI': 836.2, 'H': 'H13', 'Nivel': 'Muito Difícil', 'Tema': 'Grandezas e medidas', 'Gab': 'C'},
-    151: {'TRI': 750.4, 'H': 'H11', 'Nivel': 'Muito Difícil', 'Tema': 'Geometria', 'Gab': 'E'},
-    152: {'TRI': 604.0, 'H': 'H25', 'Nivel': 'Fácil', 'Tema': 'Estatística e probabilidade', 'Gab': 'A'},
-    153: {'TRI': 622.8, 'H': 'H1', 'Nivel': 'Fácil', 'Tema': 'Números e operações', 'Gab': 'D'},
-    154: {'TRI': 564.5, 'H': 'H27', 'Nivel': 'Fácil', 'Tema': 'Estatística e probabilidade', 'Gab': 'C'},
-    155: {'TRI': 723.7, 'H': 'H9', 'Nivel': 'Difícil', 'Tema': 'Geometria', 'Gab': 'E'},
-    156: {'TRI': 591.2, 'H': 'H19', 'Nivel': 'Fácil', 'Tema': 'Álgebra e funções', 'Gab': 'B'},
-    157: {'TRI': 611.7, 'H': 'H23', 'Nivel': 'Fácil', 'Tema': 'Estatística e probabilidade', 'Gab': 'C'},
-    158: {'TRI': 643.6, 'H': 'H4', 'Nivel': 'Fácil', 'Tema': 'Números e operações', 'Gab': 'C'},
-    159: {'TRI': 678.4, 'H': 'H10', 'Nivel': 'Intermediário', 'Tema': 'Geometria', 'Gab': 'C'},
-    160: {'TRI': 684.5, 'H': 'H16', 'Nivel': 'Intermediário', 'Tema': 'Grandezas e medidas', 'Gab': 'D'},
-    161: {'TRI': 738.7, 'H': 'H15', 'Nivel': 'Difícil', 'Tema': 'Grandezas e medidas', 'Gab': 'B'},
-    162: {'TRI': 760.8, 'H': 'H5', 'Nivel': 'Muito Difícil', 'Tema': 'Números e operações', 'Gab': 'A'},
-    163: {'TRI': 729.8, 'H': 'H12', 'Nivel': 'Difícil', 'Tema': 'Grandezas e medidas', 'Gab': 'D'},
-    164: {'TRI': 712.4, 'H': 'H8', 'Nivel': 'Intermediário', 'Tema': 'Geometria', 'Gab': 'C'},
-    165: {'TRI': 786.9, 'H': 'H30', 'Nivel': 'Muito Difícil', 'Tema': 'Análise combinatória', 'Gab': 'B'},
-    166: {'TRI': 673.6, 'H': 'H19', 'Nivel': 'Intermediário', 'Tema': 'Álgebra e funções', 'Gab': 'E'},
-    167: {'TRI': 701.9, 'H': 'H3', 'Nivel': 'Intermediário', 'Tema': 'Números e operações', 'Gab': 'D'},
-    168: {'TRI': 625.9, 'H': 'H15', 'Nivel': 'Fácil', 'Tema': 'Grandezas e medidas', 'Gab': 'A'},
-    169: {'TRI': 772.7, 'H': 'H28', 'Nivel': 'Muito Difícil', 'Tema': 'Estatística e probabilidade', 'Gab': 'E'},
-    170: {'TRI': 729.4, 'H': 'H21', 'Nivel': 'Difícil', 'Tema': 'Álgebra e funções', 'Gab': 'C'},
-    171: {'TRI': 787.2, 'H': 'H22', 'Nivel': 'Muito Difícil', 'Tema': 'Álgebra e funções', 'Gab': 'A'},
-    172: {'TRI': 673.5, 'H': 'H17', 'Nivel': 'Intermediário', 'Tema': 'Grandezas e medidas', 'Gab': 'D'},
-    173: {'TRI': 647.1, 'H': 'H29', 'Nivel': 'Fácil', 'Tema': 'Estatística e probabilidade', 'Gab': 'A'},
-    174: {'TRI': 663.0, 'H': 'H6', 'Nivel': 'Intermediário', 'Tema': 'Geometria', 'Gab': 'C'},
-    175: {'TRI': 693.9, 'H': 'H12', 'Nivel': 'Intermediário', 'Tema': 'Grandezas e medidas', 'Gab': 'D'},
-    176: {'TRI': 645.1, 'H': 'H24', 'Nivel': 'Fácil', 'Tema': 'Estatística e probabilidade', 'Gab': 'B'},
-    177: {'TRI': 673.9, 'H': 'H25', 'Nivel': 'Intermediário', 'Tema': 'Estatística e probabilidade', 'Gab': 'C'},
-    178: {'TRI': 573.5, 'H': 'H27', 'Nivel': 'Fácil', 'Tema': 'Estatística e probabilidade', 'Gab': 'E'},
-    179: {'TRI': 706.9, 'H': 'H16', 'Nivel': 'Intermediário', 'Tema': 'Grandezas e medidas', 'Gab': 'C'},
-    180: {'TRI': 742.5, 'H': 'H2', 'Nivel': 'Difícil', 'Tema': 'Números e operações', 'Gab': 'E'},
-
-}
+def __getattr__(nome: str):
+    """TRI_DATA continua acessível como atributo do módulo, carregado sob demanda"""
+    if nome == 'TRI_DATA':
+        return prompts.tri_data()
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
 
 def classificar_por_tri(tri_value: float) -> str:
     """
@@ -243,7 +65,7 @@ def classificar_por_tri(tri_value: float) -> str:
 
 def obter_tri_questao(numero: int) -> float:
     """Obtém valor TRI de uma questão"""
-    tri_info = TRI_DATA.get(numero, {})
+    tri_info = prompts.tri_data().get(numero, {})
     return tri_info.get('TRI', 0)
 
 def criar_prompt_facil() -> str:
@@ -446,7 +268,7 @@ def selecionar_prompt_por_tri(tri_value: float) -> str:
 
 def obter_info_tri(numero: int) -> dict:
     """Obtém informações TRI completas de uma questão"""
-    return TRI_DATA.get(numero, {
+    return prompts.tri_data().get(numero, {
         'TRI': 0,
         'H': 'N/A',
         'Nivel': 'N/A',
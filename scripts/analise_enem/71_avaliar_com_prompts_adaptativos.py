@@ -9,7 +9,6 @@ Uso:
     python 71_avaliar_com_prompts_adaptativos.py --area matematica [--limit 10]
 """
 
-import os
 import sys
 import json
 import time
@@ -20,12 +19,11 @@ from pathlib import Path
 # Importar sistema de prompts adaptativos
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem import cliente_maritaca
+
 # Importar funções do módulo de prompts adaptativos
-import importlib.util
-prompts_module_path = Path(__file__).parent / "70_prompts_adaptativos_por_tri.py"
-spec = importlib.util.spec_from_file_location("prompts_adaptativos", prompts_module_path)
-prompts_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(prompts_module)
+from scripts.analise_enem import prompts
+prompts_module = prompts.adaptativos
 
 selecionar_prompt_por_tri = prompts_module.selecionar_prompt_por_tri
 obter_info_tri = prompts_module.obter_info_tri
@@ -39,32 +37,17 @@ except ImportError:
     print("   Execute: pip install datasets")
     sys.exit(1)
 
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    print("   Execute: pip install openai")
-    sys.exit(1)
-
 # =============================================================================
 # CONFIGURAÇÕES
 # =============================================================================
 
 def configurar_api():
-    """Configura API OpenAI/Maritaca"""
-    api_key = os.getenv('CURSORMINIMAC') or os.getenv('MARITALK_API_SECRET_KEY')
-    
-    if not api_key:
-        print("❌ Erro: Chave API não encontrada")
-        print("   Configure: export CURSORMINIMAC=...")
+    """Configura API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v0'
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
         sys.exit(1)
-    
-    client = openai.OpenAI(
-        api_key=api_key,
-        base_url="https://api.maritaca.ai/v1"
-    )
-    
-    return client, 'v0'
 
 def formatar_questao(questao: dict, use_captions: bool = True) -> str:
     """Formata questão para o prompt"""
@@ -207,9 +190,6 @@ def avaliar_com_prompts_adaptativos(area="matematica", limit=None):
             'gabarito': correct_answer,
             'correto': is_correct
         })
-        
-        # Pequeno delay para não sobrecarregar API
-        time.sleep(0.5)
     
     elapsed_time = time.time() - start_time
     
@@ -13,11 +13,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 # Importar funções do módulo de prompts adaptativos
-import importlib.util
-prompts_module_path = Path(__file__).parent / "70_prompts_adaptativos_por_tri.py"
-spec = importlib.util.spec_from_file_location("prompts_adaptativos", prompts_module_path)
-prompts_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(prompts_module)
+from scripts.analise_enem import prompts
+prompts_module = prompts.adaptativos
 
 selecionar_prompt_por_tri = prompts_module.selecionar_prompt_por_tri
 obter_info_tri = prompts_module.obter_info_tri
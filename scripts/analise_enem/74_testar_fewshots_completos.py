@@ -16,23 +16,17 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 # Importar módulos
-import importlib.util
+from scripts.analise_enem import prompts
 
 # Módulo de prompts adaptativos
-prompts_module_path = Path(__file__).parent / "70_prompts_adaptativos_por_tri.py"
-spec = importlib.util.spec_from_file_location("prompts_adaptativos", prompts_module_path)
-prompts_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(prompts_module)
+prompts_module = prompts.adaptativos
 
 selecionar_prompt_por_tri = prompts_module.selecionar_prompt_por_tri
 obter_info_tri = prompts_module.obter_info_tri
 classificar_por_tri = prompts_module.classificar_por_tri
 
 # Módulo de few-shots
-fewshots_module_path = Path(__file__).parent / "73_fewshots_customizados_por_tema.py"
-spec2 = importlib.util.spec_from_file_location("fewshots_customizados", fewshots_module_path)
-fewshots_module = importlib.util.module_from_spec(spec2)
-spec2.loader.exec_module(fewshots_module)
+fewshots_module = prompts.fewshots
 
 obter_fewshots_por_tema = fewshots_module.obter_fewshots_por_tema
 criar_prompt_com_fewshots = fewshots_module.criar_prompt_com_fewshots
@@ -190,23 +190,21 @@ def criar_prompt_com_deteccao_figura(prompt_base: str, questao: Dict) -> str:
     analise = analisar_complexidade_descricao(description)
     
     if analise['eh_simples']:
-        # Adicionar instruções para figura simples
-        prompt_figura = criar_prompt_figura_simples()
-        
-        # Inserir antes da questão (no final do prompt base)
-        if "Agora, resolva a questão abaixo" in prompt_base:
-            prompt_completo = prompt_base.replace(
-                "Agora, resolva a questão abaixo:",
-                prompt_figura + "\nAgora, resolva a questão abaixo:"
-            )
-        else:
-            prompt_completo = prompt_base + "\n\n" + prompt_figura
+        return inserir_instrucoes_figura_simples(prompt_base)
     
-    else:
-        # Figura complexa - usar prompt normal
-        prompt_completo = prompt_base
+    # Figura complexa - usar prompt normal
+    return prompt_base
+
+def inserir_instrucoes_figura_simples(prompt_base: str) -> str:
+    """Insere as instruções de figura simples antes da questão (no final do prompt base)"""
+    prompt_figura = criar_prompt_figura_simples()
     
-    return prompt_completo
+    if "Agora, resolva a questão abaixo" in prompt_base:
+        return prompt_base.replace(
+            "Agora, resolva a questão abaixo:",
+            prompt_figura + "\nAgora, resolva a questão abaixo:"
+        )
+    return prompt_base + "\n\n" + prompt_figura
 
 def obter_info_figura(questao: Dict) -> Dict:
     """
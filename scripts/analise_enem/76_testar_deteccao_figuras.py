@@ -12,13 +12,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 # Importar módulos
-import importlib.util
+from scripts.analise_enem import prompts
 
 # Módulo de detecção de figuras
-figuras_module_path = Path(__file__).parent / "75_deteccao_figuras_simples.py"
-spec = importlib.util.spec_from_file_location("deteccao_figuras", figuras_module_path)
-figuras_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(figuras_module)
+figuras_module = prompts.figuras
 
 detectar_tipo_figura = figuras_module.detectar_tipo_figura
 eh_figura_simples = figuras_module.eh_figura_simples
@@ -28,10 +25,7 @@ criar_prompt_com_deteccao_figura = figuras_module.criar_prompt_com_deteccao_figu
 obter_info_figura = figuras_module.obter_info_figura
 
 # Módulo de prompts adaptativos
-prompts_module_path = Path(__file__).parent / "70_prompts_adaptativos_por_tri.py"
-spec2 = importlib.util.spec_from_file_location("prompts_adaptativos", prompts_module_path)
-prompts_module = importlib.util.module_from_spec(spec2)
-spec2.loader.exec_module(prompts_module)
+prompts_module = prompts.adaptativos
 
 selecionar_prompt_por_tri = prompts_module.selecionar_prompt_por_tri
 obter_info_tri = prompts_module.obter_info_tri
@@ -11,7 +11,6 @@ Uso:
     python 77_avaliar_sistema_completo_adaptativo.py --area matematica [--limit 10]
 """
 
-import os
 import sys
 import json
 import time
@@ -21,111 +20,27 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-# Importar módulos
-import importlib.util
+from scripts.analise_enem import cliente_maritaca
 
-# Módulo de prompts adaptativos
-prompts_module_path = Path(__file__).parent / "70_prompts_adaptativos_por_tri.py"
-spec = importlib.util.spec_from_file_location("prompts_adaptativos", prompts_module_path)
-prompts_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(prompts_module)
-
-selecionar_prompt_por_tri = prompts_module.selecionar_prompt_por_tri
-obter_info_tri = prompts_module.obter_info_tri
-classificar_por_tri = prompts_module.classificar_por_tri
-
-# Módulo de few-shots
-fewshots_module_path = Path(__file__).parent / "73_fewshots_customizados_por_tema.py"
-spec2 = importlib.util.spec_from_file_location("fewshots_customizados", fewshots_module_path)
-fewshots_module = importlib.util.module_from_spec(spec2)
-spec2.loader.exec_module(fewshots_module)
-
-criar_prompt_com_fewshots = fewshots_module.criar_prompt_com_fewshots
-
-# Módulo de detecção de figuras
-figuras_module_path = Path(__file__).parent / "75_deteccao_figuras_simples.py"
-spec3 = importlib.util.spec_from_file_location("deteccao_figuras", figuras_module_path)
-figuras_module = importlib.util.module_from_spec(spec3)
-spec3.loader.exec_module(figuras_module)
-
-criar_prompt_com_deteccao_figura = figuras_module.criar_prompt_com_deteccao_figura
-obter_info_figura = figuras_module.obter_info_figura
+# Carga das questões e prompt completo (TRI + few-shots + figuras)
+from scripts.analise_enem.sistema_adaptativo import (
+    carregar_questoes_2024_matematica,
+    construir_prompt_completo,
+    formatar_questao,
+)
 
 # Tentar importar dependências
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    print("   Execute: pip install openai")
-    sys.exit(1)
-
 # =============================================================================
 # CONFIGURAÇÕES
 # =============================================================================
 
 def configurar_api():
-    """Configura API OpenAI/Maritaca"""
-    api_key = os.getenv('CURSORMINIMAC') or os.getenv('MARITALK_API_SECRET_KEY')
-    
-    if not api_key:
-        print("❌ Erro: Chave API não encontrada")
-        print("   Configure: export CURSORMINIMAC=...")
+    """Configura API Maritaca (cliente compartilhado em cliente_maritaca.py)"""
+    try:
+        return cliente_maritaca.configurar_api(), 'v0'
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
         sys.exit(1)
-    
-    client = openai.OpenAI(
-        api_key=api_key,
-        base_url="https://api.maritaca.ai/v1"
-    )
-    
-    return client, 'v0'
-
-def carregar_questoes_2024_matematica():
-    """Carrega questões de matemática do ENEM 2024"""
-    project_root = Path(__file__).parent.parent.parent
-    arquivo = project_root / "data" / "processed" / "enem_2024_completo.jsonl"
-    
-    if not arquivo.exists():
-        print(f"❌ Arquivo não encontrado: {arquivo}")
-        return []
-    
-    questoes = []
-    with open(arquivo, 'r', encoding='utf-8') as f:
-        for line in f:
-            if line.strip():
-                questao = json.loads(line)
-                num_str = questao.get('id', '').replace('questao_', '') or questao.get('number', '')
-                try:
-                    num = int(num_str)
-                    if 136 <= num <= 180:
-                        questao['number'] = num
-                        questoes.append(questao)
-                except (ValueError, TypeError):
-                    continue
-    
-    return questoes
-
-def formatar_questao(questao: dict, use_captions: bool = True) -> str:
-    """Formata questão para o prompt"""
-    texto = ""
-    
-    if questao.get('context'):
-        texto += f"CONTEXTO:\n{questao['context']}\n\n"
-    
-    if use_captions and questao.get('description'):
-        desc = questao['description']
-        if isinstance(desc, list) and desc:
-            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc[0]}\n\n"
-        elif desc:
-            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc}\n\n"
-    
-    texto += f"PERGUNTA:\n{questao.get('question', '')}\n\n"
-    
-    texto += "ALTERNATIVAS:\n"
-    for i, alt in enumerate(questao.get('alternatives', []), 1):
-        letra = chr(64 + i)
-        texto += f"{letra}) {alt}\n"
-    
-    return texto
 
 def extrair_resposta(texto: str) -> str:
     """Extrai resposta do modelo"""
@@ -149,40 +64,6 @@ def extrair_resposta(texto: str) -> str:
     
     return None
 
-def construir_prompt_completo(questao: dict) -> str:
-    """
-    Constrói prompt completo usando todas as melhorias:
-    1. Prompt adaptativo por TRI
-    2. Few-shots por tema
-    3. Detecção de figuras simples
-    """
-    num = questao.get('number', 0)
-    
-    # 1. Obter TRI e classificar
-    tri_info = obter_info_tri(num)
-    tri_value = tri_info.get('TRI', 0)
-    nivel = classificar_por_tri(tri_value)
-    tema = tri_info.get('Tema', 'N/A')
-    
-    # 2. Selecionar prompt adaptativo
-    prompt_base = selecionar_prompt_por_tri(tri_value)
-    
-    # 3. Adicionar few-shots (apenas para nível médio)
-    if nivel == 'medio':
-        prompt_com_fewshots = criar_prompt_com_fewshots(prompt_base, tema, num_fewshots=3)
-    else:
-        prompt_com_fewshots = prompt_base
-    
-    # 4. Adicionar detecção de figuras simples
-    prompt_final = criar_prompt_com_deteccao_figura(prompt_com_fewshots, questao)
-    
-    return prompt_final, {
-        'tri': tri_value,
-        'nivel': nivel,
-        'tema': tema,
-        'tem_figura_simples': obter_info_figura(questao).get('eh_simples', False)
-    }
-
 def avaliar_sistema_completo(limit=None):
     """Avalia questões usando sistema completo adaptativo"""
     
@@ -295,9 +176,6 @@ def avaliar_sistema_completo(limit=None):
             'gabarito': correct_answer,
             'correto': is_correct
         })
-        
-        # Pequeno delay
-        time.sleep(0.5)
     
     elapsed_time = time.time() - start_time
     
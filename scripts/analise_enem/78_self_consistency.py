@@ -8,64 +8,50 @@ para aumentar acurácia e reduzir erros aleatórios.
 Impacto esperado: +3-5% acurácia
 """
 
-import os
 import sys
 import json
 import time
-from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    sys.exit(1)
-
 # Importar módulos existentes
-import importlib.util
+from scripts.analise_enem import prompts
 
 # Módulo de prompts adaptativos
-prompts_module_path = Path(__file__).parent / "70_prompts_adaptativos_por_tri.py"
-spec = importlib.util.spec_from_file_location("prompts_adaptativos", prompts_module_path)
-prompts_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(prompts_module)
+prompts_module = prompts.adaptativos
 
 selecionar_prompt_por_tri = prompts_module.selecionar_prompt_por_tri
 obter_info_tri = prompts_module.obter_info_tri
+classificar_por_tri = prompts_module.classificar_por_tri
 
 # Módulo de few-shots
-fewshots_module_path = Path(__file__).parent / "73_fewshots_customizados_por_tema.py"
-spec2 = importlib.util.spec_from_file_location("fewshots_customizados", fewshots_module_path)
-fewshots_module = importlib.util.module_from_spec(spec2)
-spec2.loader.exec_module(fewshots_module)
+fewshots_module = prompts.fewshots
 
 criar_prompt_com_fewshots = fewshots_module.criar_prompt_com_fewshots
 
 # Módulo de detecção de figuras
-figuras_module_path = Path(__file__).parent / "75_deteccao_figuras_simples.py"
-spec3 = importlib.util.spec_from_file_location("deteccao_figuras", figuras_module_path)
-figuras_module = importlib.util.module_from_spec(spec3)
-spec3.loader.exec_module(figuras_module)
+figuras_module = prompts.figuras
 
 criar_prompt_com_deteccao_figura = figuras_module.criar_prompt_com_deteccao_figura
 
-def configurar_api():
-    """Configura API OpenAI/Maritaca"""
-    api_key = os.getenv('CURSORMINIMAC') or os.getenv('MARITALK_API_SECRET_KEY')
-    
-    if not api_key:
-        print("❌ Erro: Chave API não encontrada")
+# Sistema completo adaptativo (prompt completo, formatação e carga das questões)
+from scripts.analise_enem.sistema_adaptativo import (
+    carregar_questoes_2024_matematica,
+    construir_prompt_completo,
+    formatar_questao,
+)
+
+from scripts.analise_enem import cliente_maritaca, self_consistency
+
+def configurar_api(dry_run: Optional[bool] = None):
+    """Cliente Maritaca compartilhado (pool, retentativas e limitador global)"""
+    try:
+        return cliente_maritaca.configurar_api(dry_run=dry_run)
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
         sys.exit(1)
-    
-    client = openai.OpenAI(
-        api_key=api_key,
-        base_url="https://chat.maritaca.ai/api"
-    )
-    
-    return client
 
 def extrair_resposta(texto: str) -> Optional[str]:
     """Extrai resposta do modelo"""
@@ -101,10 +87,6 @@ def resolver_questao(client, questao: Dict, num_passagem: int = 1) -> Dict:
     Returns:
         Dicionário com resposta e metadados
     """
-    from scripts.analise_enem.77_avaliar_sistema_completo_adaptativo import (
-        construir_prompt_completo, formatar_questao
-    )
-    
     # Construir prompt completo
     prompt_completo, info = construir_prompt_completo(questao)
     questao_formatada = formatar_questao(questao, use_captions=True)
@@ -113,10 +95,7 @@ def resolver_questao(client, questao: Dict, num_passagem: int = 1) -> Dict:
     try:
         response = client.chat.completions.create(
             model="sabia-3",
-            messages=[
-                {"role": "system", "content": "Você é um especialista em questões do ENEM."},
-                {"role": "user", "content": prompt_final}
-            ],
+            messages=self_consistency.montar_mensagens(prompt_final),
             temperature=0.1,  # Baixa temperatura para consistência
             max_tokens=2000
         )
@@ -142,67 +121,40 @@ def resolver_com_self_consistency(
     client, 
     questao: Dict, 
     n_passagens: int = 5,
-    min_consenso: int = 3
+    min_consenso: int = 3,
+    **opcoes
 ) -> Dict:
     """
     Resolve questão com self-consistency (múltiplas passagens)
     
+    As passagens rodam em paralelo pelo motor de self_consistency, sob o
+    limitador de taxa global.
+    
     Args:
         client: Cliente OpenAI/Maritaca
         questao: Dados da questão
         n_passagens: Número de passagens (default: 5)
         min_consenso: Mínimo de respostas iguais para consenso (default: 3)
+        **opcoes: Repassadas ao motor (usar_n, adaptativo, orcamento, ...)
         
     Returns:
         Dicionário com resposta final e estatísticas
     """
-    respostas = []
-    resultados = []
-    
     print(f"   🔄 Executando {n_passagens} passagens...")
     
-    for i in range(n_passagens):
-        resultado = resolver_questao(client, questao, num_passagem=i+1)
-        resultados.append(resultado)
-        
-        if resultado['sucesso'] and resultado['resposta']:
-            respostas.append(resultado['resposta'])
-        
-        # Pequeno delay entre passagens
-        time.sleep(0.3)
-    
-    # Análise de respostas
-    if not respostas:
-        return {
-            'resposta_final': None,
-            'confianca': 0.0,
-            'respostas': [],
-            'resultados': resultados,
-            'erro': 'Nenhuma resposta válida obtida'
-        }
-    
-    # Contar frequência de respostas
-    contador = Counter(respostas)
-    resposta_mais_frequente = contador.most_common(1)[0]
-    resposta_final = resposta_mais_frequente[0]
-    frequencia = resposta_mais_frequente[1]
-    
-    # Calcular confiança (0-1)
-    confianca = frequencia / len(respostas)
-    
-    # Verificar se há consenso suficiente
-    tem_consenso = frequencia >= min_consenso
-    
-    return {
-        'resposta_final': resposta_final,
-        'confianca': confianca,
-        'frequencia': frequencia,
-        'total_passagens': len(respostas),
-        'respostas_todas': respostas,
-        'distribuicao': dict(contador),
-        'tem_consenso': tem_consenso,
-        'resultados': resultados
-    }
+    prompt_completo, info = construir_prompt_completo(questao)
+    prompt_final = prompt_completo + formatar_questao(questao, use_captions=True)
+    
+    resultado = self_consistency.resolver_com_self_consistency(
+        client,
+        self_consistency.montar_mensagens(prompt_final),
+        extrair_resposta,
+        n_passagens=n_passagens,
+        min_consenso=min_consenso,
+        **opcoes
+    )
+    resultado['info'] = info
+    return resultado
 
 def validar_resposta(resposta: Optional[str], alternativas: List[str]) -> tuple[bool, str]:
     """
@@ -228,29 +180,28 @@ def validar_resposta(resposta: Optional[str], alternativas: List[str]) -> tuple[
     
     return True, "Resposta válida"
 
-def avaliar_com_self_consistency(limit=None, n_passagens=5):
+def avaliar_com_self_consistency(limit=None, n_passagens=5, passagens_por_nivel=None, opcoes=None, dry_run=None):
     """
     Avalia questões usando self-consistency
     
     Args:
         limit: Limite de questões (None = todas)
         n_passagens: Número de passagens por questão (default: 5)
+        passagens_por_nivel: Passagens por nível TRI (ex.: {'facil': 1, 'dificil': 7})
+        opcoes: kwargs do motor de self-consistency (usar_n, adaptativo, orcamento, ...)
+        dry_run: Usar o servidor simulado local em vez da API
     """
-    from scripts.analise_enem.77_avaliar_sistema_completo_adaptativo import (
-        carregar_questoes_2024_matematica
-    )
-    
     print("=" * 70)
     print("🔄 AVALIAÇÃO COM SELF-CONSISTENCY")
     print("=" * 70)
     print()
-    print(f"📊 Configuração:")
+    print("📊 Configuração:")
     print(f"   - Passagens por questão: {n_passagens}")
-    print(f"   - Método: Votação majoritária")
+    print(f"   - Método: Votação majoritária{' (adaptativa)' if (opcoes or {}).get('adaptativo') else ''}")
     print()
     
     # Configurar API
-    client = configurar_api()
+    client = configurar_api(dry_run)
     
     # Carregar questões
     questions = carregar_questoes_2024_matematica()
@@ -271,6 +222,7 @@ def avaliar_com_self_consistency(limit=None, n_passagens=5):
     }
     
     resultados = []
+    total_chamadas = 0
     start_time = time.time()
     
     for i, q in enumerate(questions):
@@ -279,8 +231,11 @@ def avaliar_com_self_consistency(limit=None, n_passagens=5):
         
         print(f"[{i+1}/{len(questions)}] Questão {q_num}")
         
-        # Resolver com self-consistency
-        resultado_sc = resolver_com_self_consistency(client, q, n_passagens=n_passagens)
+        # Resolver com self-consistency (passagens podem variar por nível TRI)
+        nivel = classificar_por_tri(obter_info_tri(q_num).get('TRI', 0))
+        n_questao = self_consistency.passagens_da_questao(q, n_passagens, passagens_por_nivel, nivel)
+        resultado_sc = resolver_com_self_consistency(client, q, n_passagens=n_questao, **(opcoes or {}))
+        total_chamadas += resultado_sc['n_passagens']
         
         resposta_final = resultado_sc['resposta_final']
         confianca = resultado_sc['confianca']
@@ -323,11 +278,9 @@ def avaliar_com_self_consistency(limit=None, n_passagens=5):
             'confianca': confianca,
             'tem_consenso': tem_consenso,
             'distribuicao': resultado_sc.get('distribuicao', {}),
-            'n_passagens': n_passagens
+            'n_passagens': n_questao,
+            'chamadas': resultado_sc['n_passagens']
         })
-        
-        # Delay entre questões
-        time.sleep(0.5)
     
     elapsed_time = time.time() - start_time
     
@@ -341,6 +294,8 @@ def avaliar_com_self_consistency(limit=None, n_passagens=5):
     print()
     print(f"Acurácia Geral: {accuracy:.2%} ({correct}/{total})")
     print(f"Tempo total: {elapsed_time:.1f}s ({elapsed_time/total:.1f}s por questão)")
+    print(f"Chamadas à API: {total_chamadas} ({total_chamadas/total:.1f} por questão)")
+    cliente_maritaca.imprimir_metricas(client)
     print()
     
     print("📊 Por Consenso:")
@@ -365,6 +320,7 @@ def avaliar_com_self_consistency(limit=None, n_passagens=5):
             'correct': correct,
             'accuracy': accuracy,
             'n_passagens': n_passagens,
+            'total_chamadas': total_chamadas,
             'stats_consenso': stats_consenso,
             'resultados': resultados,
             'timestamp': timestamp
@@ -381,9 +337,16 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="Avaliar com self-consistency")
     parser.add_argument("--limit", type=int, help="Limitar número de questões")
-    parser.add_argument("--passagens", type=int, default=5, help="Número de passagens (default: 5)")
+    cliente_maritaca.adicionar_argumentos(parser)
+    self_consistency.adicionar_argumentos(parser, passagens_padrao=5)
     
     args = parser.parse_args()
     
-    avaliar_com_self_consistency(limit=args.limit, n_passagens=args.passagens)
+    avaliar_com_self_consistency(
+        limit=args.limit,
+        n_passagens=args.passagens,
+        passagens_por_nivel=self_consistency.interpretar_passagens_por_nivel(args.passagens_por_nivel),
+        opcoes=self_consistency.opcoes_dos_argumentos(args, args.limit or len(carregar_questoes_2024_matematica())),
+        dry_run=args.dry_run
+    )
 
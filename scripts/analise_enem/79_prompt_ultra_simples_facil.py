@@ -94,6 +94,17 @@ def criar_prompt_ultra_simples(questao: dict, tem_figura: bool = False) -> str:
     else:
         return PROMPT_ULTRA_SIMPLES_FACIL
 
+def inserir_prompt_ultra_simples(prompt_base: str, tem_figura: bool = False) -> str:
+    """Insere o prompt ultra-simples antes da questão (ou no final do prompt base)"""
+    prompt_ultra_simples = criar_prompt_ultra_simples({}, tem_figura)
+    
+    if "Agora, resolva a questão abaixo" in prompt_base:
+        return prompt_base.replace(
+            "Agora, resolva a questão abaixo:",
+            prompt_ultra_simples + "\nAgora, resolva a questão abaixo:"
+        )
+    return prompt_base + "\n\n" + prompt_ultra_simples
+
 def aplicar_prompt_ultra_simples(prompt_base: str, questao: dict, tri_value: float, obter_info_figura_func=None) -> str:
     """
     Aplica prompt ultra-simples se a questão for fácil
@@ -116,19 +127,7 @@ def aplicar_prompt_ultra_simples(prompt_base: str, questao: dict, tri_value: flo
         else:
             tem_figura = bool(questao.get('description') or questao.get('figures') or questao.get('has_images'))
         
-        # Criar prompt ultra-simples
-        prompt_ultra_simples = criar_prompt_ultra_simples(questao, tem_figura)
-        
-        # Substituir ou adicionar ao prompt base
-        if "Agora, resolva a questão abaixo" in prompt_base:
-            prompt_final = prompt_base.replace(
-                "Agora, resolva a questão abaixo:",
-                prompt_ultra_simples + "\nAgora, resolva a questão abaixo:"
-            )
-        else:
-            prompt_final = prompt_base + "\n\n" + prompt_ultra_simples
-        
-        return prompt_final
+        return inserir_prompt_ultra_simples(prompt_base, tem_figura)
     
     # Para questões médias/difíceis, usar prompt normal
     return prompt_base
@@ -13,62 +13,26 @@ Integra TODAS as melhorias para superar todos os modelos:
 Meta: 94%+ acurácia (superar GPT-4o com 93.85%)
 """
 
-import os
 import sys
 import json
 import time
-from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    sys.exit(1)
+# Carga das questões (sistema completo adaptativo compartilhado)
+from scripts.analise_enem.sistema_adaptativo import carregar_questoes_2024_matematica
 
-# Importar todos os módulos
-import importlib.util
+from scripts.analise_enem import cliente_maritaca, compilador_prompts, self_consistency
 
-# Módulos existentes
-prompts_module_path = Path(__file__).parent / "70_prompts_adaptativos_por_tri.py"
-spec = importlib.util.spec_from_file_location("prompts_adaptativos", prompts_module_path)
-prompts_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(prompts_module)
-
-fewshots_module_path = Path(__file__).parent / "73_fewshots_customizados_por_tema.py"
-spec2 = importlib.util.spec_from_file_location("fewshots_customizados", fewshots_module_path)
-fewshots_module = importlib.util.module_from_spec(spec2)
-spec2.loader.exec_module(fewshots_module)
-
-figuras_module_path = Path(__file__).parent / "75_deteccao_figuras_simples.py"
-spec3 = importlib.util.spec_from_file_location("deteccao_figuras", figuras_module_path)
-figuras_module = importlib.util.module_from_spec(spec3)
-spec3.loader.exec_module(figuras_module)
-
-prompt_simples_module_path = Path(__file__).parent / "79_prompt_ultra_simples_facil.py"
-spec4 = importlib.util.spec_from_file_location("prompt_simples", prompt_simples_module_path)
-prompt_simples_module = importlib.util.module_from_spec(spec4)
-spec4.loader.exec_module(prompt_simples_module)
-
-# Funções importadas
-selecionar_prompt_por_tri = prompts_module.selecionar_prompt_por_tri
-obter_info_tri = prompts_module.obter_info_tri
-classificar_por_tri = prompts_module.classificar_por_tri
-criar_prompt_com_fewshots = fewshots_module.criar_prompt_com_fewshots
-criar_prompt_com_deteccao_figura = figuras_module.criar_prompt_com_deteccao_figura
-obter_info_figura = figuras_module.obter_info_figura
-aplicar_prompt_ultra_simples = prompt_simples_module.aplicar_prompt_ultra_simples
-
-def configurar_api():
-    """Configura API"""
-    api_key = os.getenv('CURSORMINIMAC') or os.getenv('MARITALK_API_SECRET_KEY')
-    if not api_key:
-        print("❌ Erro: Chave API não encontrada")
+def configurar_api(dry_run: Optional[bool] = None):
+    """Cliente Maritaca compartilhado (pool, retentativas e limitador global)"""
+    try:
+        return cliente_maritaca.configurar_api(dry_run=dry_run)
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
         sys.exit(1)
-    return openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
 
 def extrair_resposta(texto: str) -> Optional[str]:
     """Extrai resposta do modelo"""
@@ -89,139 +53,39 @@ def validar_resposta(resposta: Optional[str], alternativas: List[str]) -> tuple[
         return False, f"Resposta '{resposta}' inválida"
     indice = ord(resposta) - ord('A')
     if indice >= len(alternativas):
-        return False, f"Resposta fora do range"
+        return False, "Resposta fora do range"
     return True, "Resposta válida"
 
 def construir_prompt_final(questao: dict) -> tuple[str, dict]:
     """
-    Constrói prompt final com TODAS as melhorias
+    Constrói prompt final com TODAS as melhorias (prefixo compilado de compilador_prompts)
     
     Returns:
         (prompt_final, info)
     """
-    num = questao.get('number', 0)
-    
-    # 1. Obter TRI
-    tri_info = obter_info_tri(num)
-    tri_value = tri_info.get('TRI', 0)
-    nivel = classificar_por_tri(tri_value)
-    tema = tri_info.get('Tema', 'N/A')
-    
-    # 2. Selecionar prompt adaptativo
-    prompt_base = selecionar_prompt_por_tri(tri_value)
-    
-    # 3. Aplicar prompt ultra-simples se fácil
-    prompt_com_simples = aplicar_prompt_ultra_simples(prompt_base, questao, tri_value)
-    
-    # 4. Adicionar few-shots (apenas para médio)
-    if nivel == 'medio':
-        prompt_com_fewshots = criar_prompt_com_fewshots(prompt_com_simples, tema, num_fewshots=3)
-    else:
-        prompt_com_fewshots = prompt_com_simples
-    
-    # 5. Adicionar detecção de figuras
-    prompt_final = criar_prompt_com_deteccao_figura(prompt_com_fewshots, questao)
-    
-    return prompt_final, {
-        'tri': tri_value,
-        'nivel': nivel,
-        'tema': tema,
-        'tem_figura_simples': obter_info_figura(questao).get('eh_simples', False)
-    }
-
-def formatar_questao(questao: dict) -> str:
-    """Formata questão"""
-    texto = ""
-    if questao.get('context'):
-        texto += f"CONTEXTO:\n{questao['context']}\n\n"
-    if questao.get('description'):
-        desc = questao['description']
-        if isinstance(desc, list) and desc:
-            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc[0]}\n\n"
-        elif desc:
-            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc}\n\n"
-    texto += f"PERGUNTA:\n{questao.get('question', '')}\n\n"
-    texto += "ALTERNATIVAS:\n"
-    for i, alt in enumerate(questao.get('alternatives', []), 1):
-        letra = chr(64 + i)
-        texto += f"{letra}) {alt}\n"
-    return texto
+    return compilador_prompts.montar_prompt(questao, 'melhorado', area='mathematics')
 
 def resolver_questao_com_self_consistency(
     client, 
     questao: dict, 
-    n_passagens: int = 5
+    n_passagens: int = 5,
+    **opcoes
 ) -> Dict:
-    """Resolve questão com self-consistency"""
-    respostas = []
-    resultados = []
-    
-    prompt_final, info = construir_prompt_final(questao)
-    questao_formatada = formatar_questao(questao)
-    prompt_completo = prompt_final + questao_formatada
-    
-    for i in range(n_passagens):
-        try:
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[
-                    {"role": "system", "content": "Você é um especialista em questões do ENEM."},
-                    {"role": "user", "content": prompt_completo}
-                ],
-                temperature=0.1,
-                max_tokens=2000
-            )
-            
-            resposta_texto = response.choices[0].message.content
-            resposta_extraida = extrair_resposta(resposta_texto)
-            
-            if resposta_extraida:
-                respostas.append(resposta_extraida)
-            
-            resultados.append({
-                'resposta': resposta_extraida,
-                'passagem': i+1,
-                'sucesso': resposta_extraida is not None
-            })
-            
-            time.sleep(0.3)
-        except Exception as e:
-            resultados.append({
-                'resposta': None,
-                'erro': str(e),
-                'passagem': i+1,
-                'sucesso': False
-            })
-    
-    if not respostas:
-        return {
-            'resposta_final': None,
-            'confianca': 0.0,
-            'info': info
-        }
-    
-    # Votação majoritária
-    contador = Counter(respostas)
-    resposta_mais_frequente = contador.most_common(1)[0]
-    resposta_final = resposta_mais_frequente[0]
-    frequencia = resposta_mais_frequente[1]
-    confianca = frequencia / len(respostas)
-    
-    return {
-        'resposta_final': resposta_final,
-        'confianca': confianca,
-        'frequencia': frequencia,
-        'total_passagens': len(respostas),
-        'distribuicao': dict(contador),
-        'info': info
-    }
+    """Resolve questão com self-consistency (passagens em paralelo)"""
+    prompt_completo, info = construir_prompt_final(questao)
+    
+    resultado = self_consistency.resolver_com_self_consistency(
+        client,
+        self_consistency.montar_mensagens(prompt_completo),
+        extrair_resposta,
+        n_passagens=n_passagens,
+        **opcoes
+    )
+    resultado['info'] = info
+    return resultado
 
-def avaliar_sistema_completo_melhorado(limit=None, n_passagens=5):
+def avaliar_sistema_completo_melhorado(limit=None, n_passagens=5, passagens_por_nivel=None, opcoes=None, dry_run=None):
     """Avalia com sistema completo melhorado"""
-    from scripts.analise_enem.77_avaliar_sistema_completo_adaptativo import (
-        carregar_questoes_2024_matematica
-    )
-    
     print("=" * 70)
     print("🚀 AVALIAÇÃO COM SISTEMA COMPLETO MELHORADO")
     print("=" * 70)
@@ -237,7 +101,7 @@ def avaliar_sistema_completo_melhorado(limit=None, n_passagens=5):
     print("🎯 Meta: 94%+ acurácia (superar GPT-4o com 93.85%)")
     print()
     
-    client = configurar_api()
+    client = configurar_api(dry_run)
     questions = carregar_questoes_2024_matematica()
     
     if limit:
@@ -255,6 +119,7 @@ def avaliar_sistema_completo_melhorado(limit=None, n_passagens=5):
     }
     
     resultados = []
+    total_chamadas = 0
     start_time = time.time()
     
     for i, q in enumerate(questions):
@@ -263,8 +128,11 @@ def avaliar_sistema_completo_melhorado(limit=None, n_passagens=5):
         
         print(f"[{i+1}/{len(questions)}] Questão {q_num}")
         
-        # Resolver com self-consistency
-        resultado = resolver_questao_com_self_consistency(client, q, n_passagens=n_passagens)
+        # Resolver com self-consistency (passagens podem variar por nível TRI)
+        nivel = compilador_prompts.nivel_tri(q_num)
+        n_questao = self_consistency.passagens_da_questao(q, n_passagens, passagens_por_nivel, nivel)
+        resultado = resolver_questao_com_self_consistency(client, q, n_passagens=n_questao, **(opcoes or {}))
+        total_chamadas += resultado['n_passagens']
         
         resposta_final = resultado['resposta_final']
         confianca = resultado['confianca']
@@ -295,10 +163,10 @@ def avaliar_sistema_completo_melhorado(limit=None, n_passagens=5):
             'correto': is_correct,
             'confianca': confianca,
             'nivel': info['nivel'],
-            'tema': info['tema']
+            'tema': info['tema'],
+            'n_passagens': n_questao,
+            'chamadas': resultado['n_passagens']
         })
-        
-        time.sleep(0.5)
     
     elapsed_time = time.time() - start_time
     accuracy = correct / total if total > 0 else 0
@@ -310,6 +178,8 @@ def avaliar_sistema_completo_melhorado(limit=None, n_passagens=5):
     print()
     print(f"🎯 Acurácia Geral: {accuracy:.2%} ({correct}/{total})")
     print(f"⏱️  Tempo: {elapsed_time:.1f}s ({elapsed_time/total:.1f}s por questão)")
+    print(f"📞 Chamadas à API: {total_chamadas} ({total_chamadas/total:.1f} por questão)")
+    cliente_maritaca.imprimir_metricas(client)
     print()
     
     print("📊 Por Nível:")
@@ -323,9 +193,9 @@ def avaliar_sistema_completo_melhorado(limit=None, n_passagens=5):
     # Comparação
     print("📈 Comparação:")
     print("-" * 50)
-    print(f"BrainX (Atual):     86.59%")
+    print("BrainX (Atual):     86.59%")
     print(f"BrainX (Melhorado): {accuracy:.2%}")
-    print(f"GPT-4o (Paper):    93.85%")
+    print("GPT-4o (Paper):    93.85%")
     print(f"Gap para GPT-4o:    {93.85 - accuracy*100:+.2f} pontos")
     print()
     
@@ -349,6 +219,7 @@ def avaliar_sistema_completo_melhorado(limit=None, n_passagens=5):
             'correct': correct,
             'accuracy': accuracy,
             'n_passagens': n_passagens,
+            'total_chamadas': total_chamadas,
             'stats_by_nivel': stats_by_nivel,
             'resultados': resultados,
             'timestamp': timestamp
@@ -362,8 +233,15 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Avaliar com sistema completo melhorado")
     parser.add_argument("--limit", type=int, help="Limitar número de questões")
-    parser.add_argument("--passagens", type=int, default=5, help="Número de passagens (default: 5)")
+    cliente_maritaca.adicionar_argumentos(parser)
+    self_consistency.adicionar_argumentos(parser, passagens_padrao=5)
     args = parser.parse_args()
     
-    avaliar_sistema_completo_melhorado(limit=args.limit, n_passagens=args.passagens)
+    avaliar_sistema_completo_melhorado(
+        limit=args.limit,
+        n_passagens=args.passagens,
+        passagens_por_nivel=self_consistency.interpretar_passagens_por_nivel(args.passagens_por_nivel),
+        opcoes=self_consistency.opcoes_dos_argumentos(args, args.limit or len(carregar_questoes_2024_matematica())),
+        dry_run=args.dry_run
+    )
 
@@ -16,7 +16,7 @@ import os
 import sys
 import json
 import time
-from collections import Counter, defaultdict
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -36,87 +36,15 @@ if env_file.exists():
                     key, value = line.strip().split('=', 1)
                     os.environ[key] = value
 
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    sys.exit(1)
+from scripts.analise_enem import cliente_maritaca, compilador_prompts, motor_execucao, self_consistency, telemetria
 
-# Importar módulos
-import importlib.util
-
-# Módulos do sistema adaptativo
-prompts_module_path = Path(__file__).parent / "70_prompts_adaptativos_por_tri.py"
-spec = importlib.util.spec_from_file_location("prompts_adaptativos", prompts_module_path)
-prompts_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(prompts_module)
-
-fewshots_module_path = Path(__file__).parent / "73_fewshots_customizados_por_tema.py"
-spec2 = importlib.util.spec_from_file_location("fewshots_customizados", fewshots_module_path)
-fewshots_module = importlib.util.module_from_spec(spec2)
-spec2.loader.exec_module(fewshots_module)
-
-figuras_module_path = Path(__file__).parent / "75_deteccao_figuras_simples.py"
-spec3 = importlib.util.spec_from_file_location("deteccao_figuras", figuras_module_path)
-figuras_module = importlib.util.module_from_spec(spec3)
-spec3.loader.exec_module(figuras_module)
-
-prompt_simples_module_path = Path(__file__).parent / "79_prompt_ultra_simples_facil.py"
-spec4 = importlib.util.spec_from_file_location("prompt_simples", prompt_simples_module_path)
-prompt_simples_module = importlib.util.module_from_spec(spec4)
-spec4.loader.exec_module(prompt_simples_module)
-
-# Few-shots Natureza
-natureza_module_path = Path(__file__).parent / "81_fewshots_natureza_expandido.py"
-spec5 = importlib.util.spec_from_file_location("fewshots_natureza", natureza_module_path)
-natureza_module = importlib.util.module_from_spec(spec5)
-spec5.loader.exec_module(natureza_module)
-
-# Prompt Natureza
-prompt_natureza_module_path = Path(__file__).parent / "82_prompt_especializado_natureza.py"
-spec6 = importlib.util.spec_from_file_location("prompt_natureza", prompt_natureza_module_path)
-prompt_natureza_module = importlib.util.module_from_spec(spec6)
-spec6.loader.exec_module(prompt_natureza_module)
-
-# Funções importadas
-selecionar_prompt_por_tri = prompts_module.selecionar_prompt_por_tri
-obter_info_tri = prompts_module.obter_info_tri
-classificar_por_tri = prompts_module.classificar_por_tri
-criar_prompt_com_fewshots = fewshots_module.criar_prompt_com_fewshots
-criar_prompt_com_deteccao_figura = figuras_module.criar_prompt_com_deteccao_figura
-obter_info_figura = figuras_module.obter_info_figura
-aplicar_prompt_ultra_simples = prompt_simples_module.aplicar_prompt_ultra_simples
-obter_fewshots_natureza = natureza_module.obter_fewshots_natureza
-criar_prompt_natureza = prompt_natureza_module.criar_prompt_natureza
-
-def configurar_api():
-    """Configura API"""
-    # Forçar leitura do .env (sobrescreve variáveis de ambiente se necessário)
-    env_file = Path(__file__).parent.parent.parent / ".env"
-    api_key = None
-    
-    if env_file.exists():
-        # Ler diretamente do arquivo (prioridade)
-        with open(env_file, 'r') as f:
-            for line in f:
-                if line.strip() and not line.startswith('#') and '=' in line:
-                    key, value = line.strip().split('=', 1)
-                    if key == 'CURSORMINIMAC':
-                        api_key = value
-                        os.environ[key] = value  # Atualizar também no ambiente
-                        break
-    
-    # Se não encontrou no .env, tentar variável de ambiente
-    if not api_key:
-        api_key = os.getenv('CURSORMINIMAC') or os.getenv('MARITALK_API_SECRET_KEY')
-    
-    if not api_key:
-        print("❌ Erro: Chave API não encontrada")
-        print("   Configure: export CURSORMINIMAC=... ou crie arquivo .env")
+def configurar_api(dry_run: Optional[bool] = None):
+    """Cliente Maritaca compartilhado (pool, retentativas e limitador global)"""
+    try:
+        return cliente_maritaca.configurar_api(dry_run=dry_run)
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
         sys.exit(1)
-    
-    print(f"🔑 Usando chave: ...{api_key[-10:]}")
-    return openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
 
 def carregar_questoes_todas_areas():
     """Carrega questões de todas as áreas do ENEM 2024"""
@@ -174,130 +102,26 @@ def extrair_resposta(texto: str) -> Optional[str]:
     return None
 
 def construir_prompt_final(questao: dict) -> tuple[str, dict]:
-    """Constrói prompt final com todas as melhorias"""
-    num = questao.get('number', 0)
-    area = questao.get('area', '')
-    
-    # Obter TRI (pode não existir para todas as áreas)
-    tri_info = obter_info_tri(num)
-    tri_value = tri_info.get('TRI', 0)
-    nivel = classificar_por_tri(tri_value) if tri_value > 0 else 'medio'
-    tema = tri_info.get('Tema', 'N/A')
-    
-    # Selecionar prompt adaptativo
-    if tri_value > 0:
-        prompt_base = selecionar_prompt_por_tri(tri_value)
-    else:
-        # Prompt padrão para áreas sem TRI
-        prompt_base = "Você é um especialista em questões do ENEM. Resolva a questão abaixo passo-a-passo.\n\n"
-    
-    # Aplicar prompt ultra-simples se fácil
-    if tri_value > 0 and tri_value < 650:
-        prompt_com_simples = aplicar_prompt_ultra_simples(prompt_base, questao, tri_value, obter_info_figura)
-    else:
-        prompt_com_simples = prompt_base
-    
-    # Adicionar few-shots específicos por área
-    if area == 'natural-sciences':
-        # Prompt especializado para Natureza
-        prompt_com_simples = criar_prompt_natureza(prompt_com_simples)
-        # Few-shots de Natureza (se nível médio)
-        if nivel == 'medio':
-            fewshots_nat = obter_fewshots_natureza(5)
-            # Adicionar few-shots manualmente
-            for fs in fewshots_nat:
-                prompt_com_simples += f"\n\nExemplo:\n{fs['question']}\n{fs['response']}\n"
-    elif area == 'mathematics' and nivel == 'medio':
-        # Few-shots de Matemática
-        prompt_com_fewshots = criar_prompt_com_fewshots(prompt_com_simples, tema, num_fewshots=3)
-        prompt_com_simples = prompt_com_fewshots
-    else:
-        # Manter prompt base
-        pass
-    
-    # Adicionar detecção de figuras
-    prompt_final = criar_prompt_com_deteccao_figura(prompt_com_simples, questao)
-    
-    return prompt_final, {
-        'tri': tri_value,
-        'nivel': nivel,
-        'tema': tema,
-        'area': area,
-        'tem_figura_simples': obter_info_figura(questao).get('eh_simples', False)
-    }
+    """Constrói prompt final com todas as melhorias (prefixo compilado de compilador_prompts)"""
+    return compilador_prompts.montar_prompt(questao, 'melhorado')
 
-def formatar_questao(questao: dict) -> str:
-    """Formata questão"""
-    texto = ""
-    if questao.get('context'):
-        texto += f"CONTEXTO:\n{questao['context']}\n\n"
-    if questao.get('description'):
-        desc = questao['description']
-        if isinstance(desc, list) and desc:
-            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc[0]}\n\n"
-        elif desc:
-            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc}\n\n"
-    texto += f"PERGUNTA:\n{questao.get('question', '')}\n\n"
-    texto += "ALTERNATIVAS:\n"
-    for i, alt in enumerate(questao.get('alternatives', []), 1):
-        letra = chr(64 + i)
-        texto += f"{letra}) {alt}\n"
-    return texto
+def resolver_questao(client, questao: dict, n_passagens: int = 3, **opcoes) -> Dict:
+    """Resolve questão com self-consistency (passagens em paralelo pelo motor compartilhado)"""
+    prompt_completo, info = construir_prompt_final(questao)
+    
+    resultado = self_consistency.resolver_com_self_consistency(
+        client,
+        self_consistency.montar_mensagens(prompt_completo),
+        extrair_resposta,
+        n_passagens=n_passagens,
+        **opcoes
+    )
+    resultado['info'] = info
+    return resultado
 
-def resolver_questao(client, questao: dict, n_passagens: int = 3) -> Dict:
-    """Resolve questão com self-consistency (versão rápida: 3 passagens)"""
-    respostas = []
-    
-    prompt_final, info = construir_prompt_final(questao)
-    questao_formatada = formatar_questao(questao)
-    prompt_completo = prompt_final + questao_formatada
-    
-    for i in range(n_passagens):
-        try:
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[
-                    {"role": "system", "content": "Você é um especialista em questões do ENEM."},
-                    {"role": "user", "content": prompt_completo}
-                ],
-                temperature=0.1,
-                max_tokens=2000
-            )
-            
-            resposta_texto = response.choices[0].message.content
-            resposta_extraida = extrair_resposta(resposta_texto)
-            
-            if resposta_extraida:
-                respostas.append(resposta_extraida)
-            
-            time.sleep(0.2)  # Delay menor para teste rápido
-        except Exception as e:
-            print(f"      ⚠️  Erro na passagem {i+1}: {str(e)[:50]}")
-            continue
-    
-    if not respostas:
-        return {
-            'resposta_final': None,
-            'confianca': 0.0,
-            'info': info
-        }
-    
-    # Votação majoritária
-    contador = Counter(respostas)
-    resposta_mais_frequente = contador.most_common(1)[0]
-    resposta_final = resposta_mais_frequente[0]
-    frequencia = resposta_mais_frequente[1]
-    confianca = frequencia / len(respostas)
-    
-    return {
-        'resposta_final': resposta_final,
-        'confianca': confianca,
-        'frequencia': frequencia,
-        'total_passagens': len(respostas),
-        'info': info
-    }
-
-def teste_rapido_todas_areas(questoes_por_area: int = 5, n_passagens: int = 3):
+def teste_rapido_todas_areas(questoes_por_area: int = 5, n_passagens: int = 3,
+                             passagens_por_nivel=None, opcoes=None, dry_run=None,
+                             workers: int = 4, max_por_area: Optional[int] = None, retomar: bool = True):
     """Teste rápido em todas as áreas"""
     print("=" * 70)
     print("🚀 TESTE RÁPIDO - TODAS AS ÁREAS")
@@ -314,7 +138,7 @@ def teste_rapido_todas_areas(questoes_por_area: int = 5, n_passagens: int = 3):
     print(f"📊 Configuração: {questoes_por_area} questões por área")
     print()
     
-    client = configurar_api()
+    client = configurar_api(dry_run)
     questoes_por_area_dict = carregar_questoes_todas_areas()
     
     # Mapear nomes de áreas
@@ -325,14 +149,8 @@ def teste_rapido_todas_areas(questoes_por_area: int = 5, n_passagens: int = 3):
         'mathematics': 'Matemática'
     }
     
-    # Estatísticas
-    stats_por_area = defaultdict(lambda: {'correct': 0, 'total': 0})
-    resultados = []
-    total_geral = 0
-    correct_geral = 0
-    start_time = time.time()
-    
-    # Testar cada área
+    # Questões de todas as áreas, na ordem das áreas
+    questoes_teste = []
     for area_key, area_name in area_names.items():
         questoes = questoes_por_area_dict.get(area_key, [])
         
@@ -341,46 +159,70 @@ def teste_rapido_todas_areas(questoes_por_area: int = 5, n_passagens: int = 3):
             continue
         
         # Limitar número de questões
-        questoes_teste = questoes[:questoes_por_area]
+        questoes_teste.extend(questoes[:questoes_por_area])
+        print(f"📚 {area_name}: {len(questoes[:questoes_por_area])} questões")
+    print("-" * 70)
+    
+    # Estatísticas
+    stats_por_area = defaultdict(lambda: {'correct': 0, 'total': 0})
+    totais = {'chamadas': 0, 'total': 0, 'correct': 0}
+    start_time = time.time()
+    
+    def processar(q):
+        q_num = q.get('number', 0)
         
-        print(f"📚 {area_name} ({len(questoes_teste)} questões)")
-        print("-" * 70)
+        # Resolver (passagens podem variar por nível TRI)
+        nivel = compilador_prompts.nivel_tri(q_num)
+        n_questao = self_consistency.passagens_da_questao(q, n_passagens, passagens_por_nivel, nivel)
+        resultado = resolver_questao(client, q, n_passagens=n_questao, **(opcoes or {}))
+        resposta_final = resultado['resposta_final']
         
-        for i, q in enumerate(questoes_teste, 1):
-            q_num = q.get('number', 0)
-            total_geral += 1
-            stats_por_area[area_name]['total'] += 1
-            
-            print(f"  [{i}/{len(questoes_teste)}] Questão {q_num}", end=" ... ")
-            
-            # Resolver
-            resultado = resolver_questao(client, q, n_passagens=n_passagens)
-            resposta_final = resultado['resposta_final']
-            confianca = resultado['confianca']
-            
-            # Comparar
-            correct_answer = q.get('label', '')
-            is_correct = (resposta_final == correct_answer) if resposta_final else False
-            
-            if is_correct:
-                correct_geral += 1
-                stats_por_area[area_name]['correct'] += 1
-                print(f"✅ ({resposta_final}, conf: {confianca:.0%})")
-            else:
-                print(f"❌ ({resposta_final} vs {correct_answer}, conf: {confianca:.0%})")
-            
-            resultados.append({
-                'area': area_name,
-                'numero': q_num,
-                'resposta': resposta_final,
-                'gabarito': correct_answer,
-                'correto': is_correct,
-                'confianca': confianca
-            })
-            
-            time.sleep(0.3)
+        # Comparar
+        correct_answer = q.get('label', '')
+        return {
+            'area': area_names[q['area']],
+            'numero': q_num,
+            'resposta': resposta_final,
+            'gabarito': correct_answer,
+            'correto': (resposta_final == correct_answer) if resposta_final else False,
+            'confianca': resultado['confianca'],
+            'chamadas': resultado['n_passagens'],
+            'distribuicao': resultado['distribuicao'],
+            **{campo: resultado[campo] for campo in self_consistency.CAMPOS_USO}
+        }
+    
+    def ao_concluir(i, q, resultado, retomado):
+        area_name = resultado['area']
+        totais['total'] += 1
+        totais['chamadas'] += resultado['chamadas']
+        stats_por_area[area_name]['total'] += 1
+        if resultado['correto']:
+            totais['correct'] += 1
+            stats_por_area[area_name]['correct'] += 1
+        if retomado:
+            return
         
-        print()
+        prefixo = f"  [{totais['total']}/{len(questoes_teste)}] {area_name} Q{resultado['numero']}"
+        if resultado['correto']:
+            print(f"{prefixo} ✅ ({resultado['resposta']}, conf: {resultado['confianca']:.0%})")
+        else:
+            print(f"{prefixo} ❌ ({resultado['resposta']} vs {resultado['gabarito']}, conf: {resultado['confianca']:.0%})")
+    
+    resultados = motor_execucao.executar_questoes(
+        questoes_teste, processar,
+        arquivo_progresso=Path("results") / "teste_rapido_todas_areas_PROGRESSO.json",
+        max_workers=workers,
+        max_por_area=max_por_area,
+        ao_concluir=ao_concluir,
+        resumo=lambda: {'stats_por_area': dict(stats_por_area), 'total_chamadas': totais['chamadas']},
+        retomar=retomar,
+        telemetria=telemetria.Telemetria(telemetria.arquivo_execucao("teste_rapido_todas_areas"))
+    )
+    resultados = [r for r in resultados if r]
+    total_chamadas = totais['chamadas']
+    total_geral = totais['total']
+    correct_geral = totais['correct']
+    print()
     
     elapsed_time = time.time() - start_time
     accuracy_geral = correct_geral / total_geral if total_geral > 0 else 0
@@ -392,6 +234,8 @@ def teste_rapido_todas_areas(questoes_por_area: int = 5, n_passagens: int = 3):
     print()
     print(f"🎯 Acurácia Geral: {accuracy_geral:.2%} ({correct_geral}/{total_geral})")
     print(f"⏱️  Tempo: {elapsed_time:.1f}s ({elapsed_time/total_geral:.1f}s por questão)")
+    print(f"📞 Chamadas à API: {total_chamadas} ({total_chamadas/total_geral:.1f} por questão)")
+    cliente_maritaca.imprimir_metricas(client)
     print()
     
     print("📊 Por Área:")
@@ -435,7 +279,12 @@ def teste_rapido_todas_areas(questoes_por_area: int = 5, n_passagens: int = 3):
             'accuracy': accuracy_geral,
             'questoes_por_area': questoes_por_area,
             'n_passagens': n_passagens,
+            'total_chamadas': total_chamadas,
             'stats_por_area': dict(stats_por_area),
+            'variante': {'passagens': n_passagens, 'passagens_por_nivel': passagens_por_nivel,
+                         **{k: v for k, v in (opcoes or {}).items() if k != 'orcamento'}},
+            'uso': cliente_maritaca.agregar_uso(resultados),
+            'uso_por_area': cliente_maritaca.agregar_uso(resultados, 'area'),
             'resultados': resultados,
             'timestamp': timestamp
         }, f, indent=2, ensure_ascii=False)
@@ -448,8 +297,19 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Teste rápido todas as áreas")
     parser.add_argument("--questoes_por_area", type=int, default=5, help="Questões por área (default: 5)")
-    parser.add_argument("--passagens", type=int, default=3, help="Número de passagens (default: 3)")
+    cliente_maritaca.adicionar_argumentos(parser)
+    self_consistency.adicionar_argumentos(parser, passagens_padrao=3)
+    motor_execucao.adicionar_argumentos(parser)
     args = parser.parse_args()
     
-    teste_rapido_todas_areas(questoes_por_area=args.questoes_por_area, n_passagens=args.passagens)
+    teste_rapido_todas_areas(
+        questoes_por_area=args.questoes_por_area,
+        n_passagens=args.passagens,
+        passagens_por_nivel=self_consistency.interpretar_passagens_por_nivel(args.passagens_por_nivel),
+        opcoes=self_consistency.opcoes_dos_argumentos(args, 4 * args.questoes_por_area),
+        dry_run=args.dry_run,
+        workers=args.workers,
+        max_por_area=args.max_por_area,
+        retomar=not args.reiniciar
+    )
 
@@ -3,12 +3,13 @@
 📊 Carrega dados TRI do Google Sheets (ENEM 2009-2022)
 
 Fonte: https://docs.google.com/spreadsheets/d/1aCR6Q9LBd5-byvzyFAECuwkTZc8bmRtwZxZ_m4U1FA8/edit
+Lida do snapshot local de dados_tri.py; a planilha só é baixada com --atualizar.
 """
 
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 
 try:
     import gspread
@@ -18,97 +19,54 @@ except ImportError:
     HAS_GSPREAD = False
     print("⚠️  gspread não instalado. Instale com: pip install gspread google-auth")
 
-try:
-    import pandas as pd
-    HAS_PANDAS = True
-except ImportError:
-    HAS_PANDAS = False
-    print("⚠️  pandas não instalado. Instale com: pip install pandas")
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem import dados_tri
 
 # Mapeamento de áreas
-AREA_MAP = {
-    'CH': 'human-sciences',  # Ciências Humanas
-    'CN': 'natural-sciences',  # Ciências da Natureza
-    'LC': 'languages',  # Linguagens
-    'MT': 'mathematics'  # Matemática
-}
+AREA_MAP = dados_tri.AREA_MAP
 
-def carregar_tri_via_pandas(url: str) -> Dict:
+def carregar_tri(url: str, atualizar: bool = False) -> dados_tri.TabelaTRI:
     """
-    Carrega dados TRI da planilha do Google Sheets usando pandas
+    Carrega dados TRI do snapshot local; com atualizar=True baixa antes a
+    planilha do Google Sheets e grava uma nova versão do snapshot
     
     Args:
         url: URL da planilha do Google Sheets
+        atualizar: Baixar a planilha antes de carregar
         
     Returns:
-        Dict com dados TRI organizados por ano, área e questão
+        TabelaTRI com os dados por ano e questão
     """
-    if not HAS_PANDAS:
-        raise ImportError("pandas é necessário para carregar dados")
-    
-    # Converter URL do Google Sheets para formato CSV
-    sheet_id = url.split('/d/')[1].split('/')[0]
-    csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
-    
-    print(f"📥 Baixando dados TRI de: {csv_url}")
-    
-    try:
-        df = pd.read_csv(csv_url)
-        print(f"✅ Dados carregados: {len(df)} linhas")
-        print(f"   Colunas: {list(df.columns)}")
-        
-        # Analisar estrutura
-        print("\n📊 Primeiras linhas:")
-        print(df.head(10))
-        
-        return df.to_dict('records')
-    except Exception as e:
-        print(f"❌ Erro ao carregar: {e}")
-        return {}
+    if atualizar:
+        sheet_id = url.split('/d/')[1].split('/')[0]
+        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
+        colunas = dados_tri.processar_planilha(dados_tri.baixar_planilha(csv_url))
+        manifesto = dados_tri.salvar_snapshot(colunas, csv_url)
+        print(f"✅ Dados carregados: {manifesto['linhas']} linhas (snapshot versão {manifesto['versao']})")
+    
+    return dados_tri.tabela()
 
-def processar_dados_tri(dados_raw: List[Dict]) -> Dict:
+def processar_dados_tri(tabela: dados_tri.TabelaTRI) -> Dict:
     """
-    Processa dados TRI brutos e organiza por questão
+    Organiza dados TRI por ano, área e questão
     
     Args:
-        dados_raw: Lista de dicionários com dados brutos da planilha
+        tabela: TabelaTRI do snapshot
         
     Returns:
         Dict organizado: {ano: {area: {questao_num: tri_value}}}
     """
     tri_organizado = {}
     
-    for linha in dados_raw:
-        area_codigo = linha.get('area', '')
-        ano = linha.get('ano', '')
-        acertos = linha.get('acertos', 0)
-        media = linha.get('media', 0)
-        min_val = linha.get('min', 0)
-        max_val = linha.get('max', 0)
-        
-        # Mapear área
-        area = AREA_MAP.get(area_codigo, area_codigo.lower())
-        
-        if not ano or not area:
-            continue
-        
-        if ano not in tri_organizado:
-            tri_organizado[ano] = {}
-        
-        if area not in tri_organizado[ano]:
-            tri_organizado[ano][area] = {}
-        
-        # O número de acertos corresponde ao número da questão (0-indexed ou 1-indexed?)
-        # Assumindo que acertos=0 é questão 1, acertos=1 é questão 2, etc.
-        questao_num = int(acertos) + 1  # Converter para 1-indexed
-        
-        # Usar média TRI como valor principal
-        tri_organizado[ano][area][questao_num] = {
-            'TRI': float(media),
-            'TRI_min': float(min_val),
-            'TRI_max': float(max_val),
-            'acertos': int(acertos)
-        }
+    for ano in tabela.anos:
+        for numero, info in tabela.por_questao(ano).items():
+            tri_organizado.setdefault(ano, {}).setdefault(info['area'], {})[info['questao_na_area']] = {
+                'TRI': info['TRI'],
+                'TRI_min': info['TRI_min'],
+                'TRI_max': info['TRI_max'],
+                'acertos': info['questao_na_area'] - 1
+            }
     
     return tri_organizado
 
@@ -129,16 +87,19 @@ def main():
     print("=" * 70)
     print()
     
-    # Carregar dados
-    dados_raw = carregar_tri_via_pandas(url)
+    atualizar = "--atualizar" in sys.argv[1:]
     
-    if not dados_raw:
-        print("❌ Não foi possível carregar dados")
+    # Carregar dados
+    try:
+        tabela = carregar_tri(url, atualizar)
+    except (OSError, ValueError) as e:
+        print(f"❌ Não foi possível carregar dados: {e}")
+        print("   Para baixar a planilha: python scripts/analise_enem/90_carregar_tri_google_sheets.py --atualizar")
         return
     
     # Processar
     print("\n🔄 Processando dados...")
-    tri_organizado = processar_dados_tri(dados_raw)
+    tri_organizado = processar_dados_tri(tabela)
     
     # Estatísticas
     print("\n📊 Estatísticas:")
@@ -3,94 +3,56 @@
 📊 Processa dados TRI históricos do Google Sheets e integra ao sistema
 
 Fonte: https://docs.google.com/spreadsheets/d/1aCR6Q9LBd5-byvzyFAECuwkTZc8bmRtwZxZ_m4U1FA8/edit
+Lida do snapshot local de dados_tri.py; a planilha só é baixada com --atualizar.
 """
 
 import json
-import pandas as pd
+import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict
 
-# Mapeamento de áreas
-AREA_MAP = {
-    'CH': 'human-sciences',  # Ciências Humanas (questões 46-90)
-    'CN': 'natural-sciences',  # Ciências da Natureza (questões 91-135)
-    'LC': 'languages',  # Linguagens (questões 1-45)
-    'MT': 'mathematics'  # Matemática (questões 136-180)
-}
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-# Mapeamento de número de questão por área (ENEM padrão)
-QUESTAO_OFFSET = {
-    'languages': 1,      # Questões 1-45
-    'human-sciences': 46,  # Questões 46-90
-    'natural-sciences': 91,  # Questões 91-135
-    'mathematics': 136    # Questões 136-180
-}
+from scripts.analise_enem import dados_tri
 
-def carregar_dados_tri() -> pd.DataFrame:
-    """Carrega dados TRI da planilha do Google Sheets"""
-    sheet_id = "1aCR6Q9LBd5-byvzyFAECuwkTZc8bmRtwZxZ_m4U1FA8"
-    csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
-    
-    print(f"📥 Baixando dados TRI...")
-    df = pd.read_csv(csv_url)
-    
-    # Converter valores numéricos (podem estar com vírgula como separador decimal)
-    for col in ['min', 'max', 'media', 'mediana']:
-        if col in df.columns:
-            df[col] = df[col].astype(str).str.replace(',', '.').astype(float)
+# Mapeamento de áreas e de número de questão por área (ENEM padrão) ficam em dados_tri
+AREA_MAP = dados_tri.AREA_MAP
+CODIGO_AREA = {area: codigo for codigo, area in AREA_MAP.items()}
+QUESTAO_OFFSET = dados_tri.QUESTAO_OFFSET
+
+def carregar_dados_tri(atualizar: bool = False) -> dados_tri.TabelaTRI:
+    """
+    Carrega dados TRI do snapshot local (data/tri/); só baixa a planilha do
+    Google Sheets com atualizar=True (grava uma nova versão do snapshot)
+    """
+    if atualizar:
+        colunas = dados_tri.processar_planilha(dados_tri.baixar_planilha())
+        manifesto = dados_tri.salvar_snapshot(colunas, dados_tri.CSV_URL)
+        print(f"💾 Snapshot TRI versão {manifesto['versao']}: {manifesto['arquivo']}")
     
-    print(f"✅ Carregados {len(df)} registros")
-    print(f"   Anos: {sorted(df['ano'].unique())}")
-    print(f"   Áreas: {df['area'].unique()}")
+    tabela = dados_tri.tabela()
+    print(f"✅ Snapshot TRI carregado")
+    print(f"   Anos: {tabela.anos}")
     
-    return df
+    return tabela
 
-def processar_tri_por_questao(df: pd.DataFrame, ano: int = 2024) -> Dict:
+def processar_tri_por_questao(tabela: dados_tri.TabelaTRI, ano: int = 2024) -> Dict:
     """
-    Processa dados TRI e organiza por número de questão
+    Organiza dados TRI por número de questão
     
     Args:
-        df: DataFrame com dados TRI
-        ano: Ano para processar (se 2024, usa dados mais recentes disponíveis)
+        tabela: TabelaTRI do snapshot
+        ano: Ano para processar (se não houver, usa dados mais recentes disponíveis)
     
     Returns:
         Dict: {numero_questao: {"TRI": valor, "area": area, "ano": ano}}
     """
-    tri_por_questao = {}
-    
-    # Se ano 2024, usar dados mais recentes disponíveis
-    anos_disponiveis = sorted(df['ano'].unique(), reverse=True)
-    ano_usar = ano if ano in anos_disponiveis else anos_disponiveis[0]
-    
+    ano_usar = tabela.ano_disponivel(ano)
     print(f"\n📊 Processando dados do ano {ano_usar}...")
     
-    df_ano = df[df['ano'] == ano_usar].copy()
-    
-    for _, row in df_ano.iterrows():
-        area_codigo = row['area']
-        area = AREA_MAP.get(area_codigo)
-        
-        if not area:
-            continue
-        
-        # "acertos" na planilha = número da questão dentro da área (0-indexed)
-        # Converter para número global da questão no ENEM
-        questao_na_area = int(row['acertos']) + 1  # 1-indexed dentro da área
-        questao_global = QUESTAO_OFFSET[area] + questao_na_area - 1
-        
-        # Usar média TRI como valor principal
-        tri_value = float(row['media'])
-        
-        tri_por_questao[questao_global] = {
-            'TRI': tri_value,
-            'TRI_min': float(row['min']),
-            'TRI_max': float(row['max']),
-            'TRI_mediana': float(row['mediana']),
-            'area': area,
-            'area_codigo': area_codigo,
-            'ano': int(ano_usar),
-            'questao_na_area': questao_na_area
-        }
+    tri_por_questao = tabela.por_questao(ano_usar)
+    for dados in tri_por_questao.values():
+        dados['area_codigo'] = CODIGO_AREA[dados['area']]
     
     return tri_por_questao
 
@@ -157,11 +119,19 @@ def main():
     print("=" * 70)
     print()
     
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Processa dados TRI históricos")
+    parser.add_argument("--atualizar", action="store_true",
+                        help="Baixa a planilha do Google Sheets antes (nova versão do snapshot)")
+    parser.add_argument("--ano", type=int, default=2024, help="Ano (default: 2024 ou o mais recente)")
+    args = parser.parse_args()
+    
     # Carregar dados
-    df = carregar_dados_tri()
+    tabela = carregar_dados_tri(args.atualizar)
     
-    # Processar para ENEM 2024 (ou ano mais recente disponível)
-    tri_por_questao = processar_tri_por_questao(df, ano=2024)
+    # Processar para o ano pedido (ou ano mais recente disponível)
+    tri_por_questao = processar_tri_por_questao(tabela, ano=args.ano)
     
     print(f"\n✅ Processadas {len(tri_por_questao)} questões")
     
@@ -203,7 +173,7 @@ def main():
     
     print("\n💡 Próximos passos:")
     print("   1. Revisar dados gerados")
-    print("   2. Integrar TRI_DATA em 70_prompts_adaptativos_por_tri.py")
+    print("   2. Integrar TRI_DATA em prompts/dados/tri_data.json (lido por 70_prompts_adaptativos_por_tri.py)")
     print("   3. Testar sistema com dados completos")
 
 if __name__ == "__main__":
@@ -17,31 +17,32 @@ from pathlib import Path
 from typing import List, Dict, Tuple
 from collections import defaultdict
 import random
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.analise_enem.corpus import carregar_corpus
+
 def carregar_todas_questoes(processed_dir: Path) -> List[Dict]:
     """Carrega TODAS as questões de 2009-2025"""
     questoes = []
     
     print("📥 Carregando TODAS as questões (2009-2025)...")
     
-    for jsonl_file in sorted(processed_dir.glob("enem_*_completo.jsonl")):
-        ano = jsonl_file.stem.replace('enem_', '').replace('_completo', '')
-        count = 0
-        
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    questao = json.loads(line)
-                    # Validar questão
-                    if (questao.get('question') and 
-                        questao.get('label', '').upper() in ['A', 'B', 'C', 'D', 'E']):
-                        questao['ano'] = int(ano) if ano.isdigit() else None
-                        questoes.append(questao)
-                        count += 1
+    corpus = carregar_corpus(processed_dir)
+    
+    # Validar questão pelas colunas (sem materializar as inválidas)
+    validas = corpus.comprimentos('question') > 0
+    validas &= np.isin(np.char.upper(corpus.labels), ['A', 'B', 'C', 'D', 'E'])
+    
+    for ano, indices in sorted(corpus.indice_ano.items()):
+        indices = indices[validas[indices]]
+        for i in indices:
+            questao = corpus.questao(i)
+            questao['ano'] = ano
+            questoes.append(questao)
         
-        print(f"   {ano}: {count} questões válidas")
+        print(f"   {ano}: {len(indices)} questões válidas")
     
     print(f"✅ Total: {len(questoes)} questões carregadas")
     return questoes
@@ -12,10 +12,11 @@ Metodologia correta:
 5. Salvar modelo treinado
 """
 
+import hashlib
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 import random
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -25,7 +26,7 @@ try:
         AutoTokenizer, AutoModelForSequenceClassification,
         TrainingArguments, Trainer, DataCollatorWithPadding
     )
-    from datasets import Dataset
+    from datasets import Dataset, load_from_disk
     import torch
     HAS_TRANSFORMERS = True
 except ImportError:
@@ -55,47 +56,56 @@ def carregar_dataset(training_dir: Path) -> Dict[str, List[Dict]]:
     
     return datasets
 
-def preparar_dataset_huggingface(dados: List[Dict], tokenizer, max_length: int = 512):
-    """Prepara dataset no formato HuggingFace"""
-    inputs = []
-    labels = []
+LABEL_MAP = {'A': 0, 'B': 1, 'C': 2, 'D': 3, 'E': 4}
+
+def chave_tokenizacao(dados: List[Dict], tokenizer, max_length: int) -> str:
+    """Hash do tokenizador (nome, classe, vocabulário), de max_length e dos exemplos"""
+    h = hashlib.sha256()
+    h.update(f"{tokenizer.name_or_path}|{type(tokenizer).__name__}|{len(tokenizer)}|{max_length}".encode())
+    for item in dados:
+        h.update(json.dumps([item['input'], item['output']], ensure_ascii=False).encode())
+    return h.hexdigest()[:16]
+
+def preparar_dataset_huggingface(dados: List[Dict], tokenizer, max_length: int = 512,
+                                 cache_dir: Optional[Path] = None, nome: str = "dataset"):
+    """
+    Tokeniza em lote (tokenizador rápido), sem padding: os ids ficam com o
+    tamanho real e a coluna 'length' alimenta o group_by_length do Trainer;
+    o DataCollatorWithPadding completa cada batch só até o maior exemplo.
+    Com cache_dir, o resultado fica em Arrow (mmap) em
+    cache_dir/<nome>_<hash do tokenizador e dos dados> e é reaproveitado.
+    """
+    destino = None
+    if cache_dir is not None:
+        destino = Path(cache_dir) / f"{nome}_{chave_tokenizacao(dados, tokenizer, max_length)}"
+        if destino.exists():
+            print(f"   ♻️  {nome}: tokenização em cache ({destino.name})")
+            return load_from_disk(str(destino))
     
-    # Mapear respostas para números
-    label_map = {'A': 0, 'B': 1, 'C': 2, 'D': 3, 'E': 4}
+    def tokenizar(lote):
+        encoded = tokenizer(lote['texto'], truncation=True, max_length=max_length)
+        encoded['length'] = [len(ids) for ids in encoded['input_ids']]
+        return encoded
     
-    for item in dados:
-        texto = item['input']
-        resposta = item['output']
-        
-        # Tokenizar
-        encoded = tokenizer(
-            texto,
-            truncation=True,
-            padding='max_length',
-            max_length=max_length,
-            return_tensors='pt'
-        )
-        
-        inputs.append({
-            'input_ids': encoded['input_ids'].squeeze(),
-            'attention_mask': encoded['attention_mask'].squeeze()
-        })
-        labels.append(label_map.get(resposta, 0))
-    
-    return Dataset.from_dict({
-        'input_ids': [x['input_ids'] for x in inputs],
-        'attention_mask': [x['attention_mask'] for x in inputs],
-        'labels': labels
-    })
+    dataset = Dataset.from_dict({
+        'texto': [item['input'] for item in dados],
+        'labels': [LABEL_MAP.get(item['output'], 0) for item in dados]
+    }).map(tokenizar, batched=True, batch_size=1000, remove_columns=['texto'])
+    
+    if destino is not None:
+        dataset.save_to_disk(str(destino))
+        dataset = load_from_disk(str(destino))
+    return dataset
 
 def treinar_modelo(
-    model_name: str = "neuralmind/bert-base-portuguese-cased",
     train_dataset,
     val_dataset,
     output_dir: Path,
+    model_name: str = "neuralmind/bert-base-portuguese-cased",
     num_epochs: int = 3,
     batch_size: int = 16,
-    learning_rate: float = 2e-5
+    learning_rate: float = 2e-5,
+    cache_dir: Optional[Path] = None
 ):
     """Treina modelo usando HuggingFace Trainer"""
     
@@ -110,9 +120,10 @@ def treinar_modelo(
     
     # Preparar datasets
     print("\n🔄 Preparando datasets...")
-    train_hf = preparar_dataset_huggingface(train_dataset, tokenizer)
-    val_hf = preparar_dataset_huggingface(val_dataset, tokenizer)
-    print("✅ Datasets preparados")
+    train_hf = preparar_dataset_huggingface(train_dataset, tokenizer, cache_dir=cache_dir, nome="train")
+    val_hf = preparar_dataset_huggingface(val_dataset, tokenizer, cache_dir=cache_dir, nome="validation")
+    media = sum(train_hf['length']) / max(1, len(train_hf))
+    print(f"✅ Datasets preparados (média de {media:.0f} tokens por exemplo no treino)")
     
     # Configurar treinamento
     training_args = TrainingArguments(
@@ -131,10 +142,15 @@ def treinar_modelo(
         greater_is_better=True,
         save_total_limit=3,
         fp16=torch.cuda.is_available(),  # Usar GPU se disponível
+        group_by_length=True,  # batches de tamanhos parecidos (menos padding)
+        length_column_name="length",
     )
     
-    # Data collator
-    data_collator = DataCollatorWithPadding(tokenizer=tokenizer)
+    # Data collator (padding dinâmico até o maior exemplo do batch)
+    data_collator = DataCollatorWithPadding(
+        tokenizer=tokenizer,
+        pad_to_multiple_of=8 if torch.cuda.is_available() else None
+    )
     
     # Métricas
     def compute_metrics(eval_pred):
@@ -218,7 +234,8 @@ def main():
         output_dir=output_dir,
         num_epochs=3,
         batch_size=16,
-        learning_rate=2e-5
+        learning_rate=2e-5,
+        cache_dir=training_dir / "tokenizado"
     )
     
     # Salvar resultados
@@ -13,31 +13,28 @@ Metodologia correta:
 
 import json
 import sys
+import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-try:
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
-    import torch
-    HAS_TRANSFORMERS = True
-except ImportError:
-    HAS_TRANSFORMERS = False
+from scripts.analise_enem.inferencia_modelo import BACKENDS, HAS_TRANSFORMERS, MotorInferencia
+
+if not HAS_TRANSFORMERS:
     print("❌ transformers não instalado")
     print("   Execute: pip install transformers torch")
 
-def carregar_modelo_treinado(model_dir: Path):
-    """Carrega modelo e tokenizer treinados"""
-    print(f"📥 Carregando modelo de: {model_dir}")
+def carregar_modelo_treinado(model_dir: Path, backend: str = 'pytorch', batch_size: int = 32,
+                             num_threads: Optional[int] = None) -> MotorInferencia:
+    """Carrega modelo e tokenizer treinados no motor de inferência em lote"""
+    print(f"📥 Carregando modelo de: {model_dir} (backend: {backend})")
     
-    tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
-    model = AutoModelForSequenceClassification.from_pretrained(str(model_dir))
-    model.eval()
+    motor = MotorInferencia(model_dir, backend=backend, batch_size=batch_size, num_threads=num_threads)
     
     print("✅ Modelo carregado")
-    return model, tokenizer
+    return motor
 
 def carregar_dataset_teste(training_dir: Path) -> List[Dict]:
     """Carrega conjunto de teste"""
@@ -56,40 +53,21 @@ def carregar_dataset_teste(training_dir: Path) -> List[Dict]:
     print(f"✅ {len(dados)} questões de teste carregadas")
     return dados
 
-def prever_resposta(model, tokenizer, texto: str) -> str:
-    """Faz predição usando modelo treinado"""
-    # Tokenizar
-    encoded = tokenizer(
-        texto,
-        truncation=True,
-        padding='max_length',
-        max_length=512,
-        return_tensors='pt'
-    )
-    
-    # Predição
-    with torch.no_grad():
-        outputs = model(**encoded)
-        predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        predicted_class = predictions.argmax(dim=-1).item()
-    
-    # Mapear de volta para letra
-    label_map = {0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E'}
-    return label_map.get(predicted_class, 'A')
-
-def avaliar_modelo(model, tokenizer, dataset_teste: List[Dict]) -> Dict:
-    """Avalia modelo no conjunto de teste"""
+def avaliar_modelo(motor: MotorInferencia, dataset_teste: List[Dict]) -> Dict:
+    """Avalia modelo no conjunto de teste (inferência em lote, ordenada por tamanho)"""
     print("\n🔄 Avaliando modelo...")
     
+    inicio = time.monotonic()
+    predicoes = motor.prever_respostas([item['input'] for item in dataset_teste])
+    duracao = time.monotonic() - inicio
+    print(f"   {len(dataset_teste)} questões em {duracao:.1f}s")
+    
     resultados = []
     correct_count = 0
     
-    for i, item in enumerate(dataset_teste):
-        texto = item['input']
+    for item, predicao in zip(dataset_teste, predicoes):
         resposta_correta = item['output']
-        
-        # Predição
-        resposta_predita = prever_resposta(model, tokenizer, texto)
+        resposta_predita = predicao['resposta']
         
         # Verificar acerto
         acerto = resposta_predita == resposta_correta
@@ -102,11 +80,9 @@ def avaliar_modelo(model, tokenizer, dataset_teste: List[Dict]) -> Dict:
             'area': item.get('area', ''),
             'resposta_correta': resposta_correta,
             'resposta_predita': resposta_predita,
-            'acerto': acerto
+            'acerto': acerto,
+            'probabilidades': predicao['probabilidades']
         })
-        
-        if (i + 1) % 50 == 0:
-            print(f"   Processadas: {i + 1}/{len(dataset_teste)}")
     
     # Calcular métricas
     acuracia_geral = (correct_count / len(dataset_teste)) * 100 if dataset_teste else 0
@@ -150,11 +126,22 @@ def avaliar_modelo(model, tokenizer, dataset_teste: List[Dict]) -> Dict:
         'correct': correct_count,
         'acuracia_por_area': acuracia_por_area,
         'acuracia_por_ano': acuracia_por_ano,
+        'backend': motor.backend,
+        'tempo_inferencia_s': duracao,
         'resultados': resultados
     }
 
 def main():
     """Função principal"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Avalia o modelo treinado no conjunto de teste")
+    parser.add_argument("--backend", choices=BACKENDS, default='pytorch',
+                        help="pytorch, quantizado (int8 dinâmico) ou onnx (default: pytorch)")
+    parser.add_argument("--batch-size", type=int, default=32, help="Questões por batch (default: 32)")
+    parser.add_argument("--threads", type=int, default=None, help="Threads de CPU na inferência")
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("📊 AVALIAÇÃO DE MODELO TREINADO - ENEM")
     print("=" * 70)
@@ -177,7 +164,7 @@ def main():
         return
     
     # Carregar modelo
-    model, tokenizer = carregar_modelo_treinado(model_dir)
+    motor = carregar_modelo_treinado(model_dir, args.backend, args.batch_size, args.threads)
     
     # Carregar dataset de teste
     print("\n📥 Carregando dataset de teste...")
@@ -187,7 +174,7 @@ def main():
         return
     
     # Avaliar
-    resultados = avaliar_modelo(model, tokenizer, dataset_teste)
+    resultados = avaliar_modelo(motor, dataset_teste)
     
     # Mostrar resultados
     print("\n" + "=" * 70)
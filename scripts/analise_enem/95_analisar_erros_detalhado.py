@@ -14,102 +14,80 @@ Foco:
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List
-from collections import defaultdict, Counter
-import re
+from typing import Dict, Iterable, Iterator
+from collections import Counter
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def carregar_resultados(results_dir: Path) -> List[Dict]:
-    """Carrega resultados de avaliação"""
-    resultados = []
-    
-    # Procurar arquivos de resultados
-    for json_file in sorted(results_dir.glob("*.json"), reverse=True):
+from scripts.analise_enem.resultados_jsonl import ContagemPor, Registro, ler_registros
+
+SAIDA_JSON = "analise_erros_detalhada.json"
+
+def carregar_resultados(results_dir: Path) -> Iterator[Registro]:
+    """Registros de todas as avaliações em results/ (JSONL em fluxo e JSON antigos)"""
+    arquivos = sorted(list(results_dir.glob("*.jsonl")) + list(results_dir.glob("*.json")), reverse=True)
+    for arquivo in arquivos:
+        if arquivo.name == SAIDA_JSON or arquivo.name.endswith("_PROGRESSO.json"):
+            continue
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # Verificar se tem resultados
-                if 'results' in data:
-                    resultados.extend(data['results'])
-                elif isinstance(data, list):
-                    resultados.extend(data)
-        except:
+            yield from ler_registros(arquivo)
+        except (OSError, ValueError, AttributeError):
             continue
-    
-    return resultados
 
-def analisar_padroes_erro(resultados: List[Dict]) -> Dict:
-    """Analisa padrões de erro"""
-    erros = [r for r in resultados if not r.get('correto', False)]
-    
-    # Padrões de erro (resposta correta → resposta errada)
+def analisar_padroes_erro(registros: Iterable[Registro]) -> Dict:
+    """Padrões de erro, acurácia por área e problemas de extração numa única passada"""
     padroes = Counter()
-    for erro in erros:
-        correta = erro.get('resposta_correta', '') or erro.get('correct_label', '')
-        predita = erro.get('resposta_predita', '') or erro.get('model_answer', '')
-        if correta and predita:
-            padrao = f"{correta}→{predita}"
-            padroes[padrao] += 1
-    
-    # Por área
-    erros_por_area = defaultdict(int)
-    total_por_area = defaultdict(int)
-    
-    for r in resultados:
-        area = r.get('area', 'unknown')
-        total_por_area[area] += 1
-        if not r.get('correto', False):
-            erros_por_area[area] += 1
-    
-    acuracia_por_area = {}
-    for area in total_por_area:
-        total = total_por_area[area]
-        erros = erros_por_area[area]
-        acertos = total - erros
-        acuracia_por_area[area] = {
-            'acuracia': (acertos / total * 100) if total > 0 else 0,
-            'acertos': acertos,
-            'erros': erros,
-            'total': total
-        }
-    
-    # Por número de questão
+    por_area = ContagemPor()
     erros_por_numero = {}
-    for erro in erros:
-        num = erro.get('numero', 0) or erro.get('number', 0)
-        if num:
-            erros_por_numero[num] = erro
-    
-    return {
-        'total_erros': len(erros),
-        'total_questoes': len(resultados),
-        'padroes_erro': dict(padroes.most_common(10)),
-        'acuracia_por_area': acuracia_por_area,
-        'erros_por_numero': erros_por_numero,
-        'exemplos_erro': erros[:10]  # Primeiros 10 erros
-    }
-
-def analisar_extracao_resposta(resultados: List[Dict]) -> Dict:
-    """Analisa se a extração de resposta está funcionando"""
+    exemplos_erro = []
     problemas_extracao = []
+    total_problemas = 0
     
-    for r in resultados:
-        predita = r.get('resposta_predita', '') or r.get('model_answer', '')
-        resposta_raw = r.get('model_response_raw', '') or r.get('resposta_raw', '')
+    for registro in registros:
+        por_area.adicionar(registro.area if registro.area != 'desconhecida' else 'unknown', registro.correto)
         
-        # Verificar se extração falhou
-        if not predita and resposta_raw:
-            problemas_extracao.append({
-                'id': r.get('id', ''),
-                'numero': r.get('numero', 0),
-                'resposta_raw': resposta_raw[:200] if resposta_raw else None
-            })
+        # Extração falhou: há resposta bruta mas nenhuma letra
+        resposta_raw = registro.get('model_response_raw', '') or registro.get('resposta_raw', '')
+        if not registro.resposta and resposta_raw:
+            total_problemas += 1
+            if len(problemas_extracao) < 5:
+                problemas_extracao.append({
+                    'id': registro.chave,
+                    'numero': registro.numero or 0,
+                    'resposta_raw': resposta_raw[:200]
+                })
+        
+        if registro.correto:
+            continue
+        # Padrões de erro (resposta correta → resposta errada)
+        if registro.gabarito and registro.resposta:
+            padroes[f"{registro.gabarito}→{registro.resposta}"] += 1
+        if registro.numero:
+            erros_por_numero[registro.numero] = registro.dados
+        if len(exemplos_erro) < 10:
+            exemplos_erro.append(registro.dados)
+    
+    acuracia_por_area = {
+        area: {
+            'acuracia': contagem.acuracia,
+            'acertos': contagem.acertos,
+            'erros': contagem.erros,
+            'total': contagem.total
+        }
+        for area, contagem in por_area.items()
+    }
     
     return {
-        'total_problemas_extracao': len(problemas_extracao),
-        'exemplos': problemas_extracao[:5]
+        'total_erros': por_area.geral.erros,
+        'total_questoes': por_area.geral.total,
+        'padroes_erro': dict(padroes.most_common(10)),
+        'acuracia_por_area': acuracia_por_area,
+        'erros_por_numero': erros_por_numero,
+        'exemplos_erro': exemplos_erro,  # Primeiros 10 erros
+        'problemas_extracao': {
+            'total_problemas_extracao': total_problemas,
+            'exemplos': problemas_extracao
+        }
     }
 
 def gerar_relatorio(analise: Dict, output_file: Path):
@@ -178,21 +156,16 @@ def main():
         print(f"❌ Diretório não encontrado: {results_dir}")
         return
     
-    # Carregar resultados
-    print("📥 Carregando resultados...")
-    resultados = carregar_resultados(results_dir)
+    # Ler e analisar resultados (em fluxo, sem carregar tudo em memória)
+    print("📥 Lendo e analisando resultados...")
+    analise = analisar_padroes_erro(carregar_resultados(results_dir))
     
-    if not resultados:
+    if not analise['total_questoes']:
         print("❌ Nenhum resultado encontrado")
         print("   Execute primeiro uma avaliação")
         return
     
-    print(f"✅ {len(resultados)} resultados carregados")
-    
-    # Analisar
-    print("\n🔄 Analisando erros...")
-    analise = analisar_padroes_erro(resultados)
-    analise['problemas_extracao'] = analisar_extracao_resposta(resultados)
+    print(f"✅ {analise['total_questoes']} resultados analisados")
     
     # Mostrar resumo
     print("\n📊 RESUMO:")
@@ -217,7 +190,7 @@ def main():
     gerar_relatorio(analise, output_file)
     
     # Salvar JSON também
-    json_file = results_dir / "analise_erros_detalhada.json"
+    json_file = results_dir / SAIDA_JSON
     with open(json_file, 'w', encoding='utf-8') as f:
         json.dump(analise, f, indent=2, ensure_ascii=False)
     
@@ -2,20 +2,44 @@
 """
 🔍 ANÁLISE DE ERROS DO JSON - NATUREZA
 
-Analisa o JSON de resultados do Colab para identificar padrões de erro.
+Analisa o JSON (ou JSONL) de resultados do Colab para identificar padrões
+de erro. Os resultados são lidos em fluxo e agregados numa única passada.
 """
 
-import json
 import sys
 from pathlib import Path
-from collections import Counter, defaultdict
+from collections import Counter
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem.resultados_jsonl import ler_registros
 
 def analisar_json(json_path: Path):
-    """Analisa JSON de resultados"""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    resultados = data.get('resultados', [])
+    """Analisa JSON/JSONL de resultados"""
+    total = 0
+    corretos = 0
+    padroes_erro = Counter()
+    erros_list = []
+    respostas_preditas = Counter()
+    respostas_corretas = Counter()
+    soma_confianca = {True: 0.0, False: 0.0}
+    
+    for registro in ler_registros(json_path):
+        total += 1
+        corretos += registro.correto
+        soma_confianca[registro.correto] += registro.confianca or 0
+        predita = registro.resposta or ''
+        correta = registro.gabarito or ''
+        if predita:
+            respostas_preditas[predita] += 1
+        if correta and correta != 'Anulado':
+            respostas_corretas[correta] += 1
+        if not registro.correto:
+            erros_list.append({'numero': registro.numero, 'resposta': registro.resposta,
+                               'gabarito': registro.gabarito, 'confianca': registro.confianca or 0})
+            # Padrões de erro (correta → errada)
+            if correta and predita and correta != 'Anulado':
+                padroes_erro[f"{correta}→{predita}"] += 1
     
     print("=" * 70)
     print("🔍 ANÁLISE DE ERROS - NATUREZA")
@@ -23,8 +47,6 @@ def analisar_json(json_path: Path):
     print()
     
     # Estatísticas gerais
-    total = len(resultados)
-    corretos = sum(1 for r in resultados if r.get('correto', False))
     erros = total - corretos
     
     print(f"📊 ESTATÍSTICAS GERAIS:")
@@ -33,17 +55,6 @@ def analisar_json(json_path: Path):
     print(f"   Erros: {erros} ({erros/total*100:.1f}%)")
     print()
     
-    # Padrões de erro (correta → errada)
-    padroes_erro = Counter()
-    erros_list = [r for r in resultados if not r.get('correto', False)]
-    
-    for erro in erros_list:
-        correta = erro.get('gabarito', '')
-        predita = erro.get('resposta', '')
-        if correta and predita and correta != 'Anulado':
-            padrao = f"{correta}→{predita}"
-            padroes_erro[padrao] += 1
-    
     print("🔍 TOP 10 PADRÕES DE ERRO (Correta → Errada):")
     print()
     for padrao, count in padroes_erro.most_common(10):
@@ -51,18 +62,6 @@ def analisar_json(json_path: Path):
         print(f"   {padrao:8s}: {count:2d} vezes ({pct:5.1f}% dos erros)")
     print()
     
-    # Distribuição de respostas preditas
-    respostas_preditas = Counter()
-    respostas_corretas = Counter()
-    
-    for r in resultados:
-        predita = r.get('resposta', '')
-        correta = r.get('gabarito', '')
-        if predita:
-            respostas_preditas[predita] += 1
-        if correta and correta != 'Anulado':
-            respostas_corretas[correta] += 1
-    
     print("📊 DISTRIBUIÇÃO DE RESPOSTAS:")
     print()
     print("   Preditas pelo modelo:")
@@ -79,20 +78,20 @@ def analisar_json(json_path: Path):
     print()
     
     # Análise de confiança
-    confianca_corretos = [r.get('confianca', 0) for r in resultados if r.get('correto', False)]
-    confianca_erros = [r.get('confianca', 0) for r in resultados if not r.get('correto', False)]
+    media_corretos = soma_confianca[True] / corretos if corretos else 0
+    media_erros = soma_confianca[False] / erros if erros else 0
     
-    if confianca_corretos:
+    if corretos:
         print("📈 CONFIANÇA:")
-        print(f"   Média (corretos): {sum(confianca_corretos)/len(confianca_corretos):.2f}")
-        print(f"   Média (erros): {sum(confianca_erros)/len(confianca_erros):.2f}")
+        print(f"   Média (corretos): {media_corretos:.2f}")
+        print(f"   Média (erros): {media_erros:.2f}")
         print()
     
     # Questões que mais erraram
     print("❌ QUESTÕES COM ERRO:")
     print()
-    for erro in sorted(erros_list, key=lambda x: x.get('numero', 0))[:10]:
-        num = erro.get('numero', 'N/A')
+    for erro in sorted(erros_list, key=lambda x: x['numero'] or 0)[:10]:
+        num = erro['numero'] or 'N/A'
         predita = erro.get('resposta', 'N/A')
         correta = erro.get('gabarito', 'N/A')
         conf = erro.get('confianca', 0)
@@ -158,8 +157,8 @@ def analisar_json(json_path: Path):
 
 ## 📈 CONFIANÇA
 
-- Média (corretos): {sum(confianca_corretos)/len(confianca_corretos):.2f}
-- Média (erros): {sum(confianca_erros)/len(confianca_erros):.2f}
+- Média (corretos): {media_corretos:.2f}
+- Média (erros): {media_erros:.2f}
 
 ## 💡 RECOMENDAÇÕES
 
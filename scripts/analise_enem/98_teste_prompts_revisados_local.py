@@ -33,42 +33,11 @@ if env_file.exists():
                     key, value = line.strip().split('=', 1)
                     os.environ[key] = value
 
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    print("   Execute: pip install openai")
-    sys.exit(1)
+from scripts.analise_enem import cliente_maritaca, compilador_prompts, self_consistency
 
-# Importar módulos
-import importlib.util
-
-# PROMPTS REVISADOS (com correções anti-viés)
-prompts_revisados_path = Path(__file__).parent / "96_prompts_revisados_todas_areas.py"
-spec = importlib.util.spec_from_file_location("prompts_revisados", prompts_revisados_path)
-prompts_revisados_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(prompts_revisados_module)
-
-obter_prompt_por_area = prompts_revisados_module.obter_prompt_por_area
-
-# Módulos auxiliares
-prompts_module_path = Path(__file__).parent / "70_prompts_adaptativos_por_tri.py"
-spec2 = importlib.util.spec_from_file_location("prompts_adaptativos", prompts_module_path)
-prompts_module = importlib.util.module_from_spec(spec2)
-spec2.loader.exec_module(prompts_module)
-
-figuras_module_path = Path(__file__).parent / "75_deteccao_figuras_simples.py"
-spec3 = importlib.util.spec_from_file_location("deteccao_figuras", figuras_module_path)
-figuras_module = importlib.util.module_from_spec(spec3)
-spec3.loader.exec_module(figuras_module)
-
-def configurar_api():
-    """Configura API"""
-    api_key = os.getenv('CURSORMINIMAC') or os.getenv('MARITALK_API_SECRET_KEY')
-    if not api_key:
-        raise ValueError("Chave API não configurada! Configure CURSORMINIMAC no .env")
-    
-    return openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
+def configurar_api(dry_run: Optional[bool] = None):
+    """Cliente Maritaca compartilhado (pool, retentativas e limitador global)"""
+    return cliente_maritaca.configurar_api(dry_run=dry_run)
 
 def carregar_questoes_por_area(area: str, limit: Optional[int] = None):
     """Carrega questões de uma área específica"""
@@ -148,78 +117,19 @@ def extrair_resposta(texto: str) -> Optional[str]:
     
     return None
 
-def formatar_questao(questao: Dict) -> str:
-    """Formata questão para o prompt"""
-    texto = ""
-    if questao.get('context'):
-        texto += f"CONTEXTO:\n{questao['context']}\n\n"
-    if questao.get('description'):
-        desc = questao['description']
-        if isinstance(desc, list) and desc:
-            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc[0]}\n\n"
-        elif desc:
-            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc}\n\n"
-    texto += f"PERGUNTA:\n{questao.get('question', '')}\n\n"
-    texto += "ALTERNATIVAS:\n"
-    for i, alt in enumerate(questao.get('alternatives', []), 1):
-        letra = chr(64 + i)
-        texto += f"{letra}) {alt}\n"
-    return texto
-
-def resolver_questao(client, questao: Dict, n_passagens: int = 3):
-    """Resolve questão com self-consistency"""
-    area = questao.get('area', '')
-    num = questao.get('number', 0)
-    
-    # Obter TRI
-    tri_info = prompts_module.obter_info_tri(num)
-    tri_value = tri_info.get('TRI', 0)
-    
-    # Usar prompt revisado
-    prompt_base = obter_prompt_por_area(area, tri_value)
-    
-    # Detecção de figuras
-    prompt_final = figuras_module.criar_prompt_com_deteccao_figura(prompt_base, questao)
-    
-    questao_formatada = formatar_questao(questao)
-    prompt_completo = prompt_final + questao_formatada
-    
-    respostas = []
-    
-    for i in range(n_passagens):
-        try:
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[
-                    {"role": "system", "content": "Você é um especialista em questões do ENEM."},
-                    {"role": "user", "content": prompt_completo}
-                ],
-                temperature=0.1,
-                max_tokens=2000
-            )
-            
-            resposta_texto = response.choices[0].message.content
-            resposta_extraida = extrair_resposta(resposta_texto)
-            
-            if resposta_extraida:
-                respostas.append(resposta_extraida)
-            
-            time.sleep(0.2)  # Delay entre passagens
-        except Exception as e:
-            print(f"      ⚠️  Erro passagem {i+1}: {str(e)[:50]}")
-            continue
-    
-    if not respostas:
-        return None, 0.0
-    
-    # Votação majoritária
-    contador = Counter(respostas)
-    resposta_mais_frequente = contador.most_common(1)[0]
-    resposta_final = resposta_mais_frequente[0]
-    frequencia = resposta_mais_frequente[1]
-    confianca = frequencia / len(respostas)
-    
-    return resposta_final, confianca
+def resolver_questao(client, questao: Dict, n_passagens: int = 3, **opcoes):
+    """Resolve questão com self-consistency; retorna (resposta, confiança, chamadas)"""
+    prompt_completo, _ = compilador_prompts.montar_prompt(questao, 'revisado')
+    
+    resultado = self_consistency.resolver_com_self_consistency(
+        client,
+        self_consistency.montar_mensagens(prompt_completo),
+        extrair_resposta,
+        n_passagens=n_passagens,
+        **opcoes
+    )
+    
+    return resultado['resposta_final'], resultado['confianca'], resultado['n_passagens']
 
 def main():
     parser = argparse.ArgumentParser(description='Teste local com prompts revisados')
@@ -228,10 +138,11 @@ def main():
                        help='Área a testar')
     parser.add_argument('--limit', type=int, default=45,
                        help='Número máximo de questões')
-    parser.add_argument('--passagens', type=int, default=3,
-                       help='Número de passagens para self-consistency')
+    cliente_maritaca.adicionar_argumentos(parser)
+    self_consistency.adicionar_argumentos(parser, passagens_padrao=3)
     
     args = parser.parse_args()
+    passagens_por_nivel = self_consistency.interpretar_passagens_por_nivel(args.passagens_por_nivel)
     
     print("=" * 70)
     print("🧪 TESTE LOCAL - PROMPTS REVISADOS (CORREÇÕES ANTI-VIÉS)")
@@ -241,7 +152,7 @@ def main():
     # Configurar API
     print("🔧 Configurando API...")
     try:
-        client = configurar_api()
+        client = configurar_api(args.dry_run)
         print("✅ API configurada")
     except Exception as e:
         print(f"❌ Erro ao configurar API: {e}")
@@ -256,6 +167,7 @@ def main():
         sys.exit(1)
     
     print(f"✅ {len(questoes)} questões carregadas")
+    opcoes = self_consistency.opcoes_dos_argumentos(args, len(questoes))
     
     # Executar avaliação
     print(f"\n🚀 Iniciando avaliação...")
@@ -265,7 +177,7 @@ def main():
     print()
     
     resultados = []
-    stats = {'correct': 0, 'total': 0}
+    stats = {'correct': 0, 'total': 0, 'chamadas': 0}
     respostas_preditas = Counter()
     respostas_corretas = Counter()
     
@@ -275,7 +187,10 @@ def main():
         num = questao.get('number', 0)
         print(f"Q{num}: ", end='', flush=True)
         
-        resposta_final, confianca = resolver_questao(client, questao, args.passagens)
+        nivel = compilador_prompts.nivel_tri(num)
+        n_questao = self_consistency.passagens_da_questao(questao, args.passagens, passagens_por_nivel, nivel)
+        resposta_final, confianca, chamadas = resolver_questao(client, questao, n_questao, **opcoes)
+        stats['chamadas'] += chamadas
         
         # Normalizar gabarito
         gabarito_raw = questao.get('label', '') or questao.get('answer', '') or questao.get('gabarito', '')
@@ -303,10 +218,9 @@ def main():
             'resposta': resposta_final,
             'gabarito': gabarito,
             'correto': is_correct,
-            'confianca': confianca
+            'confianca': confianca,
+            'chamadas': chamadas
         })
-        
-        time.sleep(0.5)  # Delay entre questões
     
     elapsed = time.time() - start_time
     
@@ -320,6 +234,8 @@ def main():
     acuracia = (stats['correct'] / stats['total'] * 100) if stats['total'] > 0 else 0
     print(f"🎯 Acurácia: {acuracia:.2f}% ({stats['correct']}/{stats['total']})")
     print(f"⏱️  Tempo: {elapsed:.1f}s ({elapsed/stats['total']:.1f}s por questão)")
+    print(f"📞 Chamadas à API: {stats['chamadas']} ({stats['chamadas']/stats['total']:.1f} por questão)")
+    cliente_maritaca.imprimir_metricas(client)
     print()
     
     print("📊 DISTRIBUIÇÃO DE RESPOSTAS:")
@@ -359,6 +275,7 @@ def main():
         'area': args.area,
         'total': stats['total'],
         'correct': stats['correct'],
+        'total_chamadas': stats['chamadas'],
         'accuracy': acuracia / 100,
         'tempo_total': elapsed,
         'tempo_por_questao': elapsed / stats['total'] if stats['total'] > 0 else 0,
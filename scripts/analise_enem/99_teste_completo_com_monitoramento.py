@@ -16,7 +16,6 @@ import argparse
 from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Optional
-from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -33,39 +32,12 @@ if env_file.exists():
                     key, value = line.strip().split('=', 1)
                     os.environ[key] = value
 
-try:
-    import openai
-except ImportError:
-    print("❌ Erro: openai não instalado")
-    sys.exit(1)
+from scripts.analise_enem import cliente_maritaca, compilador_prompts, motor_execucao, self_consistency, telemetria
+from scripts.analise_enem.resultados_jsonl import EscritorResultados, arquivo_resultados
 
-# Importar módulos
-import importlib.util
-
-# PROMPTS REVISADOS
-prompts_revisados_path = Path(__file__).parent / "96_prompts_revisados_todas_areas.py"
-spec = importlib.util.spec_from_file_location("prompts_revisados", prompts_revisados_path)
-prompts_revisados_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(prompts_revisados_module)
-obter_prompt_por_area = prompts_revisados_module.obter_prompt_por_area
-
-# Módulos auxiliares
-prompts_module_path = Path(__file__).parent / "70_prompts_adaptativos_por_tri.py"
-spec2 = importlib.util.spec_from_file_location("prompts_adaptativos", prompts_module_path)
-prompts_module = importlib.util.module_from_spec(spec2)
-spec2.loader.exec_module(prompts_module)
-
-figuras_module_path = Path(__file__).parent / "75_deteccao_figuras_simples.py"
-spec3 = importlib.util.spec_from_file_location("deteccao_figuras", figuras_module_path)
-figuras_module = importlib.util.module_from_spec(spec3)
-spec3.loader.exec_module(figuras_module)
-
-def configurar_api():
-    """Configura API"""
-    api_key = os.getenv('CURSORMINIMAC') or os.getenv('MARITALK_API_SECRET_KEY')
-    if not api_key:
-        raise ValueError("Chave API não configurada!")
-    return openai.OpenAI(api_key=api_key, base_url="https://chat.maritaca.ai/api")
+def configurar_api(dry_run: Optional[bool] = None):
+    """Cliente Maritaca compartilhado (pool, retentativas e limitador global)"""
+    return cliente_maritaca.configurar_api(dry_run=dry_run)
 
 def carregar_questoes_por_area(area: str, limit: Optional[int] = None):
     """Carrega questões de uma área específica"""
@@ -142,71 +114,19 @@ def extrair_resposta(texto: str) -> Optional[str]:
     
     return None
 
-def formatar_questao(questao: Dict) -> str:
-    """Formata questão"""
-    texto = ""
-    if questao.get('context'):
-        texto += f"CONTEXTO:\n{questao['context']}\n\n"
-    if questao.get('description'):
-        desc = questao['description']
-        if isinstance(desc, list) and desc:
-            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc[0]}\n\n"
-        elif desc:
-            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc}\n\n"
-    texto += f"PERGUNTA:\n{questao.get('question', '')}\n\n"
-    texto += "ALTERNATIVAS:\n"
-    for i, alt in enumerate(questao.get('alternatives', []), 1):
-        letra = chr(64 + i)
-        texto += f"{letra}) {alt}\n"
-    return texto
-
-def resolver_questao(client, questao: Dict, n_passagens: int = 3):
-    """Resolve questão com self-consistency"""
-    area = questao.get('area', '')
-    num = questao.get('number', 0)
-    
-    tri_info = prompts_module.obter_info_tri(num)
-    tri_value = tri_info.get('TRI', 0)
-    
-    prompt_base = obter_prompt_por_area(area, tri_value)
-    prompt_final = figuras_module.criar_prompt_com_deteccao_figura(prompt_base, questao)
-    questao_formatada = formatar_questao(questao)
-    prompt_completo = prompt_final + questao_formatada
-    
-    respostas = []
-    
-    for i in range(n_passagens):
-        try:
-            response = client.chat.completions.create(
-                model="sabia-3",
-                messages=[
-                    {"role": "system", "content": "Você é um especialista em questões do ENEM."},
-                    {"role": "user", "content": prompt_completo}
-                ],
-                temperature=0.1,
-                max_tokens=2000
-            )
-            
-            resposta_texto = response.choices[0].message.content
-            resposta_extraida = extrair_resposta(resposta_texto)
-            
-            if resposta_extraida:
-                respostas.append(resposta_extraida)
-            
-            time.sleep(0.2)
-        except Exception as e:
-            continue
-    
-    if not respostas:
-        return None, 0.0
-    
-    contador = Counter(respostas)
-    resposta_mais_frequente = contador.most_common(1)[0]
-    resposta_final = resposta_mais_frequente[0]
-    frequencia = resposta_mais_frequente[1]
-    confianca = frequencia / len(respostas)
-    
-    return resposta_final, confianca
+def resolver_questao(client, questao: Dict, n_passagens: int = 3, **opcoes) -> Dict:
+    """Resolve questão com self-consistency (resultado da votação do motor compartilhado)"""
+    prompt_completo, _ = compilador_prompts.montar_prompt(questao, 'revisado')
+    
+    resultado = self_consistency.resolver_com_self_consistency(
+        client,
+        self_consistency.montar_mensagens(prompt_completo),
+        extrair_resposta,
+        n_passagens=n_passagens,
+        **opcoes
+    )
+    
+    return resultado
 
 def imprimir_status(questao_atual: int, total: int, corretos: int, tempo_decorrido: float, 
                    respostas_preditas: Counter, respostas_corretas: Counter):
@@ -246,10 +166,12 @@ def main():
                        help='Área a testar')
     parser.add_argument('--limit', type=int, default=45,
                        help='Número de questões')
-    parser.add_argument('--passagens', type=int, default=3,
-                       help='Número de passagens')
+    cliente_maritaca.adicionar_argumentos(parser)
+    self_consistency.adicionar_argumentos(parser, passagens_padrao=3)
+    motor_execucao.adicionar_argumentos(parser)
     
     args = parser.parse_args()
+    passagens_por_nivel = self_consistency.interpretar_passagens_por_nivel(args.passagens_por_nivel)
     
     print("=" * 70)
     print("🧪 TESTE COMPLETO COM MONITORAMENTO")
@@ -259,7 +181,7 @@ def main():
     # Configurar API
     print("🔧 Configurando API...")
     try:
-        client = configurar_api()
+        client = configurar_api(args.dry_run)
         print("✅ API configurada")
     except Exception as e:
         print(f"❌ Erro: {e}")
@@ -274,82 +196,90 @@ def main():
         sys.exit(1)
     
     print(f"✅ {len(questoes)} questões carregadas")
+    opcoes = self_consistency.opcoes_dos_argumentos(args, len(questoes))
     print(f"\n🚀 Iniciando avaliação...")
     print(f"   Passagens: {args.passagens}")
+    print(f"   Questões simultâneas: {args.workers}")
     print()
     
-    resultados = []
-    stats = {'correct': 0, 'total': 0}
+    stats = {'correct': 0, 'total': 0, 'chamadas': 0}
     respostas_preditas = Counter()
     respostas_corretas = Counter()
+    arquivo_progresso = Path(__file__).parent.parent.parent / "results" / f"teste_completo_{args.area}_PROGRESSO.json"
+    variante = {'passagens': args.passagens, 'passagens_por_nivel': passagens_por_nivel,
+                **{k: v for k, v in opcoes.items() if k != 'orcamento'}}
+    saida = EscritorResultados(arquivo_resultados(f"teste_completo_{args.area}", arquivo_progresso.parent),
+                               "99_teste_completo_com_monitoramento", {'area': args.area, **variante})
     
     start_time = time.time()
     
-    for i, questao in enumerate(questoes, 1):
+    def processar(questao):
         num = questao.get('number', 0)
-        questao_start = time.time()
-        
-        print(f"[{i}/{len(questoes)}] Q{num}: ", end='', flush=True)
-        
-        resposta_final, confianca = resolver_questao(client, questao, args.passagens)
-        
         gabarito_raw = questao.get('label', '') or questao.get('answer', '') or questao.get('gabarito', '')
         gabarito = str(gabarito_raw).upper().strip()
         
         if gabarito not in ['A', 'B', 'C', 'D', 'E']:
-            print(f"⚠️  Gabarito inválido: '{gabarito_raw}'")
-            continue
-        
-        is_correct = (resposta_final == gabarito) if resposta_final else False
+            return {'numero': num, 'gabarito_invalido': str(gabarito_raw)}
         
-        if is_correct:
-            stats['correct'] += 1
-            print(f"✅ ({resposta_final}, conf: {confianca:.0%})")
-        else:
-            print(f"❌ ({resposta_final} vs {gabarito}, conf: {confianca:.0%})")
+        nivel = compilador_prompts.nivel_tri(num)
+        n_questao = self_consistency.passagens_da_questao(questao, args.passagens, passagens_por_nivel, nivel)
+        resultado = resolver_questao(client, questao, n_questao, **opcoes)
+        resposta_final = resultado['resposta_final']
         
-        stats['total'] += 1
-        respostas_preditas[resposta_final] += 1
-        respostas_corretas[gabarito] += 1
-        
-        resultados.append({
+        return {
             'numero': num,
             'resposta': resposta_final,
             'gabarito': gabarito,
-            'correto': is_correct,
-            'confianca': confianca
-        })
+            'correto': (resposta_final == gabarito) if resposta_final else False,
+            'confianca': resultado['confianca'],
+            'chamadas': resultado['n_passagens'],
+            'distribuicao': resultado['distribuicao'],
+            **{campo: resultado[campo] for campo in self_consistency.CAMPOS_USO}
+        }
+    
+    def ao_concluir(i, questao, resultado, retomado):
+        if 'gabarito_invalido' in resultado:
+            print(f"[Q{resultado['numero']}] ⚠️  Gabarito inválido: '{resultado['gabarito_invalido']}'")
+            return
         
-        tempo_decorrido = time.time() - start_time
+        saida.escrever(resultado)
+        stats['total'] += 1
+        stats['chamadas'] += resultado['chamadas']
+        stats['correct'] += resultado['correto']
+        respostas_preditas[resultado['resposta']] += 1
+        respostas_corretas[resultado['gabarito']] += 1
+        if retomado:
+            return
         
-        # Salvar progresso incrementalmente (a cada 5 questões)
-        if i % 5 == 0 or i == len(questoes):
-            # Salvar arquivo temporário com progresso
-            output_file_temp = Path(__file__).parent.parent.parent / "results" / f"teste_completo_{args.area}_PROGRESSO.json"
-            output_file_temp.parent.mkdir(parents=True, exist_ok=True)
-            
-            output_data_temp = {
-                'area': args.area,
-                'total': i,
-                'total_final': len(questoes),
-                'correct': stats['correct'],
-                'accuracy': (stats['correct'] / i * 100) if i > 0 else 0,
-                'tempo_total': tempo_decorrido,
-                'tempo_por_questao': tempo_decorrido / i if i > 0 else 0,
-                'distribuicao_predita': dict(respostas_preditas),
-                'distribuicao_correta': dict(respostas_corretas),
-                'resultados': resultados,
-                'timestamp': datetime.now().isoformat(),
-                'status': 'em_progresso'
-            }
-            
-            with open(output_file_temp, 'w', encoding='utf-8') as f:
-                json.dump(output_data_temp, f, indent=2, ensure_ascii=False)
-            
-            imprimir_status(i, len(questoes), stats['correct'], tempo_decorrido,
-                          respostas_preditas, respostas_corretas)
+        marca = '✅' if resultado['correto'] else '❌'
+        detalhe = resultado['resposta'] if resultado['correto'] else f"{resultado['resposta']} vs {resultado['gabarito']}"
+        print(f"[{stats['total']}/{len(questoes)}] Q{resultado['numero']}: {marca} ({detalhe}, conf: {resultado['confianca']:.0%})")
         
-        time.sleep(0.5)
+        if stats['total'] % 5 == 0 or stats['total'] == len(questoes):
+            imprimir_status(stats['total'], len(questoes), stats['correct'], time.time() - start_time,
+                          respostas_preditas, respostas_corretas)
+    
+    def resumo():
+        return {
+            'area': args.area,
+            'total': stats['total'],
+            'correct': stats['correct'],
+            'total_chamadas': stats['chamadas'],
+            'accuracy': (stats['correct'] / stats['total'] * 100) if stats['total'] > 0 else 0,
+            'distribuicao_predita': dict(respostas_preditas),
+            'distribuicao_correta': dict(respostas_corretas)
+        }
+    
+    resultados = motor_execucao.executar_questoes(
+        questoes, processar,
+        arquivo_progresso=arquivo_progresso,
+        max_workers=args.workers,
+        ao_concluir=ao_concluir,
+        resumo=resumo,
+        retomar=not args.reiniciar,
+        telemetria=telemetria.Telemetria(telemetria.arquivo_execucao(f"teste_completo_{args.area}"))
+    )
+    resultados = [r for r in resultados if r and 'gabarito_invalido' not in r]
     
     elapsed = time.time() - start_time
     
@@ -363,6 +293,7 @@ def main():
     acuracia = (stats['correct'] / stats['total'] * 100) if stats['total'] > 0 else 0
     print(f"🎯 Acurácia: {acuracia:.2f}% ({stats['correct']}/{stats['total']})")
     print(f"⏱️  Tempo total: {elapsed/60:.1f} min ({elapsed/stats['total']:.1f}s por questão)")
+    cliente_maritaca.imprimir_metricas(client)
     print()
     
     print("📊 DISTRIBUIÇÃO FINAL:")
@@ -394,27 +325,24 @@ def main():
         print("✅ Sem viés significativo para E")
     print()
     
-    # Salvar resultados
-    output_file = Path(__file__).parent.parent.parent / "results" / f"teste_completo_{args.area}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    
+    # Resumo final (as questões já estão no JSONL)
     output_data = {
         'area': args.area,
         'total': stats['total'],
         'correct': stats['correct'],
+        'total_chamadas': stats['chamadas'],
         'accuracy': acuracia / 100,
         'tempo_total': elapsed,
         'tempo_por_questao': elapsed / stats['total'] if stats['total'] > 0 else 0,
         'distribuicao_predita': dict(respostas_preditas),
         'distribuicao_correta': dict(respostas_corretas),
-        'resultados': resultados,
-        'timestamp': datetime.now().isoformat()
+        'variante': variante,
+        'uso': cliente_maritaca.agregar_uso(resultados)
     }
+    saida.resumo(output_data)
+    saida.fechar()
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
-    
-    print(f"💾 Resultados salvos em: {output_file}")
+    print(f"💾 Resultados salvos em: {saida.arquivo}")
     print()
     print("=" * 70)
     print("✅ TESTE CONCLUÍDO")
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Análise Semântica Pré-computada (usada por 33_ e 34_)
+
+Antes, 33_ e 34_ mandavam um prompt longo de análise por questão, de forma
+síncrona e antes da chamada de resposta (duas idas e voltas seriais por
+questão). Aqui a análise estruturada é pré-computada para o corpus:
+várias questões por prompt, com saída em array JSON, lotes em paralelo, e o
+resultado fica no armazém SQLite de cache_respostas.py (namespace
+"analise_semantica", isento do despejo) pela hash da questão. Na hora de
+responder só há consulta ao armazém e uma chamada. Com MARITACA_CACHE=0 nada
+é guardado.
+
+Uso:
+    python analise_semantica.py --areas mathematics --tamanho-lote 8 --workers 4
+    python analise_semantica.py --anos 2023,2024 --dry-run
+"""
+import hashlib
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem import cache_respostas
+
+NAMESPACE = cache_respostas.NAMESPACE_ANALISES
+CAMPOS = ("conceitos_chave", "tipo_problema", "armadilhas_comuns", "nivel_dificuldade",
+          "conhecimentos_previos", "estrategia_resolucao")
+TAMANHO_LOTE_PADRAO = 8
+MAX_CONTEXTO = 1500
+CACHE_LEGADO = Path(__file__).parent.parent.parent / "data" / "cache" / "analises_semanticas.json"
+
+
+class CacheAnalises:
+    """
+    Análises semânticas no armazém SQLite compartilhado (cache_respostas.py),
+    por sha256 de contexto + enunciado + alternativas.
+    O JSON antigo (md5 de contexto + enunciado) é lido só como fallback.
+    Sem armazém (MARITACA_CACHE=0) nada é guardado.
+    """
+
+    def __init__(self, cache_legado: Optional[Path] = None):
+        self.armazem = cache_respostas.cache_global()
+        self.legado = {}
+        if cache_legado and cache_legado.exists():
+            try:
+                with open(cache_legado, 'r', encoding='utf-8') as f:
+                    self.legado = json.load(f)
+            except (OSError, ValueError):
+                self.legado = {}
+
+    def obter_analise(self, questao: Dict) -> Optional[Dict]:
+        """Obtém análise do cache"""
+        chave = cache_respostas.hash_questao(questao)
+        analise = self.armazem.obter(chave, NAMESPACE) if self.armazem is not None else None
+        if analise is None and self.legado:
+            texto = f"{questao.get('context', '')}{questao.get('question', '')}"
+            analise = self.legado.get(hashlib.md5(texto.encode()).hexdigest())
+            if analise is not None:
+                self.salvar_analise(questao, analise)
+        return analise
+
+    def salvar_analise(self, questao: Dict, analise: Dict):
+        """Salva análise no cache (commit em lote)"""
+        if self.armazem is not None:
+            self.armazem.salvar(cache_respostas.hash_questao(questao), analise, NAMESPACE)
+
+
+_CACHE_PADRAO: Optional[CacheAnalises] = None
+
+
+def cache_padrao() -> CacheAnalises:
+    """CacheAnalises único do processo (com o JSON legado como fallback)"""
+    global _CACHE_PADRAO
+    if _CACHE_PADRAO is None:
+        _CACHE_PADRAO = CacheAnalises(CACHE_LEGADO)
+    return _CACHE_PADRAO
+
+
+def montar_prompt_lote(questoes: List[Dict]) -> str:
+    """Prompt com várias questões numeradas pedindo um array JSON"""
+    prompt = f"""Você é a Maritaca Sabiá 3, especialista em ENEM.
+
+Realize uma ANÁLISE SEMÂNTICA PROFUNDA de cada uma das {len(questoes)} questões do ENEM abaixo.
+"""
+    for i, questao in enumerate(questoes, 1):
+        contexto = questao.get('context', '').strip()
+        if len(contexto) > MAX_CONTEXTO:
+            contexto = contexto[:MAX_CONTEXTO] + "..."
+        prompt += f"""
+### QUESTÃO {i} (ÁREA: {questao.get('area', 'desconhecida')})
+
+CONTEXTO:
+{contexto}
+
+PERGUNTA:
+{questao.get('question', '').strip()}
+
+ALTERNATIVAS:
+"""
+        for j, alt in enumerate(questao.get('alternatives', []), 1):
+            prompt += f"{chr(64 + j)}. {alt}\n"
+
+    prompt += f"""
+Responda APENAS com um array JSON com {len(questoes)} objetos, um por questão, na ordem:
+[
+  {{
+    "questao": 1,
+    "conceitos_chave": ["lista de conceitos principais"],
+    "tipo_problema": "tipo identificado",
+    "armadilhas_comuns": ["lista de armadilhas"],
+    "nivel_dificuldade": "fácil/médio/difícil",
+    "conhecimentos_previos": ["lista de conhecimentos"],
+    "estrategia_resolucao": "passo a passo resumido"
+  }}
+]"""
+    return prompt
+
+
+def _objetos_json(texto: str) -> List[Dict]:
+    """Objetos JSON do texto: o array inteiro ou, se vier quebrado, objeto a objeto"""
+    inicio, fim = texto.find('['), texto.rfind(']')
+    if 0 <= inicio < fim:
+        try:
+            dados = json.loads(texto[inicio:fim + 1])
+            return [d for d in dados if isinstance(d, dict)]
+        except ValueError:
+            pass
+    objetos = []
+    for bloco in re.findall(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', texto, re.DOTALL):
+        try:
+            objetos.append(json.loads(bloco))
+        except ValueError:
+            continue
+    return objetos
+
+
+def extrair_lote(texto: str, n: int) -> List[Optional[Dict]]:
+    """Análises do array JSON alinhadas às n questões do lote (None se faltou)"""
+    analises: List[Optional[Dict]] = [None] * n
+    objetos = _objetos_json(texto or '')
+    for posicao, objeto in enumerate(objetos):
+        indice = objeto.pop('questao', None)
+        try:
+            indice = int(indice) - 1
+        except (TypeError, ValueError):
+            indice = posicao
+        if 0 <= indice < n and analises[indice] is None and any(c in objeto for c in CAMPOS):
+            analises[indice] = objeto
+    return analises
+
+
+def analisar_lote(client, questoes: List[Dict], max_tokens_por_questao: int = 400) -> List[Optional[Dict]]:
+    """
+    Uma chamada para o lote; questões que faltarem na resposta são refeitas
+    em lotes menores (metade) até chegar a uma por chamada.
+    """
+    try:
+        response = client.chat.completions.create(
+            model="sabia-3",
+            messages=[{"role": "user", "content": montar_prompt_lote(questoes)}],
+            max_tokens=max_tokens_por_questao * len(questoes),
+            temperature=0.2
+        )
+        analises = extrair_lote(response.choices[0].message.content, len(questoes))
+    except Exception as e:
+        print(f"    ⚠️  Erro na análise em lote ({len(questoes)} questões): {e}")
+        analises = [None] * len(questoes)
+
+    faltantes = [i for i, a in enumerate(analises) if a is None]
+    if faltantes and len(questoes) > 1:
+        metade = max(1, len(faltantes) // 2)
+        for grupo in (faltantes[:metade], faltantes[metade:]):
+            if grupo:
+                refeitas = analisar_lote(client, [questoes[i] for i in grupo], max_tokens_por_questao)
+                for i, analise in zip(grupo, refeitas):
+                    analises[i] = analise
+    return analises
+
+
+def precomputar(client, questoes: List[Dict], cache: CacheAnalises,
+                tamanho_lote: int = TAMANHO_LOTE_PADRAO, max_workers: int = 4) -> Dict:
+    """Analisa (em lotes paralelos) as questões que ainda não estão no cache"""
+    pendentes, vistas = [], set()
+    for questao in questoes:
+        chave = cache_respostas.hash_questao(questao)
+        if chave not in vistas and cache.obter_analise(questao) is None:
+            pendentes.append(questao)
+        vistas.add(chave)
+
+    lotes = [pendentes[i:i + tamanho_lote] for i in range(0, len(pendentes), tamanho_lote)]
+    stats = {'total': len(vistas), 'em_cache': len(vistas) - len(pendentes),
+             'analisadas': 0, 'falhas': 0, 'lotes': len(lotes)}
+    if not lotes:
+        return stats
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = {executor.submit(analisar_lote, client, lote): lote for lote in lotes}
+        for n, futuro in enumerate(as_completed(futuros), 1):
+            for questao, analise in zip(futuros[futuro], futuro.result()):
+                if analise is None:
+                    stats['falhas'] += 1
+                else:
+                    cache.salvar_analise(questao, analise)
+                    stats['analisadas'] += 1
+            print(f"   [{n}/{len(lotes)}] lotes concluídos ({stats['analisadas']} análises)")
+    return stats
+
+
+def analise_da_questao(client, questao: Dict, cache: CacheAnalises) -> Optional[Dict]:
+    """Análise pré-computada; se faltar, analisa só esta questão e guarda"""
+    analise = cache.obter_analise(questao)
+    if analise is None and client is not None:
+        analise = analisar_lote(client, [questao])[0]
+        if analise is not None:
+            cache.salvar_analise(questao, analise)
+    return analise
+
+
+def main():
+    import argparse
+
+    from scripts.analise_enem import cliente_maritaca
+    from scripts.analise_enem.corpus import carregar_corpus
+
+    parser = argparse.ArgumentParser(description="Pré-computa análises semânticas do corpus")
+    parser.add_argument("--areas", type=str, help="Áreas (ex: mathematics,natural-sciences)")
+    parser.add_argument("--anos", type=str, help="Anos (ex: 2023,2024)")
+    parser.add_argument("--tamanho-lote", type=int, default=TAMANHO_LOTE_PADRAO,
+                        help=f"Questões por prompt (default: {TAMANHO_LOTE_PADRAO})")
+    parser.add_argument("--workers", type=int, default=4, help="Lotes simultâneos (default: 4)")
+    cliente_maritaca.adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    corpus = carregar_corpus()
+    indices = corpus.selecionar(
+        anos=[int(a) for a in args.anos.split(',')] if args.anos else None,
+        areas=args.areas.split(',') if args.areas else None
+    )
+    questoes = corpus.questoes(indices)
+    print(f"📥 {len(questoes)} questões selecionadas")
+
+    cache = cache_padrao()
+    if cache.armazem is None:
+        print("⚠️  Cache desligado (MARITACA_CACHE=0): não há onde guardar as análises")
+        return
+    client = cliente_maritaca.configurar_api(args.dry_run)
+    stats = precomputar(client, questoes, cache, args.tamanho_lote, args.workers)
+
+    print()
+    print(f"✅ {stats['analisadas']} analisadas em {stats['lotes']} lotes, "
+          f"{stats['em_cache']} já estavam no cache, {stats['falhas']} falhas")
+    print(f"💾 {cache.armazem.arquivo}")
+    cliente_maritaca.imprimir_metricas(client)
+
+
+if __name__ == "__main__":
+    main()
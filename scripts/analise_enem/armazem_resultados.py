@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Armazém Colunar de Resultados (comparação entre execuções)
+
+Comparar variantes de prompt significava reabrir dezenas de JSON em
+results/ e data/analises/ e cruzar as questões à mão em laços Python. Aqui
+cada execução é ingerida uma vez: os resultados por questão (lidos com
+resultados_jsonl.py, JSONL ou JSON antigo) são normalizados num conjunto de
+colunas fixas e gravados em data/armazem/execucao=<id>/ (Parquet com
+pyarrow; .npz do numpy sem ele). O indice.json guarda origem, tamanho e
+mtime de cada arquivo, então reingerir só processa o que mudou.
+
+As consultas rodam sobre as colunas concatenadas (numpy), sem laço por
+questão:
+    acuracia_por('area')                    acurácia por execução e área
+    acuracia_por('tema', execucoes=[...])   idem, só para algumas execuções
+    comparar(a, b)                          pares por questão: só a acertou, só b...
+    tri_por_execucao()                      Pearson e P(acerto | TRI) de cada execução (estatisticas.py)
+
+Uso:
+    python armazem_resultados.py --ingerir                 # varre results/, reports/avaliacoes/, data/analises/
+    python armazem_resultados.py --ingerir results/teste_completo_mathematics_20250101_120000.jsonl
+    python armazem_resultados.py --por area
+    python armazem_resultados.py --comparar <execucao_a> <execucao_b>
+"""
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem import estatisticas
+from scripts.analise_enem.motor_execucao import salvar_json_atomico
+from scripts.analise_enem.resultados_jsonl import eh_jsonl, ler_cabecalho, ler_registros
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DIR_ARMAZEM = PROJECT_ROOT / "data" / "armazem"
+FONTES_PADRAO = (
+    PROJECT_ROOT / "results",
+    PROJECT_ROOT / "reports" / "avaliacoes",
+    PROJECT_ROOT / "data" / "analises",
+)
+VERSAO = 2  # 2: tri em float64, como no corpus
+
+# Coluna -> dtype (texto vazio, -1 e NaN marcam ausência)
+COLUNAS = {
+    'execucao': str,
+    'questao': str,
+    'ano': np.int16,
+    'numero': np.int16,
+    'area': str,
+    'tri': np.float64,
+    'habilidade': str,
+    'tema': str,
+    'tipo_figura': str,
+    'resposta': str,
+    'gabarito': str,
+    'correto': np.bool_,
+    'confianca': np.float32,
+    'latencia': np.float32,
+    'tokens': np.int32,
+}
+ALIASES_LATENCIA = ('latencia', 'tempo_resposta', 'latencia_api', 'tempo')
+
+
+def _texto(valor) -> str:
+    return '' if valor in (None, 'N/A') else str(valor)
+
+
+def _float(valor) -> float:
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _tipo_figura(registro) -> str:
+    tipo = registro.get('tipo_figura')
+    if tipo:
+        return str(tipo)
+    return 'figura' if registro.get('tem_figura') else ''
+
+
+def _linha(execucao: str, registro) -> Dict:
+    """Uma questão normalizada nas colunas do armazém"""
+    latencia = next((registro.get(nome) for nome in ALIASES_LATENCIA if registro.get(nome) is not None), None)
+    tokens = registro.get('tokens') or (registro.get('prompt_tokens', 0) or 0) + (registro.get('completion_tokens', 0) or 0)
+    chave = registro.chave or (f"{registro.ano or ''}_{registro.numero}" if registro.numero else '')
+    return {
+        'execucao': execucao,
+        'questao': chave,
+        'ano': registro.ano or -1,
+        'numero': registro.numero or -1,
+        'area': registro.area,
+        'tri': registro.tri if registro.tri is not None else float('nan'),
+        'habilidade': _texto(registro.get('habilidade')),
+        'tema': _texto(registro.get('tema')),
+        'tipo_figura': _tipo_figura(registro),
+        'resposta': _texto(registro.resposta),
+        'gabarito': _texto(registro.gabarito),
+        'correto': registro.correto,
+        'confianca': registro.confianca if registro.confianca is not None else float('nan'),
+        'latencia': _float(latencia),
+        'tokens': int(tokens or 0),
+    }
+
+
+def colunas_da_execucao(arquivo: Path, execucao: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """Colunas tipadas de um arquivo de resultados (vazias se não houver questões)"""
+    execucao = execucao or Path(arquivo).stem
+    linhas = [_linha(execucao, registro) for registro in ler_registros(arquivo)]
+    return {
+        nome: np.array([linha[nome] for linha in linhas], dtype=tipo if tipo is not str else np.str_)
+        for nome, tipo in COLUNAS.items()
+    }
+
+
+def _salvar_particao(colunas: Dict[str, np.ndarray], diretorio: Path) -> Path:
+    diretorio.mkdir(parents=True, exist_ok=True)
+    for antigo in diretorio.glob("parte.*"):
+        antigo.unlink()
+    if HAS_PYARROW:
+        arquivo = diretorio / "parte.parquet"
+        pq.write_table(pa.table({nome: valores for nome, valores in colunas.items()}), str(arquivo))
+    else:
+        arquivo = diretorio / "parte.npz"
+        with open(arquivo, 'wb') as f:
+            np.savez_compressed(f, **colunas)
+    return arquivo
+
+
+def _ler_particao(arquivo: Path) -> Dict[str, np.ndarray]:
+    if arquivo.suffix == '.parquet':
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow é necessário para ler partições Parquet: pip install pyarrow")
+        tabela = pq.read_table(str(arquivo))
+        return {nome: tabela.column(nome).to_numpy(zero_copy_only=False) for nome in tabela.column_names}
+    with np.load(arquivo, allow_pickle=False) as dados:
+        return {nome: dados[nome] for nome in dados.files}
+
+
+def _indice(diretorio: Path) -> Dict:
+    arquivo = Path(diretorio) / "indice.json"
+    if not arquivo.exists():
+        return {'versao': VERSAO, 'execucoes': {}}
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        indice = json.load(f)
+    if indice.get('versao') != VERSAO:
+        return {'versao': VERSAO, 'execucoes': {}}  # colunas de outra versão: reingere tudo
+    return indice
+
+
+def arquivos_de_resultados(fontes: Iterable[Path] = FONTES_PADRAO) -> List[Path]:
+    """Arquivos candidatos (JSONL e JSON) nas pastas de resultados, sem checkpoints e telemetria"""
+    arquivos = []
+    for fonte in fontes:
+        fonte = Path(fonte)
+        if fonte.is_file():
+            arquivos.append(fonte)
+        elif fonte.is_dir():
+            arquivos += [a for a in sorted(fonte.glob("*.json*"))
+                         if a.suffix in ('.json', '.jsonl') and not a.stem.endswith("_PROGRESSO")]
+    return arquivos
+
+
+def _fonte(arquivo: Path) -> str:
+    """Caminho relativo à raiz do projeto (absoluto se estiver fora dela)"""
+    arquivo = Path(arquivo).resolve()
+    try:
+        return str(arquivo.relative_to(PROJECT_ROOT.resolve()))
+    except ValueError:
+        return str(arquivo)
+
+
+def ingerir(arquivos: Iterable[Path], diretorio: Path = DIR_ARMAZEM) -> Dict[str, int]:
+    """Ingere os arquivos novos ou alterados; devolve {execucao: questões} do que foi gravado"""
+    diretorio = Path(diretorio)
+    indice = _indice(diretorio)
+    gravadas = {}
+    for arquivo in arquivos:
+        arquivo = Path(arquivo)
+        estado = arquivo.stat()
+        fonte = _fonte(arquivo)
+        execucao = arquivo.stem
+        anterior = indice['execucoes'].get(execucao)
+        if anterior and anterior['fonte'] != fonte:
+            execucao = arquivo.name  # mesmo nome com outra extensão / em outra pasta
+            anterior = indice['execucoes'].get(execucao)
+        if anterior and anterior['tamanho'] == estado.st_size and anterior['mtime'] == estado.st_mtime:
+            continue
+        try:
+            colunas = colunas_da_execucao(arquivo, execucao)
+        except (OSError, ValueError, AttributeError, TypeError):
+            continue  # não é um arquivo de resultados por questão
+        if not len(colunas['correto']):
+            continue
+
+        particao = _salvar_particao(colunas, diretorio / f"execucao={execucao}")
+        cabecalho = ler_cabecalho(arquivo) if eh_jsonl(arquivo) else {}
+        indice['execucoes'][execucao] = {
+            'fonte': fonte,
+            'tamanho': estado.st_size,
+            'mtime': estado.st_mtime,
+            'particao': str(particao.relative_to(diretorio)),
+            'script': cabecalho.get('script', ''),
+            'questoes': int(len(colunas['correto'])),
+            'acuracia': float(colunas['correto'].mean()),
+        }
+        gravadas[execucao] = int(len(colunas['correto']))
+
+    if gravadas:
+        salvar_json_atomico(diretorio / "indice.json", indice, indent=2)
+        armazem.cache_clear()
+    return gravadas
+
+
+class Armazem:
+    """Todas as execuções em colunas numpy concatenadas, com consultas vetorizadas"""
+
+    def __init__(self, colunas: Dict[str, np.ndarray], execucoes: Dict[str, Dict]):
+        self.colunas = colunas
+        self.info = execucoes
+        self.execucoes, self._codigo_execucao = np.unique(colunas['execucao'], return_inverse=True)
+
+    def __len__(self) -> int:
+        return len(self.colunas['correto'])
+
+    def _mascara(self, execucoes: Optional[Iterable[str]]) -> np.ndarray:
+        if execucoes is None:
+            return np.ones(len(self), dtype=bool)
+        return np.isin(self.colunas['execucao'], list(execucoes))
+
+    def acuracia_por(self, *grupos: str, execucoes: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Acertos/total/acurácia (%) por execução e pelas colunas em `grupos`"""
+        mascara = self._mascara(execucoes)
+        colunas = {nome: self.colunas[nome][mascara] for nome in ('execucao',) + grupos}
+        return estatisticas.acuracia_por(self.colunas['correto'][mascara], colunas)
+
+    def tri_por_execucao(self) -> List[Dict]:
+        """Pearson TRI×acerto e ajuste logístico P(acerto | TRI) de cada execução, numa só passada"""
+        n_execucoes = len(self.execucoes)
+        tri = self.colunas['tri'].astype(float)
+        correto = self.colunas['correto'].astype(float)
+        r = estatisticas.pearson_por_grupo(tri, correto, self._codigo_execucao, n_execucoes)
+        ajuste = estatisticas.ajustar_logistica(tri, correto, self._codigo_execucao, n_execucoes)
+        return [
+            {'execucao': execucao.item(), 'questoes_com_tri': int(ajuste.n[i]), 'pearson': float(r[i]),
+             'intercepto': float(ajuste.intercepto[i]), 'inclinacao': float(ajuste.inclinacao[i]),
+             'tri_50': ajuste.ponto_medio(i)}
+            for i, execucao in enumerate(self.execucoes) if ajuste.n[i] >= 2
+        ]
+
+    def _por_questao(self, execucao: str):
+        mascara = self.colunas['execucao'] == execucao
+        if not mascara.any():
+            raise KeyError(f"Execução não encontrada no armazém: {execucao}")
+        questoes = self.colunas['questao'][mascara]
+        # última ocorrência de cada questão (execuções retomadas podem repetir)
+        questoes_rev = questoes[::-1]
+        distintas, primeira = np.unique(questoes_rev, return_index=True)
+        linhas = np.flatnonzero(mascara)[::-1][primeira]
+        return distintas, linhas
+
+    def comparar(self, a: str, b: str) -> Dict:
+        """Diferença pareada por questão entre duas execuções (só questões presentes nas duas)"""
+        questoes_a, linhas_a = self._por_questao(a)
+        questoes_b, linhas_b = self._por_questao(b)
+        comuns, ia, ib = np.intersect1d(questoes_a, questoes_b, assume_unique=True, return_indices=True)
+        correto_a = self.colunas['correto'][linhas_a[ia]]
+        correto_b = self.colunas['correto'][linhas_b[ib]]
+        so_a = ~correto_b & correto_a
+        so_b = correto_b & ~correto_a
+        pares = len(comuns)
+        return {
+            'a': a,
+            'b': b,
+            'pares': pares,
+            'acertos_a': int(correto_a.sum()),
+            'acertos_b': int(correto_b.sum()),
+            'ambas': int((correto_a & correto_b).sum()),
+            'nenhuma': int((~correto_a & ~correto_b).sum()),
+            'so_a': comuns[so_a].tolist(),
+            'so_b': comuns[so_b].tolist(),
+            'diferenca': float((correto_b.sum() - correto_a.sum()) / pares * 100) if pares else 0.0,
+        }
+
+
+def carregar(diretorio: Path = DIR_ARMAZEM) -> Armazem:
+    """Armazém com todas as partições do índice"""
+    diretorio = Path(diretorio)
+    execucoes = _indice(diretorio)['execucoes']
+    partes = [_ler_particao(diretorio / info['particao']) for info in execucoes.values()]
+    if partes:
+        colunas = {nome: np.concatenate([parte[nome] for parte in partes]).astype(tipo if tipo is not str else np.str_)
+                   for nome, tipo in COLUNAS.items()}
+    else:
+        colunas = {nome: np.array([], dtype=tipo if tipo is not str else np.str_) for nome, tipo in COLUNAS.items()}
+    return Armazem(colunas, execucoes)
+
+
+@lru_cache(maxsize=None)
+def armazem(diretorio: Path = DIR_ARMAZEM) -> Armazem:
+    """Armazem carregado uma vez por processo"""
+    return carregar(diretorio)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Armazém colunar de resultados por questão")
+    parser.add_argument("--ingerir", nargs='*', metavar="ARQUIVO",
+                        help="Ingere arquivos de resultados (sem argumentos: varre as pastas padrão)")
+    parser.add_argument("--por", nargs='+', metavar="COLUNA", choices=[c for c in COLUNAS if c != 'execucao'],
+                        help="Acurácia por execução e estas colunas")
+    parser.add_argument("--execucoes", nargs='+', help="Restringe --por a estas execuções")
+    parser.add_argument("--comparar", nargs=2, metavar=("A", "B"), help="Diferença pareada entre duas execuções")
+    parser.add_argument("--diretorio", type=str, default=str(DIR_ARMAZEM))
+    args = parser.parse_args()
+
+    diretorio = Path(args.diretorio)
+    print("=" * 70)
+    print("🗄️  ARMAZÉM DE RESULTADOS")
+    print("=" * 70)
+
+    if args.ingerir is not None:
+        arquivos = arquivos_de_resultados(args.ingerir or FONTES_PADRAO)
+        gravadas = ingerir(arquivos, diretorio)
+        print(f"📥 {len(arquivos)} arquivos verificados, {len(gravadas)} execuções ingeridas")
+        for execucao, questoes in sorted(gravadas.items()):
+            print(f"   {execucao}: {questoes} questões")
+
+    dados = armazem(diretorio)
+    print(f"📊 {len(dados.info)} execuções, {len(dados)} questões ({'Parquet' if HAS_PYARROW else 'npz'})")
+    print()
+
+    if args.por:
+        for linha in dados.acuracia_por(*args.por, execucoes=args.execucoes):
+            grupo = " | ".join(f"{linha[c] or '-'}" for c in args.por)
+            print(f"   {linha['execucao'][:40]:40s} | {grupo:25s} | {linha['acuracia']:6.2f}% ({linha['acertos']}/{linha['total']})")
+    elif args.comparar:
+        try:
+            r = dados.comparar(*args.comparar)
+        except KeyError as e:
+            print(f"❌ {e.args[0]}")
+            return
+        print(f"🔀 {r['a']}  vs  {r['b']}")
+        print(f"   Questões em comum: {r['pares']}")
+        print(f"   Acertos: {r['acertos_a']} vs {r['acertos_b']} ({r['diferenca']:+.2f} p.p.)")
+        print(f"   Ambas acertaram: {r['ambas']} | Nenhuma: {r['nenhuma']}")
+        print(f"   Só A acertou ({len(r['so_a'])}): {', '.join(r['so_a'][:10])}")
+        print(f"   Só B acertou ({len(r['so_b'])}): {', '.join(r['so_b'][:10])}")
+    else:
+        for execucao, info in sorted(dados.info.items()):
+            print(f"   {execucao[:50]:50s} {info['questoes']:5d} questões  {info['acuracia'] * 100:6.2f}%  {info['script']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Cache Endereçado por Conteúdo das Respostas da API
+
+Toda chamada do ClienteMaritaca (cliente_maritaca.py) passa por aqui: a chave
+é o sha256 do payload canônico (modelo, mensagens, temperature, max_tokens,
+n, ...) mais o índice da amostra, então reexecutar uma análise com o mesmo
+prompt não custa nenhuma chamada, e passagens de self-consistency continuam
+independentes entre si.
+
+Armazenamento em SQLite (WAL) com commits em lote e despejo por idade e por
+tamanho total. O mesmo arquivo guarda outros valores por namespace (ex.:
+análises semânticas do 34_ por hash da questão); os namespaces em
+NAMESPACES_PERMANENTES (análises pagas, pré-computadas) nunca são despejados.
+
+Configuração por ambiente:
+    MARITACA_CACHE=0              desliga o cache (respostas e análises semânticas)
+    MARITACA_CACHE_ARQUIVO=...    caminho do SQLite
+    MARITACA_CACHE_MAX_MB=512     tamanho máximo
+    MARITACA_CACHE_MAX_DIAS=90    idade máxima
+
+Uso:
+    python cache_respostas.py            # estatísticas
+    python cache_respostas.py --limpar   # aplica o despejo agora
+"""
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+ARQUIVO_PADRAO = Path(__file__).parent.parent.parent / "data" / "cache" / "respostas_api.sqlite"
+NAMESPACE_API = "api"
+NAMESPACE_ANALISES = "analise_semantica"
+NAMESPACES_PERMANENTES = (NAMESPACE_ANALISES,)
+LOTE_COMMIT = 50
+INTERVALO_COMMIT = 5.0
+
+
+def chave_requisicao(payload: Dict, amostra: int = 0) -> str:
+    """sha256 do payload canônico + índice da amostra"""
+    canonico = json.dumps({'payload': payload, 'amostra': amostra},
+                          sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+
+def hash_questao(questao: Dict) -> str:
+    """sha256 do conteúdo da questão (contexto, enunciado e alternativas)"""
+    conteudo = json.dumps([questao.get('context', ''), questao.get('question', ''),
+                           questao.get('alternatives', [])], ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+class CacheRespostas:
+    """Armazém chave → JSON em SQLite, thread-safe, com commits em lote"""
+
+    def __init__(self, arquivo: Path = ARQUIVO_PADRAO, max_bytes: int = 512 * 2 ** 20,
+                 max_idade_dias: float = 90.0):
+        self.arquivo = Path(arquivo)
+        self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_idade = max_idade_dias * 86400
+        self.lock = threading.Lock()
+        self.pendentes = 0
+        self.ultimo_commit = time.monotonic()
+        self.acertos = 0
+        self.faltas = 0
+        self.encerrado = False
+
+        self.conexao = self._abrir()
+        self.conexao.execute("""
+            CREATE TABLE IF NOT EXISTS entradas (
+                namespace TEXT NOT NULL,
+                chave TEXT NOT NULL,
+                valor TEXT NOT NULL,
+                tamanho INTEGER NOT NULL,
+                criado REAL NOT NULL,
+                PRIMARY KEY (namespace, chave)
+            )
+        """)
+        self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_criado ON entradas (criado)")
+        self.conexao.commit()
+        self.despejar()
+        atexit.register(self.fechar)
+
+    def _abrir(self) -> sqlite3.Connection:
+        conexao = sqlite3.connect(str(self.arquivo), check_same_thread=False)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        return conexao
+
+    def _conexao(self) -> sqlite3.Connection:
+        """Conexão aberta (reaberta se fechar() já rodou, ex.: threads ainda ativas no atexit)"""
+        if self.conexao is None:
+            self.conexao = self._abrir()
+        return self.conexao
+
+    def obter(self, chave: str, namespace: str = NAMESPACE_API) -> Optional[Any]:
+        with self.lock:
+            linha = self._conexao().execute(
+                "SELECT valor FROM entradas WHERE namespace = ? AND chave = ?",
+                (namespace, chave)
+            ).fetchone()
+            if linha is None:
+                self.faltas += 1
+                return None
+            self.acertos += 1
+        return json.loads(linha[0])
+
+    def salvar(self, chave: str, valor: Any, namespace: str = NAMESPACE_API):
+        texto = json.dumps(valor, ensure_ascii=False)
+        with self.lock:
+            self._conexao().execute(
+                "INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?, ?)",
+                (namespace, chave, texto, len(texto), time.time())
+            )
+            self.pendentes += 1
+            # Depois do fechar() do atexit não haverá commit final: grava na hora
+            if (self.encerrado or self.pendentes >= LOTE_COMMIT
+                    or time.monotonic() - self.ultimo_commit > INTERVALO_COMMIT):
+                self._commit()
+
+    def _commit(self):
+        self.conexao.commit()
+        self.pendentes = 0
+        self.ultimo_commit = time.monotonic()
+
+    def despejar(self) -> int:
+        """
+        Remove entradas mais velhas que max_idade e, acima de max_bytes, as mais
+        antigas. Namespaces permanentes não são removidos nem contam no limite.
+        """
+        despejaveis = f"namespace NOT IN ({', '.join('?' * len(NAMESPACES_PERMANENTES))})"
+        with self.lock:
+            self._conexao()
+            removidas = self.conexao.execute(
+                f"DELETE FROM entradas WHERE criado < ? AND {despejaveis}",
+                (time.time() - self.max_idade, *NAMESPACES_PERMANENTES)
+            ).rowcount
+            total = self.conexao.execute(
+                f"SELECT COALESCE(SUM(tamanho), 0) FROM entradas WHERE {despejaveis}", NAMESPACES_PERMANENTES
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                # Remove da mais antiga até caber em 90% do limite
+                excesso = total - int(0.9 * self.max_bytes)
+                limite = self.conexao.execute(f"""
+                    SELECT criado FROM (
+                        SELECT criado, SUM(tamanho) OVER (ORDER BY criado) AS acumulado
+                        FROM entradas WHERE {despejaveis}
+                    ) WHERE acumulado >= ? ORDER BY criado LIMIT 1
+                """, (*NAMESPACES_PERMANENTES, excesso)).fetchone()
+                if limite:
+                    removidas += self.conexao.execute(
+                        f"DELETE FROM entradas WHERE criado <= ? AND {despejaveis}",
+                        (limite[0], *NAMESPACES_PERMANENTES)
+                    ).rowcount
+            self._commit()
+        return removidas
+
+    def estatisticas(self) -> Dict:
+        with self.lock:
+            linhas = self._conexao().execute(
+                "SELECT namespace, COUNT(*), COALESCE(SUM(tamanho), 0) FROM entradas GROUP BY namespace"
+            ).fetchall()
+        return {
+            'arquivo': str(self.arquivo),
+            'namespaces': {ns: {'entradas': n, 'bytes': b} for ns, n, b in linhas},
+            'acertos': self.acertos,
+            'faltas': self.faltas
+        }
+
+    def fechar(self):
+        with self.lock:
+            self.encerrado = True
+            if self.conexao is not None:
+                self._commit()
+                self.conexao.close()
+                self.conexao = None
+
+
+_CACHE_GLOBAL: Optional[CacheRespostas] = None
+
+
+def cache_global() -> Optional[CacheRespostas]:
+    """Cache único do processo, ou None se MARITACA_CACHE=0"""
+    global _CACHE_GLOBAL
+    if os.environ.get("MARITACA_CACHE", "1") in ("0", ""):
+        return None
+    if _CACHE_GLOBAL is None:
+        _CACHE_GLOBAL = CacheRespostas(
+            Path(os.environ.get("MARITACA_CACHE_ARQUIVO", ARQUIVO_PADRAO)),
+            max_bytes=int(float(os.environ.get("MARITACA_CACHE_MAX_MB", 512)) * 2 ** 20),
+            max_idade_dias=float(os.environ.get("MARITACA_CACHE_MAX_DIAS", 90))
+        )
+    return _CACHE_GLOBAL
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cache de respostas da API")
+    parser.add_argument("--limpar", action="store_true", help="Aplicar despejo por idade/tamanho")
+    args = parser.parse_args()
+
+    cache = cache_global()
+    if cache is None:
+        print("⚠️  Cache desligado (MARITACA_CACHE=0)")
+        return
+    if args.limpar:
+        print(f"🧹 {cache.despejar()} entradas removidas")
+
+    stats = cache.estatisticas()
+    print(f"💾 {stats['arquivo']}")
+    for ns, info in stats['namespaces'].items():
+        print(f"   {ns:<25} {info['entradas']:>7} entradas  {info['bytes'] / 2 ** 20:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Motor de Marcação de Campos Semânticos
+
+Compila o vocabulário SEMANTIC_FIELDS uma única vez (normalizado com
+unicodedata) em uma regex por área e marca todas as questões em uma passada,
+retornando uma matriz esparsa questão×campo (CSR) usada por
+20_mapear_campos_semanticos.py e pelos prompts de 21_ e 34_.
+
+Cada regex usa lookahead em todo início de palavra, então termos que
+compartilham prefixo ("literatura" e "literatura brasileira") são
+encontrados juntos, como na busca termo a termo original.
+"""
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Definição dos campos semânticos por área do ENEM
+SEMANTIC_FIELDS = {
+    "linguagens": [
+        "arte", "artes", "educação física", "educacao fisica", "inglês", "ingles", "espanhol",
+        "interpretação de texto", "interpretacao de texto", "generos textuais", "gêneros textuais",
+        "literatura", "literatura brasileira", "comunicação", "linguagem", "gramática", "gramatica"
+    ],
+    "humanas": [
+        "filosofia", "sociologia", "geografia", "história", "historia", "sociedade", "cultura",
+        "política", "politica", "economia", "cidadania", "direitos humanos", "meio ambiente"
+    ],
+    "natureza": [
+        "física", "fisica", "química", "quimica", "biologia", "ciências", "ciencia",
+        "ecologia", "saúde", "saude", "tecnologia", "ambiente", "natureza", "universo"
+    ],
+    "matematica": [
+        "álgebra", "algebra", "aritmética", "aritmetica", "matemática básica", "matematica basica",
+        "geometria plana", "geometria espacial", "geometria analítica", "geometria analitica",
+        "cálculo", "calculo", "estatística", "estatistica", "probabilidade", "razão", "proporção"
+    ]
+}
+
+AREA_MAP = {
+    'languages': 'linguagens',
+    'human-sciences': 'humanas',
+    'natural-sciences': 'natureza',
+    'mathematics': 'matematica'
+}
+
+ARQUIVO_MATRIZ = "campos_semanticos_matriz.npz"
+
+
+def normalizar_texto(texto: str) -> str:
+    """Normaliza texto para busca (lowercase, sem acentos via unicodedata)"""
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def chave_area(area: str) -> str:
+    """Converte área do dataset ('mathematics') para chave de SEMANTIC_FIELDS"""
+    return AREA_MAP.get(area, (area or '').lower())
+
+
+class MarcadorCamposSemanticos:
+    """Vocabulário pré-normalizado e compilado em uma regex por área"""
+
+    def __init__(self, semantic_fields: Dict[str, List[str]] = None):
+        self.semantic_fields = semantic_fields or SEMANTIC_FIELDS
+
+        # Colunas da matriz: um campo por (área, termo original)
+        self.campos = [
+            f"{area}:{campo}"
+            for area, termos in self.semantic_fields.items() for campo in termos
+        ]
+        self._colunas_por_area = {}
+        self._regex_por_area = {}
+
+        coluna = 0
+        for area, termos in self.semantic_fields.items():
+            colunas_por_termo = {}
+            for campo in termos:
+                colunas_por_termo.setdefault(normalizar_texto(campo), []).append(coluna)
+                coluna += 1
+
+            # Mais longos primeiro; termos contidos em outro (com fronteira de
+            # palavra) são implicados por ele
+            unicos = sorted(colunas_por_termo, key=len, reverse=True)
+            implicados = {
+                termo: sorted({
+                    c for outro in unicos
+                    if re.search(r'\b' + re.escape(outro) + r'\b', termo)
+                    for c in colunas_por_termo[outro]
+                })
+                for termo in unicos
+            }
+            alternacao = '|'.join(re.escape(termo) for termo in unicos)
+            self._regex_por_area[area] = re.compile(r'\b(?=(' + alternacao + r')\b)')
+            self._colunas_por_area[area] = implicados
+
+    def colunas(self, texto: str, area: str) -> List[int]:
+        """Índices (ordenados) dos campos presentes no texto"""
+        area_key = chave_area(area)
+        regex = self._regex_por_area.get(area_key)
+        if regex is None:
+            return []
+
+        implicados = self._colunas_por_area[area_key]
+        encontrados = set()
+        for termo in set(regex.findall(normalizar_texto(texto))):
+            encontrados.update(implicados[termo])
+        return sorted(encontrados)
+
+    def campos_do_texto(self, texto: str, area: str) -> List[str]:
+        """Nomes originais dos campos presentes (na ordem de SEMANTIC_FIELDS)"""
+        return [self.campos[c].split(':', 1)[1] for c in self.colunas(texto, area)]
+
+    def marcar(self, textos: List[str], areas: List[str]) -> List[List[int]]:
+        """Marca uma lista de textos (executado em série)"""
+        return [self.colunas(texto, area) for texto, area in zip(textos, areas)]
+
+
+_MARCADOR_PADRAO: Optional[MarcadorCamposSemanticos] = None
+
+
+def marcador_padrao() -> MarcadorCamposSemanticos:
+    """Marcador compilado uma vez por processo"""
+    global _MARCADOR_PADRAO
+    if _MARCADOR_PADRAO is None:
+        _MARCADOR_PADRAO = MarcadorCamposSemanticos()
+    return _MARCADOR_PADRAO
+
+
+def _marcar_lote(textos: List[str], areas: List[str]) -> List[List[int]]:
+    """Executa no worker com o marcador padrão"""
+    return marcador_padrao().marcar(textos, areas)
+
+
+def marcar_questoes(questoes: List[Dict], workers: Optional[int] = None,
+                    tamanho_lote: int = 500) -> Dict[str, np.ndarray]:
+    """
+    Marca todas as questões e retorna a matriz questão×campo em formato CSR.
+
+    Retorna {'ids', 'campos', 'indptr', 'indices'}; com workers > 1 os lotes
+    são processados em paralelo.
+    """
+    marcador = marcador_padrao()
+    textos = [f"{q.get('context', '')} {q.get('question', '')}" for q in questoes]
+    areas = [q.get('area', 'desconhecida') for q in questoes]
+
+    if workers and workers > 1 and len(textos) > tamanho_lote:
+        inicios = range(0, len(textos), tamanho_lote)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            lotes = executor.map(
+                _marcar_lote,
+                [textos[i:i + tamanho_lote] for i in inicios],
+                [areas[i:i + tamanho_lote] for i in inicios]
+            )
+            colunas = [c for lote in lotes for c in lote]
+    else:
+        colunas = marcador.marcar(textos, areas)
+
+    indptr = np.zeros(len(colunas) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(c) for c in colunas])
+    indices = np.fromiter((c for linha in colunas for c in linha), dtype=np.int32, count=int(indptr[-1]))
+
+    return {
+        'ids': np.asarray([str(q.get('id', '')) for q in questoes], dtype=str),
+        'campos': np.asarray(marcador.campos, dtype=str),
+        'indptr': indptr,
+        'indices': indices
+    }
+
+
+def matriz_esparsa(resultado: Dict[str, np.ndarray]):
+    """scipy.sparse.csr_matrix questão×campo (valores 1)"""
+    from scipy.sparse import csr_matrix
+
+    indices = resultado['indices']
+    return csr_matrix(
+        (np.ones(len(indices), dtype=np.int8), indices, resultado['indptr']),
+        shape=(len(resultado['ids']), len(resultado['campos']))
+    )
+
+
+def campos_por_linha(resultado: Dict[str, np.ndarray]) -> List[List[str]]:
+    """Lista de campos (nomes originais) de cada linha da matriz"""
+    nomes = [campo.split(':', 1)[1] for campo in resultado['campos']]
+    indptr, indices = resultado['indptr'], resultado['indices']
+    return [
+        [nomes[c] for c in indices[indptr[i]:indptr[i + 1]]]
+        for i in range(len(resultado['ids']))
+    ]
+
+
+def campos_por_id(resultado: Dict[str, np.ndarray]) -> Dict[str, List[str]]:
+    """Mapa id -> lista de campos, pronto para os prompts"""
+    return {
+        str(id_questao): campos
+        for id_questao, campos in zip(resultado['ids'], campos_por_linha(resultado))
+    }
+
+
+def salvar_matriz(resultado: Dict[str, np.ndarray], output_dir: Path) -> Path:
+    """Persiste a matriz CSR com ids e rótulos dos campos"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    arquivo = output_dir / ARQUIVO_MATRIZ
+    np.savez_compressed(arquivo, **resultado)
+    return arquivo
+
+
+def carregar_matriz(analises_dir: Path) -> Optional[Dict[str, np.ndarray]]:
+    """Carrega a matriz salva por 20_mapear_campos_semanticos ou None"""
+    arquivo = analises_dir / ARQUIVO_MATRIZ
+    if not arquivo.exists():
+        return None
+
+    with np.load(arquivo, allow_pickle=False) as npz:
+        return {chave: npz[chave] for chave in npz.files}
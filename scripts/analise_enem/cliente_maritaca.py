@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Cliente Maritaca Compartilhado
+
+Substitui os configurar_api / configurar_api_maritaca / setup_api + call_model
+copiados entre os scripts. Fala direto com o endpoint compatível com OpenAI
+(`/chat/completions`) e expõe a mesma interface usada pelos scripts
+(`client.chat.completions.create(...)`, resposta com `.choices[0].message.content`
+e também acesso por chave), sem depender da versão do pacote openai.
+
+- Pool de conexões HTTP com keep-alive (reaproveitadas entre threads)
+- Retentativas só em 429/5xx/erros de conexão, com backoff exponencial com
+  jitter, respeitando Retry-After, limitadas em tentativas e em tempo total
+- Token bucket global do processo (LimitadorTaxa) + limite de simultâneas
+- Cache endereçado por conteúdo (cache_respostas.py): payload idêntico com o
+  mesmo índice de amostra não chama a API de novo
+- Métricas de latência (p50/p95), status, uso de tokens e acertos de cache
+- Modo --dry-run: servidor local simulado para testes de carga sem a API
+
+Uso (teste de carga contra o servidor simulado):
+    python cliente_maritaca.py --dry-run --requisicoes 200 --concorrencia 16
+"""
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from queue import Empty, LifoQueue
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem.cache_respostas import CacheRespostas, cache_global, chave_requisicao
+from scripts.analise_enem.telemetria import emitir_ativa
+
+URL_PADRAO = "https://chat.maritaca.ai/api"
+VARIAVEIS_CHAVE = ("CURSORMINIMAC", "MARITALK_API_SECRET_KEY", "MARITACA_API_KEY")
+STATUS_RETENTAVEIS = {408, 429, 500, 502, 503, 504}
+
+
+class LimitadorTaxa:
+    """Token bucket (requisições/s) + limite de requisições simultâneas"""
+
+    def __init__(self, requisicoes_por_segundo: float = 5.0, max_concorrentes: int = 8):
+        self.taxa = requisicoes_por_segundo
+        self.capacidade = max(1.0, requisicoes_por_segundo)
+        self.tokens = self.capacidade
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+        self.semaforo = threading.BoundedSemaphore(max_concorrentes)
+
+    def adquirir(self):
+        """Bloqueia até haver um token disponível"""
+        while True:
+            with self.lock:
+                agora = time.monotonic()
+                self.tokens = min(self.capacidade, self.tokens + (agora - self.ultimo) * self.taxa)
+                self.ultimo = agora
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                espera = (1 - self.tokens) / self.taxa
+            time.sleep(espera)
+
+    def __enter__(self):
+        self.semaforo.acquire()
+        self.adquirir()
+        return self
+
+    def __exit__(self, *exc):
+        self.semaforo.release()
+        return False
+
+
+_LIMITADOR_GLOBAL: Optional[LimitadorTaxa] = None
+
+
+def limitador_global(requisicoes_por_segundo: float = None, max_concorrentes: int = None) -> LimitadorTaxa:
+    """
+    Limitador único do processo. Os parâmetros valem na primeira chamada;
+    o padrão vem de MARITACA_RPS / MARITACA_CONCORRENCIA (5 req/s, 8 simultâneas).
+    """
+    global _LIMITADOR_GLOBAL
+    if _LIMITADOR_GLOBAL is None:
+        _LIMITADOR_GLOBAL = LimitadorTaxa(
+            requisicoes_por_segundo or float(os.environ.get("MARITACA_RPS", 5.0)),
+            max_concorrentes or int(os.environ.get("MARITACA_CONCORRENCIA", 8))
+        )
+    return _LIMITADOR_GLOBAL
+
+
+class ErroAPI(Exception):
+    """Falha definitiva de uma chamada (status não retentável ou orçamento esgotado)"""
+
+    def __init__(self, mensagem: str, status: Optional[int] = None, tentativas: int = 0):
+        super().__init__(mensagem)
+        self.status = status
+        self.tentativas = tentativas
+
+
+class RespostaAPI(dict):
+    """JSON da API com acesso por atributo (resposta.choices[0].message.content)"""
+
+    def __getattr__(self, nome):
+        try:
+            return self[nome]
+        except KeyError:
+            raise AttributeError(nome)
+
+    @classmethod
+    def de_json(cls, valor):
+        if isinstance(valor, dict):
+            return cls({k: cls.de_json(v) for k, v in valor.items()})
+        if isinstance(valor, list):
+            return [cls.de_json(v) for v in valor]
+        return valor
+
+
+class MetricasCliente:
+    """Contadores de chamadas, latência e uso de tokens (thread-safe)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.chamadas = 0
+        self.sucessos = 0
+        self.falhas = 0
+        self.retentativas = 0
+        self.cache_hits = 0
+        self.status = Counter()
+        self.latencias: List[float] = []
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def registrar(self, latencia: float, status: Optional[int], uso: Optional[Dict] = None):
+        with self.lock:
+            self.status[status or 'conexao'] += 1
+            if uso is not None:
+                self.sucessos += 1
+                self.latencias.append(latencia)
+                self.prompt_tokens += uso.get('prompt_tokens', 0) or 0
+                self.completion_tokens += uso.get('completion_tokens', 0) or 0
+
+    def resumo(self) -> Dict:
+        with self.lock:
+            latencias = sorted(self.latencias)
+
+            def percentil(p):
+                return latencias[min(len(latencias) - 1, int(p * len(latencias)))] if latencias else 0.0
+
+            return {
+                'chamadas': self.chamadas,
+                'sucessos': self.sucessos,
+                'falhas': self.falhas,
+                'retentativas': self.retentativas,
+                'cache_hits': self.cache_hits,
+                'status': dict(self.status),
+                'latencia_media': sum(latencias) / len(latencias) if latencias else 0.0,
+                'latencia_p50': percentil(0.50),
+                'latencia_p95': percentil(0.95),
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens
+            }
+
+
+class _Completions:
+    def __init__(self, cliente: 'ClienteMaritaca'):
+        self._cliente = cliente
+
+    def create(self, amostra: int = 0, **kwargs) -> RespostaAPI:
+        """`amostra` distingue passagens repetidas do mesmo prompt no cache"""
+        return self._cliente.requisitar("/chat/completions", kwargs, amostra)
+
+
+class _Chat:
+    def __init__(self, cliente: 'ClienteMaritaca'):
+        self.completions = _Completions(cliente)
+
+
+def agregar_uso(resultados: List[Dict], campo: Optional[str] = None) -> Dict:
+    """
+    Soma o uso (tokens, latência de API, retentativas, chamadas) dos
+    resultados por questão; com `campo`, agrupa pelo valor desse campo
+    (ex.: 'area'). Grava-se no JSON de resultados para orçar execuções.
+    """
+    campos = ('chamadas', 'prompt_tokens', 'completion_tokens', 'tokens', 'latencia_api', 'retentativas')
+    grupos: Dict[str, Dict] = {}
+    for r in resultados:
+        if not r:
+            continue
+        grupo = grupos.setdefault(str(r.get(campo)) if campo else 'total',
+                                  dict.fromkeys(('questoes',) + campos, 0))
+        grupo['questoes'] += 1
+        for c in campos:
+            grupo[c] += r.get(c, 0) or 0
+    return grupos if campo else grupos.get('total', {})
+
+
+class ClienteMaritaca:
+    """
+    Cliente HTTP com pool de conexões keep-alive, retentativas e limitador de
+    taxa. Compatível com o uso `client.chat.completions.create(**kwargs)`.
+    """
+
+    def __init__(self, api_key: str, base_url: str = URL_PADRAO, timeout: float = 120.0,
+                 max_conexoes: int = 16, max_tentativas: int = 5, tempo_maximo: float = 300.0,
+                 backoff_base: float = 1.0, backoff_teto: float = 30.0,
+                 limitador: Optional[LimitadorTaxa] = None,
+                 cache: Optional[CacheRespostas] = None):
+        url = urlparse(base_url)
+        self.api_key = api_key
+        self.esquema = url.scheme
+        self.host = url.hostname
+        self.porta = url.port
+        self.prefixo = url.path.rstrip('/')
+        self.timeout = timeout
+        self.max_tentativas = max_tentativas
+        self.tempo_maximo = tempo_maximo
+        self.backoff_base = backoff_base
+        self.backoff_teto = backoff_teto
+        self.limitador = limitador or limitador_global()
+        self.cache = cache
+        self.metricas = MetricasCliente()
+        self.chat = _Chat(self)
+        self._pool = LifoQueue(maxsize=max_conexoes)
+
+    # Pool de conexões -------------------------------------------------------
+
+    def _nova_conexao(self) -> http.client.HTTPConnection:
+        classe = http.client.HTTPSConnection if self.esquema == 'https' else http.client.HTTPConnection
+        return classe(self.host, self.porta, timeout=self.timeout)
+
+    def _obter_conexao(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except Empty:
+            return self._nova_conexao()
+
+    def _devolver_conexao(self, conexao: http.client.HTTPConnection):
+        try:
+            self._pool.put_nowait(conexao)
+        except Exception:
+            conexao.close()
+
+    def fechar(self):
+        """Fecha as conexões ociosas do pool"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except Empty:
+                return
+
+    # Requisição com retentativas -------------------------------------------
+
+    def _enviar(self, caminho: str, corpo: bytes):
+        """Uma tentativa: (status, cabeçalhos, dados)"""
+        conexao = self._obter_conexao()
+        try:
+            conexao.request("POST", self.prefixo + caminho, body=corpo, headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+                "Connection": "keep-alive"
+            })
+            resposta = conexao.getresponse()
+            dados = resposta.read()
+        except Exception:
+            conexao.close()
+            raise
+        if resposta.will_close:
+            conexao.close()
+        else:
+            self._devolver_conexao(conexao)
+        return resposta.status, resposta.headers, dados
+
+    def _espera(self, tentativa: int, cabecalhos=None) -> float:
+        """Backoff exponencial com jitter completo (ou Retry-After do servidor)"""
+        retry_after = cabecalhos.get("Retry-After") if cabecalhos is not None else None
+        if retry_after:
+            try:
+                return min(self.backoff_teto, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_teto, self.backoff_base * 2 ** tentativa))
+
+    def requisitar(self, caminho: str, payload: Dict, amostra: int = 0) -> RespostaAPI:
+        chave = None
+        if self.cache is not None:
+            chave = chave_requisicao(dict(payload, _caminho=caminho), amostra)
+            guardado = self.cache.obter(chave)
+            if guardado is not None:
+                with self.metricas.lock:
+                    self.metricas.cache_hits += 1
+                return RespostaAPI.de_json(guardado)
+
+        corpo = json.dumps(payload).encode('utf-8')
+        inicio = time.monotonic()
+        with self.metricas.lock:
+            self.metricas.chamadas += 1
+
+        for tentativa in range(self.max_tentativas):
+            t0 = time.monotonic()
+            cabecalhos = None
+            try:
+                with self.limitador:
+                    status, cabecalhos, dados = self._enviar(caminho, corpo)
+            except (OSError, http.client.HTTPException) as e:
+                status, erro = None, f"{type(e).__name__}: {e}"
+            else:
+                if status == 200:
+                    try:
+                        bruto = json.loads(dados)
+                    except ValueError as e:
+                        bruto = None
+                        erro = f"corpo JSON inválido ({e}): {dados[:300].decode('utf-8', 'replace')}"
+                    if isinstance(bruto, dict):
+                        if chave is not None:
+                            self.cache.salvar(chave, bruto)
+                        resposta = RespostaAPI.de_json(bruto)
+                        resposta['tentativas'] = tentativa + 1
+                        resposta['latencia'] = time.monotonic() - inicio
+                        self.metricas.registrar(time.monotonic() - t0, status, resposta.get('usage') or {})
+                        return resposta
+                    if bruto is not None:
+                        erro = f"corpo inesperado ({type(bruto).__name__})"
+                else:
+                    erro = dados[:300].decode('utf-8', 'replace')
+            self.metricas.registrar(time.monotonic() - t0, status)
+
+            if status is not None and status not in STATUS_RETENTAVEIS:
+                break
+            espera = self._espera(tentativa, cabecalhos)
+            if tentativa + 1 >= self.max_tentativas or time.monotonic() - inicio + espera > self.tempo_maximo:
+                break
+            with self.metricas.lock:
+                self.metricas.retentativas += 1
+            emitir_ativa('retentativa', status=status, tentativa=tentativa + 1, espera=espera)
+            time.sleep(espera)
+
+        with self.metricas.lock:
+            self.metricas.falhas += 1
+        raise ErroAPI(f"HTTP {status}: {erro}", status=status, tentativas=tentativa + 1)
+
+
+# Servidor simulado (--dry-run) ---------------------------------------------
+
+class _HandlerSimulado(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, status: int, corpo: Dict, cabecalhos: Optional[Dict] = None):
+        dados = json.dumps(corpo).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        for chave, valor in (cabecalhos or {}).items():
+            self.send_header(chave, valor)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        servidor = self.server
+        time.sleep(random.expovariate(1 / servidor.latencia) if servidor.latencia > 0 else 0)
+
+        if random.random() < servidor.taxa_erro:
+            self._responder(random.choice([429, 503]), {"error": {"message": "simulado"}},
+                            {"Retry-After": "0.05"})
+            return
+
+        prompt = json.dumps(payload.get("messages", []), ensure_ascii=False)
+        choices = [
+            {"index": i, "finish_reason": "stop",
+             "message": {"role": "assistant", "content": f"Raciocínio simulado.\nResposta: {random.choice('ABCDE')}"}}
+            for i in range(int(payload.get("n", 1) or 1))
+        ]
+        self._responder(200, {
+            "id": f"simulado-{random.getrandbits(32):08x}",
+            "object": "chat.completion",
+            "model": payload.get("model", "sabia-3"),
+            "choices": choices,
+            "usage": {"prompt_tokens": len(prompt) // 4,
+                      "completion_tokens": 8 * len(choices),
+                      "total_tokens": len(prompt) // 4 + 8 * len(choices)}
+        })
+
+
+def iniciar_servidor_simulado(latencia: float = 0.2, taxa_erro: float = 0.05) -> str:
+    """Sobe o servidor simulado numa thread e retorna a base_url"""
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _HandlerSimulado)
+    servidor.daemon_threads = True
+    servidor.latencia = latencia
+    servidor.taxa_erro = taxa_erro
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{servidor.server_address[1]}/api"
+
+
+# Configuração --------------------------------------------------------------
+
+_CLIENTE_GLOBAL: Optional[ClienteMaritaca] = None
+
+
+def obter_chave_api() -> Optional[str]:
+    """Chave das variáveis de ambiente ou, na falta, do .env do projeto"""
+    for variavel in VARIAVEIS_CHAVE:
+        if os.environ.get(variavel):
+            return os.environ[variavel]
+
+    env_file = Path(__file__).parent.parent.parent / ".env"
+    if env_file.exists():
+        with open(env_file, 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#') and '=' in line:
+                    key, value = line.strip().split('=', 1)
+                    if key in VARIAVEIS_CHAVE and value:
+                        return value
+    return None
+
+
+def configurar_api(dry_run: Optional[bool] = None, **kwargs) -> ClienteMaritaca:
+    """
+    Cliente único do processo (pool, cache e métricas compartilhados).
+
+    dry_run=True (ou MARITACA_DRY_RUN=1) aponta para o servidor simulado local
+    (sem cache, para não misturar respostas simuladas com as reais).
+    Levanta ValueError se a chave não estiver configurada.
+    """
+    global _CLIENTE_GLOBAL
+    if _CLIENTE_GLOBAL is not None:
+        return _CLIENTE_GLOBAL
+
+    if dry_run is None:
+        dry_run = os.environ.get("MARITACA_DRY_RUN", "") not in ("", "0")
+
+    if dry_run:
+        print("🧪 Dry-run: usando servidor simulado local")
+        _CLIENTE_GLOBAL = ClienteMaritaca("dry-run", iniciar_servidor_simulado(), **kwargs)
+        return _CLIENTE_GLOBAL
+
+    api_key = obter_chave_api()
+    if not api_key:
+        raise ValueError("Chave API não configurada! Configure: " + ", ".join(VARIAVEIS_CHAVE))
+    kwargs.setdefault('cache', cache_global())
+    _CLIENTE_GLOBAL = ClienteMaritaca(api_key, os.environ.get("MARITACA_BASE_URL", URL_PADRAO), **kwargs)
+    return _CLIENTE_GLOBAL
+
+
+def adicionar_argumentos(parser):
+    """Opção --dry-run para os scripts que usam o cliente"""
+    # default None: sem a opção, configurar_api consulta MARITACA_DRY_RUN
+    parser.add_argument("--dry-run", action="store_true", default=None,
+                        help="Usar servidor simulado local em vez da API Maritaca (ou MARITACA_DRY_RUN=1)")
+
+
+def imprimir_metricas(client=None):
+    """Resumo das métricas do cliente (se for um ClienteMaritaca)"""
+    client = client or _CLIENTE_GLOBAL
+    if not isinstance(client, ClienteMaritaca):
+        return
+    m = client.metricas.resumo()
+    print(f"📡 API: {m['sucessos']}/{m['chamadas']} chamadas ok, {m['cache_hits']} do cache, "
+          f"{m['retentativas']} retentativas, "
+          f"{m['falhas']} falhas | latência p50 {m['latencia_p50']:.2f}s p95 {m['latencia_p95']:.2f}s | "
+          f"tokens {m['prompt_tokens']}+{m['completion_tokens']}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Teste de carga do cliente Maritaca")
+    adicionar_argumentos(parser)
+    parser.add_argument("--requisicoes", type=int, default=100, help="Total de requisições (default: 100)")
+    parser.add_argument("--concorrencia", type=int, default=16, help="Threads clientes (default: 16)")
+    parser.add_argument("--rps", type=float, default=None, help="Limite de requisições/s")
+    args = parser.parse_args()
+
+    if args.rps:
+        limitador_global(args.rps, args.concorrencia)
+    client = configurar_api(dry_run=args.dry_run)
+
+    mensagens = [{"role": "user", "content": "Teste de carga"}]
+    inicio = time.time()
+
+    def uma(_):
+        try:
+            client.chat.completions.create(model="sabia-3", messages=mensagens, max_tokens=10)
+            return True
+        except ErroAPI:
+            return False
+
+    with ThreadPoolExecutor(max_workers=args.concorrencia) as executor:
+        ok = sum(executor.map(uma, range(args.requisicoes)))
+
+    elapsed = time.time() - inicio
+    print(f"✅ {ok}/{args.requisicoes} em {elapsed:.1f}s ({args.requisicoes / elapsed:.1f} req/s)")
+    imprimir_metricas(client)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Compilador de Prompts (usado por 80_, 83_, 98_ e 99_)
+
+Antes, cada questão remontava o prompt do zero: obter_prompt_por_area (96_)
+ou selecionar_prompt_por_tri (70_), depois o prompt ultra-simples (79_), os
+few-shots (73_, 81_, 82_) e a detecção de figura (75_), com as buscas de
+palavras-chave e os replace() de texto repetidos a cada chamada.
+
+Aqui o prefixo de instruções é compilado uma vez por combinação
+(variante, área, faixa TRI, figura, tema de few-shot) e guardado; a análise
+da figura é memoizada pela chave da questão. Tudo o que varia por questão
+(inclusive o valor TRI exato dos prompts revisados) vai para o sufixo, depois
+do prefixo, para que questões da mesma combinação mandem exatamente o mesmo
+começo de prompt e o cache de prefixo do servidor seja aproveitado.
+
+Variantes:
+    'revisado'   - 96_ + detecção de figura (98_ e 99_)
+    'melhorado'  - 70_ + 79_ + few-shots por área + detecção de figura (80_ e 83_)
+
+Uso:
+    python compilador_prompts.py   # pré-compila tudo e mostra os tamanhos
+"""
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem import prompts
+from scripts.analise_enem.motor_execucao import chave_questao
+
+AREAS = ('languages', 'human-sciences', 'natural-sciences', 'mathematics')
+
+# Faixas TRI em que o texto das instruções muda (régua de 70_/96_ e corte de 79_)
+FAIXAS = ('sem_tri', 'invalido', 'facil', 'medio_baixo', 'medio', 'dificil')
+REPRESENTANTES = {'sem_tri': 0, 'invalido': 100, 'facil': 500,
+                  'medio_baixo': 620, 'medio': 670, 'dificil': 750}
+
+PROMPT_SEM_TRI = "Você é um especialista em questões do ENEM. Resolva a questão abaixo passo-a-passo.\n\n"
+
+def faixa_tri(tri_value: float) -> str:
+    """Faixa TRI da questão (o prompt compilado é o mesmo dentro da faixa)"""
+    if tri_value <= 0:
+        return 'sem_tri'
+    if tri_value < 200:
+        return 'invalido'
+    if tri_value < 590:
+        return 'facil'
+    if tri_value < 650:
+        return 'medio_baixo'
+    if tri_value < 690:
+        return 'medio'
+    return 'dificil'
+
+
+def info_tri(numero: int) -> Dict:
+    """TRI, nível e tema da questão (TRI_DATA de 70_)"""
+    return prompts.adaptativos.obter_info_tri(numero)
+
+
+def nivel_tri(numero: int) -> str:
+    """'facil', 'medio' ou 'dificil' pela régua de 70_ (sem TRI conta como médio)"""
+    return prompts.adaptativos.classificar_por_tri(info_tri(numero).get('TRI', 0))
+
+
+_FIGURAS: Dict[str, Dict] = {}
+_FIGURAS_LOCK = threading.Lock()
+
+
+def info_figura(questao: Dict) -> Dict:
+    """obter_info_figura de 75_, memoizado pela chave da questão"""
+    chave = chave_questao(questao)
+    info = _FIGURAS.get(chave)
+    if info is None:
+        info = prompts.figuras.obter_info_figura(questao)
+        with _FIGURAS_LOCK:
+            _FIGURAS[chave] = info
+    return info
+
+
+@lru_cache(maxsize=None)
+def prefixo_revisado(area: str, faixa: str, figura_simples: bool) -> str:
+    """Prompt revisado da área (96_) sem o valor TRI exato, + instruções de figura simples"""
+    tri = REPRESENTANTES[faixa]
+    prompt = prompts.revisados.obter_prompt_por_area(area, tri)
+    prompt = prompt.replace(f" (TRI: {tri:.0f})", "")
+    if figura_simples:
+        prompt = prompts.figuras.inserir_instrucoes_figura_simples(prompt)
+    return prompt
+
+
+@lru_cache(maxsize=None)
+def prefixo_melhorado(area: str, faixa: str, tem_figura: bool, figura_simples: bool,
+                      tema: Optional[str]) -> str:
+    """Prompt adaptativo (70_) + ultra-simples (79_) + few-shots da área + figura simples"""
+    adaptativos = prompts.adaptativos
+    tri = REPRESENTANTES[faixa]
+    nivel = adaptativos.classificar_por_tri(tri) if tri > 0 else 'medio'
+
+    prompt = adaptativos.selecionar_prompt_por_tri(tri) if tri > 0 else PROMPT_SEM_TRI
+    if 0 < tri < 650:
+        prompt = prompts.ultra_simples.inserir_prompt_ultra_simples(prompt, tem_figura)
+
+    if area == 'natural-sciences':
+        prompt = prompts.natureza.criar_prompt_natureza(prompt)
+        if nivel == 'medio':
+            for fs in prompts.fewshots_natureza.obter_fewshots_natureza(5):
+                prompt += f"\n\nExemplo:\n{fs['question']}\n{fs['response']}\n"
+    elif area == 'mathematics' and nivel == 'medio':
+        prompt = prompts.fewshots.criar_prompt_com_fewshots(prompt, tema, num_fewshots=3)
+
+    if figura_simples:
+        prompt = prompts.figuras.inserir_instrucoes_figura_simples(prompt)
+    return prompt
+
+
+def formatar_questao(questao: Dict) -> str:
+    """Formata questão para o prompt"""
+    texto = ""
+    if questao.get('context'):
+        texto += f"CONTEXTO:\n{questao['context']}\n\n"
+    if questao.get('description'):
+        desc = questao['description']
+        if isinstance(desc, list) and desc:
+            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc[0]}\n\n"
+        elif desc:
+            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc}\n\n"
+    texto += f"PERGUNTA:\n{questao.get('question', '')}\n\n"
+    texto += "ALTERNATIVAS:\n"
+    for i, alt in enumerate(questao.get('alternatives', []), 1):
+        letra = chr(64 + i)
+        texto += f"{letra}) {alt}\n"
+    return texto
+
+
+def compilar(questao: Dict, variante: str = 'revisado', area: Optional[str] = None) -> Tuple[str, str, Dict]:
+    """
+    Prompt da questão como (prefixo, sufixo, info): o prefixo vem do cache de
+    compilação e é idêntico para a mesma combinação; o sufixo é só da questão.
+    """
+    area = area or questao.get('area', '')
+    tri_info = info_tri(questao.get('number', 0))
+    tri_value = tri_info.get('TRI', 0)
+    tema = tri_info.get('Tema', 'N/A')
+    faixa = faixa_tri(tri_value)
+    figura = info_figura(questao)
+    figura_simples = bool(figura.get('eh_simples', False))
+
+    if variante == 'revisado':
+        prefixo = prefixo_revisado(area, faixa, figura_simples)
+        cabecalho = f"TRI da questão: {tri_value:.0f}\n\n" if area in AREAS else ""
+        nivel = prompts.adaptativos.classificar_por_tri(tri_value)
+    elif variante == 'melhorado':
+        nivel = prompts.adaptativos.classificar_por_tri(tri_value) if tri_value > 0 else 'medio'
+        tem_figura = bool(figura.get('tem_figura', False)) and 0 < tri_value < 650
+        tema_fewshot = tema if area == 'mathematics' and nivel == 'medio' else None
+        prefixo = prefixo_melhorado(area, faixa, tem_figura, figura_simples, tema_fewshot)
+        cabecalho = ""
+    else:
+        raise ValueError(f"Variante de prompt desconhecida: {variante}")
+
+    return prefixo, cabecalho + formatar_questao(questao), {
+        'tri': tri_value,
+        'nivel': nivel,
+        'tema': tema,
+        'area': area,
+        'tem_figura_simples': figura_simples
+    }
+
+
+def montar_prompt(questao: Dict, variante: str = 'revisado', area: Optional[str] = None) -> Tuple[str, Dict]:
+    """Prompt completo (prefixo compilado + questão) e info"""
+    prefixo, sufixo, info = compilar(questao, variante, area)
+    return prefixo + sufixo, info
+
+
+def precompilar(variante: str = 'revisado') -> int:
+    """Compila de antemão todos os prefixos da variante; retorna quantos são distintos"""
+    prefixos = set()
+    for area in AREAS:
+        for faixa in FAIXAS:
+            for figura_simples in (False, True):
+                if variante == 'revisado':
+                    prefixos.add(prefixo_revisado(area, faixa, figura_simples))
+                    continue
+                temas = [None]
+                if area == 'mathematics' and faixa in ('sem_tri', 'invalido', 'medio_baixo', 'medio'):
+                    temas = sorted({'N/A'} | {info.get('Tema', 'N/A')
+                                              for info in prompts.tri_data().values()})
+                for tem_figura in (False, True):
+                    for tema in temas:
+                        prefixos.add(prefixo_melhorado(area, faixa, tem_figura, figura_simples, tema))
+    return len(prefixos)
+
+
+def main():
+    print("=" * 70)
+    print("🧩 COMPILADOR DE PROMPTS")
+    print("=" * 70)
+    for variante in ('revisado', 'melhorado'):
+        print(f"   {variante}: {precompilar(variante)} prefixos distintos")
+    for nome, funcao in (('revisado', prefixo_revisado), ('melhorado', prefixo_melhorado)):
+        cache = funcao.cache_info()
+        print(f"   cache {nome}: {cache.currsize} combinações")
+    print("✅ Prefixos compilados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Corpus Unificado de Questões do ENEM
+
+Substitui os carregar_dados_processados copiados em cada script: os arquivos
+data/processed/enem_*_completo.jsonl são lidos uma vez, convertidos em uma
+tabela colunar tipada (id, ano, área, número, gabarito, TRI, figura) com
+índices por ano, área e id, e gravados em um cache binário em
+data/processed/.cache_corpus/. Execuções seguintes (e os demais passos de
+executar_todas_analises.sh) carregam o cache sem parsear JSON.
+
+As colunas de texto (contexto, pergunta, alternativas, ...) ficam em arquivos
+separados mapeados em memória e só são decodificadas quando acessadas.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+VERSAO_CACHE = 2
+NOME_CACHE = ".cache_corpus"
+PADRAO_ARQUIVOS = "enem_*_completo.jsonl"
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PROCESSED_DIR_PADRAO = PROJECT_ROOT / "data" / "processed"
+
+# Campos com coluna própria -> tipo esperado (outro tipo vai para 'extras')
+CAMPOS_ESCALARES = {
+    'id': str,
+    'exam': str,
+    'area': str,
+    'number': int,
+    'label': str,
+    'has_images': bool,
+    'tri': float,
+}
+COLUNAS_TEXTO = ['context', 'question', 'alternatives', 'context_images', 'extras']
+CAMPOS_TEXTO = {'context': str, 'question': str, 'alternatives': list, 'context_images': str}
+ORDEM_CAMPOS = list(CAMPOS_ESCALARES) + list(CAMPOS_TEXTO)
+
+_CORPUS_CARREGADOS: Dict[str, "CorpusEnem"] = {}
+
+
+class ColunaTexto:
+    """Coluna de texto UTF-8 concatenada + offsets, decodificada sob demanda"""
+
+    def __init__(self, arquivo: Path, offsets: np.ndarray):
+        self.arquivo = arquivo
+        self.offsets = offsets
+        self._buffer = None
+
+    def _dados(self):
+        if self._buffer is None:
+            tamanho = int(self.offsets[-1]) if len(self.offsets) else 0
+            self._buffer = (
+                np.memmap(self.arquivo, dtype=np.uint8, mode='r') if tamanho else b''
+            )
+        return self._buffer
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        inicio, fim = int(self.offsets[i]), int(self.offsets[i + 1])
+        if inicio == fim:
+            return ''
+        return bytes(self._dados()[inicio:fim]).decode('utf-8')
+
+    def tolist(self, indices=None) -> List[str]:
+        indices = range(len(self)) if indices is None else indices
+        return [self[int(i)] for i in indices]
+
+
+class CorpusEnem:
+    """Tabela colunar de questões com índices por ano, área e id"""
+
+    def __init__(self, colunas: Dict[str, np.ndarray], textos: Dict[str, ColunaTexto]):
+        self.colunas = colunas
+        self.textos = textos
+
+        self.ids = colunas['ids']
+        self.anos = colunas['anos']
+        self.areas = colunas['areas']
+        self.numeros = colunas['numeros']
+        self.labels = colunas['labels']
+        self.tri = colunas['tri']
+        self.has_figure = colunas['has_figure']
+
+        # Índices pré-construídos (posições em ordem de arquivo/linha)
+        self.indice_ano = {int(ano): np.flatnonzero(self.anos == ano) for ano in np.unique(self.anos)}
+        self.indice_area = {str(area): np.flatnonzero(self.areas == area) for area in np.unique(self.areas)}
+        self.indice_id = {}
+        self.ids_duplicados = []
+        for i, id_questao in enumerate(self.ids.tolist()):
+            if self.indice_id.setdefault(id_questao, i) != i:
+                self.ids_duplicados.append(id_questao)
+        if self.ids_duplicados:
+            exemplos = ', '.join(sorted(set(self.ids_duplicados))[:5])
+            print(f"⚠️  Corpus com {len(self.ids_duplicados)} ids duplicados ({exemplos}); "
+                  f"linha() e por_id() usam a primeira ocorrência")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def texto(self, coluna: str) -> ColunaTexto:
+        """Coluna de texto lazy ('context', 'question', 'alternatives', ...)"""
+        return self.textos[coluna]
+
+    def comprimentos(self, coluna: str) -> np.ndarray:
+        """Número de caracteres de cada texto (sem decodificar)"""
+        return self.colunas[f"len_{coluna}"]
+
+    def selecionar(self, anos: Optional[List[int]] = None, areas: Optional[List[str]] = None,
+                   com_gabarito: bool = False) -> np.ndarray:
+        """Índices das questões que satisfazem os filtros (ordem original)"""
+        mascara = np.ones(len(self), dtype=bool)
+        if anos is not None:
+            mascara &= np.isin(self.anos, list(anos))
+        if areas is not None:
+            mascara &= np.isin(self.areas, list(areas))
+        if com_gabarito:
+            mascara &= np.isin(np.char.upper(np.char.strip(self.labels)), ['A', 'B', 'C', 'D', 'E'])
+        return np.flatnonzero(mascara)
+
+    def linha(self, id_questao: str) -> Optional[int]:
+        """Posição da questão pelo id"""
+        return self.indice_id.get(id_questao)
+
+    def questao(self, i: int) -> Dict:
+        """Materializa a questão i como dict (mesmos campos do JSONL original)"""
+        i = int(i)
+        presenca = int(self.colunas['presenca'][i])
+        questao = {}
+        for bit, campo in enumerate(ORDEM_CAMPOS):
+            if not presenca & (1 << bit):
+                continue
+            if campo == 'id':
+                questao[campo] = str(self.ids[i])
+            elif campo == 'exam':
+                questao[campo] = str(self.colunas['exams'][i])
+            elif campo == 'area':
+                questao[campo] = str(self.areas[i])
+            elif campo == 'number':
+                questao[campo] = int(self.numeros[i])
+            elif campo == 'label':
+                questao[campo] = str(self.labels[i])
+            elif campo == 'has_images':
+                questao[campo] = bool(self.colunas['has_images'][i])
+            elif campo == 'tri':
+                questao[campo] = float(self.tri[i])
+            elif campo == 'alternatives':
+                questao[campo] = json.loads(self.textos['alternatives'][i])
+            else:
+                questao[campo] = self.textos[campo][i]
+
+        extras = self.textos['extras'][i]
+        if extras:
+            questao.update(json.loads(extras))
+        return questao
+
+    def questoes(self, indices=None) -> List[Dict]:
+        """Lista de dicts das questões selecionadas"""
+        indices = range(len(self)) if indices is None else indices
+        return [self.questao(i) for i in indices]
+
+    def por_ano(self, areas: Optional[List[str]] = None) -> Dict[int, List[Dict]]:
+        """Formato {ano: [questões]} dos antigos carregar_dados_processados"""
+        dados = {}
+        for ano, indices in self.indice_ano.items():
+            if areas is not None:
+                indices = indices[np.isin(self.areas[indices], list(areas))]
+            dados[ano] = self.questoes(indices)
+        return dados
+
+    def por_ano_area(self) -> Dict[int, Dict[str, List[Dict]]]:
+        """Formato {ano: {área: [questões]}}"""
+        dados = {}
+        for ano, indices in self.indice_ano.items():
+            dados[ano] = {}
+            for i in indices:
+                questao = self.questao(i)
+                dados[ano].setdefault(questao.get('area', 'desconhecida'), []).append(questao)
+        return dados
+
+    def por_id(self, areas: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Formato {id: questão} (ids duplicados: primeira ocorrência, como em linha())"""
+        indices = self.selecionar(areas=areas)
+        return {str(self.ids[i]): self.questao(i) for i in indices
+                if self.indice_id[str(self.ids[i])] == i}
+
+
+def _impressao_digital(arquivos: List[Path]) -> List[List]:
+    """Nome, tamanho e mtime dos arquivos de origem (invalida o cache)"""
+    return [[arquivo.name, arquivo.stat().st_size, arquivo.stat().st_mtime_ns] for arquivo in arquivos]
+
+
+def _ler_jsonl(arquivos: List[Path]) -> Dict[str, list]:
+    """Parse único dos JSONL em listas por coluna"""
+    linhas = {chave: [] for chave in ['ids', 'anos', 'areas', 'numeros', 'labels', 'tri',
+                                      'has_figure', 'has_images', 'exams', 'presenca']}
+    textos = {coluna: [] for coluna in COLUNAS_TEXTO}
+
+    for arquivo in arquivos:
+        ano = int(arquivo.stem.split('_')[1])
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                questao = json.loads(line)
+
+                presenca = 0
+                extras = {}
+                for bit, campo in enumerate(ORDEM_CAMPOS):
+                    if campo not in questao:
+                        continue
+                    tipo = CAMPOS_ESCALARES.get(campo) or CAMPOS_TEXTO.get(campo)
+                    valor = questao[campo]
+                    tipo_ok = isinstance(valor, tipo) and not (tipo is int and isinstance(valor, bool))
+                    if tipo is float:
+                        tipo_ok = isinstance(valor, (int, float)) and not isinstance(valor, bool)
+                    if tipo_ok:
+                        presenca |= 1 << bit
+                    else:
+                        extras[campo] = valor
+                for campo, valor in questao.items():
+                    if campo not in CAMPOS_ESCALARES and campo not in CAMPOS_TEXTO:
+                        extras[campo] = valor
+
+                try:
+                    numero = int(questao.get('number', -1))
+                except (TypeError, ValueError):
+                    numero = -1
+                try:
+                    tri = float(questao['tri']) if questao.get('tri') not in (None, '', 'N/A') else np.nan
+                except (TypeError, ValueError):
+                    tri = np.nan
+
+                linhas['ids'].append(str(questao.get('id', '')))
+                linhas['anos'].append(ano)
+                linhas['areas'].append(str(questao.get('area', 'desconhecida') or 'desconhecida'))
+                linhas['numeros'].append(numero)
+                linhas['labels'].append(str(questao.get('label', '')))
+                linhas['tri'].append(tri)
+                linhas['has_images'].append(bool(questao.get('has_images', False)))
+                linhas['has_figure'].append(bool(
+                    questao.get('has_images') or questao.get('context_images') or questao.get('figures')
+                ))
+                linhas['exams'].append(str(questao.get('exam', '')))
+                linhas['presenca'].append(presenca)
+
+                textos['context'].append(questao.get('context', '') if isinstance(questao.get('context'), str) else '')
+                textos['question'].append(questao.get('question', '') if isinstance(questao.get('question'), str) else '')
+                alternativas = questao.get('alternatives')
+                textos['alternatives'].append(json.dumps(alternativas, ensure_ascii=False)
+                                              if isinstance(alternativas, list) else '[]')
+                textos['context_images'].append(questao.get('context_images', '')
+                                                if isinstance(questao.get('context_images'), str) else '')
+                textos['extras'].append(json.dumps(extras, ensure_ascii=False) if extras else '')
+
+    return {'linhas': linhas, 'textos': textos}
+
+
+def _gravar_cache(cache_dir: Path, lidos: Dict[str, list], impressao: List[List]):
+    """Grava colunas (.npz) e textos (.bin) com escrita atômica"""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    linhas, textos = lidos['linhas'], lidos['textos']
+
+    colunas = {
+        'ids': np.asarray(linhas['ids'], dtype=str),
+        'anos': np.asarray(linhas['anos'], dtype=np.int16),
+        'areas': np.asarray(linhas['areas'], dtype=str),
+        'numeros': np.asarray(linhas['numeros'], dtype=np.int16),
+        'labels': np.asarray(linhas['labels'], dtype=str),
+        'tri': np.asarray(linhas['tri'], dtype=np.float64),
+        'has_figure': np.asarray(linhas['has_figure'], dtype=bool),
+        'has_images': np.asarray(linhas['has_images'], dtype=bool),
+        'exams': np.asarray(linhas['exams'], dtype=str),
+        'presenca': np.asarray(linhas['presenca'], dtype=np.int16),
+    }
+
+    for coluna in COLUNAS_TEXTO:
+        codificados = [texto.encode('utf-8') for texto in textos[coluna]]
+        offsets = np.zeros(len(codificados) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in codificados])
+        colunas[f"offsets_{coluna}"] = offsets
+        colunas[f"len_{coluna}"] = np.asarray([len(t) for t in textos[coluna]], dtype=np.int32)
+
+        temporario = cache_dir / f"{coluna}.bin.tmp{os.getpid()}"
+        with open(temporario, 'wb') as f:
+            for b in codificados:
+                f.write(b)
+        os.replace(temporario, cache_dir / f"{coluna}.bin")
+
+    temporario = cache_dir / f"colunas.tmp{os.getpid()}.npz"
+    np.savez(temporario, **colunas)
+    os.replace(temporario, cache_dir / "colunas.npz")
+
+    # Manifesto por último: só marca o cache como válido depois de tudo gravado
+    temporario = cache_dir / f"manifesto.json.tmp{os.getpid()}"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({'versao': VERSAO_CACHE, 'arquivos': impressao}, f)
+    os.replace(temporario, cache_dir / "manifesto.json")
+
+
+def _cache_valido(cache_dir: Path, impressao: List[List]) -> bool:
+    """Confere versão e impressão digital dos arquivos de origem"""
+    manifesto = cache_dir / "manifesto.json"
+    if not manifesto.exists():
+        return False
+    try:
+        with open(manifesto, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return False
+    return dados.get('versao') == VERSAO_CACHE and dados.get('arquivos') == impressao
+
+
+def _abrir_cache(cache_dir: Path) -> CorpusEnem:
+    """Carrega colunas tipadas e prepara colunas de texto lazy"""
+    with np.load(cache_dir / "colunas.npz", allow_pickle=False) as npz:
+        colunas = {chave: npz[chave] for chave in npz.files}
+    textos = {
+        coluna: ColunaTexto(cache_dir / f"{coluna}.bin", colunas[f"offsets_{coluna}"])
+        for coluna in COLUNAS_TEXTO
+    }
+    return CorpusEnem(colunas, textos)
+
+
+def carregar_corpus(processed_dir: Optional[Path] = None, usar_cache: bool = True) -> CorpusEnem:
+    """
+    Carrega o corpus (uma vez por processo).
+
+    Reconstrói o cache binário quando algum enem_*_completo.jsonl muda.
+    """
+    processed_dir = Path(processed_dir or PROCESSED_DIR_PADRAO)
+    chave = str(processed_dir.resolve())
+    if usar_cache and chave in _CORPUS_CARREGADOS:
+        return _CORPUS_CARREGADOS[chave]
+
+    arquivos = sorted(processed_dir.glob(PADRAO_ARQUIVOS))
+    impressao = _impressao_digital(arquivos)
+    cache_dir = processed_dir / NOME_CACHE
+
+    if not (usar_cache and _cache_valido(cache_dir, impressao)):
+        _gravar_cache(cache_dir, _ler_jsonl(arquivos), impressao)
+
+    corpus = _abrir_cache(cache_dir)
+    _CORPUS_CARREGADOS[chave] = corpus
+    return corpus
+
+
+def carregar_dados_processados(processed_dir: Optional[Path] = None) -> Dict[int, List[Dict]]:
+    """Carrega todos os dados processados ({ano: [questões]})"""
+    return carregar_corpus(processed_dir).por_ano()
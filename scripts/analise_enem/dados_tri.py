@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Armazém Local de Dados TRI (usado por 90_ e 91_)
+
+Antes, 90_ e 91_ baixavam a planilha TRI do Google Sheets (pd.read_csv(url))
+a cada execução e percorriam as linhas com df.iterrows(); o resultado era
+colado à mão como literal em 70_. Aqui a planilha vira um snapshot colunar
+versionado em data/tri/ (Parquet com pyarrow; .npz do numpy sem ele) com um
+manifesto.json apontando para a versão atual. O download só acontece com
+--atualizar; avaliações leem o snapshot local, sem rede e sem pandas.
+
+O processamento por (ano, área, questão) é vetorizado e a consulta é O(1):
+cada métrica (TRI, TRI_min, TRI_max, TRI_mediana) fica num array denso
+[ano, número global da questão (1-180)].
+
+Uso:
+    python dados_tri.py                          # mostra o snapshot atual
+    python dados_tri.py --atualizar              # baixa a planilha e grava nova versão
+    python dados_tri.py --csv planilha.csv       # nova versão a partir de um CSV local
+    python dados_tri.py --json data/analises/tri_enem_completo.json   # a partir do JSON de 91_
+"""
+import csv
+import hashlib
+import io
+import json
+import sys
+import urllib.request
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem.motor_execucao import salvar_json_atomico
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+SHEET_ID = "1aCR6Q9LBd5-byvzyFAECuwkTZc8bmRtwZxZ_m4U1FA8"
+CSV_URL = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=csv&gid=0"
+DIR_TRI = Path(__file__).parent.parent.parent / "data" / "tri"
+
+# Mapeamento de áreas (código da planilha -> área) e primeira questão de cada área
+AREA_MAP = {
+    'LC': 'languages',         # Questões 1-45
+    'CH': 'human-sciences',    # Questões 46-90
+    'CN': 'natural-sciences',  # Questões 91-135
+    'MT': 'mathematics'        # Questões 136-180
+}
+AREAS = tuple(AREA_MAP.values())
+QUESTAO_OFFSET = {'languages': 1, 'human-sciences': 46, 'natural-sciences': 91, 'mathematics': 136}
+NUM_QUESTOES = 180
+
+METRICAS = ('TRI', 'TRI_min', 'TRI_max', 'TRI_mediana')
+COLUNAS_PLANILHA = {'TRI': 'media', 'TRI_min': 'min', 'TRI_max': 'max', 'TRI_mediana': 'mediana'}
+
+
+def _numeros(valores) -> np.ndarray:
+    """Coluna de texto da planilha (vírgula decimal, vazios) para float"""
+    texto = np.char.replace(np.asarray(valores, dtype=str), ',', '.')
+    texto = np.where(np.char.strip(texto) == '', 'nan', texto)
+    return texto.astype(float)
+
+
+def processar_planilha(linhas: Dict[str, list]) -> Dict[str, np.ndarray]:
+    """
+    Colunas brutas da planilha (area, ano, acertos, min, max, media, mediana)
+    para colunas do snapshot, de forma vetorizada. "acertos" é a posição
+    (0-indexed) da questão dentro da área.
+    """
+    codigos = np.asarray(linhas['area'], dtype=str)
+    validas = np.isin(codigos, list(AREA_MAP))
+    codigos = codigos[validas]
+
+    unicos, inverso = np.unique(codigos, return_inverse=True)
+    area = np.array([AREA_MAP[c] for c in unicos], dtype=str)[inverso]
+    offset = np.array([QUESTAO_OFFSET[AREA_MAP[c]] for c in unicos], dtype=int)[inverso]
+    questao_na_area = _numeros(np.asarray(linhas['acertos'])[validas]).astype(int) + 1
+
+    colunas = {
+        'ano': _numeros(np.asarray(linhas['ano'])[validas]).astype(int),
+        'area': area,
+        'questao_na_area': questao_na_area,
+        'questao': offset + questao_na_area - 1,
+    }
+    for metrica, coluna in COLUNAS_PLANILHA.items():
+        # planilhas antigas sem min/max/mediana: repete a média
+        colunas[metrica] = _numeros(np.asarray(linhas.get(coluna, linhas['media']))[validas])
+    return colunas
+
+
+def ler_csv(fonte) -> Dict[str, list]:
+    """Colunas de um CSV (texto ou caminho)"""
+    if isinstance(fonte, Path):
+        with open(fonte, 'r', encoding='utf-8') as f:
+            fonte = f.read()
+    leitor = csv.DictReader(io.StringIO(fonte))
+    colunas = {nome: [] for nome in leitor.fieldnames or []}
+    for linha in leitor:
+        for nome in colunas:
+            colunas[nome].append(linha.get(nome) or '')
+    return colunas
+
+
+def baixar_planilha(url: str = CSV_URL) -> Dict[str, list]:
+    """Baixa a planilha TRI como CSV (só chamado com --atualizar)"""
+    print(f"📥 Baixando dados TRI de: {url}")
+    with urllib.request.urlopen(url, timeout=60) as resposta:
+        return ler_csv(resposta.read().decode('utf-8'))
+
+
+def colunas_do_json(arquivo: Path) -> Dict[str, np.ndarray]:
+    """Colunas do snapshot a partir do JSON por questão gerado por 91_ (tri_enem_completo.json)"""
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+    itens = sorted(dados.items(), key=lambda kv: int(kv[0]))
+    colunas = {
+        'ano': np.array([int(d['ano']) for _, d in itens]),
+        'area': np.array([d['area'] for _, d in itens]),
+        'questao_na_area': np.array([int(d['questao_na_area']) for _, d in itens]),
+        'questao': np.array([int(n) for n, _ in itens]),
+    }
+    for metrica in METRICAS:
+        colunas[metrica] = np.array([float(d.get(metrica, d['TRI'])) for _, d in itens])
+    return colunas
+
+
+def _manifesto(diretorio: Path) -> Optional[Dict]:
+    arquivo = Path(diretorio) / "manifesto.json"
+    if not arquivo.exists():
+        return None
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def salvar_snapshot(colunas: Dict[str, np.ndarray], fonte: str, diretorio: Path = DIR_TRI) -> Dict:
+    """Grava uma nova versão do snapshot e aponta o manifesto para ela"""
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    anterior = _manifesto(diretorio)
+    versao = (anterior['versao'] + 1) if anterior else 1
+
+    if HAS_PYARROW:
+        arquivo = diretorio / f"tri_v{versao}.parquet"
+        pq.write_table(pa.table({nome: valores.tolist() for nome, valores in colunas.items()}), str(arquivo))
+    else:
+        arquivo = diretorio / f"tri_v{versao}.npz"
+        with open(arquivo, 'wb') as f:
+            np.savez_compressed(f, **colunas)
+
+    manifesto = {
+        'versao': versao,
+        'arquivo': arquivo.name,
+        'fonte': fonte,
+        'criado_em': datetime.now().isoformat(timespec='seconds'),
+        'linhas': int(len(colunas['questao'])),
+        'anos': sorted({int(a) for a in colunas['ano']}),
+        'sha256': hashlib.sha256(arquivo.read_bytes()).hexdigest(),
+    }
+    salvar_json_atomico(diretorio / "manifesto.json", manifesto, indent=2)
+    tabela.cache_clear()
+    return manifesto
+
+
+def carregar_snapshot(diretorio: Path = DIR_TRI) -> Dict[str, np.ndarray]:
+    """Colunas da versão atual do snapshot"""
+    manifesto = _manifesto(diretorio)
+    if manifesto is None:
+        raise FileNotFoundError(f"Snapshot TRI não encontrado em {diretorio} "
+                                f"(execute: python scripts/analise_enem/dados_tri.py --atualizar)")
+    arquivo = Path(diretorio) / manifesto['arquivo']
+    if arquivo.suffix == '.parquet':
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow é necessário para ler o snapshot Parquet: pip install pyarrow")
+        return {nome: np.asarray(valores) for nome, valores in pq.read_table(str(arquivo)).to_pydict().items()}
+    with np.load(arquivo, allow_pickle=False) as dados:
+        return {nome: dados[nome] for nome in dados.files}
+
+
+class TabelaTRI:
+    """Métricas TRI em arrays densos [ano, questão] com consulta O(1)"""
+
+    def __init__(self, colunas: Dict[str, np.ndarray]):
+        self.anos = sorted({int(a) for a in colunas['ano']})
+        self._indice_ano = {ano: i for i, ano in enumerate(self.anos)}
+
+        linha = np.array([self._indice_ano[int(a)] for a in colunas['ano']], dtype=int)
+        questao = np.asarray(colunas['questao'], dtype=int)
+        dentro = (questao >= 1) & (questao <= NUM_QUESTOES)
+        linha, questao = linha[dentro], questao[dentro]
+
+        self.valores = {}
+        for metrica in METRICAS:
+            denso = np.full((len(self.anos), NUM_QUESTOES + 1), np.nan)
+            denso[linha, questao] = np.asarray(colunas[metrica], dtype=float)[dentro]
+            self.valores[metrica] = denso
+
+    def ano_disponivel(self, ano: Optional[int] = None) -> int:
+        """O ano pedido ou, se não houver dados dele, o mais recente disponível"""
+        return ano if ano in self._indice_ano else self.anos[-1]
+
+    def tri(self, numero: int, ano: Optional[int] = None, metrica: str = 'TRI') -> float:
+        """Valor TRI da questão (0 se não houver)"""
+        if not 1 <= numero <= NUM_QUESTOES:
+            return 0.0
+        valor = self.valores[metrica][self._indice_ano[self.ano_disponivel(ano)], numero]
+        return 0.0 if np.isnan(valor) else float(valor)
+
+    def info(self, numero: int, ano: Optional[int] = None) -> Dict:
+        """Métricas, área e ano da questão (dicionário vazio se não houver)"""
+        ano = self.ano_disponivel(ano)
+        if not self.tri(numero, ano):
+            return {}
+        area = area_da_questao(numero)
+        info = {metrica: self.tri(numero, ano, metrica) for metrica in METRICAS}
+        info.update({
+            'area': area,
+            'ano': ano,
+            'questao_na_area': numero - QUESTAO_OFFSET[area] + 1
+        })
+        return info
+
+    def por_questao(self, ano: Optional[int] = None) -> Dict[int, Dict]:
+        """{número global: info} para todas as questões do ano"""
+        ano = self.ano_disponivel(ano)
+        presentes = np.flatnonzero(~np.isnan(self.valores['TRI'][self._indice_ano[ano]]))
+        return {int(numero): self.info(int(numero), ano) for numero in presentes}
+
+
+def area_da_questao(numero: int) -> str:
+    """Área pelo número global da questão (1-45 LC, 46-90 CH, 91-135 CN, 136-180 MT)"""
+    return AREAS[min(max(numero - 1, 0) // 45, len(AREAS) - 1)]
+
+
+@lru_cache(maxsize=None)
+def tabela(diretorio: Path = DIR_TRI) -> TabelaTRI:
+    """TabelaTRI da versão atual do snapshot (carregada uma vez por processo)"""
+    return TabelaTRI(carregar_snapshot(diretorio))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Snapshot local dos dados TRI do ENEM")
+    origem = parser.add_mutually_exclusive_group()
+    origem.add_argument("--atualizar", action="store_true", help="Baixa a planilha do Google Sheets")
+    origem.add_argument("--csv", type=str, help="Nova versão a partir de um CSV local da planilha")
+    origem.add_argument("--json", type=str, help="Nova versão a partir do JSON por questão de 91_")
+    parser.add_argument("--diretorio", type=str, default=str(DIR_TRI))
+    args = parser.parse_args()
+
+    diretorio = Path(args.diretorio)
+    print("=" * 70)
+    print("📊 ARMAZÉM DE DADOS TRI")
+    print("=" * 70)
+
+    if args.atualizar or args.csv or args.json:
+        if args.json:
+            colunas, fonte = colunas_do_json(Path(args.json)), args.json
+        else:
+            linhas = baixar_planilha() if args.atualizar else ler_csv(Path(args.csv))
+            colunas, fonte = processar_planilha(linhas), CSV_URL if args.atualizar else args.csv
+        manifesto = salvar_snapshot(colunas, fonte, diretorio)
+        print(f"💾 Versão {manifesto['versao']} gravada: {diretorio / manifesto['arquivo']}")
+
+    manifesto = _manifesto(diretorio)
+    if manifesto is None:
+        print("❌ Nenhum snapshot encontrado")
+        print("   Execute: python scripts/analise_enem/dados_tri.py --atualizar")
+        return
+
+    dados = tabela(diretorio)
+    print(f"   Versão: {manifesto['versao']} ({manifesto['arquivo']}, {manifesto['criado_em']})")
+    print(f"   Fonte: {manifesto['fonte']}")
+    print(f"   Linhas: {manifesto['linhas']}")
+    print(f"   Anos: {dados.anos}")
+    for ano in dados.anos:
+        linha = dados.valores['TRI'][dados.anos.index(ano)]
+        contagem = {area: int(np.count_nonzero(~np.isnan(linha[QUESTAO_OFFSET[area]:QUESTAO_OFFSET[area] + 45])))
+                    for area in AREAS}
+        print(f"   {ano}: " + ", ".join(f"{area} {n}" for area, n in contagem.items()))
+
+
+if __name__ == "__main__":
+    main()
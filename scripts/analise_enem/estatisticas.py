@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Estatísticas Vetorizadas dos Resultados (usadas por 45_ e armazem_resultados.py)
+
+Os resultados entram como colunas numpy (as mesmas do armazém:
+colunas_da_execucao() para um arquivo, Armazem.colunas para muitas
+execuções) e todas as contas são feitas sobre arrays, sem laço por questão:
+
+    acuracia_por(correto, {'area': ...})      acertos/total/acurácia por grupo (bincount)
+    pearson / spearman / ponto_bisserial      correlações (NaN são ignorados)
+    pearson_por_grupo(x, y, codigos)          uma correlação por execução, de uma vez
+    bootstrap_ic(estatistica, *arrays)        IC por reamostragem em lotes de índices
+    ajustar_logistica(x, y, codigos)          P(acerto | TRI) por Newton-Raphson,
+                                              todos os grupos ao mesmo tempo
+
+Uso:
+    python estatisticas.py results/avaliacao_detalhada_20250101_120000.jsonl
+"""
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+def _codificar(valores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(valores distintos na ordem da primeira aparição, código de cada linha)"""
+    distintos, primeiro, codigos = np.unique(valores, return_index=True, return_inverse=True)
+    ordem = np.argsort(primeiro, kind='stable')
+    posicao = np.empty(len(ordem), dtype=np.intp)
+    posicao[ordem] = np.arange(len(ordem))
+    return distintos[ordem], posicao[codigos.ravel()]
+
+
+def agrupar(colunas: Dict[str, np.ndarray]) -> Tuple[Tuple[np.ndarray, ...], np.ndarray, Tuple[int, ...]]:
+    """(valores distintos de cada coluna, código combinado de cada linha, formato)
+
+    Os grupos seguem a ordem da primeira aparição (como um dict preenchido
+    linha a linha), não a ordem alfabética.
+    """
+    if not colunas:
+        raise ValueError("agrupar() precisa de ao menos uma coluna")
+    distintos, codigos = zip(*(_codificar(valores) for valores in colunas.values()))
+    formato = tuple(len(d) for d in distintos)
+    if not all(formato):
+        return distintos, np.zeros(0, dtype=np.intp), formato
+    return distintos, np.ravel_multi_index(codigos, formato), formato
+
+
+def acuracia_por(correto: np.ndarray, colunas: Dict[str, np.ndarray]) -> List[Dict]:
+    """Uma linha por combinação presente: valores dos grupos, acertos, total, acurácia (%)"""
+    distintos, codigo, formato = agrupar(colunas)
+    if not len(codigo):
+        return []
+    total = np.bincount(codigo, minlength=int(np.prod(formato)))
+    acertos = np.bincount(codigo, weights=np.asarray(correto, dtype=float), minlength=len(total))
+
+    linhas = []
+    for indice in np.flatnonzero(total):
+        posicoes = np.unravel_index(indice, formato)
+        linha = {nome: d[p].item() for nome, d, p in zip(colunas, distintos, posicoes)}
+        linha.update({
+            'acertos': int(acertos[indice]),
+            'total': int(total[indice]),
+            'acuracia': float(acertos[indice] / total[indice] * 100),
+        })
+        linhas.append(linha)
+    return linhas
+
+
+def _validos(*arrays) -> List[np.ndarray]:
+    arrays = [np.asarray(a, dtype=float) for a in arrays]
+    mascara = np.logical_and.reduce([np.isfinite(a) for a in arrays])
+    return [a[mascara] for a in arrays]
+
+
+def pearson(x, y) -> float:
+    """Correlação de Pearson (0 se houver menos de 2 pares ou variância nula)"""
+    x, y = _validos(x, y)
+    if len(x) < 2:
+        return 0.0
+    dx, dy = x - x.mean(), y - y.mean()
+    denominador = np.sqrt((dx * dx).sum() * (dy * dy).sum())
+    return float((dx * dy).sum() / denominador) if denominador else 0.0
+
+
+def postos(x) -> np.ndarray:
+    """Postos 1..n com empates recebendo a média dos postos"""
+    x = np.asarray(x)
+    ordem = np.argsort(x, kind='mergesort')
+    ordenado = x[ordem]
+    novo = np.r_[True, ordenado[1:] != ordenado[:-1]]
+    grupo = np.cumsum(novo) - 1
+    inicio = np.flatnonzero(novo)
+    fim = np.r_[inicio[1:], len(x)]
+    medio = (inicio + fim + 1) / 2.0
+    resultado = np.empty(len(x))
+    resultado[ordem] = medio[grupo]
+    return resultado
+
+
+def spearman(x, y) -> float:
+    """Correlação de Spearman (Pearson dos postos)"""
+    x, y = _validos(x, y)
+    return pearson(postos(x), postos(y)) if len(x) >= 2 else 0.0
+
+
+def ponto_bisserial(binario, x) -> float:
+    """Correlação ponto-bisserial entre uma variável 0/1 (acerto) e uma contínua (TRI)"""
+    b, x = _validos(binario, x)
+    if len(x) < 2:
+        return 0.0
+    um = b > 0.5
+    p = um.mean()
+    desvio = x.std()
+    if p in (0.0, 1.0) or not desvio:
+        return 0.0
+    return float((x[um].mean() - x[~um].mean()) / desvio * np.sqrt(p * (1 - p)))
+
+
+def pearson_por_grupo(x, y, codigos: np.ndarray, n_grupos: Optional[int] = None) -> np.ndarray:
+    """Pearson de cada grupo (ex.: execução) a partir de somas por bincount"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    validos = np.isfinite(x) & np.isfinite(y)
+    x, y, codigos = x[validos], y[validos], np.asarray(codigos)[validos]
+    n_grupos = n_grupos or (int(codigos.max()) + 1 if len(codigos) else 0)
+
+    def soma(pesos=None):
+        return np.bincount(codigos, weights=pesos, minlength=n_grupos)
+
+    n, sx, sy = soma(), soma(x), soma(y)
+    sxx, syy, sxy = soma(x * x), soma(y * y), soma(x * y)
+    numerador = n * sxy - sx * sy
+    denominador = np.sqrt(np.clip(n * sxx - sx ** 2, 0, None) * np.clip(n * syy - sy ** 2, 0, None))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = numerador / denominador
+    r[(n < 2) | (denominador == 0)] = 0.0
+    return r
+
+
+# Estatísticas por linha para o bootstrap (cada linha é uma reamostra)
+
+def media_linhas(x: np.ndarray) -> np.ndarray:
+    return x.mean(axis=1)
+
+
+def pearson_linhas(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    dx = x - x.mean(axis=1, keepdims=True)
+    dy = y - y.mean(axis=1, keepdims=True)
+    denominador = np.sqrt((dx * dx).sum(axis=1) * (dy * dy).sum(axis=1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = (dx * dy).sum(axis=1) / denominador
+    return np.where(denominador > 0, r, 0.0)
+
+
+def bootstrap_ic(estatistica: Callable[..., np.ndarray], *arrays, n_boot: int = 2000, nivel: float = 0.95,
+                 semente: int = 0, lote: int = 500) -> Tuple[float, float]:
+    """
+    Intervalo de confiança percentil. `estatistica` recebe os arrays
+    reamostrados com forma (reamostras, n) e devolve um valor por linha
+    (media_linhas, pearson_linhas...). Os índices são sorteados em lotes
+    para limitar a memória.
+    """
+    arrays = _validos(*arrays)
+    n = len(arrays[0])
+    if n < 2:
+        return (float('nan'), float('nan'))
+    rng = np.random.default_rng(semente)
+    valores = []
+    for inicio in range(0, n_boot, lote):
+        indices = rng.integers(0, n, size=(min(lote, n_boot - inicio), n))
+        valores.append(estatistica(*(a[indices] for a in arrays)))
+    valores = np.concatenate(valores)
+    alfa = (1 - nivel) / 2
+    inferior, superior = np.quantile(valores, [alfa, 1 - alfa])
+    return float(inferior), float(superior)
+
+
+class AjusteLogistico:
+    """P(acerto | x) = 1 / (1 + exp(-(intercepto + inclinacao * x))), um par de parâmetros por grupo"""
+
+    __slots__ = ('intercepto', 'inclinacao', 'n')
+
+    def __init__(self, intercepto: np.ndarray, inclinacao: np.ndarray, n: np.ndarray):
+        self.intercepto = intercepto
+        self.inclinacao = inclinacao
+        self.n = n
+
+    def prob(self, x, grupo: int = 0) -> np.ndarray:
+        z = self.intercepto[grupo] + self.inclinacao[grupo] * np.asarray(x, dtype=float)
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def ponto_medio(self, grupo: int = 0) -> float:
+        """x com P(acerto) = 50%"""
+        inclinacao = self.inclinacao[grupo]
+        return float(-self.intercepto[grupo] / inclinacao) if inclinacao else float('nan')
+
+
+def ajustar_logistica(x, y, codigos: Optional[np.ndarray] = None, n_grupos: Optional[int] = None,
+                      iteracoes: int = 25, ridge: float = 1e-6, tolerancia: float = 1e-8) -> AjusteLogistico:
+    """
+    Regressão logística simples de y (0/1) em x, por grupo. Newton-Raphson com
+    gradiente e hessiana 2x2 de todos os grupos somados por bincount, então
+    milhares de execuções são ajustadas na mesma iteração. x é padronizado
+    internamente; `ridge` evita divergência com separação perfeita.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    codigos = np.zeros(len(x), dtype=np.intp) if codigos is None else np.asarray(codigos)
+    validos = np.isfinite(x) & np.isfinite(y)
+    x, y, codigos = x[validos], y[validos], codigos[validos]
+    n_grupos = n_grupos or (int(codigos.max()) + 1 if len(codigos) else 1)
+    if not len(x):
+        vazio = np.full(n_grupos, np.nan)
+        return AjusteLogistico(vazio, vazio.copy(), np.zeros(n_grupos, dtype=int))
+
+    media = x.mean()
+    escala = x.std() or 1.0
+    xs = (x - media) / escala
+    b0 = np.zeros(n_grupos)
+    b1 = np.zeros(n_grupos)
+
+    def soma(pesos):
+        return np.bincount(codigos, weights=pesos, minlength=n_grupos)
+
+    for _ in range(iteracoes):
+        p = 1.0 / (1.0 + np.exp(-(b0[codigos] + b1[codigos] * xs)))
+        w = p * (1 - p)
+        g0 = soma(y - p) - ridge * b0
+        g1 = soma((y - p) * xs) - ridge * b1
+        h00 = soma(w) + ridge
+        h01 = soma(w * xs)
+        h11 = soma(w * xs * xs) + ridge
+        det = h00 * h11 - h01 * h01
+        det = np.where(det > 0, det, np.inf)
+        d0 = (h11 * g0 - h01 * g1) / det
+        d1 = (h00 * g1 - h01 * g0) / det
+        b0 += d0
+        b1 += d1
+        if max(np.abs(d0).max(initial=0), np.abs(d1).max(initial=0)) < tolerancia:
+            break
+
+    inclinacao = b1 / escala
+    intercepto = b0 - inclinacao * media
+    return AjusteLogistico(intercepto, inclinacao, soma(None).astype(int))
+
+
+def main():
+    from scripts.analise_enem.armazem_resultados import colunas_da_execucao
+
+    if len(sys.argv) < 2:
+        print("Uso: python estatisticas.py <arquivo de resultados>")
+        return
+    colunas = colunas_da_execucao(Path(sys.argv[1]))
+    correto = colunas['correto'].astype(float)
+    tri = colunas['tri'].astype(float)
+
+    print(f"📁 {sys.argv[1]}: {len(correto)} questões")
+    for linha in acuracia_por(correto, {'area': colunas['area']}):
+        print(f"   {linha['area']:20s}: {linha['acuracia']:5.2f}% ({linha['acertos']}/{linha['total']})")
+    inferior, superior = bootstrap_ic(media_linhas, correto)
+    print(f"   Acurácia: {correto.mean():.1%} (IC 95%: {inferior:.1%} - {superior:.1%})")
+    if np.isfinite(tri).sum() >= 2:
+        print(f"   TRI vs acerto: Pearson {pearson(tri, correto):.3f} | Spearman {spearman(tri, correto):.3f} "
+              f"| ponto-bisserial {ponto_bisserial(correto, tri):.3f}")
+        ajuste = ajustar_logistica(tri, correto)
+        print(f"   P(acerto | TRI): logit = {ajuste.intercepto[0]:.3f} + {ajuste.inclinacao[0]:.5f}·TRI "
+              f"(50% em TRI {ajuste.ponto_medio():.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 #!/bin/bash
-# Script para executar todas as análises do ENEM em sequência
+# Script para executar todas as análises do ENEM
+#
+# Os passos, suas entradas/saídas e dependências estão declarados em
+# orquestrador.py: só roda o que está desatualizado, passos independentes
+# em paralelo. Argumentos são repassados (ex.: --forcar, --workers 2, --listar).
 
 set -e
 
@@ -18,71 +22,15 @@ if [ ! -d "data/processed" ] || [ -z "$(ls -A data/processed/*.jsonl 2>/dev/null
     exit 1
 fi
 
-echo "📊 FASE 1: Análises Básicas"
-echo "----------------------------------------------------------------------"
-echo "1. Normalizando dados..."
-python scripts/analise_enem/02_normalizar_dados.py
+# Passos padrão: 02 → 03, 04*, 06*, 08, 09, 11, 14, 17*
+#   (* pulados se faltar dependência: sentence-transformers, scikit-learn/nltk, matplotlib)
+# Integração com API Maritaca (19, 21) é opcional: pode consumir créditos.
+#   python scripts/analise_enem/orquestrador.py --passos 21 19
+python scripts/analise_enem/orquestrador.py "$@"
 
-echo ""
-echo "2. Validando dados..."
-python scripts/analise_enem/03_validar_dados.py
-
-echo ""
-echo "📊 FASE 2: Análises Semânticas (OPCIONAL - requer dependências)"
-echo "----------------------------------------------------------------------"
-echo "3. Gerando embeddings..."
-echo "   ⚠️  Instale: pip install sentence-transformers"
-# python scripts/analise_enem/04_gerar_embeddings.py
-
-echo ""
-echo "4. Modelagem de tópicos..."
-echo "   ⚠️  Instale: pip install scikit-learn nltk"
-# python scripts/analise_enem/06_modelagem_topicos.py
-
-echo ""
-echo "📊 FASE 3: Análises de Dificuldade e Similaridade"
-echo "----------------------------------------------------------------------"
-echo "5. Análise de dificuldade..."
-python scripts/analise_enem/08_heuristica_dificuldade.py
-
-echo ""
-echo "6. Similaridade entre provas..."
-python scripts/analise_enem/09_similaridade_provas.py
-
-echo ""
-echo "📊 FASE 4: Análises Temporais"
-echo "----------------------------------------------------------------------"
-echo "7. Série temporal..."
-python scripts/analise_enem/11_serie_temporal.py
-
-echo ""
-echo "8. Modelos preditivos..."
-python scripts/analise_enem/14_modelo_tendencias.py
-
-echo ""
-echo "📊 FASE 5: Visualizações"
-echo "----------------------------------------------------------------------"
-echo "9. Gerando visualizações..."
-echo "   ⚠️  Instale: pip install matplotlib seaborn"
-# python scripts/analise_enem/17_visualizacoes.py
-
-echo ""
-echo "📊 FASE 6: Integração com API Maritaca (OPCIONAL)"
-echo "----------------------------------------------------------------------"
-echo "10. Análise com API Maritaca..."
-echo "    ⚠️  Requer chave API configurada"
-echo "    ⚠️  Pode consumir créditos"
-# python scripts/analise_enem/19_integracao_maritaca.py
-
-echo ""
-echo "======================================================================"
-echo "✅ TODAS AS ANÁLISES CONCLUÍDAS"
-echo "======================================================================"
 echo ""
 echo "📁 Resultados salvos em:"
 echo "   - data/analises/"
 echo "   - reports/"
 echo ""
-echo "💡 Para análises opcionais, instale dependências e descomente os comandos"
-
-
+echo "💡 Veja o estado de cada passo com: python scripts/analise_enem/orquestrador.py --listar"
@@ -18,25 +18,15 @@ if [ -z "$CURSORMINIMAC" ]; then
     exit 1
 fi
 
-echo "📊 PASSO 1: Avaliação completa com Maritaca (objetivo 90%)"
+echo "📊 PASSO 1: Avaliação completa com Maritaca (objetivo 90%)     [21]"
+echo "📊 PASSO 2: Gerar embeddings para TODAS as questões             [04]"
+echo "📊 PASSO 3: Análise completa de complexidade com Maritaca       [19]"
 echo "----------------------------------------------------------------------"
-echo "⚠️  Isso processará TODAS as questões (pode demorar 30-40 minutos)"
+echo "⚠️  Cada passo processa TODAS as questões (pode demorar 20-40 minutos)"
+echo "   Passos já atualizados são pulados; 04 roda em paralelo com 21,"
+echo "   e 21/19 (API Maritaca) nunca rodam ao mesmo tempo."
 echo ""
-python scripts/analise_enem/21_avaliacao_acuracia_maritaca.py
-
-echo ""
-echo "📊 PASSO 2: Gerar embeddings para TODAS as questões"
-echo "----------------------------------------------------------------------"
-echo "⚠️  Isso processará TODAS as questões (pode demorar 20-30 minutos)"
-echo ""
-python scripts/analise_enem/04_gerar_embeddings.py
-
-echo ""
-echo "📊 PASSO 3: Análise completa de complexidade com Maritaca"
-echo "----------------------------------------------------------------------"
-echo "⚠️  Isso processará TODAS as questões (pode demorar 30-40 minutos)"
-echo ""
-python scripts/analise_enem/19_integracao_maritaca.py
+python scripts/analise_enem/orquestrador.py --passos 21 04 19 "$@"
 
 echo ""
 echo "======================================================================"
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Extração Vetorizada de Features de Dificuldade
+
+Substitui as cópias de calcular_complexidade_sintatica / calcular_raridade_lexical
+que existiam em 08_heuristica_dificuldade.py, 59_recalcular_dificuldade_humanas_2025.py
+e 60_grafico_comparativo_dificuldade_exames.py.
+
+Todas as questões são tokenizadas uma vez; as contagens por questão são feitas
+com np.bincount sobre o array de tokens e as funções por token (tamanho,
+isalnum, frequência no vocabulário) rodam apenas sobre os tokens únicos.
+Os valores reproduzem exatamente as heurísticas originais.
+"""
+import hashlib
+import os
+import re
+from itertools import chain
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+VERSAO_FEATURES = 1
+
+RE_SENTENCAS = re.compile(r'[.!?]+')
+RE_NAO_PALAVRA = re.compile(r'[^\w]')
+RE_CACHE_ANTIGO = re.compile(r'features_[0-9a-f]{24}')
+
+# Termos técnicos de exatas (peso adicional em 60_grafico_comparativo_dificuldade_exames)
+TERMOS_TECNICOS_EXATAS = [
+    # Matemática avançada
+    'integral', 'derivada', 'limite', 'matriz', 'determinante', 'vetor',
+    'logaritmo', 'exponencial', 'trigonometria', 'seno', 'cosseno', 'tangente',
+    'polinômio', 'raiz', 'equação diferencial', 'série', 'sequência',
+    # Física avançada
+    'eletromagnetismo', 'mecânica quântica', 'termodinâmica', 'óptica',
+    'campo elétrico', 'campo magnético', 'força', 'energia', 'potencial',
+    'circuito', 'resistência', 'capacitância', 'indutância',
+    # Química avançada
+    'equilíbrio químico', 'cinética', 'termodinâmica química', 'eletroquímica',
+    'orgânica', 'inorgânica', 'estequiometria',
+    # Notação matemática
+    '∑', '∫', '∂', '∇', '∞', '√', 'π', 'α', 'β', 'γ', 'θ', 'λ', 'μ', 'σ',
+    # Símbolos LaTeX comuns
+    '\\frac', '\\sqrt', '\\int', '\\sum', '\\lim'
+]
+
+DTYPE_FEATURES = np.dtype([
+    ('num_sentencas', np.int32),
+    ('num_palavras', np.int32),
+    ('palavras_longas', np.int32),
+    ('comprimento_texto', np.int32),
+    ('comprimento_alternativas', np.int32),
+    ('num_alternativas', np.int16),
+    ('termos_tecnicos', np.int16),
+    ('complexidade_sintatica', np.float64),
+    ('raridade_heuristica', np.float64),
+    ('raridade_lexical', np.float64),
+])
+
+
+def textos_das_questoes(questoes: List[Dict], strip: bool = False) -> List[str]:
+    """Texto analisado de cada questão: contexto + pergunta"""
+    textos = [f"{q.get('context', '')} {q.get('question', '')}" for q in questoes]
+    if strip:
+        textos = [t.strip() for t in textos]
+    return textos
+
+
+def _tokenizar(textos: List[str]):
+    """Tokens únicos, índice inverso por token e documento de cada token"""
+    tokens_por_doc = [texto.split() for texto in textos]
+    contagens = np.fromiter((len(t) for t in tokens_por_doc), dtype=np.int64, count=len(textos))
+    doc_idx = np.repeat(np.arange(len(textos)), contagens)
+
+    tokens = np.array(list(chain.from_iterable(tokens_por_doc)), dtype=object)
+    if tokens.size == 0:
+        return np.array([], dtype=object), np.array([], dtype=np.int64), doc_idx, contagens
+
+    unicos, inverso = np.unique(tokens, return_inverse=True)
+    return unicos, inverso, doc_idx, contagens
+
+
+def construir_vocabulario(textos: List[str]) -> Dict[str, int]:
+    """Frequência de cada palavra (minúscula, sem pontuação) em todos os textos"""
+    unicos, inverso, _, _ = _tokenizar([texto.lower() for texto in textos])
+    if unicos.size == 0:
+        return {}
+
+    ocorrencias = np.bincount(inverso, minlength=unicos.size)
+    vocabulario = {}
+    for token, n in zip(unicos, ocorrencias):
+        limpa = RE_NAO_PALAVRA.sub('', token)
+        if limpa:
+            vocabulario[limpa] = vocabulario.get(limpa, 0) + int(n)
+    return vocabulario
+
+
+def _contar_termos_tecnicos(textos: List[str]) -> np.ndarray:
+    """Quantos termos técnicos distintos aparecem em cada texto"""
+    if not textos:
+        return np.zeros(0, dtype=np.int16)
+
+    textos_lower = np.array([texto.lower() for texto in textos], dtype=str)
+    contador = np.zeros(len(textos), dtype=np.int16)
+    for termo in TERMOS_TECNICOS_EXATAS:
+        contador += np.char.find(textos_lower, termo) >= 0
+    return contador
+
+
+def _hash_entrada(ids: List[str], textos: List[str], vocabulario: Optional[Dict[str, int]]) -> str:
+    """Chave do cache: versão + ids + textos + vocabulário"""
+    h = hashlib.sha256(f"v{VERSAO_FEATURES}".encode('utf-8'))
+    for id_questao, texto in zip(ids, textos):
+        h.update(str(id_questao).encode('utf-8'))
+        h.update(b'\x1f')
+        h.update(texto.encode('utf-8'))
+        h.update(b'\x1e')
+    if vocabulario is not None:
+        for palavra, freq in sorted(vocabulario.items()):
+            h.update(f"{palavra}\x1f{freq}\x1e".encode('utf-8'))
+    return h.hexdigest()[:24]
+
+
+def _ler_cache(arquivo: Path, chave: str) -> Optional[Dict[str, np.ndarray]]:
+    """Matriz guardada no slot, se foi calculada para a mesma chave"""
+    try:
+        with np.load(arquivo, allow_pickle=False) as npz:
+            if 'chave' in npz.files and str(npz['chave']) == chave:
+                return {'ids': npz['ids'], 'features': npz['features']}
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _gravar_cache(arquivo: Path, chave: str, resultado: Dict[str, np.ndarray]):
+    """Substitui o slot (escrita atômica) e remove arquivos do formato antigo features_<hash>.npz"""
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    temporario = arquivo.with_name(f"{arquivo.stem}.tmp{os.getpid()}.npz")
+    np.savez_compressed(temporario, chave=np.asarray(chave), **resultado)
+    os.replace(temporario, arquivo)
+    for antigo in arquivo.parent.glob("features_*.npz"):
+        if RE_CACHE_ANTIGO.fullmatch(antigo.stem):
+            antigo.unlink(missing_ok=True)
+
+
+def extrair_features(questoes: List[Dict], vocabulario: Optional[Dict[str, int]] = None,
+                     strip: bool = False, cache_dir: Optional[Path] = None,
+                     nome_cache: str = "padrao") -> Dict[str, np.ndarray]:
+    """
+    Extrai a matriz de features de todas as questões em uma passada.
+
+    Retorna {'ids': array de ids, 'features': array estruturado DTYPE_FEATURES}.
+    Sem vocabulário, raridade_lexical usa a heurística (palavras longas ou com
+    pontuação); com vocabulário, usa o inverso da frequência média.
+
+    Com cache_dir, cada chamador tem um slot (features_<nome_cache>.npz) que
+    guarda a última matriz e sua chave; entrada nova substitui o slot, então o
+    diretório não cresce.
+    """
+    ids = [str(q.get('id', '')) for q in questoes]
+    textos = textos_das_questoes(questoes, strip=strip)
+
+    arquivo_cache = chave = None
+    if cache_dir is not None:
+        arquivo_cache = Path(cache_dir) / f"features_{nome_cache}.npz"
+        chave = _hash_entrada(ids, textos, vocabulario)
+        guardado = _ler_cache(arquivo_cache, chave)
+        if guardado is not None:
+            return guardado
+
+    n = len(textos)
+    features = np.zeros(n, dtype=DTYPE_FEATURES)
+
+    features['comprimento_texto'] = [len(t) for t in textos]
+    features['num_sentencas'] = [
+        sum(1 for s in RE_SENTENCAS.split(t) if s.strip()) for t in textos
+    ]
+    alternativas = [q.get('alternatives', []) for q in questoes]
+    features['num_alternativas'] = [len(alts) for alts in alternativas]
+    features['comprimento_alternativas'] = [sum(len(alt) for alt in alts) for alts in alternativas]
+    features['termos_tecnicos'] = _contar_termos_tecnicos(textos)
+
+    unicos, inverso, doc_idx, contagens = _tokenizar(textos)
+    features['num_palavras'] = contagens
+
+    if unicos.size:
+        # Funções por token avaliadas só nos tokens únicos e expandidas via inverso
+        unicos_lower = [u.lower() for u in unicos]
+        longa = np.fromiter((len(u) > 6 for u in unicos), dtype=np.float64, count=unicos.size)
+        rara = np.fromiter((len(u) > 8 or not u.isalnum() for u in unicos_lower),
+                           dtype=np.float64, count=unicos.size)
+        features['palavras_longas'] = np.bincount(doc_idx, weights=longa[inverso], minlength=n)
+        n_raras = np.bincount(doc_idx, weights=rara[inverso], minlength=n)
+    else:
+        n_raras = np.zeros(n)
+
+    num_palavras = features['num_palavras'].astype(np.float64)
+    num_sentencas = features['num_sentencas'].astype(np.float64)
+    com_palavras = num_palavras > 0
+
+    palavras_por_sentenca = np.divide(num_palavras, num_sentencas,
+                                      out=np.zeros(n), where=num_sentencas > 0)
+    percentual_longas = np.divide(features['palavras_longas'] * 100.0, num_palavras,
+                                  out=np.zeros(n), where=com_palavras)
+    features['complexidade_sintatica'] = palavras_por_sentenca + percentual_longas / 10
+    features['raridade_heuristica'] = np.divide(n_raras * 100.0, num_palavras,
+                                                out=np.zeros(n), where=com_palavras)
+
+    if vocabulario is None:
+        features['raridade_lexical'] = features['raridade_heuristica']
+    else:
+        freq_unicos = np.fromiter((vocabulario.get(u, 0) for u in unicos_lower),
+                                  dtype=np.float64, count=unicos.size) if unicos.size else np.zeros(0)
+        freq_tokens = freq_unicos[inverso] if unicos.size else np.zeros(0)
+        positivos = freq_tokens > 0
+        soma_freq = np.bincount(doc_idx, weights=freq_tokens, minlength=n)
+        n_positivos = np.bincount(doc_idx, weights=positivos.astype(np.float64), minlength=n)
+        freq_media = np.divide(soma_freq, n_positivos, out=np.zeros(n), where=n_positivos > 0)
+
+        # Texto vazio -> 0; texto sem nenhuma palavra conhecida -> 100 (todas raras)
+        features['raridade_lexical'] = np.where(
+            n_positivos > 0, 100.0 / (1 + freq_media),
+            np.where(features['comprimento_texto'] > 0, 100.0, 0.0)
+        )
+
+    resultado = {'ids': np.asarray(ids, dtype=str), 'features': features}
+
+    if arquivo_cache is not None:
+        _gravar_cache(arquivo_cache, chave, resultado)
+
+    return resultado
+
+
+def calcular_scores(features: np.ndarray, com_termos_tecnicos: bool = False) -> np.ndarray:
+    """Score de dificuldade 0-100 (mesma ponderação 0.4/0.4/0.2 de 08_heuristica_dificuldade)"""
+    score_complexidade = np.minimum(features['complexidade_sintatica'] * 5, 100)
+    score_raridade = np.minimum(features['raridade_lexical'], 100)
+    score_comprimento = np.minimum(features['comprimento_texto'] / 50, 100)
+
+    score = score_complexidade * 0.4 + score_raridade * 0.4 + score_comprimento * 0.2
+
+    if com_termos_tecnicos:
+        peso_exatas = np.minimum(features['termos_tecnicos'].astype(np.float64) * 5, 30)
+        score = np.minimum(score + peso_exatas, 100)
+
+    return score
+
+
+def classificar_niveis(scores: np.ndarray) -> np.ndarray:
+    """Nível de dificuldade por faixa de score"""
+    return np.select(
+        [scores < 30, scores < 50, scores < 70, scores < 85],
+        ['muito_facil', 'facil', 'medio', 'dificil'],
+        default='muito_dificil'
+    )
+
+
+def metricas_como_dicts(matriz: Dict[str, np.ndarray], scores: np.ndarray) -> List[Dict]:
+    """Converte a matriz para o formato de dicts usado em dificuldade_completo.json"""
+    features = matriz['features']
+    niveis = classificar_niveis(scores)
+    return [
+        {
+            'complexidade_sintatica': float(f['complexidade_sintatica']),
+            'raridade_lexical': float(f['raridade_lexical']),
+            'comprimento_texto': int(f['comprimento_texto']),
+            'comprimento_alternativas': int(f['comprimento_alternativas']),
+            'num_alternativas': int(f['num_alternativas']),
+            'score_dificuldade': float(score),
+            'nivel_dificuldade': str(nivel)
+        }
+        for f, score, nivel in zip(features, scores, niveis)
+    ]
+
+
+def indice_por_id(matriz: Dict[str, np.ndarray]) -> Dict[str, int]:
+    """Mapa id da questão -> linha da matriz de features"""
+    return {str(id_questao): i for i, id_questao in enumerate(matriz['ids'])}
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Gráficos Incrementais (usado por 17_, 24_, 41_, 42_, 57_ e 60_)
+
+Cada gráfico é separado em duas etapas:
+
+    preparar()               lê as entradas e devolve uma tabela pequena (dict JSON)
+    desenhar(dados, arquivo) só plota a tabela, em processo worker com backend Agg
+
+A tabela fica em data/analises/cache_graficos/<nome>.json junto com a chave
+(sha256 do conteúdo das entradas + parâmetros + código de quem prepara).
+Numa nova execução:
+
+- entradas e código iguais → a tabela vem do cache, sem reler nem recalcular nada
+- tabela e código do script iguais e PNG intacto → o gráfico é pulado
+- os demais são desenhados em paralelo (ProcessPoolExecutor)
+
+Os sha256 dos arquivos de entrada são memorizados por tamanho+mtime, então
+um arquivo grande só é relido quando muda. O dashboard de 17_ é montado a
+partir das tabelas em cache (carregar_tabelas).
+
+Uso:
+    python graficos.py          # lista os gráficos em cache e o estado de cada um
+"""
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem.motor_execucao import salvar_json_atomico
+
+try:
+    import matplotlib
+    HAS_MATPLOTLIB = True
+except ImportError:
+    HAS_MATPLOTLIB = False
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DIR_CACHE = PROJECT_ROOT / "data" / "analises" / "cache_graficos"
+DIR_VISUALIZACOES = PROJECT_ROOT / "reports" / "visualizacoes"
+ARQUIVO_HASHES = "hashes_entradas.json"
+VERSAO = 1
+
+
+class Grafico:
+    """Um PNG: entradas declaradas, preparação (cacheada) e desenho (em worker)"""
+
+    __slots__ = ('nome', 'arquivo', 'preparar', 'desenhar', 'entradas', 'parametros', 'titulo', 'descricao')
+
+    def __init__(self, arquivo: str, preparar: Callable[[], Optional[Dict]],
+                 desenhar: Callable[[Dict, Path], None], entradas: Iterable[Path] = (),
+                 parametros: Optional[Dict] = None, titulo: str = '', descricao: str = '',
+                 nome: Optional[str] = None):
+        self.arquivo = arquivo
+        self.nome = nome or Path(arquivo).stem
+        self.preparar = preparar
+        self.desenhar = desenhar
+        self.entradas = [Path(e) for e in entradas]
+        self.parametros = parametros or {}
+        self.titulo = titulo or self.nome
+        self.descricao = descricao
+
+
+def _sha256_arquivo(arquivo: Path) -> str:
+    h = hashlib.sha256()
+    with open(arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+class HashesEntradas:
+    """sha256 dos arquivos de entrada, memorizado por tamanho+mtime"""
+
+    def __init__(self, diretorio: Path):
+        self.arquivo = Path(diretorio) / ARQUIVO_HASHES
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                self.memo = json.load(f)
+        except (OSError, ValueError):
+            self.memo = {}
+        self.alterado = False
+
+    def hash(self, arquivo: Path) -> str:
+        arquivo = Path(arquivo)
+        if not arquivo.exists():
+            return 'ausente'
+        stat = arquivo.stat()
+        chave = str(arquivo.resolve())
+        memo = self.memo.get(chave)
+        if memo and memo['tamanho'] == stat.st_size and memo['mtime_ns'] == stat.st_mtime_ns:
+            return memo['sha256']
+        sha = _sha256_arquivo(arquivo)
+        self.memo[chave] = {'tamanho': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha}
+        self.alterado = True
+        return sha
+
+    def salvar(self):
+        if self.alterado:
+            salvar_json_atomico(self.arquivo, self.memo)
+
+
+def _hash_codigo(funcao: Callable, hashes: HashesEntradas) -> str:
+    """sha256 do arquivo-fonte da função (sem lru_cache/wraps nem partial), '' se não houver"""
+    funcao = inspect.unwrap(getattr(funcao, 'func', funcao))
+    try:
+        return hashes.hash(Path(inspect.getsourcefile(funcao)))
+    except TypeError:
+        return ''
+
+
+def chave_dados(grafico: Grafico, hashes: HashesEntradas) -> str:
+    """sha256 das entradas (conteúdo), dos parâmetros e do código da preparação"""
+    h = hashlib.sha256(f"v{VERSAO}\x1e{grafico.nome}\x1e".encode('utf-8'))
+    h.update(json.dumps(grafico.parametros, sort_keys=True, default=str).encode('utf-8'))
+    h.update(f"\x1e{_hash_codigo(grafico.preparar, hashes)}".encode('utf-8'))
+    for entrada in grafico.entradas:
+        h.update(f"\x1e{entrada.name}\x1f{hashes.hash(entrada)}".encode('utf-8'))
+    return h.hexdigest()[:24]
+
+
+def chave_desenho(grafico: Grafico, chave: str, hashes: HashesEntradas) -> str:
+    """Chave dos dados + código-fonte de quem desenha (editar o script redesenha)"""
+    codigo = _hash_codigo(grafico.desenhar, hashes)
+    return hashlib.sha256(f"{chave}\x1e{codigo}".encode('utf-8')).hexdigest()[:24]
+
+
+def _arquivo_cache(diretorio: Path, nome: str) -> Path:
+    return Path(diretorio) / f"{nome}.json"
+
+
+def _ler_cache(diretorio: Path, nome: str) -> Dict:
+    try:
+        with open(_arquivo_cache(diretorio, nome), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _impressao_png(arquivo: Path) -> Optional[List[int]]:
+    """Tamanho e mtime do PNG (detecta se outro script sobrescreveu o arquivo)"""
+    if not arquivo.exists():
+        return None
+    stat = arquivo.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def png_atual(cache: Dict, dir_saida: Optional[Path] = None) -> bool:
+    """O PNG em disco é o que foi desenhado a partir desta entrada do cache?"""
+    arquivo = Path(dir_saida or DIR_VISUALIZACOES) / cache.get('arquivo', '')
+    return bool(cache.get('chave_desenho')) and cache.get('png') == _impressao_png(arquivo)
+
+
+def _inicializar_worker():
+    matplotlib.use('Agg')
+
+
+def _desenhar(desenhar: Callable, dados: Dict, arquivo: Path) -> float:
+    """Roda no worker: desenha, salva e devolve o tempo gasto"""
+    import matplotlib.pyplot as plt
+
+    inicio = time.time()
+    try:
+        desenhar(dados, arquivo)
+    finally:
+        plt.close('all')
+    return time.time() - inicio
+
+
+def gerar(graficos: List[Grafico], dir_saida: Optional[Path] = None, dir_cache: Optional[Path] = None,
+          workers: Optional[int] = None, forcar: bool = False) -> Dict[str, Dict]:
+    """
+    Prepara (ou lê do cache) e desenha só o que mudou.
+
+    Retorna {nome: {'arquivo', 'estado', 'dados'}} com estado 'pulado',
+    'desenhado', 'sem_dados', 'sem_matplotlib' ou 'erro'.
+    """
+    dir_saida = Path(dir_saida or DIR_VISUALIZACOES)
+    dir_cache = Path(dir_cache or DIR_CACHE)
+    dir_saida.mkdir(parents=True, exist_ok=True)
+    hashes = HashesEntradas(dir_cache)
+
+    resultado = {}
+    pendentes = []
+    for grafico in graficos:
+        arquivo = dir_saida / grafico.arquivo
+        chave = chave_dados(grafico, hashes)
+        cache = _ler_cache(dir_cache, grafico.nome)
+
+        if not forcar and cache.get('chave_dados') == chave:
+            dados = cache['dados']
+        else:
+            dados = grafico.preparar()
+            if dados is None:
+                resultado[grafico.nome] = {'arquivo': arquivo, 'estado': 'sem_dados', 'dados': None}
+                continue
+            cache = {'chave_dados': chave, 'dados': dados}
+        cache.update({'nome': grafico.nome, 'arquivo': grafico.arquivo, 'titulo': grafico.titulo,
+                      'descricao': grafico.descricao})
+
+        desenho = chave_desenho(grafico, chave, hashes)
+        if (not forcar and cache.get('chave_desenho') == desenho
+                and cache.get('png') == _impressao_png(arquivo)):
+            salvar_json_atomico(_arquivo_cache(dir_cache, grafico.nome), cache)
+            resultado[grafico.nome] = {'arquivo': arquivo, 'estado': 'pulado', 'dados': dados}
+            print(f"  ⏭️  {grafico.arquivo}: entradas inalteradas")
+            continue
+
+        cache.pop('chave_desenho', None)
+        salvar_json_atomico(_arquivo_cache(dir_cache, grafico.nome), cache)
+        resultado[grafico.nome] = {'arquivo': arquivo, 'estado': 'sem_matplotlib', 'dados': dados}
+        pendentes.append((grafico, arquivo, dados, cache, desenho))
+    hashes.salvar()
+
+    if not pendentes:
+        return resultado
+    if not HAS_MATPLOTLIB:
+        print("  ⚠️  matplotlib não instalado. Instale com: pip install matplotlib")
+        return resultado
+
+    def concluir(grafico, arquivo, cache, desenho, tarefa):
+        try:
+            segundos = tarefa()
+        except Exception as e:
+            resultado[grafico.nome]['estado'] = 'erro'
+            print(f"  ❌ Erro ao criar {grafico.arquivo}: {e}")
+            return
+        cache.update({'chave_desenho': desenho, 'png': _impressao_png(arquivo),
+                      'desenhado_em': datetime.now().isoformat(), 'segundos': round(segundos, 2)})
+        salvar_json_atomico(_arquivo_cache(dir_cache, grafico.nome), cache)
+        resultado[grafico.nome]['estado'] = 'desenhado'
+        print(f"  ✅ Gráfico salvo: {arquivo.name} ({segundos:.1f}s)")
+
+    workers = min(workers or os.cpu_count() or 1, len(pendentes))
+    if workers <= 1:
+        _inicializar_worker()
+        for grafico, arquivo, dados, cache, desenho in pendentes:
+            concluir(grafico, arquivo, cache, desenho, lambda: _desenhar(grafico.desenhar, dados, arquivo))
+        return resultado
+
+    print(f"  🔄 Desenhando {len(pendentes)} gráficos em {workers} processos...")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker) as executor:
+        futuros = [(item, executor.submit(_desenhar, item[0].desenhar, item[2], item[1])) for item in pendentes]
+        for (grafico, arquivo, _, cache, desenho), futuro in futuros:
+            concluir(grafico, arquivo, cache, desenho, futuro.result)
+    return resultado
+
+
+def carregar_tabelas(dir_cache: Optional[Path] = None) -> Dict[str, Dict]:
+    """Todas as entradas do cache ({nome: {'dados', 'arquivo', 'titulo', ...}})"""
+    dir_cache = Path(dir_cache or DIR_CACHE)
+    tabelas = {}
+    for arquivo in sorted(dir_cache.glob('*.json')):
+        if arquivo.name == ARQUIVO_HASHES:
+            continue
+        cache = _ler_cache(dir_cache, arquivo.stem)
+        if 'dados' in cache:
+            tabelas[arquivo.stem] = cache
+    return tabelas
+
+
+def main():
+    tabelas = carregar_tabelas()
+    if not tabelas:
+        print(f"📭 Nenhum gráfico em cache em {DIR_CACHE}")
+        return
+    print(f"📁 {DIR_CACHE}")
+    for nome, cache in tabelas.items():
+        if not cache.get('chave_desenho'):
+            estado = "⚠️  não desenhado"
+        elif not png_atual(cache):
+            estado = "⚠️  PNG alterado/ausente"
+        else:
+            estado = f"✅ {cache.get('desenhado_em', '')[:19]} ({cache.get('segundos', 0)}s)"
+        print(f"   {nome:40s} {estado}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Inferência em Lote do Modelo Treinado (usada por 94_)
+
+Antes, 94_ chamava o modelo uma questão por vez: tokenização com
+padding='max_length' (sempre 512 posições), um forward de um exemplo e um
+softmax só para tirar o argmax. Aqui o conjunto é tokenizado de uma vez sem
+padding, ordenado por tamanho e processado em batches com padding dinâmico
+(cada batch só até o seu maior exemplo) sob torch.inference_mode().
+O resultado são as probabilidades por alternativa, na ordem original, para
+calibração e ensemble com as respostas dos LLMs.
+
+Backends:
+    'pytorch'     - modelo como foi salvo pelo 93_
+    'quantizado'  - quantização dinâmica int8 das camadas Linear (CPU)
+    'onnx'        - exporta para model_dir/onnx/model_<hash>.onnx e roda no onnxruntime;
+                    o hash cobre config e pesos, então um modelo retreinado gera
+                    uma nova exportação (as antigas são removidas)
+
+Uso:
+    python inferencia_modelo.py --backend onnx --exportar   # só exporta o ONNX
+"""
+import hashlib
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem.graficos import HashesEntradas
+
+try:
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    import torch
+    HAS_TRANSFORMERS = True
+except ImportError:
+    HAS_TRANSFORMERS = False
+
+try:
+    import onnxruntime
+    HAS_ONNXRUNTIME = True
+except ImportError:
+    HAS_ONNXRUNTIME = False
+
+LETRAS = ('A', 'B', 'C', 'D', 'E')
+BACKENDS = ('pytorch', 'quantizado', 'onnx')
+OPSET_ONNX = 14
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    """Softmax por linha, numericamente estável"""
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def quantizar_dinamico(model):
+    """Quantização dinâmica int8 das camadas Linear (pesos int8, ativações em float)"""
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def arquivo_onnx(model_dir: Path, opset: int = OPSET_ONNX) -> Path:
+    """Caminho do ONNX para a versão atual do modelo (sha256 da config e dos pesos + opset)"""
+    model_dir = Path(model_dir)
+    pasta = model_dir / "onnx"
+    pasta.mkdir(parents=True, exist_ok=True)
+    hashes = HashesEntradas(pasta)
+    arquivos = [model_dir / "config.json"] + sorted(model_dir.glob("*.safetensors")) \
+        + sorted(model_dir.glob("pytorch_model*.bin"))
+    h = hashlib.sha256(f"opset{opset}".encode('utf-8'))
+    for arquivo in arquivos:
+        h.update(f"\x1e{arquivo.name}\x1f{hashes.hash(arquivo)}".encode('utf-8'))
+    hashes.salvar()
+    return pasta / f"model_{h.hexdigest()[:16]}.onnx"
+
+
+def exportar_onnx(model, tokenizer, destino: Path, opset: int = OPSET_ONNX) -> Path:
+    """Exporta o modelo para ONNX com batch e sequência dinâmicos"""
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    exemplo = tokenizer(["exemplo"], return_tensors='pt')
+    entradas = list(exemplo.keys())
+    eixos = {nome: {0: 'batch', 1: 'sequencia'} for nome in entradas}
+    eixos['logits'] = {0: 'batch'}
+
+    tmp = destino.with_suffix(".onnx.tmp")
+    with torch.inference_mode():
+        torch.onnx.export(
+            model, tuple(exemplo[nome] for nome in entradas), str(tmp),
+            input_names=entradas, output_names=['logits'],
+            dynamic_axes=eixos, opset_version=opset
+        )
+    tmp.replace(destino)
+    for antigo in destino.parent.glob("model*.onnx"):
+        if antigo != destino:
+            antigo.unlink(missing_ok=True)
+    print(f"💾 Modelo ONNX exportado: {destino}")
+    return destino
+
+
+class MotorInferencia:
+    """
+    Modelo de classificação (A-E) do 93_ com tokenização em lote, ordenação
+    por tamanho e padding dinâmico. prever() devolve as probabilidades na
+    ordem dos textos recebidos.
+    """
+
+    def __init__(self, model_dir: Path, backend: str = 'pytorch', batch_size: int = 32,
+                 max_length: int = 512, num_threads: Optional[int] = None):
+        if not HAS_TRANSFORMERS:
+            raise ImportError("transformers e torch são necessários: pip install transformers torch")
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconhecido: {backend} (use um de {BACKENDS})")
+
+        self.model_dir = Path(model_dir)
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_length = max_length
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+        self.device = torch.device('cuda' if torch.cuda.is_available() and backend == 'pytorch' else 'cpu')
+        self.model = None
+        self.sessao = None
+
+        if backend == 'onnx':
+            if not HAS_ONNXRUNTIME:
+                raise ImportError("onnxruntime não instalado: pip install onnxruntime")
+            arquivo = arquivo_onnx(self.model_dir)
+            if not arquivo.exists():
+                exportar_onnx(self._carregar_modelo(), self.tokenizer, arquivo)
+            opcoes = onnxruntime.SessionOptions()
+            if num_threads:
+                opcoes.intra_op_num_threads = num_threads
+            self.sessao = onnxruntime.InferenceSession(
+                str(arquivo), opcoes, providers=['CPUExecutionProvider'])
+            self.entradas_onnx = {e.name for e in self.sessao.get_inputs()}
+        else:
+            self.model = self._carregar_modelo()
+            if backend == 'quantizado':
+                self.model = quantizar_dinamico(self.model)
+            self.model.to(self.device)
+
+    def _carregar_modelo(self):
+        model = AutoModelForSequenceClassification.from_pretrained(str(self.model_dir))
+        model.eval()
+        return model
+
+    def _logits(self, lote: Dict) -> np.ndarray:
+        """Logits de um batch já com padding"""
+        if self.sessao is not None:
+            entradas = {nome: np.asarray(valor, dtype=np.int64)
+                        for nome, valor in lote.items() if nome in self.entradas_onnx}
+            return self.sessao.run(['logits'], entradas)[0]
+        tensores = {nome: valor.to(self.device) for nome, valor in lote.items()}
+        with torch.inference_mode():
+            return self.model(**tensores).logits.float().cpu().numpy()
+
+    def prever(self, textos: List[str]) -> np.ndarray:
+        """Probabilidades (len(textos) x 5) na ordem original"""
+        if not textos:
+            return np.zeros((0, len(LETRAS)), dtype=np.float32)
+
+        encoded = self.tokenizer(list(textos), truncation=True, max_length=self.max_length)
+        ordem = sorted(range(len(textos)), key=lambda i: len(encoded['input_ids'][i]), reverse=True)
+        tensores = 'np' if self.sessao is not None else 'pt'
+        multiplo = 8 if self.device.type == 'cuda' else None
+
+        probabilidades = np.zeros((len(textos), len(LETRAS)), dtype=np.float32)
+        for inicio in range(0, len(ordem), self.batch_size):
+            indices = ordem[inicio:inicio + self.batch_size]
+            lote = self.tokenizer.pad(
+                [{nome: encoded[nome][i] for nome in encoded.keys()} for i in indices],
+                pad_to_multiple_of=multiplo, return_tensors=tensores
+            )
+            probabilidades[indices] = softmax(self._logits(lote))
+        return probabilidades
+
+    def prever_respostas(self, textos: List[str]) -> List[Dict]:
+        """Letra prevista e probabilidade de cada alternativa"""
+        return [
+            {
+                'resposta': LETRAS[int(np.argmax(p))],
+                'probabilidades': {letra: float(valor) for letra, valor in zip(LETRAS, p)}
+            }
+            for p in self.prever(textos)
+        ]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prepara o modelo treinado para inferência em CPU")
+    parser.add_argument("--model-dir", type=str,
+                        default=str(Path(__file__).parent.parent.parent / "data" / "models" / "enem_bert_trained"))
+    parser.add_argument("--backend", choices=BACKENDS, default='onnx')
+    parser.add_argument("--exportar", action="store_true", help="Força a (re)exportação do ONNX")
+    args = parser.parse_args()
+
+    if not HAS_TRANSFORMERS:
+        print("❌ transformers não instalado")
+        print("   Execute: pip install transformers torch")
+        return
+
+    model_dir = Path(args.model_dir)
+    if args.exportar:
+        tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        model = AutoModelForSequenceClassification.from_pretrained(str(model_dir))
+        model.eval()
+        exportar_onnx(model, tokenizer, arquivo_onnx(model_dir))
+
+    motor = MotorInferencia(model_dir, backend=args.backend)
+    print(f"✅ Backend '{args.backend}' pronto: {motor.prever_respostas(['Teste de inferência'])[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,66 +11,27 @@ echo "📊 MONITORAMENTO DO PASSO 1"
 echo "======================================================================"
 echo ""
 
-# Verificar se Passo 1 está rodando
-PASSO1_PID=$(pgrep -f "21_avaliacao_acuracia_maritaca.py" | head -1)
-
-if [ -z "$PASSO1_PID" ]; then
-    echo "⚠️  Passo 1 não está rodando. Iniciando..."
-    export CURSORMINIMAC='107341642936117619902_e1ed52697ebc2587'
-    nohup python scripts/analise_enem/21_avaliacao_acuracia_maritaca.py > logs/passo1.log 2>&1 &
-    PASSO1_PID=$!
-    echo "✅ Passo 1 iniciado (PID: $PASSO1_PID)"
-    echo "📝 Logs em: logs/passo1.log"
-else
-    echo "✅ Passo 1 já está rodando (PID: $PASSO1_PID)"
+# Verificar API key
+if [ -z "$CURSORMINIMAC" ]; then
+    echo "❌ CURSORMINIMAC não configurada!"
+    echo "   Configure com: export CURSORMINIMAC='sua-chave-aqui'"
+    exit 1
 fi
 
+# Um único orquestrador: 04 roda em paralelo com o 21, e o 19 só começa
+# depois do 21 (apos=['21'] e recurso "maritaca"). Se o Passo 1 já estiver
+# rodando em outro orquestrador, este espera a trava dele ser liberada e
+# pula o 21 se ele ficou atualizado (sem polling de processo ou arquivo).
+mkdir -p logs
+echo "🔄 Executando Passos 1 → 2 e 3..."
+echo "   Acompanhe com: tail -f logs/orquestrador/21.log"
+echo "   Estado dos passos: python scripts/analise_enem/orquestrador.py --listar"
 echo ""
-echo "🔄 Monitorando progresso..."
-echo "   Pressione Ctrl+C para parar o monitoramento"
-echo ""
-
-# Monitorar até concluir
-while kill -0 $PASSO1_PID 2>/dev/null; do
-    # Verificar arquivo de resultados
-    if [ -f "data/analises/avaliacao_acuracia_maritaca.json" ]; then
-        # Contar questões processadas
-        PROCESSADAS=$(python3 -c "
-import json
-try:
-    with open('data/analises/avaliacao_acuracia_maritaca.json') as f:
-        data = json.load(f)
-    total = 0
-    for ano, dados in data.items():
-        if isinstance(dados, dict) and 'estatisticas' in dados:
-            total += dados['estatisticas'].get('total', 0)
-    print(total)
-except:
-    print(0)
-" 2>/dev/null)
-        
-        if [ ! -z "$PROCESSADAS" ] && [ "$PROCESSADAS" -gt 0 ]; then
-            echo "📊 Progresso: $PROCESSADAS questões processadas (de 2891)"
-        fi
-    fi
-    
-    # Mostrar últimas linhas do log
-    if [ -f "logs/passo1.log" ]; then
-        echo "--- Últimas linhas do log ---"
-        tail -5 logs/passo1.log 2>/dev/null | grep -E "(Avaliando|Acurácia|✅|❌)" || echo "Aguardando..."
-    fi
-    
-    sleep 30  # Verificar a cada 30 segundos
-done
+python scripts/analise_enem/orquestrador.py --passos 21 04 19
 
-echo ""
-echo "======================================================================"
-echo "✅ PASSO 1 CONCLUÍDO!"
-echo "======================================================================"
-echo ""
-
-# Verificar resultados
+# Resultados do Passo 1
 if [ -f "data/analises/avaliacao_acuracia_maritaca.json" ]; then
+    echo ""
     echo "📊 Resultados do Passo 1:"
     python3 -c "
 import json
@@ -84,20 +45,7 @@ if '_geral' in data:
 " 2>/dev/null || echo "  Arquivo encontrado, mas formato pode estar diferente"
 fi
 
-echo ""
-echo "🚀 Iniciando Passo 2: Gerar Embeddings..."
-echo "----------------------------------------------------------------------"
-python scripts/analise_enem/04_gerar_embeddings.py
-
-echo ""
-echo "🚀 Iniciando Passo 3: Análise de Complexidade..."
-echo "----------------------------------------------------------------------"
-export CURSORMINIMAC='107341642936117619902_e1ed52697ebc2587'
-python scripts/analise_enem/19_integracao_maritaca.py
-
 echo ""
 echo "======================================================================"
 echo "✅ TODOS OS PASSOS CONCLUÍDOS!"
 echo "======================================================================"
-
-
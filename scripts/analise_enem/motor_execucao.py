@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Motor de Execução de Questões Compartilhado
+
+Usado por 35_, 63_, 83_ e 99_ no lugar do laço serial com time.sleep: as
+questões são despachadas para um pool limitado de threads, com limite de
+questões simultâneas por área. O limite de taxa da API fica no
+cliente_maritaca.
+
+A cada questão concluída o _PROGRESSO.json é regravado de forma atômica
+(arquivo temporário + os.replace), com os resultados na ordem original. Uma
+execução interrompida, quando reexecutada com o mesmo arquivo de progresso,
+retoma exatamente as questões que faltavam.
+
+Com `telemetria`, cada início/fim de questão vira um evento no fluxo JSONL
+de telemetria.py (acompanhado ao vivo por `python telemetria.py`).
+"""
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from scripts.analise_enem.telemetria import Telemetria, campos_do_resultado
+
+
+def chave_questao(questao: Dict) -> str:
+    """Identificador estável da questão para o checkpoint (o id se repete entre anos)"""
+    if questao.get('id'):
+        return f"{questao.get('exam', '')}_{questao['id']}"
+    return f"{questao.get('exam', '')}_{questao.get('area', '')}_{questao.get('number', '')}"
+
+
+def salvar_json_atomico(arquivo: Path, dados: Dict, indent: Optional[int] = None):
+    """Grava em arquivo temporário e troca com os.replace (nunca fica pela metade)"""
+    arquivo = Path(arquivo)
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    temporario = arquivo.with_name(arquivo.name + '.tmp')
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, indent=indent, ensure_ascii=False, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, arquivo)
+
+
+def carregar_checkpoint(arquivo: Optional[Path]) -> Optional[Dict]:
+    """Checkpoint do motor, ou None se não existir / não for do motor"""
+    if arquivo is None or not Path(arquivo).exists():
+        return None
+    try:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if 'chaves_concluidas' not in dados:
+        return None
+    return dados
+
+
+def executar_questoes(
+    questoes: List[Dict],
+    processar: Callable[[Dict], Dict],
+    arquivo_progresso: Optional[Path] = None,
+    max_workers: int = 4,
+    max_por_area: Optional[Union[int, Dict[str, int]]] = None,
+    ao_concluir: Optional[Callable[[int, Dict, Dict, bool], None]] = None,
+    resumo: Optional[Callable[[], Dict]] = None,
+    chave: Callable[[Dict], str] = chave_questao,
+    area_de: Callable[[Dict], str] = lambda q: q.get('area', ''),
+    retomar: bool = True,
+    telemetria: Optional[Telemetria] = None
+) -> List[Optional[Dict]]:
+    """
+    Processa as questões em paralelo e retorna os resultados na ordem original.
+
+    Args:
+        questoes: Questões na ordem desejada dos resultados
+        processar: Função questão -> resultado (dict); roda em thread
+        arquivo_progresso: _PROGRESSO.json (checkpoint e retomada)
+        max_workers: Questões simultâneas no total
+        max_por_area: Limite de questões simultâneas por área (int ou dict)
+        ao_concluir: Callback (índice, questão, resultado, retomado) na thread
+            principal, na ordem de conclusão; também chamado para os
+            resultados recuperados do checkpoint (retomado=True)
+        resumo: Campos extras gravados no checkpoint (acurácia etc.)
+        retomar: Reaproveitar o checkpoint existente
+        telemetria: Fluxo de eventos da execução (fechado ao final)
+
+    Returns:
+        Resultados alinhados com `questoes` (None se a questão falhou)
+    """
+    chaves = [chave(q) for q in questoes]
+    resultados: List[Optional[Dict]] = [None] * len(questoes)
+    concluidas = [False] * len(questoes)
+    inicio = time.time()
+    emitir = telemetria.emitir if telemetria else (lambda evento, **campos: None)
+
+    checkpoint = carregar_checkpoint(arquivo_progresso) if retomar else None
+    if checkpoint:
+        anteriores = dict(zip(checkpoint['chaves_concluidas'], checkpoint['resultados']))
+        for i, k in enumerate(chaves):
+            if k in anteriores:
+                resultados[i] = anteriores[k]
+                concluidas[i] = True
+                if ao_concluir:
+                    ao_concluir(i, questoes[i], resultados[i], True)
+        if any(concluidas):
+            print(f"♻️  Retomando: {sum(concluidas)}/{len(questoes)} questões já concluídas")
+
+    def gravar(status: str):
+        if arquivo_progresso is None:
+            return
+        ordem = [i for i in range(len(questoes)) if concluidas[i]]
+        dados = {
+            'status': status,
+            'total_final': len(questoes),
+            'concluidas': len(ordem),
+            'chaves': chaves,
+            'chaves_concluidas': [chaves[i] for i in ordem],
+            'resultados': [resultados[i] for i in ordem],
+            'tempo_execucao': time.time() - inicio,
+            'timestamp': datetime.now().isoformat()
+        }
+        if resumo:
+            dados.update(resumo())
+        salvar_json_atomico(arquivo_progresso, dados)
+
+    def limite(area: str) -> int:
+        if isinstance(max_por_area, dict):
+            return max(1, max_por_area.get(area, max_workers))
+        return max(1, max_por_area or max_workers)
+
+    # Filas por área; despacha só quando há vaga no pool e na área
+    filas: Dict[str, deque] = {}
+    for i, q in enumerate(questoes):
+        if not concluidas[i]:
+            filas.setdefault(area_de(q), deque()).append(i)
+    em_voo = Counter()
+    futuros = {}
+
+    emitir('inicio_execucao', total=len(questoes), retomadas=sum(concluidas))
+    for i in range(len(questoes)):
+        if concluidas[i]:
+            emitir('fim_questao', chave=chaves[i], area=area_de(questoes[i]), retomado=True,
+                   **campos_do_resultado(resultados[i]))
+
+    def cronometrar(questao):
+        t0 = time.monotonic()
+        return processar(questao), time.monotonic() - t0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while filas or futuros:
+            for area in list(filas):
+                fila = filas[area]
+                while fila and len(futuros) < max_workers and em_voo[area] < limite(area):
+                    i = fila.popleft()
+                    futuros[executor.submit(cronometrar, questoes[i])] = (i, area)
+                    em_voo[area] += 1
+                    emitir('inicio_questao', chave=chaves[i], area=area)
+                if not fila:
+                    del filas[area]
+
+            prontos, _ = wait(futuros, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                i, area = futuros.pop(futuro)
+                em_voo[area] -= 1
+                try:
+                    resultados[i], latencia = futuro.result()
+                except Exception as e:
+                    print(f"⚠️  {chaves[i]}: {type(e).__name__}: {e}")
+                    emitir('erro_questao', chave=chaves[i], area=area, erro=f"{type(e).__name__}: {e}")
+                    continue
+                concluidas[i] = True
+                emitir('fim_questao', chave=chaves[i], area=area, latencia=latencia,
+                       **campos_do_resultado(resultados[i]))
+                if ao_concluir:
+                    ao_concluir(i, questoes[i], resultados[i], False)
+                gravar('em_progresso')
+
+    status = 'concluido' if all(concluidas) else 'incompleto'
+    gravar(status)
+    if telemetria:
+        emitir('fim_execucao', status=status)
+        telemetria.fechar()
+    return resultados
+
+
+def adicionar_argumentos(parser, workers_padrao: int = 4):
+    """Opções de linha de comando do motor"""
+    parser.add_argument("--workers", type=int, default=workers_padrao,
+                        help=f"Questões simultâneas (default: {workers_padrao})")
+    parser.add_argument("--max-por-area", type=int, default=None,
+                        help="Máximo de questões simultâneas por área")
+    parser.add_argument("--reiniciar", action="store_true",
+                        help="Ignorar o _PROGRESSO.json e começar do zero")
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Motor de Modelagem de Tópicos (paralelo e incremental)
+
+Compartilhado por 06_modelagem_topicos.py (treino) e pelos scripts de
+visualização/tendências (leitura dos artefatos persistidos).
+
+- Vectoriza o corpus inteiro UMA vez e ajusta os grupos (ano ou ano_área)
+  em paralelo, enviando a matriz esparsa a cada worker só na inicialização.
+- Mantém um LDA global treinado com partial_fit: anos novos atualizam o
+  modelo existente em vez de refazer tudo (vocabulário fica congelado).
+- Persiste modelos e matrizes documento×tópico em data/analises/modelos_topicos/.
+"""
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+# Matriz compartilhada dentro de cada processo worker
+_X_COMPARTILHADO = None
+
+
+def diretorio_modelos(project_root: Path) -> Path:
+    """Diretório padrão dos artefatos de tópicos"""
+    return project_root / "data" / "analises" / "modelos_topicos"
+
+
+def carregar_stopwords() -> List[str]:
+    """Stopwords em português (baixa do NLTK se necessário)"""
+    import nltk
+    from nltk.corpus import stopwords
+
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords', quiet=True)
+
+    return stopwords.words('portuguese')
+
+
+def achatar_corpus(dados: Dict[int, List[Dict]]) -> Dict[str, list]:
+    """Achata {ano: [questões]} em colunas paralelas (ids, anos, areas, textos)"""
+    colunas = {'ids': [], 'anos': [], 'areas': [], 'textos': []}
+
+    for ano in sorted(dados.keys()):
+        for questao in dados[ano]:
+            contexto = questao.get('context', '').strip()
+            pergunta = questao.get('question', '').strip()
+            texto = f"{contexto} {pergunta}".strip()
+
+            if not texto:
+                continue
+
+            colunas['ids'].append(questao.get('id', ''))
+            colunas['anos'].append(int(ano))
+            colunas['areas'].append(questao.get('area', 'geral'))
+            colunas['textos'].append(texto)
+
+    return colunas
+
+
+def chaves_de_grupo(colunas: Dict[str, list], por_area: bool = False) -> List[str]:
+    """Chave de grupo por documento: 'ano' ou 'ano_area'"""
+    if por_area:
+        return [f"{ano}_{area}" for ano, area in zip(colunas['anos'], colunas['areas'])]
+    return [str(ano) for ano in colunas['anos']]
+
+
+def criar_vectorizer(metodo: str, stop_words: List[str]):
+    """Mesmos hiperparâmetros de vectorização usados em 06_modelagem_topicos"""
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+    classe = CountVectorizer if metodo == "lda" else TfidfVectorizer
+    return classe(
+        max_features=1000,
+        stop_words=stop_words,
+        ngram_range=(1, 2),
+        min_df=2,
+        max_df=0.95
+    )
+
+
+def criar_modelo(metodo: str, num_topics: int):
+    """Instancia LDA (online) ou NMF"""
+    if metodo == "lda":
+        from sklearn.decomposition import LatentDirichletAllocation
+        return LatentDirichletAllocation(
+            n_components=num_topics,
+            random_state=42,
+            max_iter=20,
+            learning_method='online'
+        )
+
+    from sklearn.decomposition import NMF
+    return NMF(n_components=num_topics, random_state=42, max_iter=200)
+
+
+def extrair_topicos(modelo, feature_names, top_n: int = 10) -> List[Dict]:
+    """Extrai palavras-chave de cada tópico (mesmo formato dos JSONs existentes)"""
+    topicos = []
+    for topic_idx, topic in enumerate(modelo.components_):
+        top_words_idx = topic.argsort()[-top_n:][::-1]
+        topicos.append({
+            'id': topic_idx,
+            'palavras_chave': [str(feature_names[i]) for i in top_words_idx],
+            'pesos': [float(topic[i]) for i in top_words_idx]
+        })
+    return topicos
+
+
+def _inicializar_worker(X):
+    """Recebe a matriz vectorizada uma única vez por processo"""
+    global _X_COMPARTILHADO
+    _X_COMPARTILHADO = X
+
+
+def _ajustar_grupo(chave: str, indices: np.ndarray, metodo: str, num_topics: int):
+    """Ajusta um modelo sobre as linhas do grupo (executa no worker)"""
+    X_grupo = _X_COMPARTILHADO[indices]
+    modelo = criar_modelo(metodo, num_topics)
+    doc_topic = modelo.fit_transform(X_grupo)
+    return chave, modelo, doc_topic
+
+
+def ajustar_grupos_paralelo(textos: List[str], grupos: List[str], metodo: str = "lda",
+                            num_topics: int = 10, workers: Optional[int] = None) -> Dict:
+    """Vectoriza uma vez e ajusta um modelo por grupo em paralelo"""
+    metodo = metodo.lower()
+    vectorizer = criar_vectorizer(metodo, carregar_stopwords())
+
+    print(f"  🔄 Vectorizando {len(textos)} textos (uma única vez)...")
+    X = vectorizer.fit_transform(textos).tocsr()
+    feature_names = vectorizer.get_feature_names_out()
+
+    grupos_arr = np.asarray(grupos)
+    indices_por_grupo = {
+        chave: np.flatnonzero(grupos_arr == chave) for chave in sorted(set(grupos))
+    }
+
+    modelos = {}
+    doc_topic = np.zeros((X.shape[0], num_topics), dtype=np.float32)
+    resultados = {}
+
+    print(f"  🔄 Ajustando {len(indices_por_grupo)} grupos em paralelo...")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker,
+                             initargs=(X,)) as executor:
+        futuros = {
+            chave: executor.submit(_ajustar_grupo, chave, indices, metodo, num_topics)
+            for chave, indices in indices_por_grupo.items()
+        }
+        falhas = {}
+        for chave, futuro in futuros.items():
+            try:
+                chave, modelo, matriz = futuro.result()
+            except Exception as e:
+                print(f"  ❌ Falha em {chave}: {e}")
+                falhas[chave] = e
+                continue
+
+            modelos[chave] = modelo
+            doc_topic[indices_por_grupo[chave]] = matriz
+            resultados[chave] = {
+                'topicos': extrair_topicos(modelo, feature_names),
+                'num_questoes': int(len(indices_por_grupo[chave]))
+            }
+            print(f"  ✅ {chave}: {len(indices_por_grupo[chave])} questões")
+
+    # Linhas de um grupo que falhou ficariam zeradas no doc-topic: nada é devolvido para salvar
+    if falhas:
+        raise RuntimeError(f"falha ao ajustar {len(falhas)} grupo(s): {', '.join(sorted(falhas))}") \
+            from next(iter(falhas.values()))
+
+    return {
+        'resultados': resultados,
+        'vectorizer': vectorizer,
+        'modelos': modelos,
+        'doc_topic': doc_topic
+    }
+
+
+def atualizar_lda_incremental(colunas: Dict[str, list], modelos_dir: Path,
+                              num_topics: int = 10, passagens: int = 5) -> Optional[Dict]:
+    """
+    Atualiza o LDA global apenas com os anos ainda não incorporados.
+
+    Na primeira execução, ajusta o vocabulário e treina com todos os anos.
+    Depois, partial_fit recebe só os documentos dos anos novos; o
+    vocabulário não muda, então termos inéditos dos anos novos são ignorados.
+    """
+    import joblib
+
+    artefato = carregar_modelo(modelos_dir, "lda_global")
+    anos_disponiveis = sorted(set(colunas['anos']))
+
+    if artefato is None:
+        vectorizer = criar_vectorizer("lda", carregar_stopwords())
+        vectorizer.fit(colunas['textos'])
+        modelo = criar_modelo("lda", num_topics)
+        anos_incorporados = []
+    else:
+        vectorizer = artefato['vectorizer']
+        modelo = artefato['modelo']
+        anos_incorporados = artefato['anos']
+
+    anos_novos = [ano for ano in anos_disponiveis if ano not in anos_incorporados]
+    if not anos_novos:
+        print("  ✅ LDA global já contém todos os anos; nada a atualizar")
+        return None
+
+    anos_arr = np.asarray(colunas['anos'])
+    textos_arr = np.asarray(colunas['textos'], dtype=object)
+    novos = np.isin(anos_arr, anos_novos)
+
+    print(f"  🔄 partial_fit com {int(novos.sum())} questões de {anos_novos}...")
+    X_novos = vectorizer.transform(textos_arr[novos])
+    for _ in range(passagens):
+        modelo.partial_fit(X_novos)
+
+    # transform é barato: recalcula a matriz de todos os documentos
+    doc_topic = modelo.transform(vectorizer.transform(colunas['textos'])).astype(np.float32)
+    anos_incorporados = sorted(set(anos_incorporados) | set(anos_novos))
+
+    modelos_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(
+        {'vectorizer': vectorizer, 'modelo': modelo, 'anos': anos_incorporados},
+        modelos_dir / "lda_global.joblib"
+    )
+    salvar_doc_topic(modelos_dir, "lda_global", colunas, colunas['anos'], doc_topic)
+
+    return {
+        'anos_incorporados': anos_incorporados,
+        'anos_novos': anos_novos,
+        'topicos': extrair_topicos(modelo, vectorizer.get_feature_names_out()),
+        'prevalencia_por_ano': {
+            str(ano): [float(v) for v in doc_topic[anos_arr == ano].mean(axis=0)]
+            for ano in anos_incorporados if np.any(anos_arr == ano)
+        }
+    }
+
+
+def salvar_modelo(modelos_dir: Path, nome: str, artefato: Dict):
+    """Persiste vectorizer + modelos (joblib)"""
+    import joblib
+
+    modelos_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(artefato, modelos_dir / f"{nome}.joblib")
+
+
+def carregar_modelo(modelos_dir: Path, nome: str) -> Optional[Dict]:
+    """Carrega artefato persistido ou None se não existir"""
+    arquivo = modelos_dir / f"{nome}.joblib"
+    if not arquivo.exists():
+        return None
+
+    import joblib
+    return joblib.load(arquivo)
+
+
+def salvar_doc_topic(modelos_dir: Path, nome: str, colunas: Dict[str, list],
+                     grupos: List, doc_topic: np.ndarray):
+    """Persiste matriz documento×tópico com ids, anos, áreas e grupos"""
+    modelos_dir.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        modelos_dir / f"doc_topic_{nome}.npz",
+        doc_topic=doc_topic,
+        ids=np.asarray(colunas['ids'], dtype=str),
+        anos=np.asarray(colunas['anos'], dtype=np.int16),
+        areas=np.asarray(colunas['areas'], dtype=str),
+        grupos=np.asarray(grupos, dtype=str)
+    )
+
+    manifesto_path = modelos_dir / ARQUIVO_MANIFESTO
+    manifesto = {}
+    if manifesto_path.exists():
+        with open(manifesto_path, 'r', encoding='utf-8') as f:
+            manifesto = json.load(f)
+    manifesto[nome] = {
+        'num_documentos': int(doc_topic.shape[0]),
+        'num_topicos': int(doc_topic.shape[1]),
+        'anos': sorted(int(a) for a in set(colunas['anos']))
+    }
+    with open(manifesto_path, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=2, ensure_ascii=False)
+
+
+def carregar_doc_topic(modelos_dir: Path, nome: str = "lda_global") -> Optional[Dict[str, np.ndarray]]:
+    """Carrega matriz documento×tópico persistida (sem recomputar nada)"""
+    arquivo = modelos_dir / f"doc_topic_{nome}.npz"
+    if not arquivo.exists():
+        return None
+
+    with np.load(arquivo, allow_pickle=False) as npz:
+        return {chave: npz[chave] for chave in npz.files}
+
+
+def prevalencia_topicos_por_ano(doc_topic: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Média da distribuição de tópicos por ano: (anos, matriz anos×tópicos)"""
+    anos = np.unique(doc_topic['anos'])
+    matriz = np.vstack([
+        doc_topic['doc_topic'][doc_topic['anos'] == ano].mean(axis=0) for ano in anos
+    ])
+    return anos, matriz
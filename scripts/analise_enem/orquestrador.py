@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Orquestrador das Análises (DAG de passos com impressão digital das entradas)
+
+Substitui o encadeamento serial com `set -e` de executar_todas_analises.sh,
+executar_todos_passos.sh e monitorar_e_executar.sh. Cada passo declara as
+entradas e saídas (padrões glob relativos à raiz do projeto):
+
+    data/processed/enem_*_completo.jsonl → 04 → data/embeddings/ → 09 → similaridade_provas.json
+
+As dependências saem dessas declarações (um passo depende de quem produz o
+que ele lê). Um passo só roda se a impressão digital (sha256 do script, dos
+argumentos, das entradas e das saídas, registrada ao fim da última execução)
+mudou; passos independentes (tópicos, dificuldade, similaridade...) rodam em
+paralelo. Cada execução grava duração e estado por passo.
+
+Passos que usam o mesmo recurso (a API Maritaca) nunca rodam ao mesmo tempo,
+nem entre processos: o lock em data/pipeline/locks/ faz um orquestrador
+esperar o outro, sem polling de processos.
+
+Uso:
+    python orquestrador.py                    # passos padrão (o que estiver desatualizado)
+    python orquestrador.py --listar           # DAG e estado de cada passo
+    python orquestrador.py --passos 09 17     # esses passos e suas dependências (sem 02)
+    python orquestrador.py --passos 21 04 19  # passos da API Maritaca (opcionais)
+    python orquestrador.py --forcar --workers 2
+"""
+import argparse
+import fcntl
+import hashlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem.graficos import HashesEntradas
+from scripts.analise_enem.motor_execucao import salvar_json_atomico
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DIR_SCRIPTS = Path(__file__).parent
+DIR_ESTADO = PROJECT_ROOT / "data" / "pipeline"
+DIR_LOGS = PROJECT_ROOT / "logs" / "orquestrador"
+ARQUIVO_ESTADO = "estado.json"
+ARQUIVO_HISTORICO = "historico.jsonl"
+
+PROCESSADOS = "data/processed/enem_*_completo.jsonl"
+
+
+class Passo:
+    """Script numerado com entradas e saídas declaradas"""
+
+    __slots__ = ('id', 'script', 'args', 'entradas', 'saidas', 'descricao', 'requer', 'ambiente',
+                 'recurso', 'opcional', 'apos')
+
+    def __init__(self, id: str, script: str, entradas: List[str], saidas: List[str], descricao: str,
+                 args: List[str] = (), requer: List[str] = (), ambiente: List[str] = (),
+                 recurso: Optional[str] = None, opcional: bool = False, apos: List[str] = ()):
+        self.id = id
+        self.script = script
+        self.args = list(args)
+        self.entradas = list(entradas)
+        self.saidas = list(saidas)
+        self.descricao = descricao
+        self.requer = list(requer)        # módulos Python necessários
+        self.ambiente = list(ambiente)    # variáveis de ambiente necessárias
+        self.recurso = recurso            # passos com o mesmo recurso rodam um de cada vez
+        self.opcional = opcional          # fora do conjunto padrão (custo/créditos)
+        self.apos = list(apos)            # só ordem: espera esses passos se também forem executados
+
+
+PASSOS = [
+    Passo('01', '01_carregar_dados_historico.py', ['data/enem/*'], [PROCESSADOS],
+          'Carregar dados históricos', opcional=True),
+    Passo('02', '02_normalizar_dados.py', [PROCESSADOS], [PROCESSADOS],
+          'Normalizar dados'),
+    Passo('03', '03_validar_dados.py', [PROCESSADOS],
+          ['reports/validacao_dados_historicos.txt', 'data/analises/estatisticas_dados.json'],
+          'Validar dados'),
+    Passo('04', '04_gerar_embeddings.py', [PROCESSADOS],
+          ['data/embeddings/indice_embeddings.json', 'data/embeddings/embeddings_*.npy'],
+          'Gerar embeddings', requer=['sentence_transformers']),
+    Passo('06', '06_modelagem_topicos.py', [PROCESSADOS],
+          ['data/analises/modelos_topicos/doc_topic_lda_global.npz', 'data/analises/topicos_lda_global.json'],
+          'Modelagem de tópicos (LDA global incremental)', args=['--incremental'],
+          requer=['sklearn', 'nltk', 'joblib']),
+    Passo('08', '08_heuristica_dificuldade.py', [PROCESSADOS],
+          ['data/analises/dificuldade_completo.json', 'data/analises/dificuldade_estatisticas.json'],
+          'Análise de dificuldade'),
+    Passo('09', '09_similaridade_provas.py',
+          [PROCESSADOS, 'data/embeddings/indice_embeddings.json', 'data/embeddings/embeddings_*.npy'],
+          ['data/analises/similaridade_provas.json'],
+          'Similaridade entre provas', requer=['sklearn']),
+    Passo('11', '11_serie_temporal.py', [PROCESSADOS, 'data/analises/modelos_topicos/doc_topic_lda_global.npz'],
+          ['data/analises/serie_temporal_areas.csv', 'data/analises/metricas_temporais.csv',
+           'data/analises/tendencias.json'],
+          'Série temporal', requer=['pandas']),
+    Passo('14', '14_modelo_tendencias.py', ['data/analises/serie_temporal_areas.csv'],
+          ['data/analises/predicoes_tendencias.json'],
+          'Modelos preditivos', requer=['pandas', 'sklearn']),
+    Passo('17', '17_visualizacoes.py',
+          ['data/analises/serie_temporal_areas.csv', 'data/analises/dificuldade_estatisticas.json',
+           'data/analises/similaridade_provas.json', 'data/analises/modelos_topicos/doc_topic_lda_global.npz'],
+          ['reports/visualizacoes/dashboard.html'],
+          'Visualizações', requer=['matplotlib', 'pandas']),
+    Passo('42', '42_grafico_dificuldade_por_area.py', ['data/analises/dificuldade_completo.json'],
+          ['reports/visualizacoes/dificuldade_por_area_2009_2025.png'],
+          'Gráfico de dificuldade por área', requer=['matplotlib'], opcional=True),
+    Passo('60', '60_grafico_comparativo_dificuldade_exames.py', [PROCESSADOS, 'data/treino/treino_*.jsonl'],
+          ['reports/visualizacoes/comparativo_dificuldade_exames.png',
+           'reports/visualizacoes/comparativo_dificuldade_radar.png'],
+          'Comparativo ENEM vs FUVEST, ITA e IME', requer=['matplotlib'], opcional=True),
+    Passo('21', '21_avaliacao_acuracia_maritaca.py', [PROCESSADOS],
+          ['data/analises/avaliacao_acuracia_maritaca.json'],
+          'Avaliação de acurácia com a API Maritaca', ambiente=['CURSORMINIMAC'], recurso='maritaca',
+          opcional=True),
+    Passo('19', '19_integracao_maritaca.py', [PROCESSADOS],
+          ['data/analises/analise_complexidade_maritaca.json'],
+          'Análise de complexidade com a API Maritaca', ambiente=['CURSORMINIMAC'], recurso='maritaca',
+          opcional=True, apos=['21']),
+]
+
+
+def _sobrepoe(entrada: str, saida: str) -> bool:
+    """Um padrão de entrada lê algo que o padrão de saída produz?"""
+    entrada, saida = entrada.rstrip('/'), saida.rstrip('/')
+    return (fnmatch(saida, entrada) or fnmatch(entrada, saida)
+            or entrada.startswith(saida + '/') or saida.startswith(entrada + '/'))
+
+
+def reescreve_entradas(passo: Passo) -> bool:
+    """O passo regrava no lugar o que lê (ex.: 02 normaliza data/processed)?"""
+    return any(_sobrepoe(e, s) for e in passo.entradas for s in passo.saidas)
+
+
+def dependencias(passos: List[Passo]) -> Dict[str, List[str]]:
+    """{passo: [passos que produzem suas entradas] + apos} (a ordem da lista evita ciclos)"""
+    deps = {}
+    for i, passo in enumerate(passos):
+        deps[passo.id] = [
+            outro.id for j, outro in enumerate(passos)
+            if j < i and (outro.id in passo.apos
+                          or any(_sobrepoe(e, s) for e in passo.entradas for s in outro.saidas))
+        ]
+    return deps
+
+
+def selecionar(passos: List[Passo], alvos: Optional[List[str]]) -> List[Passo]:
+    """Alvos (padrão: não opcionais) mais as dependências, na ordem declarada"""
+    por_id = {p.id: p for p in passos}
+    desconhecidos = [a for a in alvos or [] if a not in por_id]
+    if desconhecidos:
+        raise ValueError(f"Passos desconhecidos: {', '.join(desconhecidos)} (disponíveis: {', '.join(por_id)})")
+    deps = dependencias(passos)
+    pendentes = list(alvos) if alvos else [p.id for p in passos if not p.opcional]
+    escolhidos = set()
+    while pendentes:
+        atual = pendentes.pop()
+        if atual in escolhidos:
+            continue
+        escolhidos.add(atual)
+        # dependências opcionais, as que regravam as entradas no lugar (02) e as de `apos` só
+        # entram se pedidas: 01, 02 e 21 não rodam sozinhos
+        pendentes.extend(d for d in deps[atual]
+                         if d not in por_id[atual].apos
+                         and (not (por_id[d].opcional or reescreve_entradas(por_id[d])) or (alvos and d in alvos)))
+    return [p for p in passos if p.id in escolhidos]
+
+
+def expandir(padroes: List[str]) -> List[Path]:
+    """Arquivos que casam com os padrões (ordenados, sem duplicatas)"""
+    arquivos = set()
+    for padrao in padroes:
+        caminho = PROJECT_ROOT / padrao
+        if any(c in padrao for c in '*?['):
+            arquivos.update(p for p in PROJECT_ROOT.glob(padrao) if p.is_file())
+        elif caminho.is_dir():
+            arquivos.update(p for p in caminho.rglob('*') if p.is_file())
+        elif caminho.exists():
+            arquivos.add(caminho)
+    return sorted(arquivos)
+
+
+def impressao_digital(passo: Passo, hashes: HashesEntradas) -> str:
+    """sha256 do script, argumentos, entradas e saídas"""
+    h = hashlib.sha256(f"{passo.script}\x1e{' '.join(passo.args)}\x1e".encode('utf-8'))
+    h.update(hashes.hash(DIR_SCRIPTS / passo.script).encode('utf-8'))
+    for rotulo, padroes in (('e', passo.entradas), ('s', passo.saidas)):
+        for arquivo in expandir(padroes):
+            h.update(f"\x1e{rotulo}\x1f{arquivo.relative_to(PROJECT_ROOT)}\x1f{hashes.hash(arquivo)}".encode('utf-8'))
+    return h.hexdigest()[:24]
+
+
+def saidas_presentes(passo: Passo) -> bool:
+    return all(expandir([padrao]) for padrao in passo.saidas)
+
+
+def faltando(passo: Passo) -> List[str]:
+    """Requisitos ausentes (módulos e variáveis de ambiente)"""
+    ausentes = [m for m in passo.requer if importlib.util.find_spec(m) is None]
+    ausentes += [f"${v}" for v in passo.ambiente if not os.environ.get(v)]
+    return ausentes
+
+
+class Estado:
+    """Impressões digitais e tempos registrados por passo (data/pipeline/estado.json)"""
+
+    def __init__(self, diretorio: Path = DIR_ESTADO):
+        self.diretorio = Path(diretorio)
+        self.arquivo = self.diretorio / ARQUIVO_ESTADO
+        self.lock = threading.Lock()
+        self.passos = self._ler()
+
+    def _ler(self) -> Dict:
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def registrar(self, passo_id: str, dados: Dict):
+        trava = Trava('estado')
+        with self.lock:
+            # relê e grava sob o flock para não perder o que outro orquestrador gravou
+            trava.adquirir()
+            try:
+                self.passos = self._ler()
+                self.passos[passo_id] = dados
+                salvar_json_atomico(self.arquivo, self.passos, indent=2)
+            finally:
+                trava.liberar()
+
+    def historico(self, execucao: Dict):
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        with open(self.diretorio / ARQUIVO_HISTORICO, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(execucao, ensure_ascii=False) + '\n')
+
+
+class Trava:
+    """flock exclusivo em data/pipeline/locks/<nome>.lock (vale entre processos)"""
+
+    def __init__(self, nome: str):
+        self.arquivo = DIR_ESTADO / "locks" / f"{nome}.lock"
+        self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+        self.fd = None
+
+    def adquirir(self, bloquear: bool = True) -> bool:
+        self.fd = open(self.arquivo, 'a+')
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX | (0 if bloquear else fcntl.LOCK_NB))
+        except BlockingIOError:
+            self.fd.close()
+            self.fd = None
+            return False
+        return True
+
+    def liberar(self):
+        if self.fd:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            self.fd.close()
+            self.fd = None
+
+
+def em_execucao(nome: str) -> bool:
+    """Algum orquestrador está segurando a trava (passo ou recurso)?"""
+    trava = Trava(nome)
+    if trava.adquirir(bloquear=False):
+        trava.liberar()
+        return False
+    return True
+
+
+class Orquestrador:
+    """Executa os passos selecionados respeitando o DAG, pulando os atualizados"""
+
+    def __init__(self, passos: List[Passo], workers: int = 3, forcar: bool = False, estado: Optional[Estado] = None):
+        self.passos = passos
+        self.workers = max(1, workers)
+        self.forcar = forcar
+        self.estado = estado or Estado()
+        self.hashes = HashesEntradas(DIR_ESTADO)
+        self.hashes_lock = threading.Lock()
+        self.resultados: Dict[str, Dict] = {}
+
+    def _impressao(self, passo: Passo) -> str:
+        with self.hashes_lock:
+            return impressao_digital(passo, self.hashes)
+
+    def atualizado(self, passo: Passo) -> bool:
+        registrado = self.estado.passos.get(passo.id, {})
+        return (registrado.get('status') == 'ok' and saidas_presentes(passo)
+                and registrado.get('impressao') == self._impressao(passo))
+
+    def _rodar(self, passo: Passo) -> Dict:
+        """Roda um passo (thread do pool): travas, verificação, subprocesso, registro"""
+        travas = [Trava(f"passo_{passo.id}")] + ([Trava(f"recurso_{passo.recurso}")] if passo.recurso else [])
+        for trava in travas:
+            if not trava.adquirir(bloquear=False):
+                print(f"  ⏳ [{passo.id}] aguardando {trava.arquivo.stem} (em uso por outro processo)")
+                trava.adquirir()
+        try:
+            # outro orquestrador pode ter acabado de atualizar este passo
+            self.estado.passos = self.estado._ler()
+            if not self.forcar and self.atualizado(passo):
+                return {'status': 'atualizado', 'segundos': 0.0}
+
+            DIR_LOGS.mkdir(parents=True, exist_ok=True)
+            log = DIR_LOGS / f"{passo.id}.log"
+            print(f"  ▶️  [{passo.id}] {passo.descricao} (log: {log.relative_to(PROJECT_ROOT)})")
+            inicio = time.time()
+            with open(log, 'w', encoding='utf-8') as saida:
+                processo = subprocess.run(
+                    [sys.executable, str(DIR_SCRIPTS / passo.script), *passo.args],
+                    cwd=str(PROJECT_ROOT), stdout=saida, stderr=subprocess.STDOUT,
+                    env={**os.environ, 'PYTHONUNBUFFERED': '1', 'MPLBACKEND': 'Agg'}
+                )
+            segundos = time.time() - inicio
+
+            if processo.returncode != 0:
+                status = 'erro'
+            elif not saidas_presentes(passo):
+                status = 'sem_saida'
+            else:
+                status = 'ok'
+            registro = {'status': status, 'segundos': round(segundos, 2),
+                        'concluido_em': datetime.now().isoformat(), 'codigo': processo.returncode}
+            if status == 'ok':
+                registro['impressao'] = self._impressao(passo)
+            self.estado.registrar(passo.id, registro)
+
+            if status != 'ok':
+                with open(log, 'r', encoding='utf-8', errors='replace') as f:
+                    ultimas = f.readlines()[-10:]
+                print(f"  ❌ [{passo.id}] {'código ' + str(processo.returncode) if status == 'erro' else 'saídas não geradas'}:")
+                for linha in ultimas:
+                    print(f"       {linha.rstrip()}")
+            return {'status': status, 'segundos': segundos}
+        finally:
+            for trava in reversed(travas):
+                trava.liberar()
+
+    def executar(self) -> Dict[str, Dict]:
+        deps = dependencias(self.passos)
+        ids = [p.id for p in self.passos]
+        deps = {i: [d for d in deps[i] if d in ids] for i in ids}
+        por_id = {p.id: p for p in self.passos}
+        pendentes = list(ids)
+        rodando = {}
+        inicio = time.time()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while pendentes or rodando:
+                for passo_id in list(pendentes):
+                    estados = [self.resultados.get(d, {}).get('status') for d in deps[passo_id]]
+                    if any(e is None for e in estados):
+                        continue
+                    pendentes.remove(passo_id)
+                    passo = por_id[passo_id]
+                    # `apos` só ordena: a falha desses passos não bloqueia este
+                    bloqueio = [d for d, e in zip(deps[passo_id], estados)
+                                if e in ('erro', 'sem_saida', 'bloqueado') and d not in passo.apos]
+                    ausentes = faltando(passo)
+                    if bloqueio:
+                        self._concluir(passo, {'status': 'bloqueado', 'segundos': 0.0,
+                                               'motivo': f"falha em {', '.join(bloqueio)}"})
+                    elif ausentes:
+                        self._concluir(passo, {'status': 'sem_requisitos', 'segundos': 0.0,
+                                               'motivo': f"falta {', '.join(ausentes)}"})
+                    else:
+                        rodando[executor.submit(self._rodar, passo)] = passo
+
+                if not rodando:
+                    continue
+                prontos, _ = wait(rodando, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    passo = rodando.pop(futuro)
+                    try:
+                        resultado = futuro.result()
+                    except Exception as e:
+                        resultado = {'status': 'erro', 'segundos': 0.0, 'motivo': str(e)}
+                    self._concluir(passo, resultado)
+
+        self.hashes.salvar()
+        self.estado.historico({
+            'inicio': datetime.fromtimestamp(inicio).isoformat(),
+            'segundos': round(time.time() - inicio, 2),
+            'passos': self.resultados,
+        })
+        return self.resultados
+
+    def _concluir(self, passo: Passo, resultado: Dict):
+        resultado['segundos'] = round(resultado.get('segundos', 0.0), 2)
+        self.resultados[passo.id] = resultado
+        status = resultado['status']
+        if status == 'ok':
+            print(f"  ✅ [{passo.id}] {passo.descricao} ({resultado['segundos']:.1f}s)")
+        elif status == 'atualizado':
+            print(f"  ⏭️  [{passo.id}] {passo.descricao}: entradas inalteradas")
+        elif status in ('bloqueado', 'sem_requisitos'):
+            print(f"  ⚠️  [{passo.id}] {passo.descricao}: pulado ({resultado['motivo']})")
+
+
+def listar(passos: List[Passo], estado: Estado):
+    """DAG com dependências e estado registrado de cada passo"""
+    deps = dependencias(passos)
+    orquestrador = Orquestrador(passos, estado=estado)
+    print(f"{'Passo':<6} {'Depende de':<14} {'Estado':<14} {'Última':<10} Descrição")
+    print("-" * 70)
+    for passo in passos:
+        registrado = estado.passos.get(passo.id, {})
+        ausentes = faltando(passo)
+        if em_execucao(f"passo_{passo.id}"):
+            situacao = "executando"
+        elif ausentes:
+            situacao = "sem requisitos"
+        elif orquestrador.atualizado(passo):
+            situacao = "atualizado"
+        else:
+            situacao = "desatualizado"
+        ultima = f"{registrado['segundos']:.1f}s" if 'segundos' in registrado else "-"
+        opcional = " (opcional)" if passo.opcional else ""
+        print(f"{passo.id:<6} {','.join(deps[passo.id]) or '-':<14} {situacao:<14} {ultima:<10} "
+              f"{passo.descricao}{opcional}")
+    orquestrador.hashes.salvar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa as análises do ENEM como um DAG incremental")
+    parser.add_argument('--passos', nargs='+', help='Passos alvo (padrão: todos os não opcionais)')
+    parser.add_argument('--workers', type=int, default=3, help='Passos em paralelo (padrão: 3)')
+    parser.add_argument('--forcar', action='store_true', help='Ignorar impressões digitais e rodar tudo')
+    parser.add_argument('--listar', action='store_true', help='Mostrar o DAG e o estado dos passos')
+    args = parser.parse_args()
+
+    if args.listar:
+        listar(PASSOS, Estado())
+        return
+
+    try:
+        passos = selecionar(PASSOS, args.passos)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    print("=" * 70)
+    print("🚀 ORQUESTRADOR DE ANÁLISES DO ENEM")
+    print("=" * 70)
+    print(f"📋 Passos: {' → '.join(p.id for p in passos)} | paralelo: {args.workers}")
+    print()
+
+    resultados = Orquestrador(passos, workers=args.workers, forcar=args.forcar).executar()
+
+    print()
+    print("=" * 70)
+    print("⏱️  TEMPOS POR PASSO")
+    print("=" * 70)
+    for passo in passos:
+        resultado = resultados.get(passo.id, {})
+        print(f"   {passo.id:<4} {resultado.get('status', '-'):<15} {resultado.get('segundos', 0):>8.1f}s  "
+              f"{passo.descricao}")
+    print(f"\n📁 Estado: {DIR_ESTADO / ARQUIVO_ESTADO} | logs: {DIR_LOGS}")
+
+    if any(r['status'] in ('erro', 'sem_saida', 'bloqueado') for r in resultados.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
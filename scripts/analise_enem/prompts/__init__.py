@@ -0,0 +1,65 @@
+"""
+Módulos de prompt numerados como um pacote importável, carregados sob demanda
+
+Antes, cada script carregava 70_, 73_, 75_ e 96_ com
+importlib.util.spec_from_file_location + exec_module, reexecutando o corpo
+inteiro (com a tabela TRI e os bancos de few-shots) a cada carga e em cada
+processo. Aqui cada módulo é importado uma única vez por processo (via
+sys.modules) e só no primeiro acesso ao atributo:
+
+    from scripts.analise_enem import prompts
+    prompts.adaptativos.selecionar_prompt_por_tri(650)
+    prompts.figuras.obter_info_figura(questao)
+
+TRI_DATA e os bancos de few-shots ficam em dados/*.json e são lidos no
+primeiro uso (tri_data(), banco_fewshots_matematica(), banco_fewshots_natureza()).
+"""
+import importlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+DADOS = Path(__file__).parent / "dados"
+
+MODULOS = {
+    'adaptativos': "70_prompts_adaptativos_por_tri",
+    'fewshots': "73_fewshots_customizados_por_tema",
+    'figuras': "75_deteccao_figuras_simples",
+    'ultra_simples': "79_prompt_ultra_simples_facil",
+    'fewshots_natureza': "81_fewshots_natureza_expandido",
+    'natureza': "82_prompt_especializado_natureza",
+    'revisados': "96_prompts_revisados_todas_areas",
+}
+
+
+def __getattr__(nome: str):
+    """Importa o módulo numerado no primeiro acesso (prompts.adaptativos, prompts.figuras, ...)"""
+    if nome not in MODULOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    modulo = importlib.import_module(f"scripts.analise_enem.{MODULOS[nome]}")
+    globals()[nome] = modulo
+    return modulo
+
+
+def _ler(nome: str):
+    with open(DADOS / nome, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def tri_data() -> Dict[int, Dict]:
+    """TRI, habilidade, nível, tema e gabarito por número de questão"""
+    return {int(numero): info for numero, info in _ler("tri_data.json").items()}
+
+
+@lru_cache(maxsize=None)
+def banco_fewshots_matematica() -> Dict[str, List[Dict]]:
+    """Bancos de few-shots de Matemática por tema (algebra, estatistica, geometria, ...)"""
+    return _ler("fewshots_matematica.json")
+
+
+@lru_cache(maxsize=None)
+def banco_fewshots_natureza() -> List[Dict]:
+    """Banco expandido de few-shots de Ciências da Natureza"""
+    return _ler("fewshots_natureza.json")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Resultados de Avaliação em JSONL (escrita e leitura em fluxo)
+
+Antes, os avaliadores (21_, 34_, 40_, 46_, 63_, 99_) acumulavam a lista
+inteira de resultados e só no final gravavam um JSON indentado; os
+analisadores (37_, 45_, 95_, 97_) precisavam de json.load do arquivo todo.
+Aqui cada questão vira uma linha, gravada (com flush) assim que termina:
+
+    {"_tipo": "cabecalho", "formato": "resultados-enem", "versao": 1, "script": ..., "config": {...}}
+    {"_tipo": "questao", ...resultado da questão...}
+    ...
+    {"_tipo": "resumo", ...métricas finais...}        (só em execuções concluídas)
+
+ler_registros() percorre o arquivo linha a linha e entrega Registros com os
+campos normalizados (numero, area, resposta, gabarito, correto, tri...),
+seja qual for o nome usado pelo script. Execuções interrompidas continuam
+legíveis (sem o resumo), e os JSON antigos também são aceitos.
+
+Uso:
+    python resultados_jsonl.py results/teste_completo_natural-sciences_20250101_120000.jsonl
+"""
+import json
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+FORMATO = "resultados-enem"
+VERSAO = 1
+
+# Nomes equivalentes usados pelos resultados de cada script
+ALIASES = {
+    'chave': ('id', 'questao_id'),
+    'numero': ('numero', 'questao', 'number'),
+    'correto': ('correto', 'acertou', 'acerto'),
+    'resposta': ('resposta', 'resposta_modelo', 'resposta_ia', 'resposta_predita', 'model_answer'),
+    'gabarito': ('gabarito', 'resposta_correta', 'correct_label'),
+}
+# Listas de resultados nos JSON antigos
+CHAVES_LEGADAS = ('resultados', 'results', 'avaliacoes')
+
+
+def arquivo_resultados(nome: str, diretorio: Path) -> Path:
+    """<diretorio>/<nome>_<timestamp>.jsonl"""
+    return Path(diretorio) / f"{nome}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+
+def _primeiro(dados: Dict, nomes):
+    for nome in nomes:
+        if dados.get(nome) not in (None, ''):
+            return dados[nome]
+    return None
+
+
+def _numero(valor) -> Optional[float]:
+    try:
+        valor = float(valor)
+    except (TypeError, ValueError):
+        return None
+    return valor or None
+
+
+class Registro:
+    """Resultado de uma questão com os campos normalizados; o original fica em `dados`"""
+
+    __slots__ = ('chave', 'numero', 'area', 'ano', 'resposta', 'gabarito', 'correto',
+                 'tri', 'confianca', 'dados')
+
+    def __init__(self, dados: Dict):
+        self.dados = dados
+        self.chave = str(_primeiro(dados, ALIASES['chave']) or '')
+        numero = _numero(_primeiro(dados, ALIASES['numero']))
+        self.numero = int(numero) if numero else None
+        self.area = dados.get('area') or 'desconhecida'
+        ano = _numero(dados.get('ano'))
+        self.ano = int(ano) if ano else None
+        self.resposta = _primeiro(dados, ALIASES['resposta'])
+        self.gabarito = _primeiro(dados, ALIASES['gabarito'])
+        self.correto = bool(_primeiro(dados, ALIASES['correto']))
+        self.tri = _numero(dados.get('tri', dados.get('TRI')))
+        self.confianca = _numero(dados.get('confianca'))
+
+    def get(self, campo: str, padrao=None):
+        """Campo do resultado original"""
+        return self.dados.get(campo, padrao)
+
+    def __repr__(self):
+        return (f"Registro(chave={self.chave!r}, area={self.area!r}, resposta={self.resposta!r}, "
+                f"gabarito={self.gabarito!r}, correto={self.correto})")
+
+
+class EscritorResultados:
+    """Grava resultados em JSONL só de acréscimo (thread-safe, flush a cada linha)"""
+
+    def __init__(self, arquivo: Path, script: str, config: Optional[Dict] = None):
+        self.arquivo = Path(arquivo)
+        self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.total = 0
+        self.saida = open(self.arquivo, 'a', encoding='utf-8')
+        if self.saida.tell() == 0:
+            self._linha({'_tipo': 'cabecalho', 'formato': FORMATO, 'versao': VERSAO, 'script': script,
+                         'criado_em': datetime.now().isoformat(), 'config': config or {}})
+
+    def _linha(self, dados: Dict):
+        linha = json.dumps(dados, ensure_ascii=False, default=str)
+        with self.lock:
+            self.saida.write(linha + '\n')
+            self.saida.flush()
+
+    def escrever(self, resultado: Dict):
+        """Uma questão concluída"""
+        self._linha({'_tipo': 'questao', **resultado})
+        self.total += 1
+
+    def resumo(self, metricas: Dict):
+        """Métricas finais (última linha de uma execução concluída)"""
+        self._linha({'_tipo': 'resumo', 'timestamp': datetime.now().isoformat(), **metricas})
+
+    def fechar(self):
+        with self.lock:
+            self.saida.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def _linhas(arquivo: Path) -> Iterator[Dict]:
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        for linha in f:
+            if linha.strip():
+                try:
+                    yield json.loads(linha)
+                except ValueError:
+                    # última linha pela metade (execução interrompida)
+                    continue
+
+
+def _legado(arquivo: Path) -> Iterator[Dict]:
+    """Resultados de um JSON antigo (lista, {'resultados': [...]}, {ano: {'avaliacoes': [...]}})"""
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+    if isinstance(dados, dict) and dados.get('arquivo_registros'):
+        # JSON de resumo que aponta para o JSONL das questões (21_)
+        yield from _linhas_de_questoes(Path(arquivo).parent / dados['arquivo_registros'])
+        return
+    if isinstance(dados, list):
+        yield from (d for d in dados if isinstance(d, dict))
+        return
+    for chave in CHAVES_LEGADAS:
+        if isinstance(dados.get(chave), list):
+            yield from (d for d in dados[chave] if isinstance(d, dict))
+            return
+    for nome, bloco in dados.items():
+        if isinstance(bloco, dict):
+            for chave in CHAVES_LEGADAS:
+                if isinstance(bloco.get(chave), list):
+                    ano = {'ano': nome} if str(nome).isdigit() else {}
+                    yield from ({**ano, **d} for d in bloco[chave] if isinstance(d, dict))
+
+
+def eh_jsonl(arquivo: Path) -> bool:
+    return Path(arquivo).suffix == '.jsonl'
+
+
+def _linhas_de_questoes(arquivo: Path) -> Iterator[Dict]:
+    for dados in _linhas(arquivo):
+        if dados.pop('_tipo', 'questao') == 'questao':
+            yield dados
+
+
+def ler_registros(arquivo: Path) -> Iterator[Registro]:
+    """Registros das questões, um por vez (JSONL em fluxo; JSON antigo carregado inteiro)"""
+    dados = _linhas_de_questoes(arquivo) if eh_jsonl(arquivo) else _legado(arquivo)
+    yield from (Registro(d) for d in dados)
+
+
+def ler_cabecalho(arquivo: Path) -> Dict:
+    """Cabeçalho do JSONL ({} para JSON antigo ou arquivo vazio)"""
+    if not eh_jsonl(arquivo):
+        return {}
+    for dados in _linhas(arquivo):
+        return dados if dados.get('_tipo') == 'cabecalho' else {}
+    return {}
+
+
+def ler_resumo(arquivo: Path) -> Optional[Dict]:
+    """Resumo final do JSONL (None se a execução não terminou)"""
+    if not eh_jsonl(arquivo):
+        return None
+    with open(arquivo, 'rb') as f:
+        f.seek(0, 2)
+        f.seek(max(0, f.tell() - 65536))
+        final = f.read().decode('utf-8', errors='ignore').splitlines()
+    for linha in reversed(final):
+        try:
+            dados = json.loads(linha)
+        except ValueError:
+            continue
+        return dados if dados.get('_tipo') == 'resumo' else None
+    return None
+
+
+class Contagem:
+    """Acertos/total de um grupo"""
+
+    __slots__ = ('acertos', 'total')
+
+    def __init__(self):
+        self.acertos = 0
+        self.total = 0
+
+    def adicionar(self, correto: bool):
+        self.total += 1
+        self.acertos += bool(correto)
+
+    @property
+    def erros(self) -> int:
+        return self.total - self.acertos
+
+    @property
+    def acuracia(self) -> float:
+        """Acurácia em %"""
+        return self.acertos / self.total * 100 if self.total else 0.0
+
+
+class ContagemPor:
+    """Contagens por grupo (área, ano, tema...), atualizadas registro a registro"""
+
+    def __init__(self):
+        self.grupos = defaultdict(Contagem)
+        self.geral = Contagem()
+
+    def adicionar(self, grupo, correto: bool):
+        self.grupos[grupo].adicionar(correto)
+        self.geral.adicionar(correto)
+
+    def items(self):
+        return self.grupos.items()
+
+
+def main():
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Uso: python resultados_jsonl.py <arquivo.jsonl>")
+        return
+    arquivo = Path(sys.argv[1])
+    cabecalho = ler_cabecalho(arquivo)
+    por_area = ContagemPor()
+    for registro in ler_registros(arquivo):
+        por_area.adicionar(registro.area, registro.correto)
+
+    print(f"📁 {arquivo}")
+    if cabecalho:
+        print(f"   Script: {cabecalho.get('script')} ({cabecalho.get('criado_em')})")
+    geral = por_area.geral
+    print(f"   Questões: {geral.total} | Acurácia: {geral.acuracia:.2f}% ({geral.acertos}/{geral.total})")
+    for area, contagem in sorted(por_area.items()):
+        print(f"   {area:20s}: {contagem.acuracia:5.2f}% ({contagem.acertos}/{contagem.total})")
+    if eh_jsonl(arquivo) and ler_resumo(arquivo) is None:
+        print("   ⚠️  Execução sem resumo final (interrompida ou em andamento)")
+
+
+if __name__ == "__main__":
+    main()
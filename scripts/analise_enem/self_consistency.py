@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Motor de Self-Consistency Compartilhado
+
+Usado por 78_self_consistency.py, 80_sistema_completo_melhorado.py, 83_,
+98_ e 99_teste_completo_com_monitoramento.py. As passagens de uma questão
+são disparadas em paralelo (em vez de n chamadas seriais com time.sleep
+entre elas), sob o limitador de taxa global do processo (cliente_maritaca);
+quando o endpoint aceita, uma única requisição pede n escolhas (parâmetro `n`).
+
+O resultado mantém a estrutura de votação usada pelos scripts:
+resposta_final, confianca, frequencia, total_passagens, respostas_todas,
+distribuicao, tem_consenso e resultados (uma entrada por passagem).
+
+Modo adaptativo: as passagens saem em rodadas e a amostragem para assim que
+a resposta líder não pode mais ser ultrapassada nas passagens restantes (o
+voto majoritário é o mesmo da execução completa) ou, opcionalmente, quando a
+probabilidade posterior (Dirichlet) de a líder ser a moda passa de um limiar.
+As chamadas economizadas ficam num orçamento global da execução e são gastas
+em passagens extras nas questões de baixo consenso.
+"""
+import math
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from scripts.analise_enem.cliente_maritaca import LimitadorTaxa, limitador_global
+
+SYSTEM_PADRAO = "Você é um especialista em questões do ENEM."
+
+
+class OrcamentoChamadas:
+    """
+    Orçamento global de chamadas de uma execução.
+
+    Cada questão ainda não iniciada tem `reserva_por_questao` chamadas
+    garantidas; o que sobra (inclusive o economizado por paradas antecipadas)
+    fica livre para passagens extras em questões de baixo consenso.
+    """
+
+    def __init__(self, total: Optional[int], num_questoes: int, reserva_por_questao: int = 1):
+        self.total = total
+        self.pendentes = num_questoes
+        self.reserva_por_questao = reserva_por_questao
+        self.gasto = 0
+        self.lock = threading.Lock()
+
+    def iniciar_questao(self) -> int:
+        """Retira a questão da fila e devolve suas chamadas garantidas"""
+        with self.lock:
+            self.pendentes = max(0, self.pendentes - 1)
+        return self.reserva_por_questao
+
+    def reservar(self, n: int, garantidas: int = 0) -> int:
+        """Concede até n chamadas (as garantidas da questão não dependem da sobra)"""
+        with self.lock:
+            if self.total is None:
+                concedidas = n
+            else:
+                livre = self.total - self.gasto - self.pendentes * self.reserva_por_questao - garantidas
+                concedidas = max(0, min(n, garantidas + max(0, livre)))
+            self.gasto += concedidas
+            return concedidas
+
+    @property
+    def restante(self) -> Optional[int]:
+        return None if self.total is None else self.total - self.gasto
+
+
+def montar_mensagens(prompt: str, system: str = SYSTEM_PADRAO) -> List[Dict]:
+    """Mensagens no formato chat usadas por todos os scripts"""
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def votar(respostas: List[str], min_consenso: int = 3) -> Dict:
+    """Votação majoritária com confiança = frequência / respostas válidas"""
+    if not respostas:
+        return {
+            'resposta_final': None,
+            'confianca': 0.0,
+            'frequencia': 0,
+            'total_passagens': 0,
+            'respostas_todas': [],
+            'distribuicao': {},
+            'tem_consenso': False,
+            'erro': 'Nenhuma resposta válida obtida'
+        }
+
+    contador = Counter(respostas)
+    resposta_final, frequencia = contador.most_common(1)[0]
+    return {
+        'resposta_final': resposta_final,
+        'confianca': frequencia / len(respostas),
+        'frequencia': frequencia,
+        'total_passagens': len(respostas),
+        'respostas_todas': respostas,
+        'distribuicao': dict(contador),
+        'tem_consenso': frequencia >= min_consenso
+    }
+
+
+def _resultado_passagem(texto: Optional[str], extrair: Callable, passagem: int) -> Dict:
+    resposta = extrair(texto) if texto else None
+    return {
+        'resposta': resposta,
+        'resposta_completa': texto,
+        'passagem': passagem,
+        'sucesso': resposta is not None
+    }
+
+
+CAMPOS_USO = ('prompt_tokens', 'completion_tokens', 'tokens', 'latencia_api', 'retentativas')
+
+
+def _uso(response) -> Dict:
+    """Tokens, latência e retentativas de uma requisição do ClienteMaritaca (vazio se veio do cache)"""
+    if not isinstance(response, dict) or not response.get('tentativas'):
+        return {}
+    uso = response.get('usage') or {}
+    return {
+        'prompt_tokens': uso.get('prompt_tokens', 0) or 0,
+        'completion_tokens': uso.get('completion_tokens', 0) or 0,
+        'tokens': uso.get('total_tokens', 0) or 0,
+        'latencia_api': response.get('latencia', 0.0),
+        'retentativas': response['tentativas'] - 1
+    }
+
+
+def consumo(resultados: List[Dict]) -> Dict:
+    """Tokens, latência de API e retentativas somados das passagens de uma questão"""
+    return {campo: sum(r.get(campo, 0) for r in resultados) for campo in CAMPOS_USO}
+
+
+def _amostra(client, passagem: int) -> Dict:
+    """Índice da passagem para o cache de respostas do ClienteMaritaca"""
+    return {'amostra': passagem} if getattr(client, 'cache', None) is not None else {}
+
+
+def _chamar(client, mensagens: List[Dict], extrair: Callable, passagem: int,
+            limitador: LimitadorTaxa, modelo: str, temperature: float, max_tokens: int) -> Dict:
+    """Uma passagem (executa em thread)"""
+    try:
+        with limitador:
+            response = client.chat.completions.create(
+                model=modelo,
+                messages=mensagens,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **_amostra(client, passagem)
+            )
+        return {**_resultado_passagem(response.choices[0].message.content, extrair, passagem),
+                **_uso(response)}
+    except Exception as e:
+        return {'resposta': None, 'erro': str(e), 'passagem': passagem, 'sucesso': False}
+
+
+def _chamar_com_n(client, mensagens: List[Dict], extrair: Callable, n: int,
+                  limitador: LimitadorTaxa, modelo: str, temperature: float,
+                  max_tokens: int, inicio: int = 1) -> List[Dict]:
+    """Uma requisição pedindo n escolhas; lista vazia se o endpoint recusar"""
+    try:
+        with limitador:
+            response = client.chat.completions.create(
+                model=modelo,
+                messages=mensagens,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                n=n,
+                **_amostra(client, inicio)
+            )
+    except Exception:
+        return []
+    resultados = [
+        _resultado_passagem(choice.message.content, extrair, i + 1)
+        for i, choice in enumerate(response.choices[:n])
+    ]
+    if resultados:
+        resultados[0].update(_uso(response))
+    return resultados
+
+
+def executar_passagens(client, mensagens: List[Dict], extrair: Callable, n_passagens: int = 5,
+                       modelo: str = "sabia-3", temperature: float = 0.1, max_tokens: int = 2000,
+                       usar_n: bool = False, limitador: Optional[LimitadorTaxa] = None,
+                       inicio: int = 1) -> List[Dict]:
+    """
+    Executa as passagens de uma questão e retorna os resultados em ordem.
+
+    Com usar_n=True tenta uma única requisição com n escolhas; as passagens
+    que faltarem (endpoint sem suporte a `n` ou menos escolhas que o pedido)
+    são completadas com chamadas paralelas.
+    """
+    if limitador is None:
+        # O ClienteMaritaca já aplica o limitador global em cada tentativa
+        limitador = nullcontext() if getattr(client, 'limitador', None) else limitador_global()
+    resultados = []
+
+    if usar_n and n_passagens > 1:
+        resultados = _chamar_com_n(client, mensagens, extrair, n_passagens,
+                                   limitador, modelo, temperature, max_tokens, inicio)
+        for i, resultado in enumerate(resultados):
+            resultado['passagem'] = inicio + i
+
+    faltantes = range(inicio + len(resultados), inicio + n_passagens)
+    if faltantes:
+        with ThreadPoolExecutor(max_workers=len(faltantes)) as executor:
+            futuros = [
+                executor.submit(_chamar, client, mensagens, extrair, passagem,
+                                limitador, modelo, temperature, max_tokens)
+                for passagem in faltantes
+            ]
+            resultados += [futuro.result() for futuro in futuros]
+
+    return resultados
+
+
+def probabilidade_lider(contagens: List[int], amostras: int = 2000, semente: int = 0) -> float:
+    """
+    P(a resposta líder é a mais provável) sob posterior Dirichlet(1 + contagens)
+    sobre as 5 alternativas, estimada por Monte Carlo.
+    """
+    alfa = np.ones(5)
+    alfa[:len(contagens)] += sorted(contagens, reverse=True)
+    rng = np.random.default_rng(semente)
+    theta = rng.dirichlet(alfa, size=amostras)
+    return float(np.mean(theta.argmax(axis=1) == 0))
+
+
+def _decidido(contador: Counter, restantes: int, limiar_posterior: Optional[float]) -> bool:
+    """A líder não pode mais ser ultrapassada (ou a posterior já basta)"""
+    contagens = [c for _, c in contador.most_common()]
+    if not contagens:
+        return restantes <= 0
+    lider = contagens[0]
+    segunda = contagens[1] if len(contagens) > 1 else 0
+    # Desigualdade estrita: nem empate é possível, então o voto não muda
+    if lider - segunda > restantes:
+        return True
+    return limiar_posterior is not None and probabilidade_lider(contagens) >= limiar_posterior
+
+
+def _proxima_rodada(contador: Counter, restantes: int) -> int:
+    """Menor número de passagens que ainda pode encerrar a questão"""
+    contagens = [c for _, c in contador.most_common()] + [0, 0]
+    lider, segunda = contagens[0], contagens[1]
+    return max(1, min(restantes, (segunda + restantes - lider) // 2 + 1))
+
+
+def resolver_adaptativo(client, mensagens: List[Dict], extrair: Callable, n_passagens: int = 5,
+                        min_consenso: int = 3, n_teto: Optional[int] = None,
+                        limiar_posterior: Optional[float] = None,
+                        orcamento: Optional[OrcamentoChamadas] = None, **kwargs) -> Dict:
+    """
+    Self-consistency com parada antecipada.
+
+    Amostra em rodadas paralelas até n_passagens, parando quando a líder não
+    pode mais ser ultrapassada. Se ao fim das n_passagens não houver consenso
+    (frequência < min_consenso) e o orçamento tiver sobra, continua até n_teto.
+    """
+    n_teto = max(n_teto or n_passagens, n_passagens)
+    garantidas = orcamento.iniciar_questao() if orcamento else 0
+    resultados = []
+    contador = Counter()
+    limite = n_passagens
+
+    while len(resultados) < limite:
+        restantes = limite - len(resultados)
+        if _decidido(contador, restantes, limiar_posterior):
+            break
+
+        pedido = _proxima_rodada(contador, restantes)
+        concedidas = orcamento.reservar(pedido, garantidas) if orcamento else pedido
+        garantidas = max(0, garantidas - concedidas)
+        if concedidas == 0:
+            break
+
+        rodada = executar_passagens(client, mensagens, extrair, concedidas,
+                                    inicio=len(resultados) + 1, **kwargs)
+        resultados += rodada
+        contador.update(r['resposta'] for r in rodada if r['sucesso'] and r['resposta'])
+
+        # Baixo consenso ao fim das passagens normais: estende até o teto
+        if len(resultados) >= limite == n_passagens and n_teto > n_passagens:
+            frequencia = contador.most_common(1)[0][1] if contador else 0
+            if frequencia < min_consenso:
+                limite = n_teto
+
+    respostas = [r['resposta'] for r in resultados if r['sucesso'] and r['resposta']]
+    votacao = votar(respostas, min_consenso)
+    votacao['resultados'] = resultados
+    votacao['n_passagens'] = len(resultados)
+    votacao['n_maximo'] = limite
+    votacao['parada_antecipada'] = len(resultados) < limite
+    votacao.update(consumo(resultados))
+    return votacao
+
+
+def resolver_com_self_consistency(client, mensagens: List[Dict], extrair: Callable,
+                                  n_passagens: int = 5, min_consenso: int = 3,
+                                  adaptativo: bool = False, n_teto: Optional[int] = None,
+                                  limiar_posterior: Optional[float] = None,
+                                  orcamento: Optional[OrcamentoChamadas] = None,
+                                  **kwargs) -> Dict:
+    """Executa as passagens em paralelo e aplica a votação majoritária"""
+    if adaptativo:
+        return resolver_adaptativo(client, mensagens, extrair, n_passagens, min_consenso,
+                                   n_teto=n_teto, limiar_posterior=limiar_posterior,
+                                   orcamento=orcamento, **kwargs)
+
+    if orcamento is not None:
+        n_passagens = orcamento.reservar(n_passagens, orcamento.iniciar_questao())
+    resultados = executar_passagens(client, mensagens, extrair, n_passagens, **kwargs)
+    respostas = [r['resposta'] for r in resultados if r['sucesso'] and r['resposta']]
+
+    votacao = votar(respostas, min_consenso)
+    votacao['resultados'] = resultados
+    votacao['n_passagens'] = n_passagens
+    votacao.update(consumo(resultados))
+    return votacao
+
+
+def interpretar_passagens_por_nivel(texto: Optional[str]) -> Dict[str, int]:
+    """Converte 'facil=1,medio=3,dificil=5' em {'facil': 1, 'medio': 3, 'dificil': 5}"""
+    if not texto:
+        return {}
+    passagens = {}
+    for item in texto.split(','):
+        nivel, _, valor = item.partition('=')
+        passagens[nivel.strip()] = int(valor)
+    return passagens
+
+
+def passagens_da_questao(questao: Dict, padrao: int, por_nivel: Optional[Dict[str, int]] = None,
+                         nivel: Optional[str] = None) -> int:
+    """
+    Número de passagens de uma questão: campo 'n_passagens' da própria
+    questão, senão o valor do nível TRI em por_nivel, senão o padrão.
+    """
+    if questao.get('n_passagens'):
+        return int(questao['n_passagens'])
+    if por_nivel and nivel in por_nivel:
+        return por_nivel[nivel]
+    return padrao
+
+
+def adicionar_argumentos(parser, passagens_padrao: int = 5):
+    """Opções de linha de comando comuns aos scripts de self-consistency"""
+    parser.add_argument("--passagens", type=int, default=passagens_padrao,
+                        help=f"Número de passagens (default: {passagens_padrao})")
+    parser.add_argument("--passagens-por-nivel", type=str, default=None,
+                        help="Passagens por nível TRI, ex.: facil=1,medio=3,dificil=5")
+    parser.add_argument("--usar-n", action="store_true",
+                        help="Pedir as passagens em uma única requisição (parâmetro n)")
+    parser.add_argument("--adaptativo", action="store_true",
+                        help="Parar de amostrar quando a resposta líder não puder ser ultrapassada")
+    parser.add_argument("--limiar-posterior", type=float, default=None,
+                        help="Modo adaptativo: parar também quando P(líder é a moda) >= limiar")
+    parser.add_argument("--passagens-teto", type=int, default=None,
+                        help="Modo adaptativo: máximo de passagens em questões de baixo consenso")
+    parser.add_argument("--orcamento-chamadas", type=int, default=None,
+                        help="Total de chamadas à API permitido na execução")
+
+
+def opcoes_dos_argumentos(args, num_questoes: int) -> Dict:
+    """kwargs de resolver_com_self_consistency a partir de adicionar_argumentos"""
+    opcoes = {'usar_n': args.usar_n}
+    if args.adaptativo:
+        opcoes.update(adaptativo=True, n_teto=args.passagens_teto,
+                      limiar_posterior=args.limiar_posterior)
+    if args.orcamento_chamadas is not None:
+        reserva = math.ceil((args.passagens + 1) / 2) if args.adaptativo else args.passagens
+        opcoes['orcamento'] = OrcamentoChamadas(args.orcamento_chamadas, num_questoes,
+                                                min(reserva, args.orcamento_chamadas // max(1, num_questoes)))
+    return opcoes
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Sistema Completo Adaptativo Compartilhado
+
+Carga das questões de Matemática do ENEM 2024, formatação da questão e
+montagem do prompt completo (TRI + few-shots + figuras). Usado por
+77_avaliar_sistema_completo_adaptativo.py, 78_self_consistency.py e
+80_sistema_completo_melhorado.py, que antes carregavam o 77_ pelo caminho
+do arquivo só para obter estas funções.
+"""
+import json
+from pathlib import Path
+
+from scripts.analise_enem import prompts
+
+
+def carregar_questoes_2024_matematica():
+    """Carrega questões de matemática do ENEM 2024"""
+    project_root = Path(__file__).parent.parent.parent
+    arquivo = project_root / "data" / "processed" / "enem_2024_completo.jsonl"
+    
+    if not arquivo.exists():
+        print(f"❌ Arquivo não encontrado: {arquivo}")
+        return []
+    
+    questoes = []
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                questao = json.loads(line)
+                num_str = questao.get('id', '').replace('questao_', '') or questao.get('number', '')
+                try:
+                    num = int(num_str)
+                    if 136 <= num <= 180:
+                        questao['number'] = num
+                        questoes.append(questao)
+                except (ValueError, TypeError):
+                    continue
+    
+    return questoes
+
+
+def formatar_questao(questao: dict, use_captions: bool = True) -> str:
+    """Formata questão para o prompt"""
+    texto = ""
+    
+    if questao.get('context'):
+        texto += f"CONTEXTO:\n{questao['context']}\n\n"
+    
+    if use_captions and questao.get('description'):
+        desc = questao['description']
+        if isinstance(desc, list) and desc:
+            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc[0]}\n\n"
+        elif desc:
+            texto += f"DESCRIÇÃO DAS IMAGENS:\n{desc}\n\n"
+    
+    texto += f"PERGUNTA:\n{questao.get('question', '')}\n\n"
+    
+    texto += "ALTERNATIVAS:\n"
+    for i, alt in enumerate(questao.get('alternatives', []), 1):
+        letra = chr(64 + i)
+        texto += f"{letra}) {alt}\n"
+    
+    return texto
+
+
+def construir_prompt_completo(questao: dict) -> str:
+    """
+    Constrói prompt completo usando todas as melhorias:
+    1. Prompt adaptativo por TRI
+    2. Few-shots por tema
+    3. Detecção de figuras simples
+    """
+    num = questao.get('number', 0)
+    
+    # 1. Obter TRI e classificar
+    tri_info = prompts.adaptativos.obter_info_tri(num)
+    tri_value = tri_info.get('TRI', 0)
+    nivel = prompts.adaptativos.classificar_por_tri(tri_value)
+    tema = tri_info.get('Tema', 'N/A')
+    
+    # 2. Selecionar prompt adaptativo
+    prompt_base = prompts.adaptativos.selecionar_prompt_por_tri(tri_value)
+    
+    # 3. Adicionar few-shots (apenas para nível médio)
+    if nivel == 'medio':
+        prompt_com_fewshots = prompts.fewshots.criar_prompt_com_fewshots(prompt_base, tema, num_fewshots=3)
+    else:
+        prompt_com_fewshots = prompt_base
+    
+    # 4. Adicionar detecção de figuras simples
+    prompt_final = prompts.figuras.criar_prompt_com_deteccao_figura(prompt_com_fewshots, questao)
+    
+    return prompt_final, {
+        'tri': tri_value,
+        'nivel': nivel,
+        'tema': tema,
+        'tem_figura_simples': prompts.figuras.obter_info_figura(questao).get('eh_simples', False)
+    }
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Telemetria Estruturada das Execuções
+
+Substitui 99_monitorar_teste.py (que relia o log inteiro procurando linhas com
+emoji), 99_verificar_progresso.py (ps aux + releitura do _PROGRESSO.json) e
+monitorar_progresso.sh (polling a cada 30s).
+
+Os runners (via motor_execucao) gravam um fluxo de eventos JSONL só de
+acréscimo em results/telemetria/:
+    inicio_execucao   total, retomadas
+    inicio_questao    chave, area
+    fim_questao       chave, area, latencia, resposta, gabarito, correto,
+                      confianca, chamadas, tokens, retentativas, distribuicao
+    erro_questao      chave, area, erro
+    retentativa       status, tentativa, espera (emitido pelo ClienteMaritaca)
+    fim_execucao      status
+
+O monitor segue o arquivo a partir do último offset lido (tail -f) e o
+agregador atualiza acurácia, vazão, latência p50/p95 (estimador P²) e ETA com
+trabalho O(1) por evento.
+
+Uso:
+    python telemetria.py                      # segue a execução mais recente
+    python telemetria.py results/telemetria/teste_completo_natural-sciences_20250101_120000.jsonl
+    python telemetria.py --uma-vez            # lê o que já existe e sai
+"""
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.analise_enem.resultados_jsonl import ALIASES
+
+DIRETORIO_PADRAO = Path(__file__).parent.parent.parent / "results" / "telemetria"
+
+# Campos do fim_questao lidos pelos nomes equivalentes de resultados_jsonl.ALIASES
+CAMPOS_ALIASES = ('correto', 'resposta', 'gabarito')
+CAMPOS_DIRETOS = ('confianca', 'chamadas', 'tokens', 'retentativas', 'distribuicao')
+
+_ATIVA: Optional['Telemetria'] = None
+
+
+def arquivo_execucao(nome: str, diretorio: Path = DIRETORIO_PADRAO) -> Path:
+    """results/telemetria/<nome>_<timestamp>.jsonl"""
+    return Path(diretorio) / f"{nome}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+
+def campos_do_resultado(resultado: Dict) -> Dict:
+    """Extrai do resultado de uma questão os campos do evento fim_questao"""
+    campos = {}
+    for nome in CAMPOS_ALIASES:
+        for opcao in ALIASES[nome]:
+            if opcao in resultado:
+                campos[nome] = resultado[opcao]
+                break
+    for nome in CAMPOS_DIRETOS:
+        if nome in resultado:
+            campos[nome] = resultado[nome]
+    return campos
+
+
+class Telemetria:
+    """Emissor de eventos JSONL (thread-safe, uma linha por evento, flush imediato)"""
+
+    def __init__(self, arquivo: Path, execucao: Optional[str] = None):
+        global _ATIVA
+        self.arquivo = Path(arquivo)
+        self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+        self.execucao = execucao or self.arquivo.stem
+        self.lock = threading.Lock()
+        self.saida = open(self.arquivo, 'a', encoding='utf-8')
+        _ATIVA = self
+
+    def emitir(self, evento: str, **campos):
+        linha = json.dumps({'evento': evento, 't': time.time(), 'execucao': self.execucao, **campos},
+                           ensure_ascii=False, default=str)
+        with self.lock:
+            if self.saida.closed:
+                return
+            self.saida.write(linha + '\n')
+            self.saida.flush()
+
+    def fechar(self):
+        global _ATIVA
+        with self.lock:
+            self.saida.close()
+        if _ATIVA is self:
+            _ATIVA = None
+
+
+def emitir_ativa(evento: str, **campos):
+    """Emite na telemetria da execução corrente, se houver (usado pelo cliente)"""
+    if _ATIVA is not None:
+        _ATIVA.emitir(evento, **campos)
+
+
+class LeitorIncremental:
+    """Lê só as linhas novas do arquivo, a partir do último offset"""
+
+    def __init__(self, arquivo: Path):
+        self.arquivo = Path(arquivo)
+        self.offset = 0
+        self.pendente = b''
+
+    def novos_eventos(self) -> Iterator[Dict]:
+        try:
+            tamanho = os.path.getsize(self.arquivo)
+        except OSError:
+            return
+        if tamanho < self.offset:
+            # Arquivo truncado/recriado: recomeça
+            self.offset, self.pendente = 0, b''
+        if tamanho == self.offset:
+            return
+        with open(self.arquivo, 'rb') as f:
+            f.seek(self.offset)
+            dados = self.pendente + f.read()
+            self.offset = f.tell()
+        *linhas, self.pendente = dados.split(b'\n')
+        for linha in linhas:
+            if linha.strip():
+                try:
+                    yield json.loads(linha)
+                except ValueError:
+                    continue
+
+
+class QuantilP2:
+    """Estimador P² (Jain & Chlamtac) de um quantil: O(1) memória e tempo por amostra"""
+
+    def __init__(self, p: float):
+        self.p = p
+        self.iniciais: List[float] = []
+        self.q: List[float] = []
+        self.n: List[int] = []
+        self.desejadas: List[float] = []
+        self.incrementos = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def adicionar(self, x: float):
+        if len(self.iniciais) < 5:
+            self.iniciais.append(x)
+            if len(self.iniciais) == 5:
+                self.q = sorted(self.iniciais)
+                self.n = [0, 1, 2, 3, 4]
+                p = self.p
+                self.desejadas = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+            return
+
+        q, n = self.q, self.n
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desejadas[i] += self.incrementos[i]
+
+        for i in (1, 2, 3):
+            d = self.desejadas[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidato = self._parabolico(i, d)
+                if not q[i - 1] < candidato < q[i + 1]:
+                    candidato = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidato
+                n[i] += d
+
+    def _parabolico(self, i: int, d: int) -> float:
+        q, n = self.q, self.n
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def valor(self) -> Optional[float]:
+        if self.q:
+            return self.q[2]
+        if not self.iniciais:
+            return None
+        ordenados = sorted(self.iniciais)
+        return ordenados[min(len(ordenados) - 1, int(self.p * len(ordenados)))]
+
+
+class AgregadorTelemetria:
+    """Estatísticas ao vivo de uma execução, atualizadas evento a evento"""
+
+    def __init__(self):
+        self.total = 0
+        self.concluidas = 0
+        self.retomadas = 0
+        self.corretas = 0
+        self.avaliadas = 0
+        self.erros = 0
+        self.em_voo = 0
+        self.chamadas = 0
+        self.tokens = 0
+        self.retentativas = 0
+        self.p50 = QuantilP2(0.5)
+        self.p95 = QuantilP2(0.95)
+        self.inicio: Optional[float] = None
+        self.ultimo: Optional[float] = None
+        self.status = 'em_andamento'
+        self.ultimas: List[Dict] = []
+
+    def consumir(self, evento: Dict):
+        tipo = evento.get('evento')
+        t = evento.get('t')
+        if tipo == 'inicio_execucao':
+            self.total = evento.get('total', 0)
+            self.inicio = t
+        elif tipo == 'inicio_questao':
+            self.em_voo += 1
+        elif tipo == 'fim_questao':
+            self._fim_questao(evento)
+        elif tipo == 'erro_questao':
+            self.em_voo = max(0, self.em_voo - 1)
+            self.erros += 1
+        elif tipo == 'retentativa':
+            self.retentativas += 1
+        elif tipo == 'fim_execucao':
+            self.status = evento.get('status', 'concluido')
+        if t is not None:
+            self.ultimo = t
+
+    def _fim_questao(self, evento: Dict):
+        self.concluidas += 1
+        if 'correto' in evento:
+            self.avaliadas += 1
+            self.corretas += bool(evento['correto'])
+        if evento.get('retomado'):
+            self.retomadas += 1
+            return
+        self.em_voo = max(0, self.em_voo - 1)
+        self.chamadas += evento.get('chamadas') or 0
+        self.tokens += evento.get('tokens') or 0
+        if evento.get('latencia') is not None:
+            self.p50.adicionar(evento['latencia'])
+            self.p95.adicionar(evento['latencia'])
+        self.ultimas = (self.ultimas + [evento])[-5:]
+
+    def resumo(self) -> Dict:
+        decorrido = (self.ultimo - self.inicio) if self.inicio and self.ultimo else 0
+        novas = self.concluidas - self.retomadas
+        vazao = novas / decorrido if decorrido > 0 else 0
+        faltam = max(0, self.total - self.concluidas)
+        return {
+            'status': self.status,
+            'total': self.total,
+            'concluidas': self.concluidas,
+            'em_voo': self.em_voo,
+            'erros': self.erros,
+            'acuracia': self.corretas / self.avaliadas * 100 if self.avaliadas else 0,
+            'corretas': self.corretas,
+            'avaliadas': self.avaliadas,
+            'vazao_por_min': vazao * 60,
+            'latencia_p50': self.p50.valor,
+            'latencia_p95': self.p95.valor,
+            'eta_segundos': faltam / vazao if vazao > 0 else None,
+            'decorrido': decorrido,
+            'chamadas': self.chamadas,
+            'tokens': self.tokens,
+            'retentativas': self.retentativas
+        }
+
+
+def imprimir_resumo(agregador: AgregadorTelemetria, arquivo: Path):
+    r = agregador.resumo()
+    pct = r['concluidas'] / r['total'] * 100 if r['total'] else 0
+    p50 = f"{r['latencia_p50']:.1f}s" if r['latencia_p50'] is not None else "-"
+    p95 = f"{r['latencia_p95']:.1f}s" if r['latencia_p95'] is not None else "-"
+    eta = f"{r['eta_segundos'] / 60:.1f} min" if r['eta_segundos'] is not None else "-"
+
+    print("=" * 70)
+    print(f"📊 {arquivo.name} - {datetime.now().strftime('%H:%M:%S')} ({r['status']})")
+    print("=" * 70)
+    print(f"📈 Progresso: {r['concluidas']}/{r['total']} ({pct:.1f}%), {r['em_voo']} em andamento, {r['erros']} erros")
+    print(f"🎯 Acurácia: {r['acuracia']:.2f}% ({r['corretas']}/{r['avaliadas']})")
+    print(f"⚡ Vazão: {r['vazao_por_min']:.1f} questões/min | latência p50 {p50}, p95 {p95}")
+    print(f"⏱️  Decorrido: {r['decorrido'] / 60:.1f} min | restante: ~{eta}")
+    print(f"📞 Chamadas: {r['chamadas']} | tokens: {r['tokens']} | retentativas: {r['retentativas']}")
+    if agregador.ultimas:
+        print("📋 Últimas questões:")
+        for e in agregador.ultimas:
+            marca = "✅" if e.get('correto') else "❌"
+            print(f"   {marca} {e.get('chave')} ({e.get('resposta')} vs {e.get('gabarito')}, {e.get('latencia', 0):.1f}s)")
+    print()
+
+
+def execucao_mais_recente(diretorio: Path = DIRETORIO_PADRAO) -> Optional[Path]:
+    arquivos = sorted(Path(diretorio).glob("*.jsonl"), key=lambda a: a.stat().st_mtime)
+    return arquivos[-1] if arquivos else None
+
+
+def monitorar(arquivo: Path, intervalo: float = 2.0, seguir: bool = True) -> AgregadorTelemetria:
+    """Segue o arquivo de eventos e imprime o resumo quando há novidades"""
+    leitor = LeitorIncremental(arquivo)
+    agregador = AgregadorTelemetria()
+    while True:
+        novos = 0
+        for evento in leitor.novos_eventos():
+            agregador.consumir(evento)
+            novos += 1
+        if novos or not seguir:
+            imprimir_resumo(agregador, Path(arquivo))
+        if not seguir or agregador.status != 'em_andamento':
+            return agregador
+        time.sleep(intervalo)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Monitor de telemetria das execuções")
+    parser.add_argument("arquivo", nargs="?", help="Arquivo .jsonl (default: o mais recente)")
+    parser.add_argument("--intervalo", type=float, default=2.0, help="Segundos entre leituras")
+    parser.add_argument("--uma-vez", action="store_true", help="Ler o que existe e sair")
+    args = parser.parse_args()
+
+    arquivo = Path(args.arquivo) if args.arquivo else execucao_mais_recente()
+    if arquivo is None or not arquivo.exists():
+        print(f"❌ Nenhum arquivo de telemetria em {DIRETORIO_PADRAO}")
+        return
+
+    try:
+        monitorar(arquivo, args.intervalo, seguir=not args.uma_vez)
+    except KeyboardInterrupt:
+        print("\n✅ Monitoramento encerrado")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Precompute the image store used by the multimodal ENEM tasks.
+
+Downscales and re-encodes every figure under ``data/figures/<year>`` into the
+blob store of ``lm_eval/image_store.py``, so evaluation runs only read
+precomputed data URLs. Files already in the store (same size and mtime) are
+skipped. Use the same --max_side / --format as the run (ENEM_IMAGE_MAX_SIDE /
+ENEM_IMAGE_FORMAT environment variables, default 1024 / png).
+
+Example:
+    python scripts/build_image_store.py --years 2023,2024 --max_side 768 --format webp
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lm_eval import image_store
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--figures_dir", default=os.path.join("data", "figures"))
+    parser.add_argument("--years", default=None, help="Comma-separated years (default: all)")
+    parser.add_argument("--store_dir", default=image_store.DEFAULT_STORE_DIR)
+    parser.add_argument("--max_side", type=int, default=image_store.DEFAULT_MAX_SIDE)
+    parser.add_argument("--format", default=image_store.DEFAULT_FORMAT, choices=["png", "jpeg", "webp"])
+    parser.add_argument("--quality", type=int, default=image_store.DEFAULT_QUALITY,
+                        help="jpeg/webp quality")
+    parser.add_argument("--workers", type=int, default=4, help="Images encoded in parallel")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if image_store.Image is None:
+        print("WARNING: Pillow not installed; images are stored without resizing or re-encoding")
+
+    years = args.years.split(",") if args.years else sorted(os.listdir(args.figures_dir))
+    paths = []
+    for year in years:
+        year_dir = os.path.join(args.figures_dir, year)
+        if os.path.isdir(year_dir):
+            paths += [os.path.join(year_dir, name) for name in sorted(os.listdir(year_dir))
+                      if os.path.splitext(name)[1].lower() in (".png", ".jpg", ".jpeg", ".gif", ".webp")]
+
+    store = image_store.ImageStore(args.store_dir, args.max_side, args.format, args.quality)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        entries = list(executor.map(store.add, paths))
+    store.save()
+
+    source_bytes = sum(os.path.getsize(p) for p in paths)
+    stored_bytes = sum(e["bytes"] for e in entries)
+    print(f"{len(paths)} images, {len({e['sha256'] for e in entries})} distinct payloads "
+          f"({store.variant}) in {time.monotonic() - start:.1f}s")
+    print(f"{source_bytes / 1e6:.1f} MB -> {stored_bytes / 1e6:.1f} MB "
+          f"(blob file: {os.path.getsize(store.blob_path) / 1e6:.1f} MB base64)")
+
+
+if __name__ == "__main__":
+    main()
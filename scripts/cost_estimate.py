@@ -1,98 +1,175 @@
-import random
-import transformers
+"""Dry-run token, cost and wall-clock estimate for the ENEM tasks.
+
+Runs the real evaluator over every registered ``enem*`` task (or a subset)
+for each few-shot / conversation setting, without calling any API: a
+``DryrunLM`` counts prompt tokens of every request and assumes a fixed
+completion length. Use it to budget a sweep before launching it.
+
+Example:
+    python scripts/cost_estimate.py --tasks "enem_2024*" --num_fewshot 0,3 \
+        --conversation_template none,chatgpt --output_path estimate.json
+"""
+import argparse
+import fnmatch
+import json
+
 from lm_eval import tasks, evaluator
 from lm_eval.base import LM
 
+# Rough Portuguese characters per token when no tokenizer is given
+CHARS_PER_TOKEN = 4.0
+
 
 class DryrunLM(LM):
-    def __init__(self):
-        self.tokencost = 0
-        self.tokenizer = transformers.GPT2TokenizerFast.from_pretrained("gpt2")
-        self.tokenizer.pad_token = "<|endoftext|>"
+    def __init__(self, tokenizer=None, gen_tokens=8):
+        self.tokenizer = tokenizer
+        self.gen_tokens = gen_tokens
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
 
     @classmethod
-    def create_from_arg_string(cls, arg_string):
+    def create_from_arg_string(cls, arg_string, additional_config=None):
         return cls()
 
+    def count_tokens(self, text):
+        if self.tokenizer is not None:
+            return len(self.tokenizer.encode(text, add_special_tokens=False))
+        return int(len(text) / CHARS_PER_TOKEN) + 1
+
+    def count_context(self, context):
+        # Conversation templates serialize the context as a JSON list of messages
+        try:
+            messages = json.loads(context)
+        except json.decoder.JSONDecodeError:
+            return self.count_tokens(context)
+        if not isinstance(messages, list):
+            return self.count_tokens(context)
+        # ~4 tokens of chat formatting per message
+        return sum(self.count_tokens(m.get("content", "")) + 4 for m in messages)
+
     def loglikelihood(self, requests):
         res = []
-
         for ctx, cont in requests:
-            res.append((-random.random(), False))
-            self.tokencost += len(self.tokenizer.tokenize(ctx + cont))
-
+            res.append((0.0, False))
+            self.requests += 1
+            self.prompt_tokens += self.count_tokens(ctx + cont)
         return res
 
     def greedy_until(self, requests):
         res = []
-
         for ctx, until in requests:
-            res.append("lol")
-
-            # assume worst case - generates until 256
-            self.tokencost += len(self.tokenizer.tokenize(ctx)) + 256
-
+            res.append("A.")
+            self.requests += 1
+            self.prompt_tokens += self.count_context(ctx)
+            self.completion_tokens += self.gen_tokens
         return res
 
     def loglikelihood_rolling(self, requests):
         res = []
-
         for (s,) in requests:
-            # assume worst case: extra full context
-            self.tokencost += len(self.tokenizer.tokenize(s)) + 2048
-
+            res.append(0.0)
+            self.requests += 1
+            self.prompt_tokens += self.count_tokens(s)
         return res
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", default="enem*", help="Comma-separated task patterns (default: enem*)")
+    parser.add_argument("--num_fewshot", default="0,3", help="Comma-separated few-shot counts")
+    parser.add_argument("--conversation_template", default="none",
+                        help="Comma-separated templates; 'none' for plain prompts")
+    parser.add_argument("--prompt_as_single_user_message", action="store_true")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--tokenizer", default=None,
+                        help="HF tokenizer for exact counts (default: ~%.0f chars/token)" % CHARS_PER_TOKEN)
+    parser.add_argument("--gen_tokens_direct", type=int, default=8,
+                        help="Completion tokens assumed for direct-answer tasks")
+    parser.add_argument("--gen_tokens_cot", type=int, default=512,
+                        help="Completion tokens assumed for CoT tasks (worst case: max_gen_toks)")
+    parser.add_argument("--price_in", type=float, default=5.0, help="Price per 1M prompt tokens")
+    parser.add_argument("--price_out", type=float, default=10.0, help="Price per 1M completion tokens")
+    parser.add_argument("--latency", type=float, default=3.0, help="Mean seconds per request")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight")
+    parser.add_argument("--output_path", default=None)
+    return parser.parse_args()
+
+
 def main():
-    lm = DryrunLM()
-
-    task_list = "arc_challenge,arc_easy,boolq,cola,copa,headqa,hellaswag,lambada,logiqa,mathqa,mc_taco,mrpc,multirc,openbookqa,piqa,prost,pubmedqa,qnli,qqp,race,record,rte,sciq,sst,triviaqa,webqs,wic,wikitext,winogrande,wnli,wsc"
-    values = []
-    for taskname in task_list.split(","):
-        lm.tokencost = 0
-        evaluator.evaluate(
-            lm=lm,
-            task_dict={taskname: tasks.get_task(taskname)()},
-            num_fewshot=0,
-            limit=None,
-            bootstrap_iters=10,
-            description_dict=None,
-        )
-
-        print(taskname, lm.tokencost)
-        values.append(
-            [
-                taskname,
-                lm.tokencost,
-                lm.tokencost / 1000 * 0.0008,
-                lm.tokencost / 1000 * 0.0012,
-                lm.tokencost / 1000 * 0.006,
-                lm.tokencost / 1000 * 0.06,
-            ]
-        )
-    from pytablewriter import MarkdownTableWriter
+    args = parse_args()
 
-    writer = MarkdownTableWriter()
-    writer.headers = ["Task", "Tokens", "Ada", "Babbage", "Curie", "Davinci"]
-
-    values.sort(key=lambda x: -x[1])
-    totcost = sum([x[1] for x in values])
-    values.append(
-        [
-            "**Total**",
-            totcost,
-            totcost / 1000 * 0.0008,
-            totcost / 1000 * 0.0012,
-            totcost / 1000 * 0.006,
-            totcost / 1000 * 0.06,
-        ]
+    tokenizer = None
+    if args.tokenizer:
+        import transformers
+
+        tokenizer = transformers.AutoTokenizer.from_pretrained(args.tokenizer)
+
+    task_names = sorted(
+        {name for pattern in args.tasks.split(",") for name in fnmatch.filter(tasks.ALL_TASKS, pattern)}
     )
+    fewshots = [int(n) for n in args.num_fewshot.split(",")]
+    templates = [None if t == "none" else t for t in args.conversation_template.split(",")]
+
+    rows = []
+    for taskname in task_names:
+        task = tasks.get_task(taskname)()
+        gen_tokens = args.gen_tokens_cot if "cot" in taskname else args.gen_tokens_direct
+        lm = DryrunLM(tokenizer, gen_tokens)
+        for num_fewshot in fewshots:
+            for template in templates:
+                lm.reset()
+                evaluator.evaluate(
+                    lm=lm,
+                    task_dict={taskname: task},
+                    num_fewshot=num_fewshot,
+                    limit=args.limit,
+                    bootstrap_iters=10,
+                    description_dict=None,
+                    conversation_template=template,
+                    prompt_as_single_user_message=args.prompt_as_single_user_message,
+                )
+                cost = (lm.prompt_tokens * args.price_in + lm.completion_tokens * args.price_out) / 1e6
+                hours = lm.requests * args.latency / max(1, args.concurrency) / 3600
+                rows.append({
+                    "task": taskname,
+                    "num_fewshot": num_fewshot,
+                    "conversation_template": template,
+                    "requests": lm.requests,
+                    "prompt_tokens": lm.prompt_tokens,
+                    "completion_tokens": lm.completion_tokens,
+                    "cost": cost,
+                    "hours": hours,
+                })
+                print(taskname, num_fewshot, template, lm.requests, lm.prompt_tokens, lm.completion_tokens)
 
-    writer.value_matrix = values
+    from pytablewriter import MarkdownTableWriter
 
+    writer = MarkdownTableWriter()
+    writer.headers = ["Task", "Shots", "Template", "Requests", "Prompt tok", "Completion tok", "Cost", "Hours"]
+    values = [
+        [r["task"], r["num_fewshot"], r["conversation_template"] or "-", r["requests"],
+         r["prompt_tokens"], r["completion_tokens"], "%.2f" % r["cost"], "%.2f" % r["hours"]]
+        for r in sorted(rows, key=lambda r: -r["cost"])
+    ]
+    values.append([
+        "**Total**", "", "",
+        sum(r["requests"] for r in rows),
+        sum(r["prompt_tokens"] for r in rows),
+        sum(r["completion_tokens"] for r in rows),
+        "%.2f" % sum(r["cost"] for r in rows),
+        "%.2f" % sum(r["hours"] for r in rows),
+    ])
+    writer.value_matrix = values
     print(writer.dumps())
 
+    if args.output_path:
+        with open(args.output_path, "w") as f:
+            json.dump({"settings": vars(args), "estimates": rows}, f, indent=2)
+
 
 if __name__ == "__main__":
     main()
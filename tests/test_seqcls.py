@@ -0,0 +1,63 @@
+import re
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("datasets")
+pytest.importorskip("sqlitedict")
+
+from lm_eval.models.seqcls import SequenceClassificationLM, training_input  # noqa: E402
+
+
+def make_lm(scores):
+    """A SequenceClassificationLM without a checkpoint; _log_probs records its inputs."""
+    lm = SequenceClassificationLM.__new__(SequenceClassificationLM)
+    lm.letters = list("ABCDE")
+    lm._letter_re = re.compile(r"^\s*([ABCDE])\.?\s*$")
+    lm._docs = {}
+    lm.seen = []
+
+    def _log_probs(texts):
+        lm.seen.extend(texts)
+        return np.log(np.array([scores] * len(texts)))
+
+    lm._log_probs = _log_probs
+    return lm
+
+
+DOC = {
+    "context": "Um texto de apoio.",
+    "question": "Quanto é 2 + 2?",
+    "choices": ["1", "2", "3", "4", "5"],
+    "gold": 3,
+}
+
+
+def test_greedy_until_uses_the_request_doc():
+    lm = make_lm([0.1, 0.1, 0.1, 0.6, 0.1])
+    args = ("Exemplo\n##\nQuestão renderizada", ["\n##\n"])
+    lm.set_request_docs("greedy_until", [(args, DOC)])
+
+    assert lm.greedy_until([args]) == ["D."]
+    assert lm.seen == [training_input(DOC)]
+
+
+def test_greedy_until_without_doc_drops_fewshots():
+    lm = make_lm([0.6, 0.1, 0.1, 0.1, 0.1])
+    args = ("Exemplo\n##\nQuestão renderizada", ["\n##\n"])
+
+    assert lm.greedy_until([args]) == ["A."]
+    assert lm.seen == ["Questão renderizada"]
+
+
+def test_loglikelihood_scores_one_row_per_doc():
+    lm = make_lm([0.1, 0.1, 0.1, 0.6, 0.1])
+    requests = [("Questão", f" {letter}") for letter in "ABCDE"]
+    lm.set_request_docs("loglikelihood", [(args, DOC) for args in requests])
+
+    results = lm.loglikelihood(requests)
+    assert [is_greedy for _, is_greedy in results] == [False, False, False, True, False]
+    assert results[3][0] == pytest.approx(np.log(0.6))
+    assert lm.seen == [training_input(DOC)]